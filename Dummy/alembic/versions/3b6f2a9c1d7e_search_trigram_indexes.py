@@ -0,0 +1,38 @@
+"""search trigram indexes
+
+Revision ID: 3b6f2a9c1d7e
+Revises: 844877d02043
+Create Date: 2026-10-19 09:12:31.402118
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b6f2a9c1d7e"
+down_revision = "844877d02043"
+branch_labels = None
+depends_on = None
+
+# tables searched by the per-object search() functions
+SEARCH_TABLES = ["risk", "control", "assessment", "framework", "project_evaluation"]
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in SEARCH_TABLES:
+        for column in ("name", "description"):
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm "
+                f"ON {table} USING gin (lower({column}) gin_trgm_ops)"
+            )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_keyword_name_trgm "
+        "ON keyword USING gin (lower(name) gin_trgm_ops)"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_keyword_name_trgm")
+    for table in SEARCH_TABLES:
+        for column in ("name", "description"):
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_{column}_trgm")
@@ -0,0 +1,39 @@
+"""keyset pagination indexes
+
+Revision ID: 5d2e8f7a4c91
+Revises: 3b6f2a9c1d7e
+Create Date: 2026-10-19 14:05:47.218305
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5d2e8f7a4c91"
+down_revision = "3b6f2a9c1d7e"
+branch_labels = None
+depends_on = None
+
+# (table, sort column) pairs that back pagination cursors, see utils.keyset_order
+KEYSET_INDEXES = [
+    ("project", "name"),
+    ("project", "created_date"),
+    ("task", "id"),
+    ("task", "created_at"),
+]
+
+
+def _index_columns(column):
+    return "tenant_id, id" if column == "id" else f"tenant_id, {column}, id"
+
+
+def upgrade():
+    for table, column in KEYSET_INDEXES:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_tenant_id_{column}_keyset "
+            f"ON {table} ({_index_columns(column)})"
+        )
+
+
+def downgrade():
+    for table, column in KEYSET_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_tenant_id_{column}_keyset")
@@ -0,0 +1,32 @@
+"""reminder due date indexes
+
+Revision ID: 7c4a1e9b2f60
+Revises: 5d2e8f7a4c91
+Create Date: 2026-10-19 16:42:11.503920
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7c4a1e9b2f60"
+down_revision = "5d2e8f7a4c91"
+branch_labels = None
+depends_on = None
+
+# (table, due date column) pairs the reminder scheduler looks up by date,
+# see db.user_notification.schedule_due_reminders
+REMINDER_DUE_DATE_INDEXES = [
+    ("audit_test", "end_date"),
+    ("task", "due_date"),
+    ("approval_workflow", "due_date"),
+]
+
+
+def upgrade():
+    for table, column in REMINDER_DUE_DATE_INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})")
+
+
+def downgrade():
+    for table, column in REMINDER_DUE_DATE_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_{column}")
@@ -0,0 +1,30 @@
+"""user notification inbox
+
+Revision ID: 9e3d5b7c1a24
+Revises: 7c4a1e9b2f60
+Create Date: 2026-10-19 18:20:36.114872
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9e3d5b7c1a24"
+down_revision = "7c4a1e9b2f60"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("user_notifications", sa.Column("read_date", sa.DateTime(), nullable=True))
+    # there was no read state before the inbox; start every user with an empty badge
+    op.execute("UPDATE user_notifications SET read_date = created")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_user_notifications_user_created "
+        "ON user_notifications (user_id, created, id)"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_user_notifications_user_created")
+    op.drop_column("user_notifications", "read_date")
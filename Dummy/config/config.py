@@ -32,6 +32,8 @@ class Settings(BaseSettings):
     AWS_SHARED_CREDENTIALS_FILE: str = Field(
         "~/.aws/credentials", env="AWS_SHARED_CREDENTIALS_FILE"
     )
+    # an S3 compatible endpoint such as MinIO or LocalStack; None uses AWS
+    S3_ENDPOINT_URL: str = Field(None, env="S3_ENDPOINT_URL")
 
     COGNITO_ACCESS_KEY_ID: str = Field(
         ...,
@@ -362,13 +362,14 @@ async def update_approval_workflow(
             owner = db.query(User).filter_by(id=owner_id).first()
             if owner_notif_settings.assigned_email:
                 await send_assigned_email(
+                    db=db,
                     subject="Approval Workflow Updated",
                     email=owner.email,
                     message=f"{all_changes} Link: {full_link}",
                 )
             if owner_notif_settings.assigned_sms:
                 # Implement your sms sending function accordingly.
-                await send_sms(owner.phone_no, f"{all_changes} Link: {full_link}")
+                await send_sms(db, owner.phone_no, f"{all_changes} Link: {full_link}")
 
         # Notifications for approvers
         approvers = db.query(Approval).filter(Approval.approval_workflow_id == id).all()
@@ -387,13 +388,14 @@ async def update_approval_workflow(
             if settings and settings.assigned_email:
                 approver_user = db.query(User).filter_by(id=approver.user_id).first()
                 await send_assigned_email(
+                    db=db,
                     subject="Approval Workflow Updated",
                     email=approver_user.email,
                     message=f"{all_changes} Link: {full_link}",
                 )
             if settings and settings.assigned_sms:
                 # Implement your sms sending function accordingly.
-                await send_sms(approver_user.phone_no, f"{all_changes} Link: {full_link}")
+                await send_sms(db, approver_user.phone_no, f"{all_changes} Link: {full_link}")
         # Notifications for stakeholders
         stakeholders = db.query(ApprovalStakeholder).filter_by(approval_workflow_id=id).all()
         for stakeholder in stakeholders:
@@ -411,13 +413,14 @@ async def update_approval_workflow(
             if settings and settings.assigned_email:
                 stakeholder_user = db.query(User).filter_by(id=stakeholder.user_id).first()
                 await send_assigned_email(
+                    db=db,
                     subject="Approval Workflow Updated",
                     email=stakeholder_user.email,
                     message=f"{all_changes} Link: {full_link}",
                 )
             if settings and settings.assigned_sms:
                 # Implement your sms sending function accordingly.
-                await send_sms(stakeholder_user.phone_no, f"{all_changes} Link: {full_link}")
+                await send_sms(db, stakeholder_user.phone_no, f"{all_changes} Link: {full_link}")
         db.commit()  # Commit all notifications in a single transaction
 
     # Update the existing workflow with new data
@@ -455,13 +458,14 @@ async def delete_approval_workflow(db: Session, id: int, user_id: int, tenant_id
         owner = db.query(User).filter_by(id=owner_id).first()
         if owner_notif_settings.assigned_email:
             await send_assigned_email(
+                db=db,
                 subject="Approval Workflow Deleted",
                 email=owner.email,
                 message=f"{all_changes} Link: {full_link}",
             )
         if owner_notif_settings.assigned_sms:
             # Implement your sms sending function accordingly.
-            await send_sms(owner.phone_no, f"{all_changes} Link: {full_link}")
+            await send_sms(db, owner.phone_no, f"{all_changes} Link: {full_link}")
 
     # Notifications for approvers
     approvers = db.query(Approval).filter(Approval.approval_workflow_id == id).all()
@@ -478,13 +482,14 @@ async def delete_approval_workflow(db: Session, id: int, user_id: int, tenant_id
         if settings and settings.assigned_email:
             approver_user = db.query(User).filter_by(id=approver.user_id).first()
             await send_assigned_email(
+                db=db,
                 subject="Approval Workflow Deleted",
                 email=approver_user.email,
                 message=f"{all_changes} Link: {full_link}",
             )
         if settings and settings.assigned_sms:
             # Implement your sms sending function accordingly.
-            await send_sms(approver_user.phone_no, f"{all_changes} Link: {full_link}")
+            await send_sms(db, approver_user.phone_no, f"{all_changes} Link: {full_link}")
     # Notifications for stakeholders
     stakeholders = db.query(ApprovalStakeholder).filter_by(approval_workflow_id=id).all()
     for stakeholder in stakeholders:
@@ -500,13 +505,14 @@ async def delete_approval_workflow(db: Session, id: int, user_id: int, tenant_id
         if settings and settings.assigned_email:
             stakeholder_user = db.query(User).filter_by(id=stakeholder.user_id).first()
             await send_assigned_email(
+                db=db,
                 subject="Approval Workflow Deleted",
                 email=stakeholder_user.email,
                 message=f"{all_changes} Link: {full_link}",
             )
         if settings and settings.assigned_sms:
             # Implement your sms sending function accordingly.
-            await send_sms(stakeholder_user.phone_no, f"{all_changes} Link: {full_link}")
+            await send_sms(db, stakeholder_user.phone_no, f"{all_changes} Link: {full_link}")
     db.commit()  # Commit all notifications in a single transaction
 
     # delete all associations
@@ -768,13 +774,14 @@ async def create_approval(
         owner = db.query(User).filter_by(id=owner_id).first()
         if owner_notif_settings.assigned_email:
             await send_assigned_email(
+                db=db,
                 subject="Approval Workflow Updated",
                 email=owner.email,
                 message=f"{message} Link: {full_link}",
             )
         if owner_notif_settings.assigned_sms:
             # Implement your sms sending function accordingly.
-            await send_sms(owner.phone_no, f"{message} Link: {full_link}")
+            await send_sms(db, owner.phone_no, f"{message} Link: {full_link}")
 
     # Notifications for approvers
     approvers = (
@@ -795,13 +802,14 @@ async def create_approval(
         if settings and settings.assigned_email:
             approver_user = db.query(User).filter_by(id=approver.user_id).first()
             await send_assigned_email(
+                db=db,
                 subject="Approval Workflow Updated",
                 email=approver_user.email,
                 message=f"{message} Link: {full_link}",
             )
         if settings and settings.assigned_sms:
             # Implement your sms sending function accordingly.
-            await send_sms(approver_user.phone_no, f"{message} Link: {full_link}")
+            await send_sms(db, approver_user.phone_no, f"{message} Link: {full_link}")
     # Notifications for stakeholders
     stakeholders = (
         db.query(ApprovalStakeholder)
@@ -821,13 +829,15 @@ async def create_approval(
         if settings and settings.assigned_email:
             stakeholder_user = db.query(User).filter_by(id=stakeholder.user_id).first()
             await send_assigned_email(
+                db=db,
                 subject="Approval Workflow Updated",
                 email=stakeholder_user.email,
                 message=f"{message} Link: {full_link}",
             )
         if settings and settings.assigned_sms:
             # Implement your sms sending function accordingly.
-            await send_sms(stakeholder_user.phone_no, f"{message} Link: {full_link}")
+            await send_sms(db, stakeholder_user.phone_no, f"{message} Link: {full_link}")
+    db.commit()  # Commit all notifications in a single transaction
 
     return new_approval
 
@@ -891,13 +901,14 @@ async def update_approval(
             owner = db.query(User).filter_by(id=owner_id).first()
             if owner_notif_settings.assigned_email:
                 await send_assigned_email(
+                    db=db,
                     subject="Approval Workflow Updated",
                     email=owner.email,
                     message=f"{all_changes} Link: {full_link}",
                 )
             if owner_notif_settings.assigned_sms:
                 # Implement your sms sending function accordingly.
-                await send_sms(owner.phone_no, f"{all_changes} Link: {full_link}")
+                await send_sms(db, owner.phone_no, f"{all_changes} Link: {full_link}")
 
         # Notifications for approvers
         approvers = db.query(Approval).filter(Approval.approval_workflow_id == id).all()
@@ -916,13 +927,14 @@ async def update_approval(
             if settings and settings.assigned_email:
                 approver_user = db.query(User).filter_by(id=approver.user_id).first()
                 await send_assigned_email(
+                    db=db,
                     subject="Approval Workflow Updated",
                     email=approver_user.email,
                     message=f"{all_changes} Link: {full_link}",
                 )
             if settings and settings.assigned_sms:
                 # Implement your sms sending function accordingly.
-                await send_sms(approver_user.phone_no, f"{all_changes} Link: {full_link}")
+                await send_sms(db, approver_user.phone_no, f"{all_changes} Link: {full_link}")
         # Notifications for stakeholders
         stakeholders = db.query(ApprovalStakeholder).filter_by(approval_workflow_id=id).all()
         for stakeholder in stakeholders:
@@ -940,13 +952,14 @@ async def update_approval(
             if settings and settings.assigned_email:
                 stakeholder_user = db.query(User).filter_by(id=stakeholder.user_id).first()
                 await send_assigned_email(
+                    db=db,
                     subject="Approval Workflow Updated",
                     email=stakeholder_user.email,
                     message=f"{all_changes} Link: {full_link}",
                 )
             if settings and settings.assigned_sms:
                 # Implement your sms sending function accordingly.
-                await send_sms(stakeholder_user.phone_no, f"{all_changes} Link: {full_link}")
+                await send_sms(db, stakeholder_user.phone_no, f"{all_changes} Link: {full_link}")
         db.commit()  # Commit all notifications in a single transaction
 
     existing_approval.update(approval_data)
@@ -996,13 +1009,14 @@ async def delete_approval(db: Session, user_id: int, id: int):
         owner = db.query(User).filter_by(id=owner_id).first()
         if owner_notif_settings.assigned_email:
             await send_assigned_email(
+                db=db,
                 subject="Approval Workflow Updated",
                 email=owner.email,
                 message=f"{all_changes} Link: {full_link}",
             )
         if owner_notif_settings.assigned_sms:
             # Implement your sms sending function accordingly.
-            await send_sms(owner.phone_no, f"{all_changes} Link: {full_link}")
+            await send_sms(db, owner.phone_no, f"{all_changes} Link: {full_link}")
 
     # Notifications for approvers
     approvers = db.query(Approval).filter(Approval.approval_workflow_id == id).all()
@@ -1019,13 +1033,14 @@ async def delete_approval(db: Session, user_id: int, id: int):
         if settings and settings.assigned_email:
             approver_user = db.query(User).filter_by(id=approver.user_id).first()
             await send_assigned_email(
+                db=db,
                 subject="Approval Workflow Updated",
                 email=approver_user.email,
                 message=f"{all_changes} Link: {full_link}",
             )
         if settings and settings.assigned_sms:
             # Implement your sms sending function accordingly.
-            await send_sms(approver_user.phone_no, f"{all_changes} Link: {full_link}")
+            await send_sms(db, approver_user.phone_no, f"{all_changes} Link: {full_link}")
     # Notifications for stakeholders
     stakeholders = db.query(ApprovalStakeholder).filter_by(approval_workflow_id=id).all()
     for stakeholder in stakeholders:
@@ -1041,13 +1056,14 @@ async def delete_approval(db: Session, user_id: int, id: int):
         if settings and settings.assigned_email:
             stakeholder_user = db.query(User).filter_by(id=stakeholder.user_id).first()
             await send_assigned_email(
+                db=db,
                 subject="Approval Workflow Updated",
                 email=stakeholder_user.email,
                 message=f"{all_changes} Link: {full_link}",
             )
         if settings and settings.assigned_sms:
             # Implement your sms sending function accordingly.
-            await send_sms(stakeholder_user.phone_no, f"{all_changes} Link: {full_link}")
+            await send_sms(db, stakeholder_user.phone_no, f"{all_changes} Link: {full_link}")
     db.commit()  # Commit all notifications in a single transaction
 
     db.delete(my_existing_approval)
@@ -1,5 +1,4 @@
 import logging
-from sqlalchemy import func, or_
 from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.orm.session import Session
 from datetime import date, timedelta
@@ -28,7 +27,11 @@ from fedrisk_api.schema.assessment import (
     UpdateAssessmentInstance,
 )
 
-from fedrisk_api.utils.utils import filter_by_tenant, filter_by_user_project_role
+from fedrisk_api.utils.utils import (
+    filter_by_tenant,
+    filter_by_user_project_role,
+    search_page,
+)
 
 # from fedrisk_api.db import history as db_history
 
@@ -290,28 +293,7 @@ async def delete_assessment(db: Session, id: int, tenant_id: int):
 
 def search(query: str, db: Session, tenant_id: int, user_id: int, offset: int = 0, limit: int = 10):
     lowercase_query = query.lower()
-    res = (
-        db.query(Assessment)
-        .filter(
-            or_(
-                func.lower(Assessment.name).contains(lowercase_query),
-                func.lower(Assessment.description).contains(lowercase_query),
-                func.lower(Assessment.keywords).contains(lowercase_query),
-            )
-        )
-        .all()
-    )
-    count = (
-        db.query(Assessment)
-        .filter(
-            or_(
-                func.lower(Assessment.name).contains(lowercase_query),
-                func.lower(Assessment.description).contains(lowercase_query),
-                func.lower(Assessment.keywords).contains(lowercase_query),
-            )
-        )
-        .count()
-    )
+    return search_page(db, db.query(Assessment), Assessment, lowercase_query, offset, limit)
 
 
 # DB methods for assessment_instance to CREATE, GET by id, GET all by assessment_id and DELETE by id
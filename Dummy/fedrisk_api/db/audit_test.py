@@ -67,7 +67,7 @@ async def manage_stakeholders(db, stakeholder_ids, audit_test, project, link):
             project.id,
         )
         await notify_user(
-            stakeholder, f"You've been added as a stakeholder on {audit_test.name}", link, None
+            db, stakeholder, f"You've been added as a stakeholder on {audit_test.name}", link, None
         )
     db.commit()
 
@@ -148,7 +148,7 @@ async def create_audit_test(
         f"You've been assigned as a tester for audit test {new_audit_test.name}",
         project.id,
     )
-    # Send email and sms updates to tester
+    # Queue email and sms updates to tester
     tester = db.query(User).filter_by(id=new_audit_test.tester_id).first()
     tester_settings = (
         db.query(UserNotificationSettings).filter_by(user_id=new_audit_test.tester_id).first()
@@ -156,11 +156,13 @@ async def create_audit_test(
     link = f"/projects/{project.id}/audit_tests/{new_audit_test.id}"
     if tester is not None:
         await notify_user(
+            db,
             tester,
             f"You've been added as a tester on audit test {new_audit_test.name}",
             link,
             tester_settings,
         )
+        db.commit()
 
     await add_keywords(db, keywords, new_audit_test.id, tenant_id)
     await manage_stakeholders(db, stakeholder_ids, new_audit_test, project, link)
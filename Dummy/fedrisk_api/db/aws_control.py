@@ -1,13 +1,10 @@
 import logging
-import pandas as pd
-from io import BytesIO
 from sqlalchemy.orm import Session
 from itertools import groupby
 
 from sqlalchemy import Date, cast
 
-from fedrisk_api.s3 import S3Service
-
+from fedrisk_api.db.enums import ImportJobType
 from fedrisk_api.db.models import (
     AWSControl,
     ProjectControl,
@@ -15,7 +12,6 @@ from fedrisk_api.db.models import (
     Project,
     ImportAWSControls,
     Control,
-    Tenant,
 )
 from fedrisk_api.schema.aws_control import (
     CreateAWSControl,
@@ -244,76 +240,13 @@ def delete_import_aws_control(db: Session, id: int, tenant_id: int):
 
 
 async def get_aws_controls_import(db: Session, tenant_id: int):
-    imports = []
+    from fedrisk_api.db.import_job import queue_pending_imports
+    from fedrisk_api.utils.import_queue import import_job_queue
+
     aws_control_imports = (
         db.query(ImportAWSControls).filter(ImportAWSControls.tenant_id == tenant_id).all()
     )
-    for aws_control_import in aws_control_imports:
-        # check s3 tags
-        tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
-        file_key = f"awscontrols/{aws_control_import.id}-{aws_control_import.name}"
-        if aws_control_import.imported is None:
-            # Try to import
-            # try:
-            s3_service = S3Service()
-            response = s3_service.get_object_tags(tenant.s3_bucket, file_key)
-            # Extract tags from the response
-            tags = response.get("TagSet", [])
-            aws_control_import_cur = db.query(ImportAWSControls).filter(
-                ImportAWSControls.id == aws_control_import.id
-            )
-            if tags:
-                # print("Tags for the object:")
-                for tag in tags:
-                    # print(f"Key: {tag['Key']}, Value: {tag['Value']}")
-                    if tag["Key"] == "ScanResult":
-                        scan_result = tag["Value"]
-                        # Try to import
-                        if scan_result == "Clean":
-                            from fedrisk_api.db.util.import_aws_controls import (
-                                load_aws_control_data_from_dataframe as load_aws_control_data_from_dataframe_s3,
-                            )
-
-                            aws_import_file = await s3_service.get_file_object(
-                                tenant.s3_bucket, file_key
-                            )
-                            df = pd.read_csv(BytesIO(aws_import_file["Body"].read()))
-                            aws_control_num = await load_aws_control_data_from_dataframe_s3(
-                                df, aws_control_import.project_id
-                            )
-                            if type(aws_control_num) != list:
-                                # if aws_control_num.get("error") is not None:
-                                aws_control_import_cur.update(
-                                    {
-                                        "imported": False,
-                                        "import_results": f"There was a problem importing your file. {aws_control_import_cur.get('error')}",
-                                    }
-                                )
-                                db.commit()
-                            else:
-                                success_msg = f"Successfully loaded {aws_control_num[0]} aws controls. Successfully loaded {aws_control_num[1]} aws control to project control mappings."
-                                LOGGER.info(f"{success_msg}")
-                                LOGGER.info(f"aws_control_import_cur {aws_control_import_cur}")
-                                aws_control_import_cur.update(
-                                    {"imported": True, "import_results": success_msg}
-                                )
-                                db.commit()
-                            # return "Imported"  # response added
-                        elif scan_result == "Infected":
-                            aws_control_import_cur.update(
-                                {
-                                    "imported": False,
-                                    "import_results": "Could not import controls as file is infected",
-                                }
-                            )
-                            db.commit()
-                imports.append(aws_control_import)
-            else:
-                print("No tags found for the object.")
-                imports.append(aws_control_import)
-            # except Exception:
-            #     LOGGER.exception("Could not find object with tags")
-            #     raise AssertionError("Could not find object with tags")
-        else:
-            imports.append(aws_control_import)
-    return imports
+    # the import itself runs in the background; this only queues uploads without a live job
+    for import_job in queue_pending_imports(db, ImportJobType.aws_control, aws_control_imports):
+        import_job_queue.submit(import_job.id)
+    return aws_control_imports
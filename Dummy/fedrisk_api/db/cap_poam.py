@@ -59,6 +59,9 @@ async def manage_stakeholders(db, stakeholder_ids, cap_poam, project, link):
             db.commit()
     # cap_poam.stakeholders = stakeholders
     for stakeholder in new_stakeholders:
+        await notify_user(
+            db, stakeholder, f"You've been added as a stakeholder on {cap_poam.name}", link, None
+        )
         await add_notification(
             db,
             stakeholder.id,
@@ -68,9 +71,6 @@ async def manage_stakeholders(db, stakeholder_ids, cap_poam, project, link):
             f"You've been added as a stakeholder to {cap_poam.name}",
             project.id,
         )
-        await notify_user(
-            stakeholder, f"You've been added as a stakeholder on {cap_poam.name}", link, None
-        )
 
 
 async def manage_project_controls(db, project_control_ids, cap_poam):
@@ -287,7 +287,7 @@ async def delete_cap_poam(db: Session, id: int, tenant_id: int):
         .filter(Project.id == existing_cap_poam.first().project_id)
         .first()
     )
-    manage_notifications(
+    await manage_notifications(
         db,
         db.query(UserWatching)
         .filter(UserWatching.project_cap_poams == True, UserWatching.project_id == project.id)
@@ -28,7 +28,7 @@ from fedrisk_api.schema.control import (
     CreateBatchControlsFrameworkVersion,
     UpdateControl,
 )
-from fedrisk_api.utils.utils import filter_by_tenant, ordering_query
+from fedrisk_api.utils.utils import filter_by_tenant, ordering_query, search_page
 
 LOGGER = logging.getLogger(__name__)
 
@@ -288,84 +288,16 @@ def search(query: str, db: Session, tenant_id: int, user_id: int, offset: int =
     user = db.query(User).filter(User.id == user_id).first()
 
     if user.is_superuser:
-        res = (
-            db.query(Control)
-            .filter(
-                or_(
-                    func.lower(Control.name).contains(lowercase_query),
-                    func.lower(Control.description).contains(lowercase_query),
-                    func.lower(Control.keywords).contains(lowercase_query),
-                )
-            )
-            .all()
-        )
-    elif user.is_tenant_admin:
-        res = (
-            filter_by_tenant(db, Control, tenant_id)
-            .filter(
-                or_(
-                    func.lower(Control.name).contains(lowercase_query),
-                    func.lower(Control.description).contains(lowercase_query),
-                    func.lower(Control.keywords).contains(lowercase_query),
-                )
-            )
-            .all()
-        )
-    else:
-        res = (
-            filter_by_tenant(db, Control, tenant_id)
-            .join(ProjectControl, ProjectControl.control_id == Control.id)
-            .join(ProjectUser, ProjectUser.project_id == ProjectControl.project_id)
-            .filter(ProjectUser.user_id == user_id)
-            .filter(
-                or_(
-                    func.lower(Control.name).contains(lowercase_query),
-                    func.lower(Control.description).contains(lowercase_query),
-                    func.lower(Control.keywords).contains(lowercase_query),
-                )
-            )
-            .all()
-        )
-
-    if user.is_superuser:
-        count = (
-            db.query(Control)
-            .filter(
-                or_(
-                    func.lower(Control.name).contains(lowercase_query),
-                    func.lower(Control.description).contains(lowercase_query),
-                    func.lower(Control.keywords).contains(lowercase_query),
-                )
-            )
-            .count()
-        )
+        queryset = db.query(Control)
     elif user.is_tenant_admin:
-        count = (
-            filter_by_tenant(db, Control, tenant_id)
-            .filter(
-                or_(
-                    func.lower(Control.name).contains(lowercase_query),
-                    func.lower(Control.description).contains(lowercase_query),
-                    func.lower(Control.keywords).contains(lowercase_query),
-                )
-            )
-            .count()
-        )
+        queryset = filter_by_tenant(db, Control, tenant_id)
     else:
-        count = (
-            filter_by_tenant(db, Control, tenant_id)
-            .join(ProjectControl, ProjectControl.control_id == Control.id)
-            .join(ProjectUser, ProjectUser.project_id == ProjectControl.project_id)
-            .filter(ProjectUser.user_id == user_id)
-            .filter(
-                or_(
-                    func.lower(Control.name).contains(lowercase_query),
-                    func.lower(Control.description).contains(lowercase_query),
-                    func.lower(Control.keywords).contains(lowercase_query),
-                )
+        queryset = filter_by_tenant(db, Control, tenant_id).filter(
+            Control.id.in_(
+                db.query(ProjectControl.control_id)
+                .join(ProjectUser, ProjectUser.project_id == ProjectControl.project_id)
+                .filter(ProjectUser.user_id == user_id)
             )
-            .distinct()
-            .count()
         )
 
-    return count, res[offset : offset + limit]
+    return search_page(db, queryset, Control, lowercase_query, offset, limit)
@@ -0,0 +1,197 @@
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from fedrisk_api.db.models import (
+    Assessment,
+    AuditTest,
+    AuditTestInstance,
+    CapPoam,
+    Control,
+    DashboardMetric,
+    Exception,
+    ExceptionReview,
+    Project,
+    ProjectControl,
+    Risk,
+)
+from fedrisk_api.utils.event_stream import EVENT_STREAM_ENABLED, queue_event
+
+LOGGER = logging.getLogger(__name__)
+
+# a stale row is still served until it is this old, so a burst of writes to one
+# project costs a single recompute
+DASHBOARD_METRIC_REFRESH_SECONDS = int(os.getenv("DASHBOARD_METRIC_REFRESH_SECONDS", "30"))
+# safety net for changes that bypass the ORM (bulk updates, reference data renames)
+DASHBOARD_METRIC_MAX_AGE_SECONDS = int(os.getenv("DASHBOARD_METRIC_MAX_AGE_SECONDS", "3600"))
+
+# model -> (attribute, lookup); lookup turns attribute values into a project_id select,
+# None means the attribute already is the project_id
+PROJECT_ID_SOURCES = {
+    Project: ("id", None),
+    Risk: ("project_id", None),
+    ProjectControl: ("project_id", None),
+    AuditTest: ("project_id", None),
+    CapPoam: ("project_id", None),
+    AuditTestInstance: (
+        "audit_test_id",
+        lambda ids: select(AuditTest.project_id).where(AuditTest.id.in_(ids)),
+    ),
+    Assessment: (
+        "project_control_id",
+        lambda ids: select(ProjectControl.project_id).where(ProjectControl.id.in_(ids)),
+    ),
+    Exception: (
+        "project_control_id",
+        lambda ids: select(ProjectControl.project_id).where(ProjectControl.id.in_(ids)),
+    ),
+    ExceptionReview: (
+        "exception_id",
+        lambda ids: select(ProjectControl.project_id)
+        .join(Exception, Exception.project_control_id == ProjectControl.id)
+        .where(Exception.id.in_(ids)),
+    ),
+    Control: (
+        "id",
+        lambda ids: select(ProjectControl.project_id).where(ProjectControl.control_id.in_(ids)),
+    ),
+}
+
+
+def mark_dashboard_metrics_stale(connection, project_ids=(), project_id_selects=()):
+    """Flag the stored metrics of the given projects for recompute on next read"""
+    conditions = [DashboardMetric.project_id.in_(query) for query in project_id_selects]
+    if project_ids:
+        conditions.append(DashboardMetric.project_id.in_(project_ids))
+    if not conditions:
+        return
+    table = DashboardMetric.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.stale_date.is_(None))
+        .where(or_(*conditions))
+        .values(stale_date=datetime.utcnow())
+    )
+
+
+def changed_project_ids(session, sources=PROJECT_ID_SOURCES):
+    """(project ids, project id selects) of the objects in the session's pending flush"""
+    project_ids = set()
+    lookup_ids = defaultdict(set)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        source = sources.get(type(obj))
+        if not source:
+            continue
+        attribute, lookup = source
+        value = getattr(obj, attribute)
+        if value is None:
+            continue
+        if lookup is None:
+            project_ids.add(value)
+        else:
+            lookup_ids[lookup].add(value)
+    return project_ids, [lookup(ids) for lookup, ids in lookup_ids.items()]
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_dashboard_metrics(session, flush_context):
+    project_ids, project_id_selects = changed_project_ids(session)
+    if project_ids or project_id_selects:
+        mark_dashboard_metrics_stale(session.connection(), project_ids, project_id_selects)
+        if EVENT_STREAM_ENABLED:
+            queue_dashboard_invalidated(session, project_ids, project_id_selects)
+
+
+def queue_dashboard_invalidated(session, project_ids=(), project_id_selects=()):
+    """Tell the event streams of the projects' tenants to reload their dashboards"""
+    conditions = [Project.id.in_(query) for query in project_id_selects]
+    if project_ids:
+        conditions.append(Project.id.in_(project_ids))
+    tenant_project_ids = defaultdict(list)
+    for project_id, tenant_id in session.connection().execute(
+        select(Project.id, Project.tenant_id).where(or_(*conditions))
+    ):
+        tenant_project_ids[tenant_id].append(project_id)
+    for tenant_id, ids in tenant_project_ids.items():
+        queue_event(session, "dashboard_invalidated", tenant_id=tenant_id, project_ids=sorted(ids))
+
+
+def _is_fresh(row, now):
+    if row.computed_date < now - timedelta(seconds=DASHBOARD_METRIC_MAX_AGE_SECONDS):
+        return False
+    if row.stale_date is None:
+        return True
+    return row.computed_date > now - timedelta(seconds=DASHBOARD_METRIC_REFRESH_SECONDS)
+
+
+def _store(db: Session, rows, project_id, metric, scope, payload, now):
+    row = rows.get(project_id)
+    if row is None:
+        row = DashboardMetric(project_id=project_id, metric=metric, scope=scope)
+        db.add(row)
+    row.payload = payload
+    row.computed_date = now
+    row.stale_date = None
+
+
+def get_dashboard_metrics(db: Session, project_ids, metric: str, compute, scope: str = ""):
+    """{project_id: (payload, computed_date)} for a metric, recomputing missing or stale rows.
+
+    compute is called with the list of project ids that need refreshing and returns
+    {project_id: payload}; projects it leaves out are not stored.
+    """
+    project_ids = list(project_ids)
+    rows = {
+        row.project_id: row
+        for row in db.query(DashboardMetric)
+        .filter(DashboardMetric.project_id.in_(project_ids))
+        .filter(DashboardMetric.metric == metric)
+        .filter(DashboardMetric.scope == scope)
+        .all()
+    }
+    now = datetime.utcnow()
+    results = {
+        project_id: (row.payload, row.computed_date)
+        for project_id, row in rows.items()
+        if _is_fresh(row, now)
+    }
+    refresh_ids = [project_id for project_id in project_ids if project_id not in results]
+    if not refresh_ids:
+        return results
+
+    computed = compute(refresh_ids)
+    for project_id, payload in computed.items():
+        payload = jsonable_encoder(payload)
+        _store(db, rows, project_id, metric, scope, payload, now)
+        results[project_id] = (payload, now)
+    try:
+        db.commit()
+    except IntegrityError:
+        # another request stored the same metric first; ours is just as fresh
+        LOGGER.info(f"Dashboard metric {metric} was refreshed concurrently")
+        db.rollback()
+    return results
+
+
+def get_dashboard_metric(db: Session, project_id: int, metric: str, compute, scope: str = ""):
+    """(payload, computed_date) for one project; compute() builds the payload.
+
+    Returns (None, None) without storing anything when compute() returns a falsy value.
+    """
+    def compute_one(refresh_ids):
+        payload = compute()
+        return {project_id: payload} if payload else {}
+
+    results = get_dashboard_metrics(db, [project_id], metric, compute_one, scope)
+    return results.get(project_id, (None, None))
+
+
+def with_computed_date(payload, computed_date):
+    """Payload as returned to the client, stamped with when it was computed"""
+    return {**payload, "metrics_computed_date": computed_date}
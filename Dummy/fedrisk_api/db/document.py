@@ -113,30 +113,31 @@ async def create_document(
     db.add(new_history)
     db.commit()
 
-    # create notification for document owner
-    await add_notification(
-        db,
-        new_document.owner_id,
-        "documents",
-        new_document.id,
-        f"/documents/{new_document.id}",
-        f"You've been assigned as an owner for document {new_document.title}",
-        project_id,
-    )
-
-    # Send email and sms updates
+    # Queue email and sms updates
     owner = db.query(User).filter_by(id=new_document.owner_id).first()
     owner_settings = (
         db.query(UserNotificationSettings).filter_by(user_id=new_document.owner_id).first()
     )
     link = f"/projects/documents/{new_document.id}"
     await notify_user(
+        db,
         owner,
         f"You've been added as an owner on document {new_document.name}",
         link,
         owner_settings,
     )
 
+    # create notification for document owner, committing the queued updates with it
+    await add_notification(
+        db,
+        new_document.owner_id,
+        "documents",
+        new_document.id,
+        f"/documents/{new_document.id}",
+        f"You've been assigned as an owner for document {new_document.title}",
+        project_id,
+    )
+
     # add keywords
     await add_keywords(db, keywords, new_document.id, tenant_id)
 
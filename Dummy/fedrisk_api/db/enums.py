@@ -153,3 +153,34 @@ class ApprovalWorkflowStatus(str, enum.Enum):
 class ApprovalStatus(str, enum.Enum):
     rejected = "rejected"
     approved = "approved"
+
+
+class ImportJobType(str, enum.Enum):
+    framework = "framework"
+    task = "task"
+    workflow = "workflow"
+    aws_control = "aws_control"
+
+
+class ImportJobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class NotificationChannel(str, enum.Enum):
+    email = "email"
+    sms = "sms"
+
+
+class NotificationOutboxStatus(str, enum.Enum):
+    pending = "pending"
+    sending = "sending"
+    sent = "sent"
+    dead = "dead"
+
+
+class ScheduledJobRunStatus(str, enum.Enum):
+    succeeded = "succeeded"
+    failed = "failed"
@@ -148,6 +148,7 @@ async def create_exception(
     link = f"/projects/{project.id}/controls/{new_exception.project_control_id}/exceptions/{new_exception.id}"
     if owner is not None:
         await notify_user(
+            db,
             owner,
             f"You've been added as an owner on exception {new_exception.name}",
             link,
@@ -164,6 +165,7 @@ async def create_exception(
         stake_settings = db.query(UserNotificationSettings).filter_by(user_id=stakeholder).first()
         if stake is not None:
             await notify_user(
+                db,
                 stake,
                 f"You've been added as a stakeholder on exception {new_exception.name}",
                 link,
@@ -171,7 +173,7 @@ async def create_exception(
             )
     # add keywords
     await add_keywords(db, keywords, new_exception.id, tenant_id)
-    # db.commit()
+    db.commit()
 
     # Send email notification
     project_id = existing_project_control.project.id
@@ -268,6 +270,7 @@ async def update_exception(
             )
             if stake and stake_settings:
                 await notify_user(
+                    db,
                     stake,
                     f"You've been added as a stakeholder on exception {existing_exception.name}",
                     link,
@@ -303,6 +306,7 @@ async def update_exception(
                 )
                 if owner:
                     await notify_user(
+                        db,
                         owner,
                         f"You've been added as an owner on exception {existing_exception.name}",
                         link,
@@ -1,6 +1,5 @@
 import logging
 
-from sqlalchemy import or_, func
 from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.session import Session
 
@@ -17,7 +16,7 @@ from fedrisk_api.db.models import (
     KeywordMapping,
     FrameworkDocument,
     FrameworkTenant,
-    # ProjectUser,
+    ProjectUser,
     User,
 )
 from fedrisk_api.schema.framework import (
@@ -26,7 +25,7 @@ from fedrisk_api.schema.framework import (
     CreateFrameworkTenant,
     UpdateFrameworkTenant,
 )
-from fedrisk_api.utils.utils import filter_by_tenant  # , ordering_query
+from fedrisk_api.utils.utils import search_page  # , filter_by_tenant, ordering_query
 
 from sqlalchemy.exc import IntegrityError
 
@@ -295,86 +294,30 @@ def search(
     user = db.query(User).filter(User.id == user_id).first()
 
     if user.is_superuser:
-        res = (
-            db.query(Framework)
-            .filter(
-                or_(
-                    func.lower(Framework.name).contains(lowercase_query),
-                    func.lower(Framework.description).contains(lowercase_query),
-                    func.lower(Framework.keywords).contains(lowercase_query),
-                )
-            )
-            .all()
-        )
+        queryset = db.query(Framework)
     elif user.is_tenant_admin:
-        res = (
-            filter_by_tenant(db, Framework, tenant_id)
-            .filter(
-                or_(
-                    func.lower(Framework.name).contains(lowercase_query),
-                    func.lower(Framework.description).contains(lowercase_query),
-                    func.lower(Framework.keywords).contains(lowercase_query),
+        queryset = db.query(Framework).filter(
+            Framework.id.in_(
+                db.query(FrameworkTenant.framework_id).filter(
+                    FrameworkTenant.tenant_id == tenant_id
                 )
             )
-            .all()
         )
     else:
-        res = (
-            filter_by_tenant(db, Framework, tenant_id)
-            .join(Control, Control.framework_id == Framework.id)
-            .join(ProjectControl, ProjectControl.control_id == Control.id)
-            .join(ProjectUser, ProjectUser.project_id == ProjectControl.project_id)
-            .filter(ProjectUser.user_id == user_id)
-            .filter(
-                or_(
-                    func.lower(Framework.name).contains(lowercase_query),
-                    func.lower(Framework.description).contains(lowercase_query),
-                    func.lower(Framework.keywords).contains(lowercase_query),
-                )
-            )
-            .distinct()
-            .all()
-        )
-
-    if user.is_superuser:
-        count = (
-            db.query(Framework)
-            .filter(
-                or_(
-                    func.lower(Framework.name).contains(lowercase_query),
-                    func.lower(Framework.description).contains(lowercase_query),
-                    func.lower(Framework.keywords).contains(lowercase_query),
+        queryset = db.query(Framework).filter(
+            Framework.id.in_(
+                db.query(FrameworkVersion.framework_id)
+                .join(
+                    ControlFrameworkVersion,
+                    ControlFrameworkVersion.framework_version_id == FrameworkVersion.id,
                 )
-            )
-            .count()
-        )
-    elif user.is_tenant_admin:
-        count = (
-            filter_by_tenant(db, Framework, tenant_id)
-            .filter(
-                or_(
-                    func.lower(Framework.name).contains(lowercase_query),
-                    func.lower(Framework.description).contains(lowercase_query),
-                    func.lower(Framework.keywords).contains(lowercase_query),
+                .join(
+                    ProjectControl,
+                    ProjectControl.control_id == ControlFrameworkVersion.control_id,
                 )
+                .join(ProjectUser, ProjectUser.project_id == ProjectControl.project_id)
+                .filter(ProjectUser.user_id == user_id)
             )
-            .count()
         )
-    else:
-        count = (
-            filter_by_tenant(db, Framework, tenant_id)
-            .join(Control, Control.framework_id == Framework.id)
-            .join(ProjectControl, ProjectControl.control_id == Control.id)
-            .join(ProjectUser, ProjectUser.project_id == ProjectControl.project_id)
-            .filter(ProjectUser.user_id == user_id)
-            .filter(
-                or_(
-                    func.lower(Framework.name).contains(lowercase_query),
-                    func.lower(Framework.description).contains(lowercase_query),
-                    func.lower(Framework.keywords).contains(lowercase_query),
-                )
-            )
-            .distinct()
-            .count()
-        )
-    return count, res[offset : offset + limit]
+
+    return search_page(db, queryset, Framework, lowercase_query, offset, limit)
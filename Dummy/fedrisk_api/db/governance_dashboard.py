@@ -0,0 +1,95 @@
+import logging
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from fedrisk_api.db.models import (
+    ControlClass,
+    ControlFamily,
+    ControlFrameworkVersion,
+    ControlPhase,
+    ControlStatus,
+    Framework,
+    FrameworkTenant,
+    FrameworkVersion,
+    ProjectControl,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+# dimension -> (model listing the dimension values, ProjectControl column pointing at it)
+CONTROL_BREAKDOWN_DIMENSIONS = {
+    "class": (ControlClass, ProjectControl.control_class_id),
+    "family": (ControlFamily, ProjectControl.control_family_id),
+    "phase": (ControlPhase, ProjectControl.control_phase_id),
+    "status": (ControlStatus, ProjectControl.control_status_id),
+    # project controls reach their framework through the control's framework versions
+    "framework": (Framework, None),
+}
+
+
+def _project_controls_by_dimension(dimension: str, project_id: int):
+    _, column = CONTROL_BREAKDOWN_DIMENSIONS[dimension]
+    if column is None:
+        column = FrameworkVersion.framework_id
+    query = select(
+        column.label("dimension_id"),
+        ProjectControl.id.label("project_control_id"),
+        ProjectControl.mitigation_percentage,
+    ).where(ProjectControl.project_id == project_id)
+    if dimension == "framework":
+        query = (
+            query.join(
+                ControlFrameworkVersion,
+                ControlFrameworkVersion.control_id == ProjectControl.control_id,
+            )
+            .join(
+                FrameworkVersion,
+                FrameworkVersion.id == ControlFrameworkVersion.framework_version_id,
+            )
+            .distinct()
+        )
+    return query.subquery()
+
+
+def _dimension_tenant_filter(dimension: str, tenant_id: int):
+    model, _ = CONTROL_BREAKDOWN_DIMENSIONS[dimension]
+    if dimension == "framework":
+        return Framework.id.in_(
+            select(FrameworkTenant.framework_id).where(FrameworkTenant.tenant_id == tenant_id)
+        )
+    return model.tenant_id == tenant_id
+
+
+def get_control_breakdown(db: Session, project_id: int, tenant_id: int, dimension: str):
+    """Project control count and average mitigation for every tenant value of a dimension.
+
+    Returns chart points {"x": name, "y": count, "percent": average mitigation}; values
+    without project controls are included with zero counts.
+    """
+    model, _ = CONTROL_BREAKDOWN_DIMENSIONS[dimension]
+    project_controls = _project_controls_by_dimension(dimension, project_id)
+    rows = (
+        db.query(
+            model.name,
+            func.count(project_controls.c.project_control_id).label("count"),
+            func.avg(project_controls.c.mitigation_percentage).label("mitigation_percentage"),
+        )
+        .outerjoin(project_controls, project_controls.c.dimension_id == model.id)
+        .filter(_dimension_tenant_filter(dimension, tenant_id))
+        .group_by(model.id, model.name)
+        .order_by(model.id)
+        .all()
+    )
+    return [
+        {
+            "x": row.name,
+            "y": row.count,
+            "percent": (
+                round(float(row.mitigation_percentage), 2)
+                if row.mitigation_percentage is not None
+                else 0
+            ),
+        }
+        for row in rows
+    ]
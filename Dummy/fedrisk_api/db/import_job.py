@@ -0,0 +1,364 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+import pandas as pd
+from sqlalchemy import event
+from sqlalchemy.orm import attributes
+from sqlalchemy.orm.session import Session
+
+from fedrisk_api.db.database import get_db
+from fedrisk_api.db.enums import ImportJobStatus, ImportJobType
+from fedrisk_api.db.models import (
+    ImportAWSControls,
+    ImportFramework,
+    ImportJob,
+    ImportTask,
+    Tenant,
+)
+from fedrisk_api.db.util.import_aws_controls import load_aws_control_data_from_dataframe
+from fedrisk_api.db.util.import_framework_utils import load_data_from_dataframe
+from fedrisk_api.db.util.import_task_utils import load_data_from_dataframe_tasks
+from fedrisk_api.db.util.import_workflow_tasks import (
+    import_workflow_flowchart_from_excel,
+    safe_import_spreadsheet,
+)
+from fedrisk_api.s3 import S3Service
+from fedrisk_api.utils.event_stream import queue_event
+
+LOGGER = logging.getLogger(__name__)
+
+# how long a worker waits for the virus scanner to tag an upload before giving up; the upload
+# is queued again the next time its import list is read
+IMPORT_JOB_SCAN_TIMEOUT_SECONDS = int(os.getenv("IMPORT_JOB_SCAN_TIMEOUT_SECONDS", "120"))
+IMPORT_JOB_SCAN_POLL_SECONDS = 5
+# queued or running jobs without an update for this long are treated as lost (e.g. the
+# process running them was restarted) and their upload may be queued again
+IMPORT_JOB_STALE_SECONDS = int(os.getenv("IMPORT_JOB_STALE_SECONDS", "900"))
+
+# upload rows whose imported/import_results columns mirror the outcome of their jobs
+IMPORT_JOB_SOURCES = {
+    ImportJobType.framework: ImportFramework,
+    ImportJobType.task: ImportTask,
+    ImportJobType.aws_control: ImportAWSControls,
+}
+IMPORT_JOB_FILE_KEY_PREFIXES = {
+    ImportJobType.framework: "frameworks",
+    ImportJobType.task: "tasks",
+    ImportJobType.aws_control: "awscontrols",
+    ImportJobType.workflow: "workflows",
+}
+INFECTED_MESSAGES = {
+    ImportJobType.framework: "Could not import framework as file is infected",
+    ImportJobType.task: "Could not import task as file is infected",
+    ImportJobType.aws_control: "Could not import controls as file is infected",
+}
+
+
+class ImportJobError(Exception):
+    """The upload could not be imported; the message is shown to the user"""
+
+
+class ImportScanPending(Exception):
+    """The upload has not been scanned yet"""
+
+
+class ImportJobProgress:
+    """progress(done, total) callback for the loaders; stores whole-percent changes on the job"""
+
+    def __init__(self, db: Session, job: ImportJob):
+        self.db = db
+        self.job = job
+
+    def __call__(self, done: int, total: int):
+        # 100 is only reported once the outcome is stored
+        percent = min(int(done * 100 / total), 99) if total else 0
+        if percent <= (self.job.progress or 0):
+            return
+        self.job.progress = percent
+        self.db.commit()
+
+
+@event.listens_for(Session, "after_flush")
+def _push_import_job_progress(session, flush_context):
+    # jobs run in worker processes, their events reach the streams through NOTIFY
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, ImportJob):
+            continue
+        if obj in session.dirty and not any(
+            attributes.get_history(obj, name).has_changes() for name in ("status", "progress")
+        ):
+            continue
+        queue_event(
+            session,
+            "import_job",
+            tenant_id=obj.tenant_id,
+            user_id=obj.user_id,
+            id=obj.id,
+            import_type=obj.import_type,
+            status=obj.status,
+            progress=obj.progress,
+        )
+
+
+def import_file_key(import_type: ImportJobType, source_id: int, name: str):
+    return f"{IMPORT_JOB_FILE_KEY_PREFIXES[import_type]}/{source_id}-{name}"
+
+
+def create_import_job(
+    db: Session,
+    import_type: ImportJobType,
+    tenant_id: int,
+    file_key: str,
+    user_id: int = None,
+    source_id: int = None,
+    params: dict = None,
+):
+    new_import_job = ImportJob(
+        import_type=import_type,
+        tenant_id=tenant_id,
+        file_key=file_key,
+        user_id=user_id,
+        source_id=source_id,
+        params=params,
+    )
+    db.add(new_import_job)
+    db.commit()
+    db.refresh(new_import_job)
+    return new_import_job
+
+
+def get_import_job(db: Session, id: int, tenant_id: int):
+    return (
+        db.query(ImportJob).filter(ImportJob.id == id, ImportJob.tenant_id == tenant_id).first()
+    )
+
+
+def get_all_import_jobs(
+    db: Session,
+    tenant_id: int,
+    status: ImportJobStatus = None,
+    import_type: ImportJobType = None,
+):
+    queryset = db.query(ImportJob).filter(ImportJob.tenant_id == tenant_id)
+    if status:
+        queryset = queryset.filter(ImportJob.status == status)
+    if import_type:
+        queryset = queryset.filter(ImportJob.import_type == import_type)
+    return queryset.order_by(ImportJob.id.desc())
+
+
+def queue_pending_imports(
+    db: Session, import_type: ImportJobType, sources, user_id: int = None, params: dict = None
+):
+    """Creates jobs for the uploads in sources that are neither imported nor being processed.
+
+    Returns the new jobs; the caller submits them to the import queue.
+    """
+    pending = {source.id: source for source in sources if source.imported is None}
+    if not pending:
+        return []
+    stale_date = datetime.utcnow() - timedelta(seconds=IMPORT_JOB_STALE_SECONDS)
+    active_source_ids = {
+        source_id
+        for (source_id,) in db.query(ImportJob.source_id).filter(
+            ImportJob.import_type == import_type,
+            ImportJob.source_id.in_(pending),
+            ImportJob.status.in_([ImportJobStatus.queued, ImportJobStatus.running]),
+            ImportJob.last_updated_date >= stale_date,
+        )
+    }
+    return [
+        create_import_job(
+            db,
+            import_type,
+            source.tenant_id,
+            import_file_key(import_type, source.id, source.name),
+            user_id=user_id,
+            source_id=source.id,
+            params=params,
+        )
+        for source_id, source in pending.items()
+        if source_id not in active_source_ids
+    ]
+
+
+def _scan_result(s3_service: S3Service, bucket: str, file_key: str):
+    deadline = time.monotonic() + IMPORT_JOB_SCAN_TIMEOUT_SECONDS
+    while True:
+        tags = s3_service.get_object_tags(bucket, file_key).get("TagSet", [])
+        scan_result = next((tag["Value"] for tag in tags if tag["Key"] == "ScanResult"), None)
+        if scan_result in ("Clean", "Infected") or time.monotonic() >= deadline:
+            return scan_result
+        time.sleep(IMPORT_JOB_SCAN_POLL_SECONDS)
+
+
+def read_import_file(db: Session, job: ImportJob, scanned: bool = True):
+    """Contents of the job's upload; scanned uploads are only read once tagged Clean"""
+    tenant = db.query(Tenant).filter(Tenant.id == job.tenant_id).first()
+    s3_service = S3Service()
+    if scanned:
+        scan_result = _scan_result(s3_service, tenant.s3_bucket, job.file_key)
+        if scan_result == "Infected":
+            raise ImportJobError(INFECTED_MESSAGES[job.import_type])
+        if scan_result != "Clean":
+            raise ImportScanPending(f"{job.file_key} has not been scanned yet")
+    s3_object = asyncio.run(s3_service.get_file_object(tenant.s3_bucket, job.file_key))
+    return s3_object["Body"].read()
+
+
+def _import_frameworks(db: Session, job: ImportJob, progress: ImportJobProgress):
+    my_data_frame = pd.read_excel(BytesIO(read_import_file(db, job)))
+    job.total_rows = len(my_data_frame)
+    result = load_data_from_dataframe(my_data_frame, job.tenant_id, True, progress=progress)
+    if not isinstance(result, list):
+        raise ImportJobError(result.get("error"))
+    num_frameworks, num_controls, num_framework_versions, row_errors = result
+    job.errors = row_errors
+    result = (
+        f"Successfully loaded {num_frameworks} frameworks. "
+        f"Successfully loaded {num_controls} controls. "
+        f"Successfully loaded {num_framework_versions} framework_versions."
+    )
+    if row_errors:
+        skipped_rows = ", ".join(str(row_error["row"]) for row_error in row_errors)
+        result += f" Skipped rows {skipped_rows}."
+    return result
+
+
+def _import_tasks(db: Session, job: ImportJob, progress: ImportJobProgress):
+    my_data_frame = pd.read_excel(BytesIO(read_import_file(db, job)))
+    job.total_rows = len(my_data_frame)
+    result = asyncio.run(
+        load_data_from_dataframe_tasks(
+            my_data_frame,
+            job.tenant_id,
+            True,
+            job.user_id,
+            job.params["project_id"],
+            job.params["wbs_id"],
+            job.source_id,
+            progress=progress,
+        )
+    )
+    if not isinstance(result, list):
+        raise ImportJobError(result.get("error"))
+    return f"Successfully loaded {result[0]} tasks."
+
+
+def _import_aws_controls(db: Session, job: ImportJob, progress: ImportJobProgress):
+    source = db.query(ImportAWSControls).filter(ImportAWSControls.id == job.source_id).first()
+    my_data_frame = pd.read_csv(BytesIO(read_import_file(db, job)))
+    job.total_rows = len(my_data_frame)
+    result = asyncio.run(
+        load_aws_control_data_from_dataframe(my_data_frame, source.project_id, progress=progress)
+    )
+    if not isinstance(result, list):
+        raise ImportJobError(result.get("error"))
+    return (
+        f"Successfully loaded {result[0]} aws controls. "
+        f"Successfully loaded {result[1]} aws control to project control mappings."
+    )
+
+
+def _import_workflows(db: Session, job: ImportJob, progress: ImportJobProgress):
+    # workflow uploads are checked for formula injection instead of the S3 virus scan
+    with NamedTemporaryFile(delete=False, suffix=Path(job.file_key).suffix) as tmp:
+        tmp.write(read_import_file(db, job, scanned=False))
+        tmp_path = Path(tmp.name)
+    try:
+        if not safe_import_spreadsheet(tmp_path):
+            raise ImportJobError("Import blocked due to suspicious content in the spreadsheet")
+        job.total_rows = len(pd.read_excel(tmp_path))
+        workflows = import_workflow_flowchart_from_excel(
+            tmp_path,
+            db,
+            job.user_id,
+            job.tenant_id,
+            job.params["project_id"],
+            progress=progress,
+        )
+    finally:
+        tmp_path.unlink()
+    return f"Successfully imported {len(workflows)} workflows."
+
+
+IMPORT_JOB_RUNNERS = {
+    ImportJobType.framework: _import_frameworks,
+    ImportJobType.task: _import_tasks,
+    ImportJobType.aws_control: _import_aws_controls,
+    ImportJobType.workflow: _import_workflows,
+}
+
+
+def _finish_import_job(db: Session, job: ImportJob, status: ImportJobStatus, result: str):
+    job.status = status
+    job.result = result
+    job.finished_date = datetime.utcnow()
+    if status == ImportJobStatus.succeeded:
+        job.progress = 100
+        job.error_rows = len(job.errors or [])
+        if job.total_rows is not None:
+            job.processed_rows = job.total_rows - job.error_rows
+    source_model = IMPORT_JOB_SOURCES.get(job.import_type)
+    if source_model is not None and job.source_id is not None:
+        db.query(source_model).filter(source_model.id == job.source_id).update(
+            {
+                "imported": status == ImportJobStatus.succeeded,
+                "import_results": result,
+            },
+            synchronize_session=False,
+        )
+    db.commit()
+
+
+def run_import_job(job_id: int):
+    """Worker entry point: imports the upload of a queued job and stores the outcome"""
+    db = next(get_db())
+    try:
+        job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+        if job is None or job.status != ImportJobStatus.queued:
+            LOGGER.warning(f"Import job {job_id} is not queued, skipping")
+            return
+        job.status = ImportJobStatus.running
+        job.started_date = datetime.utcnow()
+        db.commit()
+
+        try:
+            result = IMPORT_JOB_RUNNERS[job.import_type](db, job, ImportJobProgress(db, job))
+        except ImportScanPending as e:
+            db.rollback()
+            # the upload row stays unimported so that it is queued again later
+            job.status = ImportJobStatus.failed
+            job.result = str(e)
+            job.finished_date = datetime.utcnow()
+            db.commit()
+            return
+        except ImportJobError as e:
+            db.rollback()
+            _finish_import_job(
+                db,
+                job,
+                ImportJobStatus.failed,
+                f"There was a problem importing your file. {e}",
+            )
+            return
+        except Exception as e:
+            LOGGER.exception(f"Import job {job_id} failed")
+            db.rollback()
+            _finish_import_job(
+                db,
+                job,
+                ImportJobStatus.failed,
+                f"There was a problem importing your file. Unexpected error: {e}",
+            )
+            return
+        LOGGER.info(f"Import job {job_id}: {result}")
+        _finish_import_job(db, job, ImportJobStatus.succeeded, result)
+    finally:
+        db.close()
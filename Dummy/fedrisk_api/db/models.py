@@ -1,4 +1,5 @@
-from sqlalchemy import Column, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.functions import current_timestamp
 from sqlalchemy.types import (
@@ -37,6 +38,11 @@ from fedrisk_api.db.enums import (
     WorkflowFlowchartStatus,
     ApprovalWorkflowStatus,
     ApprovalStatus,
+    ImportJobStatus,
+    ImportJobType,
+    NotificationChannel,
+    NotificationOutboxStatus,
+    ScheduledJobRunStatus,
 )
 
 
@@ -1446,6 +1452,102 @@ class Tenant(Base):
         return f"id: {self.id}, name: {self.name}, s3_bucket: {self.s3_bucket}, webhook_api_key: {self.webhook_api_key}"
 
 
+class TenantSubscriptionStatus(Base):
+    """Local mirror of a tenant's Stripe subscription state.
+
+    Kept fresh by the stripe webhook and the reconcile command so that
+    authorization never has to call out to Stripe.
+    """
+
+    __tablename__ = "tenant_subscription_status"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    tenant_id = Column(Integer, ForeignKey("tenant.id"), nullable=False, unique=True, index=True)
+    customer_id = Column(String, nullable=True)
+    subscription_id = Column(String, nullable=True)
+    status = Column(String, nullable=True)
+    current_period_end = Column(DateTime, nullable=True)
+    cancel_at_period_end = Column(Boolean, default=False)
+    last_synced_date = Column(
+        DateTime, nullable=False, server_default=current_timestamp(), onupdate=current_timestamp()
+    )
+
+    tenant = relationship("Tenant")
+
+    def __repr__(self):
+        return f"id: {self.id}, tenant_id: {self.tenant_id}, subscription_id: {self.subscription_id}, status: {self.status}, current_period_end: {self.current_period_end}"
+
+
+class DashboardMetric(Base):
+    """Precomputed dashboard aggregate for one project.
+
+    Rows are marked stale by the ORM listeners in fedrisk_api.db.dashboard_metrics
+    and recomputed on the next read.
+    """
+
+    __tablename__ = "dashboard_metric"
+    __table_args__ = (
+        UniqueConstraint("project_id", "metric", "scope", name="dashboard_metric_project_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    # no foreign key so that deleting a project is not blocked by its cached metrics
+    project_id = Column(Integer, nullable=False, index=True)
+    metric = Column(String, nullable=False)
+    # distinguishes variants of a metric, e.g. "framework:3" or "year:2024"
+    scope = Column(String, nullable=False, default="")
+    payload = Column(JSON, nullable=True)
+    computed_date = Column(DateTime, nullable=False)
+    stale_date = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"id: {self.id}, project_id: {self.project_id}, metric: {self.metric}, scope: {self.scope}, computed_date: {self.computed_date}, stale_date: {self.stale_date}"
+
+
+class SearchDocument(Base):
+    """Denormalized full-text search row for one searchable object.
+
+    Maintained by the ORM listeners in fedrisk_api.db.search and rebuilt with
+    the reindex_search_documents command.
+    """
+
+    __tablename__ = "search_document"
+    __table_args__ = (
+        UniqueConstraint("object_type", "object_id", name="search_document_object_key"),
+        Index("ix_search_document_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    # no foreign keys: rows are derived and removed after their source rows are deleted
+    tenant_id = Column(Integer, nullable=False, index=True)
+    project_id = Column(Integer, nullable=True, index=True)
+    object_type = Column(String, nullable=False)
+    object_id = Column(Integer, nullable=False)
+    title = Column(String, nullable=True)
+    body = Column(TEXT, nullable=True)
+    search_vector = Column(TEXT().with_variant(TSVECTOR(), "postgresql"), nullable=True)
+    last_updated_date = Column(
+        DateTime, nullable=False, server_default=current_timestamp(), onupdate=current_timestamp()
+    )
+
+    def __repr__(self):
+        return f"id: {self.id}, tenant_id: {self.tenant_id}, object_type: {self.object_type}, object_id: {self.object_id}, title: {self.title}"
+
+
+class TenantDataKey(Base):
+    """KMS-wrapped AES data key used for envelope encryption of a tenant's PII"""
+
+    __tablename__ = "tenant_data_key"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    tenant_id = Column(Integer, ForeignKey("tenant.id"), nullable=False, unique=True, index=True)
+    encrypted_data_key = Column(TEXT, nullable=False)
+    created_date = Column(DateTime, nullable=False, server_default=current_timestamp())
+
+    def __repr__(self):
+        return f"id: {self.id}, tenant_id: {self.tenant_id}, created_date: {self.created_date}"
+
+
 class User(Base):
     __tablename__ = "user"
 
@@ -1701,6 +1803,98 @@ class ImportTask(Base):
         return f"id: {self.id}, name: {self.name}, file_content_type: {self.file_content_type}, created_date: {self.created_date}, last_updated_date: {self.last_updated_date}, tenant_id: {self.tenant_id}, imported: {self.imported}, import_results: {self.import_results}, wbs_id: {self.wbs_id}"
 
 
+class ImportJob(Base):
+    """Spreadsheet import processed in the background by fedrisk_api.utils.import_queue.
+
+    Polled through /import_jobs/ for status, progress and per-row errors.
+    """
+
+    __tablename__ = "import_job"
+    __table_args__ = (Index("ix_import_job_source", "import_type", "source_id"),)
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    tenant_id = Column(Integer, ForeignKey("tenant.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=True)
+    import_type = Column(Enum(ImportJobType), nullable=False)
+    # the ImportFramework, ImportTask or ImportAWSControls row of the upload, if any
+    source_id = Column(Integer, nullable=True)
+    file_key = Column(String, nullable=False)
+    # loader arguments that aren't on the source row, e.g. {"project_id": 1}
+    params = Column(JSON, nullable=True)
+    status = Column(Enum(ImportJobStatus), nullable=False, default=ImportJobStatus.queued.value)
+    progress = Column(Integer, nullable=False, default=0)
+    total_rows = Column(Integer, nullable=True)
+    processed_rows = Column(Integer, nullable=True)
+    error_rows = Column(Integer, nullable=True)
+    # [{"row": spreadsheet line, "error": message}]
+    errors = Column(JSON, nullable=True)
+    result = Column(String, nullable=True)
+    created_date = Column(DateTime, nullable=False, server_default=current_timestamp())
+    last_updated_date = Column(
+        DateTime, nullable=False, server_default=current_timestamp(), onupdate=current_timestamp()
+    )
+    started_date = Column(DateTime, nullable=True)
+    finished_date = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"id: {self.id}, import_type: {self.import_type}, source_id: {self.source_id}, status: {self.status}, progress: {self.progress}, tenant_id: {self.tenant_id}"
+
+
+class NotificationOutbox(Base):
+    """Email or SMS written in the transaction that caused it.
+
+    Delivered by the dispatcher in fedrisk_api.db.notification_outbox once that transaction
+    commits.
+    """
+
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index("ix_notification_outbox_due", "status", "next_attempt_date", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    channel = Column(Enum(NotificationChannel), nullable=False)
+    # email address or E.164 phone number
+    recipient = Column(String, nullable=False)
+    subject = Column(String, nullable=True)
+    body = Column(String, nullable=False)
+    status = Column(
+        Enum(NotificationOutboxStatus),
+        nullable=False,
+        default=NotificationOutboxStatus.pending.value,
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    # when a pending message is retried, or when a claimed one is considered abandoned
+    next_attempt_date = Column(DateTime, nullable=False, server_default=current_timestamp())
+    last_error = Column(String, nullable=True)
+    created_date = Column(DateTime, nullable=False, server_default=current_timestamp())
+    sent_date = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"id: {self.id}, channel: {self.channel}, recipient: {self.recipient}, status: {self.status}, attempts: {self.attempts}"
+
+
+class ScheduledJobRun(Base):
+    """One run of a periodic job of the in-process scheduler, see fedrisk_api.utils.job_scheduler"""
+
+    __tablename__ = "scheduled_job_run"
+    __table_args__ = (Index("ix_scheduled_job_run_job_started", "job_name", "started_date"),)
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    job_name = Column(String, nullable=False)
+    # replica that ran the job
+    host = Column(String, nullable=True)
+    started_date = Column(DateTime, nullable=False)
+    finished_date = Column(DateTime, nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    status = Column(Enum(ScheduledJobRunStatus), nullable=False)
+    result = Column(String, nullable=True)
+    error = Column(String, nullable=True)
+
+    def __repr__(self):
+        return f"id: {self.id}, job_name: {self.job_name}, started_date: {self.started_date}, status: {self.status}, duration_seconds: {self.duration_seconds}"
+
+
 class WBS(Base):
     __tablename__ = "wbs"
 
@@ -2392,6 +2586,8 @@ class UserWatching(Base):
 
 class UserNotifications(Base):
     __tablename__ = "user_notifications"
+    # backs the newest-first inbox pages of a user, see db.notification_inbox
+    __table_args__ = (Index("ix_user_notifications_user_created", "user_id", "created", "id"),)
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("user.id"))
@@ -2400,9 +2596,9 @@ class UserNotifications(Base):
     notification_data_path = Column(TEXT)
     notification_message = Column(TEXT)
     project_id = Column(Integer, ForeignKey("project.id"))
-    created = Column(
-        DateTime, nullable=False, server_default=current_timestamp(), onupdate=current_timestamp()
-    )
+    created = Column(DateTime, nullable=False, server_default=current_timestamp())
+    # unread while None
+    read_date = Column(DateTime, nullable=True)
 
     project = relationship(
         "Project", foreign_keys=[project_id], back_populates="user_notifications_project"
@@ -2412,6 +2608,40 @@ class UserNotifications(Base):
         return f"id: {self.id}, user_id: {self.user_id}, notification_date_type: {self.notification_data_type}, notification_data_id: {self.notification_data_id}, notification_data_path: {self.notification_data_path}, project_id: {self.project_id}, project: {self.project}"
 
 
+class UserNotificationCounter(Base):
+    """Unread notifications per user, kept in step with user_notifications so that the badge
+    is a primary key lookup"""
+
+    __tablename__ = "user_notification_counter"
+
+    user_id = Column(Integer, ForeignKey("user.id"), primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"user_id: {self.user_id}, unread_count: {self.unread_count}"
+
+
+class UserNotificationArchive(Base):
+    """Notifications moved out of user_notifications after the retention period"""
+
+    __tablename__ = "user_notification_archive"
+
+    # the id the notification had in user_notifications
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, index=True)
+    notification_data_type = Column(TEXT)
+    notification_data_id = Column(Integer)
+    notification_data_path = Column(TEXT)
+    notification_message = Column(TEXT)
+    project_id = Column(Integer)
+    created = Column(DateTime, nullable=False)
+    read_date = Column(DateTime, nullable=True)
+    archived_date = Column(DateTime, nullable=False, server_default=current_timestamp())
+
+    def __repr__(self):
+        return f"id: {self.id}, user_id: {self.user_id}, created: {self.created}, archived_date: {self.archived_date}"
+
+
 class UserNotificationSettings(Base):
     __tablename__ = "user_notification_settings"
 
@@ -2461,6 +2691,34 @@ class SMSNotifications(Base):
         return f"id: {self.id}, user_id: {self.user_id}, phone_no: {self.phone_no}, message: {self.message}, created: {self.created}"
 
 
+class ScheduledReminder(Base):
+    """Due-date reminder sent to a user, one per item, channel and reminder offset"""
+
+    __tablename__ = "scheduled_reminder"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "channel",
+            "object_type",
+            "object_id",
+            "days_prior",
+            name="scheduled_reminder_key",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    channel = Column(Enum(NotificationChannel), nullable=False)
+    # notification data type of the item, e.g. "tasks"
+    object_type = Column(String, nullable=False)
+    object_id = Column(Integer, nullable=False)
+    days_prior = Column(Integer, nullable=False)
+    created_date = Column(DateTime, nullable=False, server_default=current_timestamp())
+
+    def __repr__(self):
+        return f"id: {self.id}, user_id: {self.user_id}, channel: {self.channel}, object_type: {self.object_type}, object_id: {self.object_id}, days_prior: {self.days_prior}"
+
+
 class ChatBotPrompt(Base):
     __tablename__ = "chat_bot_prompt"
 
@@ -2826,6 +3084,23 @@ class WorkflowEventLog(Base):
         return f"id: {self.id}, workflow_event_id: {self.workflow_event_id}, event_type: {self.event_type}, event_description: {self.event_description}, link: {self.link}, created_date: {self.created_date}"
 
 
+class WorkflowEventSweep(Base):
+    """State of the workflow event trigger sweeps, see db.workflow_event"""
+
+    __tablename__ = "workflow_event_sweep"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    # database time the last sweep started; incremental sweeps only evaluate events and
+    # tasks changed since then
+    watermark = Column(DateTime, nullable=True)
+    last_run_date = Column(DateTime, nullable=True)
+    events_evaluated = Column(Integer, nullable=False, default=0)
+    events_triggered = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"id: {self.id}, watermark: {self.watermark}, last_run_date: {self.last_run_date}, events_evaluated: {self.events_evaluated}, events_triggered: {self.events_triggered}"
+
+
 # Association Table: WorkflowTaskMapping
 class WorkflowTaskMapping(Base):
     __tablename__ = "workflow_task_mapping"
@@ -0,0 +1,188 @@
+import logging
+import os
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, delete, event, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, attributes, joinedload
+
+from fedrisk_api.db.models import (
+    UserNotificationArchive,
+    UserNotificationCounter,
+    UserNotifications,
+)
+from fedrisk_api.utils.event_stream import queue_event
+
+LOGGER = logging.getLogger(__name__)
+
+# notifications older than this are moved to user_notification_archive
+USER_NOTIFICATION_RETENTION_DAYS = int(os.getenv("USER_NOTIFICATION_RETENTION_DAYS", "180"))
+USER_NOTIFICATION_ARCHIVE_BATCH_SIZE = int(
+    os.getenv("USER_NOTIFICATION_ARCHIVE_BATCH_SIZE", "1000")
+)
+
+# newest first, see utils.pagination
+INBOX_KEYSET = [(UserNotifications.created, True), (UserNotifications.id, True)]
+
+
+def adjust_unread_counts(db: Session, deltas):
+    """Adds {user_id: delta} to the users' unread counters in the caller's transaction.
+
+    The counters are changed with relative updates, so concurrent writers don't lose counts.
+    The users' event streams are told once the transaction commits.
+    """
+    connection = db.connection()
+    table = UserNotificationCounter.__table__
+    increments = [
+        {"user_id": user_id, "unread_count": delta}
+        for user_id, delta in deltas.items()
+        if user_id is not None and delta > 0
+    ]
+    decrements = [
+        {"counter_user_id": user_id, "delta": -delta}
+        for user_id, delta in deltas.items()
+        if user_id is not None and delta < 0
+    ]
+    if increments:
+        dialect_name = connection.dialect.name
+        dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        statement = dialect_insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={"unread_count": table.c.unread_count + statement.excluded.unread_count},
+        )
+        connection.execute(statement, increments)
+    if decrements:
+        connection.execute(
+            table.update()
+            .where(table.c.user_id == bindparam("counter_user_id"))
+            .values(unread_count=table.c.unread_count - bindparam("delta")),
+            decrements,
+        )
+    for user_id, delta in deltas.items():
+        if user_id is not None and delta:
+            queue_event(db, "notifications_changed", user_id=user_id)
+
+
+def _is_unread_change(history):
+    # +1 when a notification becomes unread, -1 when it is read
+    was_unread = history.deleted and history.deleted[0] is None
+    is_unread = history.added and history.added[0] is None
+    return int(bool(is_unread)) - int(bool(was_unread))
+
+
+@event.listens_for(Session, "after_flush")
+def _count_unread_notifications(session, flush_context):
+    deltas = defaultdict(int)
+    for obj in session.new:
+        if isinstance(obj, UserNotifications) and obj.read_date is None:
+            deltas[obj.user_id] += 1
+    for obj in session.deleted:
+        if isinstance(obj, UserNotifications) and obj.read_date is None:
+            deltas[obj.user_id] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, UserNotifications):
+            history = attributes.get_history(obj, "read_date")
+            if history.added or history.deleted:
+                deltas[obj.user_id] += _is_unread_change(history)
+    if any(deltas.values()):
+        adjust_unread_counts(session, deltas)
+
+
+def count_new_notifications(db: Session, rows):
+    """Counts rows inserted into user_notifications without the ORM"""
+    adjust_unread_counts(
+        db, Counter(row["user_id"] for row in rows if row.get("read_date") is None)
+    )
+
+
+def get_inbox(db: Session, user_id: int, unread_only: bool = False):
+    queryset = (
+        db.query(UserNotifications)
+        .options(joinedload(UserNotifications.project))
+        .filter(UserNotifications.user_id == user_id)
+    )
+    if unread_only:
+        queryset = queryset.filter(UserNotifications.read_date.is_(None))
+    return queryset
+
+
+def get_unread_count(db: Session, user_id: int) -> int:
+    unread_count = (
+        db.query(UserNotificationCounter.unread_count)
+        .filter(UserNotificationCounter.user_id == user_id)
+        .scalar()
+    )
+    return max(unread_count or 0, 0)
+
+
+def mark_notifications_read(db: Session, user_id: int, ids: list = None) -> int:
+    """Marks the user's notifications with the given ids, or all of them, read.
+
+    Returns how many were unread.
+    """
+    statement = update(UserNotifications).where(
+        UserNotifications.user_id == user_id, UserNotifications.read_date.is_(None)
+    )
+    if ids is not None:
+        statement = statement.where(UserNotifications.id.in_(ids))
+    marked = db.execute(
+        statement.values(read_date=datetime.utcnow()).execution_options(
+            synchronize_session=False
+        )
+    ).rowcount
+    if marked:
+        adjust_unread_counts(db, {user_id: -marked})
+    db.commit()
+    return marked
+
+
+def delete_notifications(db: Session, *criteria) -> int:
+    """Bulk deletes the notifications matching criteria, keeping the unread counters in step"""
+    unread = db.execute(
+        select(UserNotifications.user_id, func.count())
+        .where(*criteria, UserNotifications.read_date.is_(None))
+        .group_by(UserNotifications.user_id)
+    ).all()
+    adjust_unread_counts(db, {user_id: -count for user_id, count in unread})
+    return db.execute(
+        delete(UserNotifications).where(*criteria).execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def archive_user_notifications(
+    db: Session,
+    retention_days: int = USER_NOTIFICATION_RETENTION_DAYS,
+    batch_size: int = USER_NOTIFICATION_ARCHIVE_BATCH_SIZE,
+) -> int:
+    """Moves notifications older than retention_days to the archive, one batch per commit"""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    columns = [column.name for column in UserNotifications.__table__.columns]
+    archived = 0
+    while True:
+        ids = (
+            db.execute(
+                select(UserNotifications.id)
+                .where(UserNotifications.created < cutoff)
+                .order_by(UserNotifications.id)
+                .limit(batch_size)
+            )
+            .scalars()
+            .all()
+        )
+        if not ids:
+            break
+        db.execute(
+            insert(UserNotificationArchive).from_select(
+                columns,
+                select(*[UserNotifications.__table__.c[column] for column in columns]).where(
+                    UserNotifications.id.in_(ids)
+                ),
+            )
+        )
+        delete_notifications(db, UserNotifications.id.in_(ids))
+        db.commit()
+        archived += len(ids)
+    LOGGER.info(f"Archived {archived} notifications older than {cutoff}")
+    return archived
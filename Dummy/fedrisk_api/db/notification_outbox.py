@@ -0,0 +1,235 @@
+import logging
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm.session import Session
+
+from fedrisk_api.db.enums import NotificationChannel, NotificationOutboxStatus
+from fedrisk_api.db.models import NotificationOutbox
+
+LOGGER = logging.getLogger(__name__)
+
+NOTIFICATION_OUTBOX_BATCH_SIZE = int(os.getenv("NOTIFICATION_OUTBOX_BATCH_SIZE", "100"))
+# failed messages are retried after NOTIFICATION_OUTBOX_RETRY_SECONDS, doubling with every
+# attempt, and dead-lettered after NOTIFICATION_OUTBOX_MAX_ATTEMPTS
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = int(os.getenv("NOTIFICATION_OUTBOX_MAX_ATTEMPTS", "5"))
+NOTIFICATION_OUTBOX_RETRY_SECONDS = int(os.getenv("NOTIFICATION_OUTBOX_RETRY_SECONDS", "60"))
+# claimed messages whose dispatcher died before recording the outcome are claimed again after
+# this long, so a crash delivers a message at most one extra time
+NOTIFICATION_OUTBOX_LEASE_SECONDS = int(os.getenv("NOTIFICATION_OUTBOX_LEASE_SECONDS", "300"))
+# concurrent sends per channel, kept under the SES and SNS rate limits
+NOTIFICATION_OUTBOX_CONCURRENCY = {
+    NotificationChannel.email: int(os.getenv("NOTIFICATION_OUTBOX_EMAIL_CONCURRENCY", "8")),
+    NotificationChannel.sms: int(os.getenv("NOTIFICATION_OUTBOX_SMS_CONCURRENCY", "2")),
+}
+
+OutboxMessage = namedtuple("OutboxMessage", ["id", "channel", "recipient", "subject", "body"])
+
+
+def enqueue_email(db: Session, email: str, subject: str, body: str):
+    """Adds an email to the outbox; it is sent once the caller commits"""
+    if not email:
+        LOGGER.warning(f"Not queueing email '{subject}' without a recipient")
+        return
+    db.add(
+        NotificationOutbox(
+            channel=NotificationChannel.email, recipient=email, subject=subject, body=body
+        )
+    )
+
+
+def enqueue_sms(db: Session, phone_no: str, message: str):
+    """Adds a text message to the outbox; it is sent once the caller commits"""
+    if not phone_no:
+        LOGGER.warning("Not queueing text message without a phone number")
+        return
+    db.add(NotificationOutbox(channel=NotificationChannel.sms, recipient=phone_no, body=message))
+
+
+def enqueue_many(db: Session, channel: NotificationChannel, messages):
+    """Adds (recipient, subject, body) messages of one channel with a single multi-row insert;
+    they are sent once the caller commits"""
+    rows = [
+        {"channel": channel, "recipient": recipient, "subject": subject, "body": body}
+        for recipient, subject, body in messages
+        if recipient
+    ]
+    if rows:
+        db.execute(insert(NotificationOutbox), rows)
+    return len(rows)
+
+
+def claim_outbox_batch(db: Session, batch_size: int = NOTIFICATION_OUTBOX_BATCH_SIZE):
+    """Marks up to batch_size due messages as sending and returns them.
+
+    On PostgreSQL concurrent dispatchers skip each other's rows instead of waiting on them.
+    """
+    now = datetime.utcnow()
+    due_ids = (
+        select(NotificationOutbox.id)
+        .where(
+            NotificationOutbox.status.in_(
+                [NotificationOutboxStatus.pending, NotificationOutboxStatus.sending]
+            ),
+            NotificationOutbox.next_attempt_date <= now,
+        )
+        .order_by(NotificationOutbox.id)
+        .limit(batch_size)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        due_ids = due_ids.with_for_update(skip_locked=True)
+    ids = db.execute(due_ids).scalars().all()
+    if not ids:
+        db.commit()
+        return []
+    db.execute(
+        update(NotificationOutbox)
+        .where(NotificationOutbox.id.in_(ids))
+        .values(
+            status=NotificationOutboxStatus.sending,
+            attempts=NotificationOutbox.attempts + 1,
+            next_attempt_date=now + timedelta(seconds=NOTIFICATION_OUTBOX_LEASE_SECONDS),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    messages = [
+        OutboxMessage(*row)
+        for row in db.execute(
+            select(
+                NotificationOutbox.id,
+                NotificationOutbox.channel,
+                NotificationOutbox.recipient,
+                NotificationOutbox.subject,
+                NotificationOutbox.body,
+            )
+            .where(NotificationOutbox.id.in_(ids))
+            .order_by(NotificationOutbox.id)
+        )
+    ]
+    db.commit()
+    return messages
+
+
+def _email_sender():
+    # imported here so that enqueueing doesn't need AWS clients
+    from fedrisk_api.utils.ses import EmailService
+
+    email_service = EmailService()
+    return lambda message: email_service.send_email(
+        message.recipient, message.subject, message.body
+    )
+
+
+def _sms_sender():
+    from fedrisk_api.utils.sns import SnsWrapper
+
+    sns_wrapper = SnsWrapper()
+    return lambda message: sns_wrapper.publish_text_message(message.recipient, message.body)
+
+
+# channel -> factory of a send(message) callable shared by that channel's workers
+OUTBOX_SENDERS = {
+    NotificationChannel.email: _email_sender,
+    NotificationChannel.sms: _sms_sender,
+}
+
+
+def _send_messages(messages):
+    """Sends messages with at most NOTIFICATION_OUTBOX_CONCURRENCY workers per channel.
+
+    Returns {message id: error message} for the messages that could not be sent.
+    """
+    by_channel = {}
+    for message in messages:
+        by_channel.setdefault(message.channel, []).append(message)
+
+    errors = {}
+    executors = []
+    futures = {}
+    try:
+        for channel, channel_messages in by_channel.items():
+            try:
+                send = OUTBOX_SENDERS[channel]()
+            except Exception as e:
+                LOGGER.exception(f"Could not create the {channel.value} sender")
+                errors.update((message.id, str(e)) for message in channel_messages)
+                continue
+            executor = ThreadPoolExecutor(
+                max_workers=max(NOTIFICATION_OUTBOX_CONCURRENCY.get(channel, 1), 1),
+                thread_name_prefix=f"outbox-{channel.value}",
+            )
+            executors.append(executor)
+            for message in channel_messages:
+                futures[executor.submit(send, message)] = message
+        for future, message in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                LOGGER.warning(f"Could not send {message.channel.value} {message.id}: {e}")
+                errors[message.id] = str(e)
+    finally:
+        for executor in executors:
+            executor.shutdown(wait=True)
+    return errors
+
+
+def _record_outcomes(db: Session, messages, errors):
+    now = datetime.utcnow()
+    sent_ids = [message.id for message in messages if message.id not in errors]
+    if sent_ids:
+        db.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(sent_ids))
+            .values(status=NotificationOutboxStatus.sent, sent_date=now, last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+    dead = 0
+    if errors:
+        attempts = dict(
+            db.execute(
+                select(NotificationOutbox.id, NotificationOutbox.attempts).where(
+                    NotificationOutbox.id.in_(errors)
+                )
+            ).all()
+        )
+        for message_id, error in errors.items():
+            if attempts[message_id] >= NOTIFICATION_OUTBOX_MAX_ATTEMPTS:
+                dead += 1
+                LOGGER.error(f"Dead-lettered notification {message_id}: {error}")
+                values = {"status": NotificationOutboxStatus.dead}
+            else:
+                delay = NOTIFICATION_OUTBOX_RETRY_SECONDS * 2 ** (attempts[message_id] - 1)
+                values = {
+                    "status": NotificationOutboxStatus.pending,
+                    "next_attempt_date": now + timedelta(seconds=delay),
+                }
+            db.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id == message_id)
+                .values(**values, last_error=error[:1000])
+                .execution_options(synchronize_session=False)
+            )
+    db.commit()
+    return {"sent": len(sent_ids), "retried": len(errors) - dead, "dead": dead}
+
+
+def dispatch_outbox_batch(db: Session, batch_size: int = NOTIFICATION_OUTBOX_BATCH_SIZE):
+    """Claims, sends and records one batch; returns the counts of each outcome"""
+    messages = claim_outbox_batch(db, batch_size)
+    if not messages:
+        return {"sent": 0, "retried": 0, "dead": 0}
+    return _record_outcomes(db, messages, _send_messages(messages))
+
+
+def drain_notification_outbox(db: Session, batch_size: int = NOTIFICATION_OUTBOX_BATCH_SIZE):
+    """Dispatches batches until no message is due; returns the totals of each outcome"""
+    totals = {"sent": 0, "retried": 0, "dead": 0}
+    while True:
+        counts = dispatch_outbox_batch(db, batch_size)
+        for outcome, count in counts.items():
+            totals[outcome] += count
+        if sum(counts.values()) < batch_size:
+            return totals
@@ -1,6 +1,6 @@
 import logging
 from fastapi import status
-from sqlalchemy import and_, func, or_
+from sqlalchemy import and_, func, literal, or_, select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.session import Session
 
@@ -134,6 +134,7 @@ from fedrisk_api.schema.assessment import CreateAssessment
 
 from fedrisk_api.db.assessment import create_assessment
 
+from fedrisk_api.db.notification_inbox import delete_notifications
 from fedrisk_api.db.util.notifications_utils import (
     # notify_user,
     # add_notification,
@@ -275,6 +276,16 @@ async def create_project(
     return new_project
 
 
+def _project_count(model, label: str):
+    return (
+        select(func.count(model.id))
+        .where(model.project_id == Project.id)
+        .correlate(Project)
+        .scalar_subquery()
+        .label(label)
+    )
+
+
 def get_all_projects(
     db: Session,
     tenant_id: int,
@@ -283,48 +294,64 @@ def get_all_projects(
     filter_by: str,
     filter_value: str,
     sort_by: str,
+    with_role: bool = False,
 ):
+    """Project list rows: project columns plus counts of the related objects.
+
+    The list view doesn't need the related objects themselves, so they are counted with
+    correlated subqueries instead of being loaded; get_project returns the full graph.
+    """
     user = db.query(User).filter(User.id == user_id).first()
 
-    if user.system_role == 4:
-        queryset = db.query(Project)
+    role_name = literal(None)
+    if with_role:
+        role_name = (
+            select(Role.name)
+            .join(ProjectUser, ProjectUser.role_id == Role.id)
+            .where(ProjectUser.project_id == Project.id)
+            .where(ProjectUser.user_id == user_id)
+            .correlate(Project)
+            .limit(1)
+            .scalar_subquery()
+        )
+    queryset = db.query(
+        Project.id,
+        Project.name,
+        Project.description,
+        Project.tenant_id,
+        Project.created_date,
+        Project.last_updated_date,
+        Project.status,
+        Project.project_group_id,
+        Project.project_admin_id,
+        select(ProjectGroup.name)
+        .where(ProjectGroup.id == Project.project_group_id)
+        .correlate(Project)
+        .scalar_subquery()
+        .label("project_group_name"),
+        role_name.label("my_role"),
+        _project_count(ProjectControl, "project_control_count"),
+        _project_count(Risk, "risk_count"),
+        _project_count(AuditTest, "audit_test_count"),
+        _project_count(ProjectDocument, "document_count"),
+        _project_count(ProjectEvaluation, "project_evaluation_count"),
+    )
 
-    elif user.system_role == 1:
-        queryset = filter_by_tenant(db, Project, tenant_id)
-    else:
-        queryset = (
-            filter_by_tenant(db, Project, tenant_id)
-            .join(ProjectUser, ProjectUser.project_id == Project.id)
-            .filter(ProjectUser.user_id == user_id)
+    if user.system_role != 4:
+        queryset = queryset.filter(Project.tenant_id == tenant_id)
+    if user.system_role not in (1, 4):
+        # membership as a subquery keeps one row per project, so no DISTINCT is needed
+        queryset = queryset.filter(
+            Project.id.in_(select(ProjectUser.project_id).where(ProjectUser.user_id == user_id))
         )
 
-    queryset = queryset.options(
-        selectinload(Project.project_controls)
-        .selectinload(ProjectControl.control)
-        .selectinload(Control.framework_versions),
-        selectinload(Project.project_controls).selectinload(ProjectControl.assessment),
-        selectinload(Project.project_controls)
-        .selectinload(ProjectControl.exception)
-        .selectinload(Exception.owner),
-        selectinload(Project.project_controls)
-        .selectinload(ProjectControl.exception)
-        .selectinload(Exception.stakeholders),
-        selectinload(Project.project_evaluations),
-        selectinload(Project.risks),
-        selectinload(Project.documents),
-        selectinload(Project.audit_tests),
-        selectinload(Project.project_group),
-        selectinload(Project.project_admin),
-    )
     if filter_by and filter_value:
         if filter_by in ("name", "description"):
             queryset = queryset.filter(
                 func.lower(getattr(Project, filter_by)).contains(func.lower(filter_value))
             )
         elif filter_by in ("project_group",):
-            queryset = queryset.join(
-                ProjectGroup, Project.project_group_id == ProjectGroup.id
-            ).filter(ProjectGroup.id == filter_value)
+            queryset = queryset.filter(Project.project_group_id == filter_value)
         else:
             queryset = queryset.filter(getattr(Project, filter_by) == filter_value)
 
@@ -339,7 +366,7 @@ def get_all_projects(
             )
         )
 
-    return queryset.distinct()
+    return queryset
 
 
 async def get_project(db: Session, id: int, tenant_id: int, user_id: int):
@@ -719,9 +746,8 @@ async def delete_project(db: Session, id: int, tenant_id: int):
     db.commit()
     db.query(AuditTest).filter(AuditTest.project_id == existing_project.first().id).delete()
     db.commit()
-    db.query(UserNotifications).filter(
-        UserNotifications.project_id == existing_project.first().id
-    ).delete()
+    # a bulk delete bypasses the listener that maintains the unread counters
+    delete_notifications(db, UserNotifications.project_id == existing_project.first().id)
     db.commit()
     db.query(UserWatching).filter(UserWatching.project_id == existing_project.first().id).delete()
     db.commit()
@@ -1,6 +1,5 @@
 import logging
 
-from sqlalchemy import func, or_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.session import Session
 
@@ -22,7 +21,11 @@ from fedrisk_api.db.models import (
     # UserNotificationSettings,
 )
 from fedrisk_api.schema.project_evaluation import CreateProjectEvaluation, UpdateProjectEvaluation
-from fedrisk_api.utils.utils import filter_by_tenant, filter_by_user_project_role
+from fedrisk_api.utils.utils import (
+    filter_by_tenant,
+    filter_by_user_project_role,
+    search_page,
+)
 
 # from fedrisk_api.utils.email_util import send_watch_email
 # from fedrisk_api.utils.sms_util import publish_notification
@@ -288,82 +291,14 @@ def search(query: str, db: Session, tenant_id: int, user_id: int, offset: int =
 
     user = db.query(User).filter(User.id == user_id).first()
     if user.is_superuser:
-        res = (
-            db.query(ProjectEvaluation)
-            .filter(
-                or_(
-                    func.lower(ProjectEvaluation.name).contains(lowercase_query),
-                    func.lower(ProjectEvaluation.description).contains(lowercase_query),
-                    func.lower(ProjectEvaluation.keywords).contains(lowercase_query),
-                )
-            )
-            .all()
-        )
+        queryset = db.query(ProjectEvaluation)
     elif user.is_tenant_admin:
-        res = (
-            filter_by_tenant(db, ProjectEvaluation, tenant_id)
-            .filter(
-                or_(
-                    func.lower(ProjectEvaluation.name).contains(lowercase_query),
-                    func.lower(ProjectEvaluation.description).contains(lowercase_query),
-                    func.lower(ProjectEvaluation.keywords).contains(lowercase_query),
-                )
-            )
-            .all()
-        )
+        queryset = filter_by_tenant(db, ProjectEvaluation, tenant_id)
     else:
-        res = (
-            filter_by_tenant(db, ProjectEvaluation, tenant_id)
-            .join(ProjectUser, ProjectUser.id == ProjectEvaluation.project_id)
-            .filter(ProjectUser.user_id == user_id)
-            .filter(
-                or_(
-                    func.lower(ProjectEvaluation.name).contains(lowercase_query),
-                    func.lower(ProjectEvaluation.description).contains(lowercase_query),
-                    func.lower(ProjectEvaluation.keywords).contains(lowercase_query),
-                )
+        queryset = filter_by_tenant(db, ProjectEvaluation, tenant_id).filter(
+            ProjectEvaluation.project_id.in_(
+                db.query(ProjectUser.project_id).filter(ProjectUser.user_id == user_id)
             )
-            .distinct()
-            .all()
         )
 
-    if user.is_superuser:
-        count = (
-            db.query(ProjectEvaluation)
-            .filter(
-                or_(
-                    func.lower(ProjectEvaluation.name).contains(lowercase_query),
-                    func.lower(ProjectEvaluation.description).contains(lowercase_query),
-                    func.lower(ProjectEvaluation.keywords).contains(lowercase_query),
-                )
-            )
-            .count()
-        )
-    elif user.is_tenant_admin:
-        count = (
-            filter_by_tenant(db, ProjectEvaluation, tenant_id)
-            .filter(
-                or_(
-                    func.lower(ProjectEvaluation.name).contains(lowercase_query),
-                    func.lower(ProjectEvaluation.description).contains(lowercase_query),
-                    func.lower(ProjectEvaluation.keywords).contains(lowercase_query),
-                )
-            )
-            .count()
-        )
-    else:
-        count = (
-            filter_by_tenant(db, ProjectEvaluation, tenant_id)
-            .join(ProjectUser, ProjectUser.id == ProjectEvaluation.project_id)
-            .filter(ProjectUser.user_id == user_id)
-            .filter(
-                or_(
-                    func.lower(ProjectEvaluation.name).contains(lowercase_query),
-                    func.lower(ProjectEvaluation.description).contains(lowercase_query),
-                    func.lower(ProjectEvaluation.keywords).contains(lowercase_query),
-                )
-            )
-            .distinct()
-            .count()
-        )
-    return count, res[offset : offset + limit]
+    return search_page(db, queryset, ProjectEvaluation, lowercase_query, offset, limit)
@@ -16,10 +16,6 @@ from fedrisk_api.db.models import (
     ProjectUser,
     ProjectControl,
     # Control,
-    RiskStatus,
-    RiskScore,
-    RiskLikelihood,
-    RiskImpact,
     AuditTest,
     AuditTestInstance,
     ReportingSettings,
@@ -32,9 +28,8 @@ from fedrisk_api.schema.reporting_dashboard import (
 )
 
 import logging
-from fedrisk_api.utils.utils import get_risk_mapping_metrics
-
-risk_mapping_metrics = get_risk_mapping_metrics()
+from fedrisk_api.db.dashboard_metrics import get_dashboard_metrics, with_computed_date
+from fedrisk_api.db.risk_matrix import count_risk_levels_by
 
 LOGGER = logging.getLogger(__name__)
 
@@ -63,6 +58,11 @@ RISK_ATTRIBUTES = {
 }
 
 
+AUDIT_TEST_STATUSES = ["not_started", "on_going", "complete", "on_hold"]
+CAP_POAM_STATUSES = ["not_started", "in_progress", "completed"]
+CAP_POAM_CRITICALITIES = ["low", "medium", "high"]
+
+
 def get_risk_by_category_count(db: Session, project_id: int, year: int):
 
     risk_total_count = (
@@ -122,7 +122,116 @@ def get_risk_by_category_count(db: Session, project_id: int, year: int):
         }
 
 
+def _audit_test_counts(db: Session, project_ids):
+    rows = (
+        db.query(
+            AuditTest.project_id,
+            *[
+                func.count(AuditTestInstance.id)
+                .filter(AuditTestInstance.status == audit_status)
+                .label(audit_status)
+                for audit_status in AUDIT_TEST_STATUSES
+            ],
+        )
+        .join(AuditTest, AuditTest.id == AuditTestInstance.audit_test_id)
+        .filter(AuditTest.project_id.in_(project_ids))
+        .group_by(AuditTest.project_id)
+        .all()
+    )
+    return {row.project_id: row for row in rows}
+
+
+def _project_control_counts(db: Session, project_ids):
+    rows = (
+        db.query(
+            ProjectControl.project_id,
+            func.count(ProjectControl.id).label("count"),
+            func.avg(func.coalesce(ProjectControl.mitigation_percentage, 0)).label(
+                "mitigation_percent"
+            ),
+        )
+        .filter(ProjectControl.project_id.in_(project_ids))
+        .group_by(ProjectControl.project_id)
+        .all()
+    )
+    return {row.project_id: row for row in rows}
+
+
+def _cap_poam_counts(db: Session, project_ids):
+    rows = (
+        db.query(
+            CapPoam.project_id,
+            *[
+                func.count(CapPoam.id)
+                .filter(CapPoam.status == cap_poam_status)
+                .label(cap_poam_status)
+                for cap_poam_status in CAP_POAM_STATUSES
+            ],
+            *[
+                func.count(CapPoam.id)
+                .filter(CapPoam.criticality_rating == criticality)
+                .label(f"criticality_{criticality}")
+                for criticality in CAP_POAM_CRITICALITIES
+            ],
+        )
+        .filter(CapPoam.project_id.in_(project_ids))
+        .group_by(CapPoam.project_id)
+        .all()
+    )
+    return {row.project_id: row for row in rows}
+
+
+def _compute_pivot_rows(db: Session, projects):
+    """{project_id: pivot row}; every tally is one GROUP BY over all of the projects"""
+    project_ids = [project.id for project in projects]
+
+    risk_levels = count_risk_levels_by(db, Risk.project_id, Risk.project_id.in_(project_ids))
+    audit_tests = _audit_test_counts(db, project_ids)
+    project_controls = _project_control_counts(db, project_ids)
+    cap_poams = _cap_poam_counts(db, project_ids)
+
+    results = {}
+    for project in projects:
+        levels = risk_levels.get(project.id, {})
+        audit_test = audit_tests.get(project.id)
+        project_control = project_controls.get(project.id)
+        cap_poam = cap_poams.get(project.id)
+        result = {
+            "id": project.id,
+            "name": project.name,
+            "status": project.status,
+            "created_date": project.created_date,
+            "last_updated_date": project.last_updated_date,
+            "project_group_id": project.project_group_id,
+            "project_group_name": project.project_group.name,
+            "risk_low_count": levels.get("low", 0),
+            "risk_low_medium_count": levels.get("low_medium", 0),
+            "risk_medium_count": levels.get("medium", 0),
+            "risk_medium_high_count": levels.get("medium_high", 0),
+            "risk_high_count": levels.get("high", 0),
+        }
+        for audit_status in AUDIT_TEST_STATUSES:
+            result[f"audit_test_{audit_status}"] = getattr(audit_test, audit_status, 0)
+        result["control_mitigation_percent"] = (
+            float(project_control.mitigation_percent) if project_control else 0
+        )
+        result["project_control_count"] = project_control.count if project_control else 0
+        for criticality in CAP_POAM_CRITICALITIES:
+            result[f"cap_poam_criticality_{criticality}"] = getattr(
+                cap_poam, f"criticality_{criticality}", 0
+            )
+        for cap_poam_status in CAP_POAM_STATUSES:
+            result[f"cap_poam_{cap_poam_status}"] = getattr(cap_poam, cap_poam_status, 0)
+        results[project.id] = result
+    return results
+
+
 def get_data_for_pivot(db: Session, tenant_id: int, user_id: int):
+    """One row per project with risk, audit test, control and cap poam tallies.
+
+    Rows come from the dashboard metric store; only missing or stale projects are
+    recomputed, together, in a fixed number of queries.
+    """
     user = db.query(User).filter(User.id == user_id).first()
     if user.system_role in [1, 4]:
         queryset = db.query(Project).filter(
@@ -139,228 +248,19 @@ def get_data_for_pivot(db: Session, tenant_id: int, user_id: int):
             )
         )
 
-    queryset = queryset.options(selectinload(Project.project_group)).all()
-
-    # for query in queryset:
-
-    results = []
-    for query in queryset:
-        # go through each risk and get mapping data and add to appropriate tally
-        low_count = 0
-        low_medium_count = 0
-        medium_count = 0
-        medium_high_count = 0
-        high_count = 0
-        project_risk = db.query(Risk).filter(Risk.project_id == query.id).all()
-
-        all_risks_ids = {risk.id for risk in project_risk}
-
-        risk_status = (
-            db.query(
-                RiskStatus.name,
-                func.count("*").label("count"),
-            )
-            .select_from(Risk)
-            .join(RiskStatus, RiskStatus.id == Risk.risk_status_id)
-            .filter(Risk.id.in_(all_risks_ids))
-            .group_by(RiskStatus.name)
-            .filter(Risk.project_id == query.id)
-            .all()
-        )
-
-        risk_score = (
-            db.query(
-                RiskScore.name,
-                func.count("*").label("count"),
-            )
-            .select_from(Risk)
-            .join(RiskScore, RiskScore.id == Risk.risk_score_id)
-            .filter(Risk.id.in_(all_risks_ids))
-            .group_by(RiskScore.name)
-            .filter(Risk.project_id == query.id)
-            .all()
-        )
-
-        risk_impact = (
-            db.query(RiskImpact.name, func.count("*").label("count"))
-            .select_from(Risk)
-            .join(RiskImpact, RiskImpact.id == Risk.risk_impact_id)
-            .filter(Risk.id.in_(all_risks_ids))
-            .group_by(RiskImpact.name)
-            .filter(Risk.project_id == query.id)
-            .all()
-        )
-
-        risk_likelihood = (
-            db.query(
-                RiskLikelihood.name,
-                func.count("*").label("count"),
-            )
-            .select_from(Risk)
-            .join(RiskLikelihood, RiskLikelihood.id == Risk.current_likelihood_id)
-            .filter(Risk.id.in_(all_risks_ids))
-            .group_by(RiskLikelihood.name)
-            .filter(Risk.project_id == query.id)
-            .all()
-        )
-
-        default_mapping = [
-            (risk_status, RISK_ATTRIBUTES["risk_status"].copy()),
-            (risk_score, RISK_ATTRIBUTES["risk_score"].copy()),
-            (risk_impact, RISK_ATTRIBUTES["risk_impact"].copy()),
-            (risk_likelihood, RISK_ATTRIBUTES["risk_likelihood"].copy()),
-        ]
-
-        for risk_attr_value in default_mapping:
-            missing_values = risk_attr_value[1] - {obj.name for obj in risk_attr_value[0]}
-            for missing_value in missing_values:
-                risk_attr_value[0].append({"name": missing_value, "count": 0})
-
-        risks = (
-            db.query(
-                RiskLikelihood.name.label("current_likelihood"),
-                RiskImpact.name.label("risk_impact"),
-            )
-            .select_from(Risk)
-            .join(RiskLikelihood, RiskLikelihood.id == Risk.current_likelihood_id)
-            .join(RiskImpact, RiskImpact.id == Risk.risk_impact_id)
-            .filter(Risk.id.in_(all_risks_ids))
-            .filter(Risk.project_id == query.id)
-            .group_by(RiskLikelihood.name)
-            .group_by(RiskImpact.name)
-            .all()
-        )
-
-        for risk in risks:
-            current_likelihood_name = "_".join(risk.current_likelihood.split(" "))
-            risk_matrics_key = f"{current_likelihood_name}__{risk.risk_impact}".lower()
-            for key, value in risk_mapping_metrics.items():
-                for risk_matrics in set(value):
-                    if risk_matrics_key == risk_matrics:
-                        if key == "low":
-                            low_count += 1
-                        elif key == "low_medium":
-                            low_medium_count += 1
-                        elif key == "medium":
-                            medium_count += 1
-                        elif key == "medium_high":
-                            medium_high_count += 1
-                        elif key == "high":
-                            high_count += 1
-        # get audit tests by status
-        # not_started = "Not Started"
-        # on_going = "On Going"
-        # complete = "Complete"
-        # on_hold = "On Hold"
-        audit_test_not_started = (
-            db.query(AuditTestInstance)
-            .join(AuditTest, AuditTest.id == AuditTestInstance.audit_test_id)
-            .filter(AuditTest.project_id == query.id)
-            .filter(AuditTestInstance.status == "not_started")
-        ).count()
-        audit_test_on_going = (
-            db.query(AuditTestInstance)
-            .join(AuditTest, AuditTest.id == AuditTestInstance.audit_test_id)
-            .filter(AuditTest.project_id == query.id)
-            .filter(AuditTestInstance.status == "on_going")
-        ).count()
-        audit_test_complete = (
-            db.query(AuditTestInstance)
-            .join(AuditTest, AuditTest.id == AuditTestInstance.audit_test_id)
-            .filter(AuditTest.project_id == query.id)
-            .filter(AuditTestInstance.status == "complete")
-        ).count()
-        audit_test_on_hold = (
-            db.query(AuditTestInstance)
-            .join(AuditTest, AuditTest.id == AuditTestInstance.audit_test_id)
-            .filter(AuditTest.project_id == query.id)
-            .filter(AuditTestInstance.status == "on_hold")
-        ).count()
-
-        project_control_count = (
-            db.query(ProjectControl).filter(ProjectControl.project_id == query.id)
-        ).count()
-        mitigation_percentages = (
-            db.query(ProjectControl).filter(ProjectControl.project_id == query.id)
-        ).all()
-        control_mitigation_percent = 0.00
-        control_count_perc = 0
-        control_mitigation_percent_sum = 0
-        for mp in mitigation_percentages:
-            control_mitigation_percent += float(mp.mitigation_percentage)
-            if float(mp.mitigation_percentage) > 0:
-                control_count_perc += 1
-        if project_control_count > 0:
-            control_mitigation_percent_sum = float(control_mitigation_percent) / float(
-                project_control_count
-            )
-        # get cap poams by status
-        # not_started = "Not Started"
-        # in_progress = "In Progress"
-        # completed = "Completed"
-        cap_poam_not_started = (
-            db.query(CapPoam)
-            .filter(CapPoam.project_id == query.id)
-            .filter(CapPoam.status == "not_started")
-        ).count()
-        cap_poam_in_progress = (
-            db.query(CapPoam)
-            .filter(CapPoam.project_id == query.id)
-            .filter(CapPoam.status == "in_progress")
-        ).count()
-        cap_poam_completed = (
-            db.query(CapPoam)
-            .filter(CapPoam.project_id == query.id)
-            .filter(CapPoam.status == "completed")
-        ).count()
-        # get cap poams by criticality rating
-        # low = "low"
-        # medium = "medium"
-        # high = "high"
-        cap_poam_criticality_low = (
-            db.query(CapPoam)
-            .filter(CapPoam.project_id == query.id)
-            .filter(CapPoam.criticality_rating == "low")
-        ).count()
-        cap_poam_criticality_medium = (
-            db.query(CapPoam)
-            .filter(CapPoam.project_id == query.id)
-            .filter(CapPoam.criticality_rating == "medium")
-        ).count()
-        cap_poam_criticality_high = (
-            db.query(CapPoam)
-            .filter(CapPoam.project_id == query.id)
-            .filter(CapPoam.criticality_rating == "high")
-        ).count()
-        # control_mit_sum = round(control_mitigation_percent_sum, 3)
-        result = {
-            "id": query.id,
-            "name": query.name,
-            "status": query.status,
-            "created_date": query.created_date,
-            "last_updated_date": query.last_updated_date,
-            "project_group_id": query.project_group_id,
-            "project_group_name": query.project_group.name,
-            "risk_low_count": low_count,
-            "risk_low_medium_count": low_medium_count,
-            "risk_medium_count": medium_count,
-            "risk_medium_high_count": medium_high_count,
-            "risk_high_count": high_count,
-            "audit_test_not_started": audit_test_not_started,
-            "audit_test_on_going": audit_test_on_going,
-            "audit_test_complete": audit_test_complete,
-            "audit_test_on_hold": audit_test_on_hold,
-            "control_mitigation_percent": control_mitigation_percent_sum,
-            "project_control_count": project_control_count,
-            "cap_poam_criticality_low": cap_poam_criticality_low,
-            "cap_poam_criticality_medium": cap_poam_criticality_medium,
-            "cap_poam_criticality_high": cap_poam_criticality_high,
-            "cap_poam_not_started": cap_poam_not_started,
-            "cap_poam_in_progress": cap_poam_in_progress,
-            "cap_poam_completed": cap_poam_completed,
-        }
-        results.append(result)
-    return results
+    projects = {
+        project.id: project
+        for project in queryset.options(selectinload(Project.project_group)).all()
+    }
+    stored = get_dashboard_metrics(
+        db,
+        projects,
+        "pivot",
+        lambda project_ids: _compute_pivot_rows(
+            db, [projects[project_id] for project_id in project_ids]
+        ),
+    )
+    return [with_computed_date(*stored[project_id]) for project_id in projects]
 
 
 def create_reporting_settings_user(settings: CreateReportingSettings, db: Session):
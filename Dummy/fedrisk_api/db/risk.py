@@ -30,12 +30,14 @@ from fedrisk_api.db.models import (
     UserWatching,
     # UserNotificationSettings,
 )
+from fedrisk_api.db.risk_matrix import get_risk_level
 from fedrisk_api.schema.risk import CreateRisk, UpdateRisk
 from fedrisk_api.utils.utils import (
     filter_by_tenant,
     get_risk_mapping_metrics,
     get_risk_mapping_order,
     ordering_query,
+    search_page,
 )
 
 # from fedrisk_api.utils.email_util import send_watch_email
@@ -343,16 +345,10 @@ def get_all_risks_with_tasks_by_project(tenant_id: int, project_id: int, db: Ses
             risk.risk_mapping = "n/a"
             continue
 
-        current_likelihood_name = "_".join(risk_map_values.current_likelihood.split(" "))
-        risk_matrics_key = f"{current_likelihood_name}__{risk_map_values.risk_impact}".lower()
-
-        risk_mapping = "n/a"
-        for key, value in risk_mapping_metrics.items():
-            if risk_matrics_key in set(value):
-                risk_mapping = key
-                break
-
-        risk.risk_mapping = risk_mapping
+        risk.risk_mapping = (
+            get_risk_level(risk_map_values.current_likelihood, risk_map_values.risk_impact)
+            or "n/a"
+        )
 
     return risks
 
@@ -379,18 +375,11 @@ def get_risk(db: Session, id: int, tenant_id: int):
         .join(RiskImpact, RiskImpact.id == Risk.risk_impact_id)
         .filter(Risk.id == id)
     )
-    if risk_map_values.first() is not None:
-        risk_mapping = ""
-        current_likelihood_name = "_".join(risk_map_values.first().current_likelihood.split(" "))
-        if risk_map_values.first().risk_impact is not None:
-            risk_matrics_key = (
-                f"{current_likelihood_name}__{risk_map_values.first().risk_impact}".lower()
-            )
-            for key, value in risk_mapping_metrics.items():
-                for risk_matrics in set(value):
-                    if risk_matrics_key == risk_matrics:
-                        risk_mapping = key
-            risk.risk_mapping = risk_mapping
+    risk_map_value = risk_map_values.first()
+    if risk_map_value is not None and risk_map_value.risk_impact is not None:
+        risk.risk_mapping = (
+            get_risk_level(risk_map_value.current_likelihood, risk_map_value.risk_impact) or ""
+        )
     return risk
 
 
@@ -536,83 +525,14 @@ def search(query: str, db: Session, tenant_id: int, user_id: int, offset: int =
     user = db.query(User).filter(User.id == user_id).first()
 
     if user.is_superuser:
-        res = (
-            db.query(Risk)
-            .filter(
-                or_(
-                    func.lower(Risk.name).contains(lowercase_query),
-                    func.lower(Risk.description).contains(lowercase_query),
-                    func.lower(Risk.keywords).contains(lowercase_query),
-                )
-            )
-            .all()
-        )
-    elif user.is_tenant_admin:
-        res = (
-            filter_by_tenant(db, Risk, tenant_id)
-            .filter(
-                or_(
-                    func.lower(Risk.name).contains(lowercase_query),
-                    func.lower(Risk.description).contains(lowercase_query),
-                    func.lower(Risk.keywords).contains(lowercase_query),
-                )
-            )
-            .all()
-        )
-    else:
-        res = (
-            filter_by_tenant(db, Risk, tenant_id)
-            .join(ProjectUser, ProjectUser.id == Risk.project_id)
-            .filter(ProjectUser.user_id == user_id)
-            .filter(
-                or_(
-                    func.lower(Risk.name).contains(lowercase_query),
-                    func.lower(Risk.description).contains(lowercase_query),
-                    func.lower(Risk.keywords).contains(lowercase_query),
-                )
-            )
-            .all()
-        )
-
-    if user.is_superuser:
-        count = (
-            db.query(Risk)
-            .filter(
-                or_(
-                    func.lower(Risk.name).contains(lowercase_query),
-                    func.lower(Risk.description).contains(lowercase_query),
-                    func.lower(Risk.keywords).contains(lowercase_query),
-                )
-            )
-            .count()
-        )
+        queryset = db.query(Risk)
     elif user.is_tenant_admin:
-        count = (
-            filter_by_tenant(db, Risk, tenant_id)
-            .filter(
-                or_(
-                    func.lower(Risk.name).contains(lowercase_query),
-                    func.lower(Risk.description).contains(lowercase_query),
-                    func.lower(Risk.keywords).contains(lowercase_query),
-                )
-            )
-            .distinct()
-            .count()
-        )
+        queryset = filter_by_tenant(db, Risk, tenant_id)
     else:
-        count = (
-            filter_by_tenant(db, Risk, tenant_id)
-            .join(ProjectUser, ProjectUser.id == Risk.project_id)
-            .filter(ProjectUser.user_id == user_id)
-            .filter(
-                or_(
-                    func.lower(Risk.name).contains(lowercase_query),
-                    func.lower(Risk.description).contains(lowercase_query),
-                    func.lower(Risk.keywords).contains(lowercase_query),
-                )
+        queryset = filter_by_tenant(db, Risk, tenant_id).filter(
+            Risk.project_id.in_(
+                db.query(ProjectUser.project_id).filter(ProjectUser.user_id == user_id)
             )
-            .distinct()
-            .count()
         )
 
-    return count, res[offset : offset + limit]
+    return search_page(db, queryset, Risk, lowercase_query, offset, limit)
@@ -0,0 +1,106 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from fedrisk_api.db.models import Risk, RiskImpact, RiskLikelihood
+from fedrisk_api.utils.utils import get_risk_mapping_metrics
+
+LOGGER = logging.getLogger(__name__)
+
+# likelihood and impact rows are seeded reference data, so the lookup rarely changes
+RISK_LEVEL_LOOKUP_TTL_SECONDS = 300
+
+RISK_LEVELS = list(get_risk_mapping_metrics())
+
+RISK_LEVEL_DISPLAY_NAMES = {
+    "low": "Low",
+    "low_medium": "Low-Medium",
+    "medium": "Medium",
+    "medium_high": "Medium-High",
+    "high": "High",
+}
+
+RISK_LEVEL_BY_KEY = {
+    risk_matrics: level
+    for level, risk_matrics_keys in get_risk_mapping_metrics().items()
+    for risk_matrics in risk_matrics_keys
+}
+
+_lookup_cache = {}
+_lookup_lock = threading.Lock()
+
+
+def risk_matrix_key(likelihood_name: str, impact_name: str):
+    current_likelihood_name = "_".join(likelihood_name.split(" "))
+    return f"{current_likelihood_name}__{impact_name}".lower()
+
+
+def get_risk_level(likelihood_name: str, impact_name: str):
+    """Risk level (e.g. "medium_high") for a likelihood/impact name pair, or None"""
+    if not likelihood_name or not impact_name:
+        return None
+    return RISK_LEVEL_BY_KEY.get(risk_matrix_key(likelihood_name, impact_name))
+
+
+def get_risk_level_lookup(db: Session):
+    """{(likelihood_id, impact_id): level} for every classified cell of the matrix"""
+    bind = db.get_bind()
+    with _lookup_lock:
+        cached = _lookup_cache.get(bind)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+    likelihoods = db.query(RiskLikelihood.id, RiskLikelihood.name).all()
+    impacts = db.query(RiskImpact.id, RiskImpact.name).all()
+    lookup = {}
+    for likelihood_id, likelihood_name in likelihoods:
+        for impact_id, impact_name in impacts:
+            level = get_risk_level(likelihood_name, impact_name)
+            if level:
+                lookup[(likelihood_id, impact_id)] = level
+
+    if lookup:
+        with _lookup_lock:
+            _lookup_cache[bind] = (time.monotonic() + RISK_LEVEL_LOOKUP_TTL_SECONDS, lookup)
+    return lookup
+
+
+def clear_risk_level_lookup():
+    with _lookup_lock:
+        _lookup_cache.clear()
+
+
+def count_risk_levels_by(db: Session, group_by, *criterion):
+    """{group value: {level: risk count}} from one GROUP BY over likelihood/impact ids"""
+    lookup = get_risk_level_lookup(db)
+    rows = (
+        db.query(
+            group_by,
+            Risk.current_likelihood_id,
+            Risk.risk_impact_id,
+            func.count(Risk.id),
+        )
+        .filter(*criterion)
+        .group_by(group_by, Risk.current_likelihood_id, Risk.risk_impact_id)
+        .all()
+    )
+    counts = defaultdict(lambda: dict.fromkeys(RISK_LEVELS, 0))
+    for group, likelihood_id, impact_id, count in rows:
+        level = lookup.get((likelihood_id, impact_id))
+        if level:
+            counts[group][level] += count
+    return counts
+
+
+def count_risk_levels(db: Session, *criterion):
+    """{level: risk count} for the risks matching criterion"""
+    counts = count_risk_levels_by(db, Risk.project_id, *criterion)
+    totals = dict.fromkeys(RISK_LEVELS, 0)
+    for project_counts in counts.values():
+        for level, count in project_counts.items():
+            totals[level] += count
+    return totals
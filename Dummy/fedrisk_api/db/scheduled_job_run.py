@@ -0,0 +1,35 @@
+import logging
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from fedrisk_api.db.models import ScheduledJobRun
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_scheduled_job_runs(db: Session, job_name: str):
+    return (
+        db.query(ScheduledJobRun)
+        .filter(ScheduledJobRun.job_name == job_name)
+        .order_by(ScheduledJobRun.started_date.desc(), ScheduledJobRun.id.desc())
+    )
+
+
+def get_last_scheduled_job_runs(db: Session, job_names: list):
+    """Returns {job name: latest run} over all replicas"""
+    latest = (
+        db.query(
+            ScheduledJobRun.job_name,
+            func.max(ScheduledJobRun.started_date).label("started_date"),
+        )
+        .filter(ScheduledJobRun.job_name.in_(job_names))
+        .group_by(ScheduledJobRun.job_name)
+        .subquery()
+    )
+    runs = db.query(ScheduledJobRun).join(
+        latest,
+        (ScheduledJobRun.job_name == latest.c.job_name)
+        & (ScheduledJobRun.started_date == latest.c.started_date),
+    )
+    return {run.job_name: run for run in runs}
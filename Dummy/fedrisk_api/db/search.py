@@ -0,0 +1,226 @@
+import logging
+from collections import defaultdict, namedtuple
+
+from sqlalchemy import and_, bindparam, event, func, literal, or_
+from sqlalchemy.orm import Session
+
+from fedrisk_api.db.models import (
+    Assessment,
+    Control,
+    Document,
+    Project,
+    ProjectEvaluation,
+    ProjectUser,
+    Risk,
+    SearchDocument,
+    Task,
+    User,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+SEARCH_LANGUAGE = "english"
+
+# title_fields are tried in order, body_fields are joined
+SearchSpec = namedtuple("SearchSpec", ["model", "title_fields", "body_fields", "updated_field"])
+
+SEARCH_SPECS = {
+    "project": SearchSpec(Project, ("name",), ("description",), "last_updated_date"),
+    "risk": SearchSpec(Risk, ("name",), ("description",), "last_updated_date"),
+    "control": SearchSpec(Control, ("name",), ("description",), "last_updated_date"),
+    "assessment": SearchSpec(Assessment, ("name",), ("description",), "last_updated_date"),
+    "task": SearchSpec(Task, ("title", "name"), ("description",), "updated_at"),
+    "document": SearchSpec(
+        Document, ("title", "name"), ("name", "description"), "last_updated_date"
+    ),
+    "project_evaluation": SearchSpec(
+        ProjectEvaluation, ("name",), ("description",), "last_updated_date"
+    ),
+}
+
+SEARCH_OBJECT_TYPES = {spec.model: object_type for object_type, spec in SEARCH_SPECS.items()}
+
+
+def _object_project_id(obj):
+    if isinstance(obj, Project):
+        return obj.id
+    if isinstance(obj, Control):
+        # controls are shared by every project in the tenant
+        return None
+    if isinstance(obj, Assessment):
+        return obj.project_control.project_id if obj.project_control else None
+    return obj.project_id
+
+
+def _search_document_row(object_type, obj):
+    spec = SEARCH_SPECS[object_type]
+    title = next((getattr(obj, field) for field in spec.title_fields if getattr(obj, field)), "")
+    body = " ".join(getattr(obj, field) or "" for field in spec.body_fields).strip()
+    return {
+        "tenant_id": obj.tenant_id,
+        "project_id": _object_project_id(obj),
+        "object_type": object_type,
+        "object_id": obj.id,
+        "title": title,
+        "body": body,
+        "vector_title": title,
+        "vector_body": body,
+    }
+
+
+def _search_vector(dialect_name):
+    if dialect_name != "postgresql":
+        return func.lower(bindparam("vector_title") + " " + bindparam("vector_body"))
+    return func.setweight(
+        func.to_tsvector(SEARCH_LANGUAGE, bindparam("vector_title")), "A"
+    ).op("||")(func.setweight(func.to_tsvector(SEARCH_LANGUAGE, bindparam("vector_body")), "B"))
+
+
+def write_search_documents(connection, changed, removed=None):
+    """Replace the search documents for changed objects and drop removed ones.
+
+    changed maps object_type to ORM instances, removed maps object_type to ids.
+    """
+    table = SearchDocument.__table__
+    removed = removed or {}
+    for object_type in set(changed) | set(removed):
+        objects = changed.get(object_type, [])
+        object_ids = {obj.id for obj in objects} | set(removed.get(object_type, ()))
+        if object_ids:
+            connection.execute(
+                table.delete().where(
+                    and_(table.c.object_type == object_type, table.c.object_id.in_(object_ids))
+                )
+            )
+        # objects outside a tenant never show up in search
+        rows = [
+            _search_document_row(object_type, obj)
+            for obj in objects
+            if obj.tenant_id is not None
+        ]
+        if rows:
+            connection.execute(
+                table.insert().values(search_vector=_search_vector(connection.dialect.name)),
+                rows,
+            )
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_search_documents(session, flush_context):
+    changed = defaultdict(list)
+    removed = defaultdict(set)
+    for obj in session.new:
+        object_type = SEARCH_OBJECT_TYPES.get(type(obj))
+        if object_type:
+            changed[object_type].append(obj)
+    for obj in session.dirty:
+        object_type = SEARCH_OBJECT_TYPES.get(type(obj))
+        if object_type and session.is_modified(obj, include_collections=False):
+            changed[object_type].append(obj)
+    for obj in session.deleted:
+        object_type = SEARCH_OBJECT_TYPES.get(type(obj))
+        if object_type:
+            removed[object_type].add(obj.id)
+
+    if changed or removed:
+        write_search_documents(session.connection(), changed, removed)
+
+
+def _search_match(db, query):
+    if db.get_bind().dialect.name != "postgresql":
+        return SearchDocument.search_vector.contains(query.lower()), literal(0)
+    ts_query = func.websearch_to_tsquery(SEARCH_LANGUAGE, query)
+    return (
+        SearchDocument.search_vector.op("@@")(ts_query),
+        func.ts_rank_cd(SearchDocument.search_vector, ts_query),
+    )
+
+
+def search_documents(
+    query: str,
+    db: Session,
+    tenant_id: int,
+    user_id: int,
+    object_types=None,
+    offset: int = 0,
+    limit: int = 10,
+):
+    """Ranked search across every indexed object type, returns (total, page)"""
+    user = db.query(User).filter(User.id == user_id).first()
+
+    queryset = db.query(SearchDocument)
+    if not user.is_superuser:
+        queryset = queryset.filter(SearchDocument.tenant_id == tenant_id)
+    if not (user.is_superuser or user.is_tenant_admin):
+        queryset = queryset.filter(
+            or_(
+                SearchDocument.project_id.is_(None),
+                SearchDocument.project_id.in_(
+                    db.query(ProjectUser.project_id).filter(ProjectUser.user_id == user_id)
+                ),
+            )
+        )
+    if object_types:
+        queryset = queryset.filter(SearchDocument.object_type.in_(object_types))
+
+    match, rank = _search_match(db, query)
+    queryset = queryset.filter(match)
+    rows = (
+        queryset.add_columns(func.count().over().label("total_count"))
+        .order_by(rank.desc(), SearchDocument.last_updated_date.desc(), SearchDocument.id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    if rows:
+        return rows[0][1], [row[0] for row in rows]
+    return (queryset.count() if offset else 0), []
+
+
+def reindex_search_documents(db: Session, full: bool = False, object_types=None, batch_size=500):
+    """Bring search_document up to date, returns the number of rows written per type.
+
+    By default only objects changed since they were last indexed (e.g. by bulk
+    updates that skip the ORM listeners) are rewritten; full rebuilds everything.
+    """
+    written = {}
+    for object_type in object_types or SEARCH_SPECS:
+        spec = SEARCH_SPECS[object_type]
+        model = spec.model
+        queryset = db.query(model)
+        if full:
+            db.query(SearchDocument).filter(SearchDocument.object_type == object_type).delete(
+                synchronize_session=False
+            )
+        else:
+            queryset = queryset.outerjoin(
+                SearchDocument,
+                and_(
+                    SearchDocument.object_type == object_type,
+                    SearchDocument.object_id == model.id,
+                ),
+            ).filter(
+                or_(
+                    SearchDocument.id.is_(None),
+                    getattr(model, spec.updated_field) > SearchDocument.last_updated_date,
+                )
+            )
+            # objects deleted outside the ORM
+            db.query(SearchDocument).filter(
+                SearchDocument.object_type == object_type,
+                ~db.query(model).filter(model.id == SearchDocument.object_id).exists(),
+            ).delete(synchronize_session=False)
+
+        written[object_type] = 0
+        last_id = 0
+        while True:
+            batch = queryset.filter(model.id > last_id).order_by(model.id).limit(batch_size).all()
+            if not batch:
+                break
+            last_id = batch[-1].id
+            write_search_documents(db.connection(), {object_type: batch})
+            written[object_type] += len(batch)
+            db.commit()
+        db.commit()
+        LOGGER.info(f"Indexed {written[object_type]} {object_type} search documents")
+    return written
@@ -1,9 +1,14 @@
 # from datetime import datetime, timedelta, timezone
+import logging
+from datetime import datetime
 
 from sqlalchemy.orm import Session
 
 # from fedrisk_api.db.enums import SubscriptionStatus
-from fedrisk_api.db.models import Tenant
+from fedrisk_api.db.models import Tenant, TenantSubscriptionStatus
+from fedrisk_api.schema.subscription import ListSubscriptions
+
+LOGGER = logging.getLogger(__name__)
 
 
 def get_tenant_customer_id(tenant_id: int, db: Session):
@@ -18,3 +23,79 @@ def get_tenant_subscription_id(tenant_id: int, db: Session):
     if tenant.subscription:
         return tenant.subscription.subscription_id
     return None
+
+
+def get_tenant_subscription_status(tenant_id: int, db: Session):
+    return (
+        db.query(TenantSubscriptionStatus)
+        .filter(TenantSubscriptionStatus.tenant_id == tenant_id)
+        .first()
+    )
+
+
+def is_tenant_trial_expired(tenant_id: int, db: Session, now: datetime = None):
+    """True when the locally mirrored subscription is a trial whose period has ended"""
+    subscription_status = get_tenant_subscription_status(tenant_id=tenant_id, db=db)
+    if not subscription_status or subscription_status.status != "trialing":
+        return False
+    if subscription_status.current_period_end is None:
+        return False
+    return subscription_status.current_period_end < (now or datetime.now())
+
+
+def _get_subscription_tenant_id(subscription, db: Session):
+    metadata = subscription.get("metadata") or {}
+    if metadata.get("tenant_id"):
+        return int(metadata["tenant_id"])
+    tenant = db.query(Tenant).filter(Tenant.customer_id == subscription.get("customer")).first()
+    return tenant.id if tenant else None
+
+
+def sync_tenant_subscription_status(subscription, db: Session, tenant_id: int = None):
+    """Upsert the local subscription mirror from a Stripe subscription object"""
+    if tenant_id is None:
+        tenant_id = _get_subscription_tenant_id(subscription, db)
+    if tenant_id is None:
+        LOGGER.warning(f"No tenant found for stripe subscription {subscription.get('id')}")
+        return None
+
+    current_period_end = subscription.get("current_period_end")
+    subscription_status = get_tenant_subscription_status(tenant_id=tenant_id, db=db)
+    if not subscription_status:
+        subscription_status = TenantSubscriptionStatus(tenant_id=tenant_id)
+        db.add(subscription_status)
+
+    subscription_status.customer_id = subscription.get("customer")
+    subscription_status.subscription_id = subscription.get("id")
+    subscription_status.status = subscription.get("status")
+    subscription_status.current_period_end = (
+        datetime.fromtimestamp(current_period_end) if current_period_end else None
+    )
+    subscription_status.cancel_at_period_end = bool(subscription.get("cancel_at_period_end"))
+    subscription_status.last_synced_date = datetime.now()
+    db.commit()
+    db.refresh(subscription_status)
+    return subscription_status
+
+
+def reconcile_tenant_subscription_statuses(payment_client, db: Session):
+    """Refresh the local mirror for every tenant with a Stripe customer.
+
+    Catches anything the webhook missed; meant to be run periodically.
+    """
+    reconciled = 0
+    tenants = db.query(Tenant).filter(Tenant.customer_id.isnot(None)).all()
+    for tenant in tenants:
+        try:
+            subscriptions = payment_client.list_subscriptions(
+                ListSubscriptions(customer=tenant.customer_id, status="all")
+            )
+        except Exception:
+            LOGGER.exception(f"Unable to list stripe subscriptions for tenant {tenant.id}")
+            continue
+        if not subscriptions or not subscriptions.data:
+            continue
+        # stripe returns the most recently created subscription first
+        sync_tenant_subscription_status(subscriptions.data[0], db, tenant_id=tenant.id)
+        reconciled += 1
+    return reconciled
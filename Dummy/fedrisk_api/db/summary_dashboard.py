@@ -18,20 +18,12 @@ from fedrisk_api.db.models import (
     Risk,
     User,
     Assessment,
-    RiskLikelihood,
-    RiskImpact,
     ControlStatus,
     Exception,
     ExceptionReview,
 )
-from fedrisk_api.utils.utils import (
-    filter_by_tenant,
-    get_risk_mapping_metrics,
-    get_risk_mapping_order,
-)
-
-risk_mapping_metrics = get_risk_mapping_metrics()
-risk_mapping_order = get_risk_mapping_order()
+from fedrisk_api.db.risk_matrix import count_risk_levels
+from fedrisk_api.utils.utils import filter_by_tenant
 
 LOGGER = logging.getLogger(__name__)
 
@@ -643,38 +635,7 @@ def get_summary_chart_data_by_project(db: Session, project_id, tenant_id, user_i
         .filter(User.id == project_query.project_admin_id)
         .first()
     )
-    risks = (
-        db.query(
-            RiskLikelihood.name.label("current_likelihood"), RiskImpact.name.label("risk_impact")
-        )
-        .select_from(Risk)
-        .join(RiskLikelihood, RiskLikelihood.id == Risk.current_likelihood_id)
-        .join(RiskImpact, RiskImpact.id == Risk.risk_impact_id)
-        .filter(Risk.project_id == project_id)
-        .all()
-    )
-
-    low_count = 0
-    low_medium_count = 0
-    medium_count = 0
-    medium_high_count = 0
-    high_count = 0
-    for risk in risks:
-        current_likelihood_name = "_".join(risk.current_likelihood.split(" "))
-        risk_matrics_key = f"{current_likelihood_name}__{risk.risk_impact}".lower()
-        for key, value in risk_mapping_metrics.items():
-            for risk_matrics in set(value):
-                if risk_matrics_key == risk_matrics:
-                    if key == "low":
-                        low_count += 1
-                    elif key == "low_medium":
-                        low_medium_count += 1
-                    elif key == "medium":
-                        medium_count += 1
-                    elif key == "medium_high":
-                        medium_high_count += 1
-                    elif key == "high":
-                        high_count += 1
+    risk_levels = count_risk_levels(db, Risk.project_id == project_id)
 
     num_risks_over_5 = 0
 
@@ -868,11 +829,11 @@ def get_summary_chart_data_by_project(db: Session, project_id, tenant_id, user_i
         "id": project_query.id,
         "total_assessments": total_assessments,
         "assessments_complete": assessments_complete,
-        "low_risks": low_count,
-        "low_medium_risks": low_medium_count,
-        "medium_risks": medium_count,
-        "medium_high_risks": medium_high_count,
-        "high_risks": high_count,
+        "low_risks": risk_levels["low"],
+        "low_medium_risks": risk_levels["low_medium"],
+        "medium_risks": risk_levels["medium"],
+        "medium_high_risks": risk_levels["medium_high"],
+        "high_risks": risk_levels["high"],
         "num_risks_over_5": num_risks_over_5,
         "controls": project_control_count,
         "audit_tests": audit_test_count,
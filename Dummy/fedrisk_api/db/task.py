@@ -46,14 +46,14 @@ from fedrisk_api.db.models import (
     WorkflowFlowchart,
     WorkflowTaskMapping,
 )
+from fedrisk_api.db.notification_outbox import enqueue_email, enqueue_sms
 from fedrisk_api.schema.task import CreateTask, UpdateTask
 from fedrisk_api.utils.utils import filter_by_tenant, ordering_query
 
 # from fedrisk_api.s3 import BUCKET_NAME, S3Service, get_profile_s3_key
 
-from fedrisk_api.utils.email_util import send_watch_email
+from fedrisk_api.utils.email_util import watch_email_body
 
-from fedrisk_api.utils.sms_util import publish_notification
 
 from fedrisk_api.db.util.notifications_utils import (
     # notify_user,
@@ -162,7 +162,7 @@ async def remove_old_keywords(db, keywords, task_id):
 
 
 async def send_assignment_notification(db, task, user_id):
-    """Sends assignment notification to user based on their settings."""
+    """Queues assignment notification to user based on their settings."""
     user_settings = (
         db.query(UserNotificationSettings)
         .filter(UserNotificationSettings.user_id == task.assigned_to)
@@ -172,18 +172,19 @@ async def send_assignment_notification(db, task, user_id):
     project_link = f"/projects/{task.project_id}/tasks/{task.id}"
     if user_settings and assigned_user:
         if user_settings.assigned_email:
-            email_content = {
-                "subject": f"You've been assigned to task {task.name} on Fedrisk",
-                "email": assigned_user.email,
-                "message": f"Task {task.name} assigned to you. Link: {project_link}",
-            }
-            await send_watch_email(email_content)
+            enqueue_email(
+                db,
+                assigned_user.email,
+                f"You've been assigned to task {task.name} on Fedrisk",
+                watch_email_body(f"Task {task.name} assigned to you. Link: {project_link}"),
+            )
         if user_settings.assigned_sms and assigned_user.phone_no:
-            sms_content = {
-                "phone_no": assigned_user.phone_no,
-                "message": f"Task {task.name} assigned to you. Link: {project_link}",
-            }
-            await publish_notification(sms_content)
+            enqueue_sms(
+                db,
+                assigned_user.phone_no,
+                f"Task {task.name} assigned to you. Link: {project_link}",
+            )
+        db.commit()
 
 
 async def create_task(db: Session, task: CreateTask, tenant_id: int, keywords: str, user_id: int):
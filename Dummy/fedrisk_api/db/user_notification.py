@@ -1,7 +1,11 @@
 import logging
+from datetime import date, timedelta
 
+from sqlalchemy import case, exists, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
+from fedrisk_api.db.enums import NotificationChannel, UpcomingEventDeadline
 from fedrisk_api.db.models import (
     Approval,
     ApprovalStakeholder,
@@ -12,15 +16,16 @@ from fedrisk_api.db.models import (
     Task,
     User,
     EmailNotifications,
+    ScheduledReminder,
     SMSNotifications,
 )
+from fedrisk_api.db.notification_outbox import enqueue_email, enqueue_sms
 from fedrisk_api.schema.user_notification import (
     CreateUserNotification,
     CreateUserNotificationSettings,
     UpdateUserNotificationSettings,
 )
-
-from datetime import date, timedelta
+from fedrisk_api.utils.email_util import assigned_email_body
 
 # from fedrisk_api.utils.utils import filter_by_tenant
 
@@ -86,355 +91,227 @@ def get_user_notification_settings_by_user_id(db: Session, user_id: int):
     return queryset
 
 
-# Returns all scheduled emails
-def get_scheduled_emails(db: Session):
-    today = date.today()
-    emails = []
-    users = db.query(UserNotificationSettings).all()
-    for user in users:
-        days_prior = 0
-        if user.upcoming_event_deadline == "one_day_prior":
-            days_prior = 1
-        if user.upcoming_event_deadline == "three_days_prior":
-            days_prior = 3
-        if user.upcoming_event_deadline == "seven_days_prior":
-            days_prior = 7
-        if user.upcoming_event_deadline == "fifteen_days_prior":
-            days_prior = 15
-        if user.upcoming_event_deadline == "thirty_days_prior":
-            days_prior = 30
-        if user.upcoming_event_deadline == "sixty_days_prior":
-            days_prior = 60
-        if user.upcoming_event_deadline == "ninety_days_prior":
-            days_prior = 90
-        audit_tests = db.query(AuditTest).filter(AuditTest.tester_id == user.user_id).all()
-        for audit in audit_tests:
-            if audit.end_date - timedelta(days=days_prior) == today:
-                user_email = db.query(User).filter(User.id == user.user_id).first()
-                message = (
-                    f"An audit test {audit.name} you are assigned to is due in {days_prior} days"
-                )
-                # check if email has already been sent
-                email_sent = (
-                    db.query(EmailNotifications)
-                    .filter(EmailNotifications.user_id == user.user_id)
-                    .filter(EmailNotifications.message == message)
-                )
-                if not email_sent.first():
-                    # add an email
-                    email = {
-                        "email": user_email.email,
-                        "message": message,
-                    }
-                    emails.append(email)
-                    email_notification = {
-                        "user_id": user.user_id,
-                        "email": user_email.email,
-                        "message": message,
-                    }
-                    new_notification = EmailNotifications(**email_notification)
-                    db.add(new_notification)
-                    db.commit()
-        tasks = db.query(Task).filter(Task.assigned_to == user.user_id).all()
-        for task in tasks:
-            if task.due_date - timedelta(days=days_prior) == today:
-                user_email = db.query(User).filter(User.id == user.user_id).first()
-                message = f"A task {task.name} you are assigned to is due in {days_prior} days"
-                # check if email has already been sent
-                email_sent = (
-                    db.query(EmailNotifications)
-                    .filter(EmailNotifications.user_id == user.user_id)
-                    .filter(EmailNotifications.message == message)
-                )
-                if not email_sent.first():
-                    # add an email
-                    email = {
-                        "email": user_email.email,
-                        "message": message,
-                    }
-                    emails.append(email)
-                    email_notification = {
-                        "user_id": user.user_id,
-                        "email": user_email.email,
-                        "message": message,
-                    }
-                    new_notification = EmailNotifications(**email_notification)
-                    db.add(new_notification)
-                    db.commit()
-                tasks = db.query(Task).filter(Task.assigned_to == user.user_id).all()
-        approval_workflows = (
-            db.query(ApprovalWorkflow).filter(ApprovalWorkflow.owner_id == user.user_id).all()
-        )
-        for apwf in approval_workflows:
-            if apwf.due_date - timedelta(days=days_prior) == today:
-                user_email = db.query(User).filter(User.id == user.user_id).first()
-                message = f"An approval workflow {apwf.name} you own is due in {days_prior} days"
-                # check if email has already been sent
-                email_sent = (
-                    db.query(EmailNotifications)
-                    .filter(EmailNotifications.user_id == user.user_id)
-                    .filter(EmailNotifications.message == message)
-                )
-                if not email_sent.first():
-                    # add an email
-                    email = {
-                        "email": user_email.email,
-                        "message": message,
-                    }
-                    emails.append(email)
-                    email_notification = {
-                        "user_id": user.user_id,
-                        "email": user_email.email,
-                        "message": message,
-                    }
-                    new_notification = EmailNotifications(**email_notification)
-                    db.add(new_notification)
-                    db.commit()
-        approvals = (
-            db.query(ApprovalWorkflow)
-            .join(Approval, Approval.approval_workflow_id == ApprovalWorkflow.id)
-            .filter(Approval.user_id == user.user_id)
-            .all()
-        )
-        for ap in approvals:
-            if ap.due_date - timedelta(days=days_prior) == today:
-                user_email = db.query(User).filter(User.id == user.user_id).first()
-                message = f"An approval workflow {ap.name} you own is due in {days_prior} days"
-                # check if email has already been sent
-                email_sent = (
-                    db.query(EmailNotifications)
-                    .filter(EmailNotifications.user_id == user.user_id)
-                    .filter(EmailNotifications.message == message)
-                )
-                if not email_sent.first():
-                    # add an email
-                    email = {
-                        "email": user_email.email,
-                        "message": message,
-                    }
-                    emails.append(email)
-                    email_notification = {
-                        "user_id": user.user_id,
-                        "email": user_email.email,
-                        "message": message,
-                    }
-                    new_notification = EmailNotifications(**email_notification)
-                    db.add(new_notification)
-                    db.commit()
-        stakeholders = (
-            db.query(ApprovalWorkflow)
-            .join(
-                ApprovalStakeholder, ApprovalStakeholder.approval_workflow_id == ApprovalWorkflow.id
-            )
-            .filter(ApprovalStakeholder.user_id == user.user_id)
-            .all()
+# days before an item's due date at which each upcoming_event_deadline setting is reminded;
+# users without a setting are reminded on the due date
+REMINDER_DAYS_PRIOR = {
+    UpcomingEventDeadline.one_day_prior: 1,
+    UpcomingEventDeadline.three_days_prior: 3,
+    UpcomingEventDeadline.five_days_prior: 5,
+    UpcomingEventDeadline.seven_days_prior: 7,
+    UpcomingEventDeadline.fifteen_days_prior: 15,
+    UpcomingEventDeadline.thirty_days_prior: 30,
+    UpcomingEventDeadline.sixty_days_prior: 60,
+    UpcomingEventDeadline.ninety_days_prior: 90,
+}
+REMINDER_BATCH_SIZE = 1000
+REMINDER_EMAIL_SUBJECT = "Upcoming due date"
+
+# (object type, user column, item model, due date column, join to the item, message per
+# channel); an item is reminded once per user and offset, through the first matching role
+REMINDER_SOURCES = [
+    (
+        "audit_tests",
+        AuditTest.tester_id,
+        AuditTest,
+        AuditTest.end_date,
+        None,
+        {
+            NotificationChannel.email: (
+                "An audit test {name} you are assigned to is due in {days} days"
+            ),
+            NotificationChannel.sms: (
+                "An audit test {name} you are assigned to is due in {days} days"
+            ),
+        },
+    ),
+    (
+        "tasks",
+        Task.assigned_to,
+        Task,
+        Task.due_date,
+        None,
+        {
+            NotificationChannel.email: "A task {name} you are assigned to is due in {days} days",
+            NotificationChannel.sms: "A task {name} you are assigned to is due in {days} days",
+        },
+    ),
+    (
+        "approval_workflows",
+        ApprovalWorkflow.owner_id,
+        ApprovalWorkflow,
+        ApprovalWorkflow.due_date,
+        None,
+        {
+            NotificationChannel.email: "An approval workflow {name} you own is due in {days} days",
+            NotificationChannel.sms: "An approval workflow {name} you own is due in {days} days",
+        },
+    ),
+    (
+        "approval_workflows",
+        Approval.user_id,
+        ApprovalWorkflow,
+        ApprovalWorkflow.due_date,
+        (Approval, Approval.approval_workflow_id == ApprovalWorkflow.id),
+        {
+            NotificationChannel.email: "An approval workflow {name} you own is due in {days} days",
+            NotificationChannel.sms: (
+                "An approval workflow {name} you are an approver on is due in {days} days"
+            ),
+        },
+    ),
+    (
+        "approval_workflows",
+        ApprovalStakeholder.user_id,
+        ApprovalWorkflow,
+        ApprovalWorkflow.due_date,
+        (ApprovalStakeholder, ApprovalStakeholder.approval_workflow_id == ApprovalWorkflow.id),
+        {
+            NotificationChannel.email: "An approval workflow {name} you own is due in {days} days",
+            NotificationChannel.sms: (
+                "An approval workflow {name} you are a stakeholder on is due in {days} days"
+            ),
+        },
+    ),
+]
+
+
+def _insert_ignoring_duplicates(db: Session, model, rows):
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        statement = postgresql.insert(model).on_conflict_do_nothing()
+    elif dialect_name == "sqlite":
+        statement = sqlite.insert(model).on_conflict_do_nothing()
+    else:
+        statement = insert(model)
+    for start in range(0, len(rows), REMINDER_BATCH_SIZE):
+        db.execute(statement, rows[start : start + REMINDER_BATCH_SIZE])
+
+
+def _due_reminder_query(channel: NotificationChannel, on_date: date, source):
+    """Users and items of one source due for a reminder on on_date and not reminded yet"""
+    object_type, user_column, model, due_column, join, _ = source
+    deadline = UserNotificationSettings.upcoming_event_deadline
+    days_prior = case(
+        {setting: days for setting, days in REMINDER_DAYS_PRIOR.items()},
+        value=deadline,
+        else_=0,
+    )
+    # the due date each user's offset reminds on, compared against the item in SQL
+    reminded_due_date = case(
+        {
+            setting: on_date + timedelta(days=days)
+            for setting, days in REMINDER_DAYS_PRIOR.items()
+        },
+        value=deadline,
+        else_=on_date,
+    )
+    recipient = User.email if channel == NotificationChannel.email else User.phone_no
+    query = select(user_column, recipient, model.id, model.name, days_prior).select_from(model)
+    if join is not None:
+        query = query.join(*join)
+    return (
+        query.join(UserNotificationSettings, UserNotificationSettings.user_id == user_column)
+        .join(User, User.id == user_column)
+        .where(
+            due_column.in_(
+                {on_date + timedelta(days=days) for days in REMINDER_DAYS_PRIOR.values()}
+                | {on_date}
+            ),
+            due_column == reminded_due_date,
+            recipient.isnot(None),
+            ~exists().where(
+                ScheduledReminder.user_id == user_column,
+                ScheduledReminder.channel == channel,
+                ScheduledReminder.object_type == object_type,
+                ScheduledReminder.object_id == model.id,
+                ScheduledReminder.days_prior == days_prior,
+            ),
         )
-        for apst in stakeholders:
-            if apst.due_date - timedelta(days=days_prior) == today:
-                user_email = db.query(User).filter(User.id == user.user_id).first()
-                message = f"An approval workflow {apst.name} you own is due in {days_prior} days"
-                # check if email has already been sent
-                email_sent = (
-                    db.query(EmailNotifications)
-                    .filter(EmailNotifications.user_id == user.user_id)
-                    .filter(EmailNotifications.message == message)
-                )
-                if not email_sent.first():
-                    # add an email
-                    email = {
-                        "email": user_email.email,
-                        "message": message,
-                    }
-                    emails.append(email)
-                    email_notification = {
-                        "user_id": user.user_id,
-                        "email": user_email.email,
-                        "message": message,
-                    }
-                    new_notification = EmailNotifications(**email_notification)
-                    db.add(new_notification)
-                    db.commit()
-    return emails
+        .order_by(user_column, model.id)
+    )
+
+
+def schedule_due_reminders(
+    db: Session, channel: NotificationChannel, on_date: date = None, do_commit: bool = True
+):
+    """Records and returns the reminders due on on_date (default today) for one channel.
+
+    Returns [(user id, recipient, message)]; each item is reminded once per user and offset.
+    """
+    on_date = on_date or date.today()
+    reminders = []
+    reminded = set()
+    for source in REMINDER_SOURCES:
+        object_type, messages = source[0], source[-1]
+        for user_id, recipient, object_id, name, days_prior in db.execute(
+            _due_reminder_query(channel, on_date, source)
+        ):
+            key = (user_id, object_type, object_id, days_prior)
+            if key in reminded:
+                continue
+            reminded.add(key)
+            message = messages[channel].format(name=name, days=days_prior)
+            reminders.append((user_id, recipient, message, object_type, object_id, days_prior))
+
+    _insert_ignoring_duplicates(
+        db,
+        ScheduledReminder,
+        [
+            {
+                "user_id": user_id,
+                "channel": channel,
+                "object_type": object_type,
+                "object_id": object_id,
+                "days_prior": days_prior,
+            }
+            for user_id, _, _, object_type, object_id, days_prior in reminders
+        ],
+    )
+    # sent reminders are also kept in the email and sms notification logs
+    if channel == NotificationChannel.email:
+        log_model, recipient_field = EmailNotifications, "email"
+    else:
+        log_model, recipient_field = SMSNotifications, "phone_no"
+    _insert_ignoring_duplicates(
+        db,
+        log_model,
+        [
+            {"user_id": user_id, recipient_field: recipient, "message": message}
+            for user_id, recipient, message, *_ in reminders
+        ],
+    )
+    if do_commit:
+        db.commit()
+    LOGGER.info(f"Scheduled {len(reminders)} {channel.value} reminders for {on_date}")
+    return [(user_id, recipient, message) for user_id, recipient, message, *_ in reminders]
+
+
+# Returns all scheduled emails
+def get_scheduled_emails(db: Session, on_date: date = None):
+    return [
+        {"email": email, "message": message}
+        for _, email, message in schedule_due_reminders(db, NotificationChannel.email, on_date)
+    ]
 
 
 # Returns all scheduled sms
-def get_scheduled_sms(db: Session):
-    today = date.today()
-    sms = []
-    users = db.query(UserNotificationSettings).all()
-    for user in users:
-        days_prior = 0
-        if user.upcoming_event_deadline == "one_day_prior":
-            days_prior = 1
-        if user.upcoming_event_deadline == "three_days_prior":
-            days_prior = 3
-        if user.upcoming_event_deadline == "seven_days_prior":
-            days_prior = 7
-        if user.upcoming_event_deadline == "fifteen_days_prior":
-            days_prior = 15
-        if user.upcoming_event_deadline == "thirty_days_prior":
-            days_prior = 30
-        if user.upcoming_event_deadline == "sixty_days_prior":
-            days_prior = 60
-        if user.upcoming_event_deadline == "ninety_days_prior":
-            days_prior = 90
-        audit_tests = db.query(AuditTest).filter(AuditTest.tester_id == user.user_id).all()
-        for audit in audit_tests:
-            LOGGER.info(f"days prior = {days_prior}")
-            if audit.end_date - timedelta(days=days_prior) == today:
-                LOGGER.info(
-                    f"An audit test {audit.name} you are assigned to is due in {days_prior} days"
-                )
-                user_phone = db.query(User).filter(User.id == user.user_id).first()
-                message = (
-                    f"An audit test {audit.name} you are assigned to is due in {days_prior} days"
-                )
-                # check if email has already been sent
-                sms_sent = (
-                    db.query(SMSNotifications)
-                    .filter(SMSNotifications.user_id == user.user_id)
-                    .filter(SMSNotifications.message == message)
-                )
-                if not sms_sent.first():
-                    # add an email
-                    sms_msg = {
-                        "phone_no": user_phone.phone_no,
-                        "message": message,
-                    }
-                    sms.append(sms_msg)
-                    sms_notification = {
-                        "user_id": user.user_id,
-                        "phone_no": user_phone.phone_no,
-                        "message": message,
-                    }
-                    new_notification = SMSNotifications(**sms_notification)
-                    db.add(new_notification)
-                    db.commit()
-        tasks = db.query(Task).filter(Task.assigned_to == user.user_id).all()
-        for task in tasks:
-            if task.due_date - timedelta(days=days_prior) == today:
-                LOGGER.info(f"A task {task.name} you are assigned to is due in {days_prior} days")
-                user_phone = db.query(User).filter(User.id == user.user_id).first()
-                message = f"A task {task.name} you are assigned to is due in {days_prior} days"
-                # check if email has already been sent
-                sms_sent = (
-                    db.query(SMSNotifications)
-                    .filter(SMSNotifications.user_id == user.user_id)
-                    .filter(SMSNotifications.message == message)
-                )
-                if not sms_sent.first():
-                    # add an email
-                    sms_msg = {
-                        "phone_no": user_phone.phone_no,
-                        "message": message,
-                    }
-                    sms.append(sms_msg)
-                    sms_notification = {
-                        "user_id": user.user_id,
-                        "phone_no": user_phone.phone_no,
-                        "message": message,
-                    }
-                    new_notification = SMSNotifications(**sms_notification)
-                    db.add(new_notification)
-                    db.commit()
-        apwfs = db.query(ApprovalWorkflow).filter(ApprovalWorkflow.owner_id == user.user_id).all()
-        for apwf in apwfs:
-            if apwf.due_date - timedelta(days=days_prior) == today:
-                LOGGER.info(f"An approval workflow {apwf.name} you own is due in {days_prior} days")
-                user_phone = db.query(User).filter(User.id == user.user_id).first()
-                message = f"An approval workflow {apwf.name} you own is due in {days_prior} days"
-                # check if email has already been sent
-                sms_sent = (
-                    db.query(SMSNotifications)
-                    .filter(SMSNotifications.user_id == user.user_id)
-                    .filter(SMSNotifications.message == message)
-                )
-                if not sms_sent.first():
-                    # add an email
-                    sms_msg = {
-                        "phone_no": user_phone.phone_no,
-                        "message": message,
-                    }
-                    sms.append(sms_msg)
-                    sms_notification = {
-                        "user_id": user.user_id,
-                        "phone_no": user_phone.phone_no,
-                        "message": message,
-                    }
-                    new_notification = SMSNotifications(**sms_notification)
-                    db.add(new_notification)
-                    db.commit()
-        approvals = (
-            db.query(ApprovalWorkflow)
-            .join(Approval, ApprovalWorkflow.id == Approval.approval_workflow_id)
-            .filter(Approval.user_id == user.user_id)
-            .all()
-        )
-        for ap in approvals:
-            if ap.due_date - timedelta(days=days_prior) == today:
-                LOGGER.info(
-                    f"An approval workflow {ap.name} you are an approver on is due in {days_prior} days"
-                )
-                user_phone = db.query(User).filter(User.id == user.user_id).first()
-                message = f"An approval workflow {ap.name} you are an approver on is due in {days_prior} days"
-                # check if email has already been sent
-                sms_sent = (
-                    db.query(SMSNotifications)
-                    .filter(SMSNotifications.user_id == user.user_id)
-                    .filter(SMSNotifications.message == message)
-                )
-                if not sms_sent.first():
-                    # add an email
-                    sms_msg = {
-                        "phone_no": user_phone.phone_no,
-                        "message": message,
-                    }
-                    sms.append(sms_msg)
-                    sms_notification = {
-                        "user_id": user.user_id,
-                        "phone_no": user_phone.phone_no,
-                        "message": message,
-                    }
-                    new_notification = SMSNotifications(**sms_notification)
-                    db.add(new_notification)
-                    db.commit()
-        stakeholders = (
-            db.query(ApprovalWorkflow)
-            .join(
-                ApprovalStakeholder, ApprovalWorkflow.id == ApprovalStakeholder.approval_workflow_id
-            )
-            .filter(ApprovalStakeholder.user_id == user.user_id)
-            .all()
-        )
-        for ap in stakeholders:
-            if ap.due_date - timedelta(days=days_prior) == today:
-                LOGGER.info(
-                    f"An approval workflow {ap.name} you are a stakeholder on is due in {days_prior} days"
-                )
-                user_phone = db.query(User).filter(User.id == user.user_id).first()
-                message = f"An approval workflow {ap.name} you are a stakeholder on is due in {days_prior} days"
-                # check if email has already been sent
-                sms_sent = (
-                    db.query(SMSNotifications)
-                    .filter(SMSNotifications.user_id == user.user_id)
-                    .filter(SMSNotifications.message == message)
-                )
-                if not sms_sent.first():
-                    # add an email
-                    sms_msg = {
-                        "phone_no": user_phone.phone_no,
-                        "message": message,
-                    }
-                    sms.append(sms_msg)
-                    sms_notification = {
-                        "user_id": user.user_id,
-                        "phone_no": user_phone.phone_no,
-                        "message": message,
-                    }
-                    new_notification = SMSNotifications(**sms_notification)
-                    db.add(new_notification)
-                    db.commit()
-    return sms
+def get_scheduled_sms(db: Session, on_date: date = None):
+    return [
+        {"phone_no": phone_no, "message": message}
+        for _, phone_no, message in schedule_due_reminders(db, NotificationChannel.sms, on_date)
+    ]
+
+
+# Queues the reminders due today in the notification outbox, in the transaction recording them
+def queue_due_reminders(db: Session, on_date: date = None):
+    emails = schedule_due_reminders(db, NotificationChannel.email, on_date, do_commit=False)
+    for _, email, message in emails:
+        enqueue_email(db, email, REMINDER_EMAIL_SUBJECT, assigned_email_body(message))
+    sms = schedule_due_reminders(db, NotificationChannel.sms, on_date, do_commit=False)
+    for _, phone_no, message in sms:
+        enqueue_sms(db, phone_no, message)
+    db.commit()
+    return {"emails": len(emails), "sms": len(sms)}
 
 
 # Posts all scheduled notifications
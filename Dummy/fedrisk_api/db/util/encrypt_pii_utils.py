@@ -1,13 +1,78 @@
+import base64
 import boto3
 import binascii
-from fedrisk_api.db.models import User  # update import to your actual User model path
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from fedrisk_api.db.models import TenantDataKey, User
 from sqlalchemy.orm.session import Session as SessionLocal
 import os
 
+LOGGER = logging.getLogger(__name__)
+
 # AWS KMS setup
 kms_client = boto3.client("kms")
 KMS_KEY_ID = os.getenv("AWS_KMS_KEY_ID")  # Replace with your actual AWS KMS Key ID
 
+# ENC:: values are encrypted directly with KMS (one round trip per value).
+# ENC2:: values are envelope encrypted: ENC2::<kms wrapped data key>::<nonce + AES-GCM ciphertext>
+# so only the tenant's data key has to go through KMS, and only once per cache lifetime.
+ENC_PREFIX = "ENC::"
+ENC2_PREFIX = "ENC2::"
+ENC2_SEPARATOR = "::"
+AES_GCM_NONCE_SIZE = 12
+
+DATA_KEY_CACHE_MAX_SIZE = int(os.getenv("PII_DATA_KEY_CACHE_MAX_SIZE", "256"))
+DATA_KEY_CACHE_TTL_SECONDS = int(os.getenv("PII_DATA_KEY_CACHE_TTL_SECONDS", "900"))
+PII_DECRYPT_MAX_WORKERS = int(os.getenv("PII_DECRYPT_MAX_WORKERS", "8"))
+PII_FIELDS = ("first_name", "last_name", "phone_no")
+
+# ciphertext -> plaintext for the current request, see pii_decryption_memo
+request_pii_memo: ContextVar = ContextVar("request_pii_memo", default=None)
+
+
+class DataKeyCache:
+    """Bounded, thread-safe TTL cache of plaintext data keys keyed by their wrapped blob"""
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, wrapped_key: bytes):
+        with self._lock:
+            entry = self._entries.get(wrapped_key)
+            if entry is None:
+                return None
+            plaintext_key, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[wrapped_key]
+                return None
+            self._entries.move_to_end(wrapped_key)
+            return plaintext_key
+
+    def set(self, wrapped_key: bytes, plaintext_key: bytes):
+        with self._lock:
+            self._entries[wrapped_key] = (plaintext_key, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(wrapped_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+data_key_cache = DataKeyCache(DATA_KEY_CACHE_MAX_SIZE, DATA_KEY_CACHE_TTL_SECONDS)
+
 
 def encrypt_value(value: str) -> str:
     if not value:
@@ -31,16 +96,142 @@ def decrypt_value(encrypted_hex: str) -> str:
         return encrypted_hex
 
 
+def unwrap_data_key(wrapped_key: bytes) -> bytes:
+    plaintext_key = data_key_cache.get(wrapped_key)
+    if plaintext_key is None:
+        plaintext_key = kms_client.decrypt(CiphertextBlob=wrapped_key)["Plaintext"]
+        data_key_cache.set(wrapped_key, plaintext_key)
+    return plaintext_key
+
+
+def get_or_create_tenant_data_key(db: SessionLocal, tenant_id: int) -> bytes:
+    """Return the tenant's KMS-wrapped data key, generating one on first use"""
+    tenant_data_key = db.query(TenantDataKey).filter(TenantDataKey.tenant_id == tenant_id).first()
+    if tenant_data_key:
+        return bytes.fromhex(tenant_data_key.encrypted_data_key)
+
+    response = kms_client.generate_data_key(KeyId=KMS_KEY_ID, KeySpec="AES_256")
+    db.add(
+        TenantDataKey(tenant_id=tenant_id, encrypted_data_key=response["CiphertextBlob"].hex())
+    )
+    db.flush()
+    data_key_cache.set(response["CiphertextBlob"], response["Plaintext"])
+    return response["CiphertextBlob"]
+
+
+def envelope_encrypt_value(value: str, wrapped_key: bytes) -> str:
+    if not value:
+        return value
+    nonce = os.urandom(AES_GCM_NONCE_SIZE)
+    ciphertext = AESGCM(unwrap_data_key(wrapped_key)).encrypt(nonce, value.encode("utf-8"), None)
+    encoded_key = base64.urlsafe_b64encode(wrapped_key).decode("ascii")
+    encoded_payload = base64.urlsafe_b64encode(nonce + ciphertext).decode("ascii")
+    return f"{ENC2_PREFIX}{encoded_key}{ENC2_SEPARATOR}{encoded_payload}"
+
+
+def envelope_decrypt_value(value: str) -> str:
+    try:
+        encoded_key, encoded_payload = value[len(ENC2_PREFIX) :].split(ENC2_SEPARATOR, 1)
+        wrapped_key = base64.urlsafe_b64decode(encoded_key)
+        payload = base64.urlsafe_b64decode(encoded_payload)
+        nonce, ciphertext = payload[:AES_GCM_NONCE_SIZE], payload[AES_GCM_NONCE_SIZE:]
+        plaintext = AESGCM(unwrap_data_key(wrapped_key)).decrypt(nonce, ciphertext, None)
+        return plaintext.decode("utf-8")
+    except (
+        ValueError,
+        binascii.Error,
+        InvalidTag,
+        kms_client.exceptions.InvalidCiphertextException,
+    ) as e:
+        LOGGER.warning(f"Error decrypting envelope value: {e}")
+        return value
+
+
+def is_encrypted(value) -> bool:
+    return isinstance(value, str) and (
+        value.startswith(ENC2_PREFIX) or value.startswith(ENC_PREFIX)
+    )
+
+
+def _decrypt_pii_uncached(value):
+    if value.startswith(ENC2_PREFIX):
+        return envelope_decrypt_value(value)
+    return decrypt_value(value[len(ENC_PREFIX) :])
+
+
+def decrypt_pii(value):
+    """Decrypt a stored PII value in either the ENC2:: or legacy ENC:: format"""
+    if not is_encrypted(value):
+        return value
+    memo = request_pii_memo.get()
+    if memo is not None and value in memo:
+        return memo[value]
+    plaintext = _decrypt_pii_uncached(value)
+    if memo is not None:
+        memo[value] = plaintext
+    return plaintext
+
+
+async def pii_decryption_memo():
+    """FastAPI dependency memoizing decrypted PII values for the rest of the request"""
+    request_pii_memo.set({})
+
+
+def _warm_data_keys(values):
+    # unwrap each distinct data key once up front so the workers don't all miss the cache
+    wrapped_keys = {
+        base64.urlsafe_b64decode(value[len(ENC2_PREFIX) :].split(ENC2_SEPARATOR, 1)[0])
+        for value in values
+        if value.startswith(ENC2_PREFIX) and ENC2_SEPARATOR in value[len(ENC2_PREFIX) :]
+    }
+    for wrapped_key in wrapped_keys:
+        try:
+            unwrap_data_key(wrapped_key)
+        except Exception as e:
+            LOGGER.warning(f"Error unwrapping data key: {e}")
+
+
+def decrypt_pii_values(values):
+    """Decrypt the distinct encrypted values in ``values`` concurrently.
+
+    Returns a ciphertext -> plaintext lookup; plain values map to themselves.
+    Results are shared with the request memo when one is active.
+    """
+    memo = request_pii_memo.get()
+    if memo is None:
+        memo = {}
+    pending = list({value for value in values if is_encrypted(value) and value not in memo})
+    if len(pending) == 1:
+        memo[pending[0]] = _decrypt_pii_uncached(pending[0])
+    elif pending:
+        _warm_data_keys(pending)
+        max_workers = min(PII_DECRYPT_MAX_WORKERS, len(pending))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for value, plaintext in zip(pending, executor.map(_decrypt_pii_uncached, pending)):
+                memo[value] = plaintext
+    return {value: memo.get(value, value) for value in values if value is not None}
+
+
+def encrypt_pii(db: SessionLocal, tenant_id: int, value: str) -> str:
+    if not value or is_encrypted(value):
+        return value
+    return envelope_encrypt_value(value, get_or_create_tenant_data_key(db, tenant_id))
+
+
+def _encrypt_user_fields(db: SessionLocal, user):
+    for field in PII_FIELDS:
+        setattr(user, field, encrypt_pii(db, user.tenant_id, getattr(user, field)))
+
+
+def _decrypt_user_fields_in_place(user):
+    for field in PII_FIELDS:
+        setattr(user, field, decrypt_pii(getattr(user, field)))
+
+
 def encrypt_user_data(db: SessionLocal):
     users = db.query(User).all()
     for user in users:
-
-        if user.first_name and not user.first_name.startswith("ENC::"):
-            user.first_name = f"ENC::{encrypt_value(user.first_name)}"
-        if user.last_name and not user.last_name.startswith("ENC::"):
-            user.last_name = f"ENC::{encrypt_value(user.last_name)}"
-        if user.phone_no and not user.phone_no.startswith("ENC::"):
-            user.phone_no = f"ENC::{encrypt_value(user.phone_no)}"
+        _encrypt_user_fields(db, user)
         # Add more fields as needed...
 
     db.commit()
@@ -50,35 +241,51 @@ def encrypt_user_data(db: SessionLocal):
 def decrypt_user_data(db: SessionLocal):
     users = db.query(User).all()
     for user in users:
-
-        if user.first_name and user.first_name.startswith("ENC::"):
-            encrypted_part = user.first_name[5:]
-            user.first_name = decrypt_value(encrypted_part)
-
-        if user.last_name and user.last_name.startswith("ENC::"):
-            encrypted_part = user.last_name[5:]
-            user.last_name = decrypt_value(encrypted_part)
-
-        if user.phone_no and user.phone_no.startswith("ENC::"):
-            encrypted_part = user.phone_no[5:]
-            user.phone_no = decrypt_value(encrypted_part)
+        _decrypt_user_fields_in_place(user)
 
     db.commit()
     print("User data decrypted and saved.")
 
 
+def migrate_user_data_to_envelope(db: SessionLocal, batch_size: int = 500):
+    """Re-encrypt legacy ENC:: user fields into the ENC2:: envelope format in batches"""
+    legacy_filter = (
+        User.first_name.startswith(ENC_PREFIX)
+        | User.last_name.startswith(ENC_PREFIX)
+        | User.phone_no.startswith(ENC_PREFIX)
+    )
+    migrated = 0
+    last_id = 0
+    while True:
+        users = (
+            db.query(User)
+            .filter(User.id > last_id)
+            .filter(legacy_filter)
+            .order_by(User.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not users:
+            break
+        for user in users:
+            for field in PII_FIELDS:
+                value = getattr(user, field)
+                if value and value.startswith(ENC_PREFIX):
+                    setattr(user, field, encrypt_pii(db, user.tenant_id, decrypt_pii(value)))
+            migrated += 1
+        last_id = users[-1].id
+        db.commit()
+        print(f"Migrated {migrated} users to envelope encryption.")
+    return migrated
+
+
 def encrypt_user_by_id(db: SessionLocal, user_id: int):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         print(f"User with ID {user_id} not found.")
         return
 
-    if user.first_name and not user.first_name.startswith("ENC::"):
-        user.first_name = f"ENC::{encrypt_value(user.first_name)}"
-    if user.last_name and not user.last_name.startswith("ENC::"):
-        user.last_name = f"ENC::{encrypt_value(user.last_name)}"
-    if user.phone_no and not user.phone_no.startswith("ENC::"):
-        user.phone_no = f"ENC::{encrypt_value(user.phone_no)}"
+    _encrypt_user_fields(db, user)
 
     db.commit()
     print(f"User {user_id} encrypted.")
@@ -90,15 +297,7 @@ def decrypt_user_by_id(db: SessionLocal, user_id: int):
         print(f"User with ID {user_id} not found.")
         return
 
-    if user.first_name and user.first_name.startswith("ENC::"):
-        encrypted_part = user.first_name[5:]
-        user.first_name = decrypt_value(encrypted_part)
-    if user.last_name and user.last_name.startswith("ENC::"):
-        encrypted_part = user.last_name[5:]
-        user.last_name = decrypt_value(encrypted_part)
-    if user.phone_no and user.phone_no.startswith("ENC::"):
-        encrypted_part = user.phone_no[5:]
-        user.phone_no = decrypt_value(encrypted_part)
+    _decrypt_user_fields_in_place(user)
 
     db.commit()
     print(f"User {user_id} decrypted.")
@@ -113,21 +312,9 @@ def get_decrypted_user_display_by_id(db: SessionLocal, user_id: int):
     decrypted_user = {
         "id": user.id,
         "email": user.email,
-        "first_name": (
-            decrypt_value(user.first_name[5:])
-            if user.first_name and user.first_name.startswith("ENC::")
-            else user.first_name
-        ),
-        "last_name": (
-            decrypt_value(user.last_name[5:])
-            if user.last_name and user.last_name.startswith("ENC::")
-            else user.last_name
-        ),
-        "phone_no": (
-            decrypt_value(user.phone_no[5:])
-            if user.phone_no and user.phone_no.startswith("ENC::")
-            else user.phone_no
-        ),
+        "first_name": decrypt_pii(user.first_name),
+        "last_name": decrypt_pii(user.last_name),
+        "phone_no": decrypt_pii(user.phone_no),
     }
 
     print(decrypted_user)
@@ -135,19 +322,13 @@ def get_decrypted_user_display_by_id(db: SessionLocal, user_id: int):
     return decrypted_user
 
 
-def decrypt_user_fields(user_obj):
-    if not user_obj:
-        return None
-
-    def maybe_decrypt(value):
-        return decrypt_value(value[5:]) if value and value.startswith("ENC::") else value
-
+def _decrypted_user_dict(user_obj, decrypted):
     return {
         "id": user_obj.id,
         "email": user_obj.email,
-        "first_name": maybe_decrypt(user_obj.first_name),
-        "last_name": maybe_decrypt(user_obj.last_name),
-        "phone_no": maybe_decrypt(user_obj.phone_no),
+        "first_name": decrypted.get(user_obj.first_name, user_obj.first_name),
+        "last_name": decrypted.get(user_obj.last_name, user_obj.last_name),
+        "phone_no": decrypted.get(user_obj.phone_no, user_obj.phone_no),
         "tenant_id": user_obj.tenant_id,
         "is_superuser": user_obj.is_superuser,
         "is_tenant_admin": user_obj.is_tenant_admin,
@@ -158,3 +339,31 @@ def decrypt_user_fields(user_obj):
         "s3_bucket": user_obj.s3_bucket,
         "profile_picture": user_obj.profile_picture,
     }
+
+
+def decrypt_user_fields(user_obj):
+    if not user_obj:
+        return None
+
+    decrypted = {
+        value: decrypt_pii(value)
+        for value in (user_obj.first_name, user_obj.last_name, user_obj.phone_no)
+        if value is not None
+    }
+    return _decrypted_user_dict(user_obj, decrypted)
+
+
+def decrypt_users_fields(users):
+    """Bulk version of decrypt_user_fields that decrypts a whole page concurrently"""
+    users = [user_obj for user_obj in users if user_obj]
+    decrypted = decrypt_pii_values(
+        [getattr(user_obj, field) for user_obj in users for field in PII_FIELDS]
+    )
+    return [_decrypted_user_dict(user_obj, decrypted) for user_obj in users]
+
+
+def prefetch_users_pii(users):
+    """Decrypt the PII of ``users`` concurrently into the active request memo"""
+    decrypt_pii_values(
+        [getattr(user_obj, field) for user_obj in users if user_obj for field in PII_FIELDS]
+    )
@@ -1,110 +1,131 @@
 import logging
-import pandas as pd
-from fedrisk_api.db import aws_control as db_aws_control
+from collections import defaultdict
+
 from fedrisk_api.db.database import get_db
 from fedrisk_api.db.models import (
     AWSControl,
+    AWSControlProjectControl,
     ProjectControl,
     Control,
-    FrameworkVersion,
-    Framework,
     ControlFrameworkVersion,
 )
 from fedrisk_api.schema import aws_control as schema_aws_control
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, insert, select
 
 LOGGER = logging.getLogger(__name__)
 
 
-async def load_aws_control_data_from_dataframe(my_data_frame, project_id):
-    db = next(get_db())
-    num_aws_controls = 0
-    num_aws_proj_cont_mappings = 0
-    related_requirements = []
-    try:
-        for row in my_data_frame.iterrows():
-            my_next_aws_control_aws_id = str(row[1]["ID"])
-            my_next_aws_control_from_db = (
-                db.query(AWSControl).filter(AWSControl.aws_id == my_next_aws_control_aws_id).first()
+def parse_related_requirements(related_requirements):
+    """Control names listed in a Security Hub "Related requirements" cell.
+
+    "NIST.800-53.r5 AC-2, NIST.800-53.r5 AC-2(1)" gives ["AC-2", "AC-2(1)"].
+    """
+    if not isinstance(related_requirements, str):
+        return []
+    control_names = []
+    for requirement in related_requirements.split(","):
+        words = requirement.split()
+        if words:
+            control_names.append(words[-1])
+    return control_names
+
+
+def control_requirement_name(control_name):
+    """The part of a control name that requirements refer to, e.g. "AC-2" for "AC-2: Account" """
+    words = (control_name or "").split()
+    return words[0].rstrip(":,") if words else ""
+
+
+def _insert_aws_controls(db, my_data_frame):
+    """Creates the AWS controls not yet in the database; returns {aws control id: requirements}"""
+    sheet = my_data_frame.assign(aws_id=my_data_frame["ID"].astype(str)).drop_duplicates("aws_id")
+    aws_ids = sheet["aws_id"].tolist()
+    existing_aws_ids = set(
+        db.execute(select(AWSControl.aws_id).where(AWSControl.aws_id.in_(aws_ids))).scalars()
+    )
+    new_rows = sheet[~sheet["aws_id"].isin(list(existing_aws_ids))]
+    if new_rows.empty:
+        return {}
+    db.execute(
+        insert(AWSControl),
+        [
+            schema_aws_control.CreateAWSControl(
+                aws_id=row["aws_id"],
+                aws_title=row["Title"],
+                aws_control_status=row["Control Status"],
+                aws_severity=row["Severity"],
+                aws_failed_checks=row["Failed checks"],
+                aws_unknown_checks=row["Unknown checks"],
+                aws_not_available_checks=row["Not available checks"],
+                aws_passed_checks=row["Passed checks"],
+                aws_related_requirements=row["Related requirements"],
+                aws_custom_parameters=row["Custom parameters"],
+            ).dict()
+            for row in new_rows.to_dict("records")
+        ],
+    )
+    requirements_by_aws_id = dict(zip(new_rows["aws_id"], new_rows["Related requirements"]))
+    return {
+        aws_control_id: requirements_by_aws_id[aws_id]
+        for aws_control_id, aws_id in db.execute(
+            select(AWSControl.id, AWSControl.aws_id).where(
+                AWSControl.aws_id.in_(list(requirements_by_aws_id))
             )
-            if not my_next_aws_control_from_db:
-                next_aws_control = schema_aws_control.CreateAWSControl(
-                    aws_id=my_next_aws_control_aws_id,
-                    aws_title=row[1]["Title"],
-                    aws_control_status=row[1]["Control Status"],
-                    aws_severity=row[1]["Severity"],
-                    aws_failed_checks=row[1]["Failed checks"],
-                    aws_unknown_checks=row[1]["Unknown checks"],
-                    aws_not_available_checks=row[1]["Not available checks"],
-                    aws_passed_checks=row[1]["Passed checks"],
-                    aws_related_requirements=row[1]["Related requirements"],
-                    aws_custom_parameters=row[1]["Custom parameters"],
-                )
-                response = db_aws_control.create_aws_control(next_aws_control, db)
-                db.commit()
-                related_requirements.append(
-                    {"id": response.id, "requirements": row[1]["Related requirements"]}
-                )
-                num_aws_controls += 1
-    except Exception as e:
-        LOGGER.exception("There was a problem processing this request")
-        return {"error": f"{e}"}
-    # create mapping to existing project controls
-    project_controls = (
-        db.query(ProjectControl, Control, FrameworkVersion, Framework)
+        )
+    }
+
+
+def _project_control_mappings(db, project_id, requirements_by_aws_control_id):
+    """(aws control id, project control id) pairs for controls named in the requirements"""
+    aws_control_ids_by_name = defaultdict(list)
+    for aws_control_id, related_requirements in requirements_by_aws_control_id.items():
+        for control_name in dict.fromkeys(parse_related_requirements(related_requirements)):
+            aws_control_ids_by_name[control_name].append(aws_control_id)
+
+    project_controls = db.execute(
+        select(ProjectControl.id, Control.name)
         .join(Control, ProjectControl.control_id == Control.id)
-        .join(ControlFrameworkVersion, ControlFrameworkVersion.control_id == Control.id)
-        .join(
-            FrameworkVersion,
-            FrameworkVersion.id == ControlFrameworkVersion.framework_version_id,
+        .where(ProjectControl.project_id == project_id)
+        # only controls that belong to a framework version, as before
+        .where(
+            exists().where(ControlFrameworkVersion.control_id == ProjectControl.control_id)
         )
-        .join(Framework, FrameworkVersion.framework_id == Framework.id)
-        .filter(ProjectControl.project_id == project_id)
-    ).all()
-    try:
-        for pc in project_controls:
-            pc_str = str(pc)
-            pc_split = pc_str.split(",")
-            pc_split_id = pc_split[0].split(":")
-            pc_split_control_name = pc_split[5].split(":")
-            control_name = str(pc_split_control_name[1])
-            trim_space_from_front = control_name.lstrip()
-            split_cn = trim_space_from_front.split(" ")
-            control_match = str(split_cn[0])
-            # match the control with the requirement
-            for rr in related_requirements:
-                if "," in rr:
-                    # iterate through each value
-                    rr_arr = str(rr["requirements"]).split(",")
-                    for r in rr_arr:
-                        split_r = r.split(" ")
-                        control_to_match = split_r[1].replace(",", "")
-                        if control_match == control_to_match:
-                            # enter a reference
-                            next_aws_proj_control = schema_aws_control.CreateAWSControlProjControl(
-                                aws_control_id=rr["id"],
-                                project_control_id=pc_split_id[1],
-                            )
-                            db_aws_control.create_aws_proj_control(next_aws_proj_control, db)
-                            num_aws_proj_cont_mappings += 1
-                else:
-                    req = str(rr["requirements"])
-                    if " " in req:
-                        split_r = req.split(" ")
-                        if split_r[1] is not None:
-                            control_to_match = split_r[1].replace(",", "")
-                        else:
-                            control_to_match = split_r[0].replace(",", "")
+    )
+    return [
+        (aws_control_id, project_control_id)
+        for project_control_id, control_name in project_controls
+        for aws_control_id in aws_control_ids_by_name.get(
+            control_requirement_name(control_name), ()
+        )
+    ]
 
-                        if control_match == control_to_match:
-                            # enter a reference
-                            next_aws_proj_control = schema_aws_control.CreateAWSControlProjControl(
-                                aws_control_id=rr["id"],
-                                project_control_id=pc_split_id[1],
-                            )
-                            db_aws_control.create_aws_proj_control(next_aws_proj_control, db)
-                            num_aws_proj_cont_mappings += 1
+
+async def load_aws_control_data_from_dataframe(my_data_frame, project_id, progress=None):
+    """Loads AWS Security Hub controls and maps them to the project's controls.
+
+    The requirements of the new AWS controls are indexed by control name once, so each
+    project control is matched with a dict lookup; controls and mappings are inserted in
+    bulk and committed together. progress(done, total) is called after each step.
+    """
+    db = next(get_db())
+    report_progress = progress or (lambda done, total: None)
+    try:
+        requirements_by_aws_control_id = _insert_aws_controls(db, my_data_frame)
+        report_progress(1, 3)
+        mappings = _project_control_mappings(db, project_id, requirements_by_aws_control_id)
+        report_progress(2, 3)
+        if mappings:
+            db.execute(
+                insert(AWSControlProjectControl),
+                [
+                    {"aws_control_id": aws_control_id, "project_control_id": project_control_id}
+                    for aws_control_id, project_control_id in mappings
+                ],
+            )
+        db.commit()
+        report_progress(3, 3)
     except Exception as e:
+        db.rollback()
         LOGGER.exception("There was a problem processing this request")
         return {"error": f"{e}"}
-    return [num_aws_controls, num_aws_proj_cont_mappings]
+    return [len(requirements_by_aws_control_id), len(mappings)]
@@ -1,4 +1,5 @@
 import logging
+import re
 import pandas as pd
 from fedrisk_api.db import control as db_control
 from fedrisk_api.db import framework as db_framework
@@ -7,18 +8,24 @@ from fedrisk_api.db.database import get_db
 from fedrisk_api.db.models import (
     Control,
     Framework,
+    FrameworkTenant,
     FrameworkVersion,
     ControlFrameworkVersion,
+    Keyword,
+    KeywordMapping,
 )
-from fedrisk_api.schema import control as schema_control
-from fedrisk_api.schema import framework as schema_framework
-from fedrisk_api.schema import framework_version as schema_framework_version
+from fedrisk_api.db.search import write_search_documents
 import uuid
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 
 LOGGER = logging.getLogger(__name__)
 
 BAD_CHARS_TEXT = "!*&%^$#@{}+=<>"
+BAD_CHARS_PATTERN = f"[{re.escape(BAD_CHARS_TEXT)}]"
+# rows per multi-row INSERT
+IMPORT_BATCH_SIZE = 1000
 
 
 def trim_bad_text_string_chars(textstring):
@@ -41,90 +48,102 @@ def create_control_name_from_row(row):
         return ""
 
 
-def load_data_from_dataframe(my_data_frame, tenant_id, is_superuser):
-    """Processes a DataFrame and loads framework, versions, and controls into the database."""
+def _clean_text(series):
+    """Vectorized trim_bad_text_string_chars; cells that aren't text become empty strings"""
+    if not pd.api.types.is_string_dtype(series.dtype):
+        return pd.Series("", index=series.index, dtype=object)
+    return series.str.replace(BAD_CHARS_PATTERN, "", regex=True).str.strip().fillna("")
+
+
+def _sheet_column(my_data_frame, column):
+    if column not in my_data_frame:
+        return pd.Series("", index=my_data_frame.index, dtype=object)
+    return _clean_text(my_data_frame[column])
+
+
+def _version_column(my_data_frame, column):
+    if column not in my_data_frame:
+        # one generated version for the whole sheet rather than one per row
+        return pd.Series(str(uuid.uuid4()), index=my_data_frame.index, dtype=object)
+    return _clean_text(my_data_frame[column].astype(str))
+
+
+def normalize_framework_sheet(my_data_frame):
+    """One cleaned row per spreadsheet row, with the spreadsheet line number in "row" """
+    title = _sheet_column(my_data_frame, "Control Title")
+    title_2 = _sheet_column(my_data_frame, "Control Title 2")
+    keywords = (
+        my_data_frame["Keywords"].map(process_keywords)
+        if "Keywords" in my_data_frame
+        else pd.Series("", index=my_data_frame.index, dtype=object)
+    )
+    return pd.DataFrame(
+        {
+            # line 1 of the sheet is the header
+            "row": range(2, len(my_data_frame) + 2),
+            "framework": _sheet_column(my_data_frame, "Framework").tolist(),
+            "prefix": _version_column(my_data_frame, "Prefix Version").tolist(),
+            "suffix": _version_column(my_data_frame, "Suffix Version").tolist(),
+            "control_name": title.where(title_2 == "", title + ": " + title_2).tolist(),
+            "description": _sheet_column(my_data_frame, "Control Description").tolist(),
+            "guidance": _sheet_column(my_data_frame, "Guidance").tolist(),
+            "keywords": keywords.fillna("").tolist(),
+        }
+    )
+
+
+def load_data_from_dataframe(my_data_frame, tenant_id, is_superuser, progress=None):
+    """Loads the frameworks, versions and controls of a spreadsheet in one transaction.
+
+    Existing rows are resolved with one IN query per entity type and missing ones are
+    inserted in batches. Returns [frameworks, controls, framework versions, row errors]
+    where row errors lists the skipped rows, or {"error": ...} when nothing was imported.
+    progress(done, total) is called as each of the import steps completes.
+    """
     try:
         db = next(get_db())
     except Exception as e:
         LOGGER.error(f"Database session error: {e}")
         return {"error": "Could not initialize database session"}
 
-    num_frameworks, num_framework_versions, num_controls = 0, 0, 0
-    my_prev_framework_id, my_prev_fv_id, my_prev_control_id = None, None, None
-
+    sheet = normalize_framework_sheet(my_data_frame)
+    missing_framework = sheet["framework"] == ""
+    missing_control = ~missing_framework & (sheet["control_name"] == "")
+    row_errors = [
+        {"row": row, "error": "Framework is missing or empty"}
+        for row in sheet.loc[missing_framework, "row"].tolist()
+    ] + [
+        {"row": row, "error": "Control Title is missing or invalid"}
+        for row in sheet.loc[missing_control, "row"].tolist()
+    ]
+    row_errors.sort(key=lambda row_error: row_error["row"])
+    sheet = sheet[~missing_framework & ~missing_control]
+    if sheet.empty:
+        return {"error": "No row in the spreadsheet has both a Framework and a Control Title"}
+
+    report_progress = progress or (lambda done, total: None)
     try:
-        for _, row in my_data_frame.iterrows():
-            framework_name = trim_bad_text_string_chars(row.get("Framework", ""))
-            if not framework_name:
-                return {"error": "Framework column is missing or empty in the spreadsheet"}
-
-            prefix_version = trim_bad_text_string_chars(
-                str(row.get("Prefix Version", uuid.uuid4()))
-            )
-            suffix_version = trim_bad_text_string_chars(
-                str(row.get("Suffix Version", uuid.uuid4()))
-            )
-            keywords_str = process_keywords(row.get("Keywords", ""))
-
-            # Fetch or create Framework
-            my_next_framework_from_db = (
-                db.query(Framework).filter(Framework.name == framework_name).first()
-            )
-            if not my_next_framework_from_db:
-                my_next_framework_from_db = create_framework(
-                    db, framework_name, keywords_str, is_superuser, tenant_id
-                )
-                num_frameworks += 1
-            my_prev_framework_id = my_next_framework_from_db.id
-
-            # Fetch or create Framework Version
-            my_next_fv_from_db = (
-                db.query(FrameworkVersion)
-                .filter_by(
-                    framework_id=my_prev_framework_id,
-                    version_prefix=prefix_version,
-                    version_suffix=suffix_version,
-                )
-                .first()
-            )
-            if not my_next_fv_from_db:
-                my_next_fv_from_db = create_framework_version(
-                    db,
-                    my_prev_framework_id,
-                    prefix_version,
-                    suffix_version,
-                    keywords_str,
-                    tenant_id,
+        framework_ids, num_frameworks = _import_frameworks(db, sheet, tenant_id, is_superuser)
+        report_progress(1, 4)
+        sheet = sheet.assign(framework_id=sheet["framework"].map(framework_ids).tolist())
+        version_ids, num_framework_versions = _import_framework_versions(db, sheet, tenant_id)
+        report_progress(2, 4)
+        sheet = sheet.assign(
+            framework_version_id=[
+                version_ids[key]
+                for key in zip(
+                    sheet["framework_id"].tolist(),
+                    sheet["prefix"].tolist(),
+                    sheet["suffix"].tolist(),
                 )
-                num_framework_versions += 1
-            my_prev_fv_id = my_next_fv_from_db.id
-
-            # Handling Control Title
-            control_name = create_control_name_from_row(row)
-            if not control_name:
-                return {"error": "Control Title is missing or invalid in the spreadsheet"}
-
-            my_next_control_from_db = db.query(Control).filter(Control.name == control_name).first()
-
-            if not my_next_control_from_db:
-                control_description = trim_bad_text_string_chars(row.get("Control Description", ""))
-                guidance = trim_bad_text_string_chars(row.get("Guidance", ""))
-
-                my_next_control_from_db = create_control(
-                    db,
-                    control_name,
-                    control_description,
-                    guidance,
-                    keywords_str,
-                    tenant_id,
-                    my_prev_fv_id,
-                )
-                num_controls += 1
-            my_prev_control_id = my_next_control_from_db.id
-
-            # Ensure Control-Framework Version Relationship
-            ensure_control_framework_version_relationship(db, my_prev_control_id, my_prev_fv_id)
-
+            ]
+        )
+        control_ids, num_controls = _import_controls(db, sheet, tenant_id)
+        report_progress(3, 4)
+        sheet = sheet.assign(control_id=sheet["control_name"].map(control_ids).tolist())
+        _link_controls_to_framework_versions(db, sheet)
+        db.commit()
+        report_progress(4, 4)
     except IntegrityError as e:
         db.rollback()
         LOGGER.error(f"Database Integrity Error: {e}")
@@ -134,7 +153,7 @@ def load_data_from_dataframe(my_data_frame, tenant_id, is_superuser):
         LOGGER.exception("Unexpected error occurred while processing the spreadsheet")
         return {"error": f"Unexpected error: {str(e)}"}
 
-    return [num_frameworks, num_controls, num_framework_versions]
+    return [num_frameworks, num_controls, num_framework_versions, row_errors]
 
 
 # --- Helper Functions ---
@@ -150,47 +169,196 @@ def process_keywords(keywords):
     )
 
 
-def create_framework(db, name, keywords, is_superuser, tenant_id):
-    """Creates a new framework if it does not exist."""
-    new_framework = schema_framework.CreatePreloadedFramework(
-        name=name, description=name, keywords=keywords, is_preloaded=True, is_global=is_superuser
+def _bulk_insert(db, model, rows):
+    """Batched multi-row INSERT that skips rows violating a unique constraint"""
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        statement = postgresql.insert(model).on_conflict_do_nothing()
+    elif dialect_name == "sqlite":
+        statement = sqlite.insert(model).on_conflict_do_nothing()
+    else:
+        statement = insert(model)
+    for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+        db.execute(statement, rows[start : start + IMPORT_BATCH_SIZE])
+
+
+def _ids_by_key(db, statement):
+    """{key: id} from rows of (*key columns, id); the oldest row wins for duplicate keys"""
+    ids = {}
+    for *key, object_id in db.execute(statement):
+        ids.setdefault(key[0] if len(key) == 1 else tuple(key), object_id)
+    return ids
+
+
+def _add_keywords(db, tenant_id, mapping_column, keywords_by_id):
+    """Maps the new objects in keywords_by_id ({object id: "a,b"}) to their keywords"""
+    names_by_id = {
+        object_id: sorted({name.strip() for name in keywords.split(",") if name.strip()})
+        for object_id, keywords in keywords_by_id.items()
+    }
+    names = {name for object_names in names_by_id.values() for name in object_names}
+    if not names:
+        return
+    query = (
+        select(Keyword.name, Keyword.id)
+        .where(Keyword.tenant_id == tenant_id)
+        .where(Keyword.name.in_(names))
+        .order_by(Keyword.id)
     )
-    return db_framework.create_framework(db, new_framework, tenant_id=tenant_id, keywords=keywords)
-
-
-def create_framework_version(db, framework_id, prefix, suffix, keywords, tenant_id):
-    """Creates a new framework version if it does not exist."""
-    new_version = schema_framework_version.CreatePreloadedFrameworkVersion(
-        framework_id=framework_id, version_prefix=prefix, version_suffix=suffix, is_preloaded=True
+    existing = _ids_by_key(db, query)
+    _bulk_insert(
+        db,
+        Keyword,
+        [{"name": name, "tenant_id": tenant_id} for name in sorted(names - existing.keys())],
+    )
+    keyword_ids = _ids_by_key(db, query)
+    _bulk_insert(
+        db,
+        KeywordMapping,
+        [
+            {"keyword_id": keyword_ids[name], mapping_column: object_id}
+            for object_id, object_names in names_by_id.items()
+            for name in object_names
+        ],
     )
-    return db_framework_version.create_framework_version(db, new_version, keywords, tenant_id)
 
 
-def create_control(db, name, description, guidance, keywords, tenant_id, framework_version_id):
-    """Creates a new control if it does not exist."""
-    new_control = schema_control.CreatePreloadedControl(
-        name=name,
-        description=description,
-        guidance=guidance,
-        keywords=keywords,
-        is_preloaded=True,
-        tenant_id=tenant_id,
-        framework_versions=[framework_version_id],
+def _import_frameworks(db, sheet, tenant_id, is_superuser):
+    """({framework name: id}, number created); new frameworks are mapped to the tenant"""
+    first_rows = sheet.drop_duplicates("framework")
+    query = (
+        select(Framework.name, Framework.id)
+        .where(Framework.name.in_(first_rows["framework"].tolist()))
+        .order_by(Framework.id)
+    )
+    existing = _ids_by_key(db, query)
+    new_rows = first_rows[~first_rows["framework"].isin(list(existing))]
+    _bulk_insert(
+        db,
+        Framework,
+        [
+            {"name": name, "description": name, "is_preloaded": True, "is_global": is_superuser}
+            for name in new_rows["framework"].tolist()
+        ],
+    )
+    framework_ids = _ids_by_key(db, query)
+    new_ids = [framework_ids[name] for name in new_rows["framework"].tolist()]
+    _bulk_insert(
+        db,
+        FrameworkTenant,
+        [
+            {"tenant_id": tenant_id, "framework_id": framework_id, "is_enabled": True}
+            for framework_id in new_ids
+        ],
+    )
+    _add_keywords(db, tenant_id, "framework_id", dict(zip(new_ids, new_rows["keywords"])))
+    return framework_ids, len(new_ids)
+
+
+def _import_framework_versions(db, sheet, tenant_id):
+    """({(framework id, prefix, suffix): id}, number created)"""
+    first_rows = sheet.drop_duplicates(["framework_id", "prefix", "suffix"])
+    keys = list(
+        zip(
+            first_rows["framework_id"].tolist(),
+            first_rows["prefix"].tolist(),
+            first_rows["suffix"].tolist(),
+        )
+    )
+    query = (
+        select(
+            FrameworkVersion.framework_id,
+            FrameworkVersion.version_prefix,
+            FrameworkVersion.version_suffix,
+            FrameworkVersion.id,
+        )
+        .where(FrameworkVersion.framework_id.in_({key[0] for key in keys}))
+        .order_by(FrameworkVersion.id)
+    )
+    existing = _ids_by_key(db, query)
+    new_rows = [
+        (key, keywords)
+        for key, keywords in zip(keys, first_rows["keywords"].tolist())
+        if key not in existing
+    ]
+    _bulk_insert(
+        db,
+        FrameworkVersion,
+        [
+            {
+                "framework_id": framework_id,
+                "version_prefix": prefix,
+                "version_suffix": suffix,
+                "is_preloaded": True,
+            }
+            for (framework_id, prefix, suffix), _ in new_rows
+        ],
+    )
+    version_ids = _ids_by_key(db, query)
+    _add_keywords(
+        db,
+        tenant_id,
+        "framework_version_id",
+        {version_ids[key]: keywords for key, keywords in new_rows},
     )
-    return db_control.create_control(db, new_control, keywords, tenant_id=tenant_id)
+    return version_ids, len(new_rows)
 
 
-def ensure_control_framework_version_relationship(db, control_id, framework_version_id):
-    """Ensures that a control is linked to a framework version."""
-    exists = (
-        db.query(ControlFrameworkVersion)
-        .filter_by(control_id=control_id, framework_version_id=framework_version_id)
-        .first()
+def _import_controls(db, sheet, tenant_id):
+    """({control name: id}, number created)"""
+    first_rows = sheet.drop_duplicates("control_name")
+    query = (
+        select(Control.name, Control.id)
+        .where(Control.name.in_(first_rows["control_name"].tolist()))
+        .order_by(Control.id)
+    )
+    existing = _ids_by_key(db, query)
+    new_rows = first_rows[~first_rows["control_name"].isin(list(existing))]
+    _bulk_insert(
+        db,
+        Control,
+        [
+            {
+                "name": name,
+                "description": description,
+                "guidance": guidance,
+                "is_preloaded": True,
+                "tenant_id": tenant_id,
+            }
+            for name, description, guidance in zip(
+                new_rows["control_name"].tolist(),
+                new_rows["description"].tolist(),
+                new_rows["guidance"].tolist(),
+            )
+        ],
+    )
+    control_ids = _ids_by_key(db, query)
+    new_ids = [control_ids[name] for name in new_rows["control_name"].tolist()]
+    _add_keywords(db, tenant_id, "control_id", dict(zip(new_ids, new_rows["keywords"])))
+    if new_ids:
+        # core inserts skip the ORM listener that indexes new controls for search
+        controls = db.query(Control).filter(Control.id.in_(new_ids)).all()
+        write_search_documents(db.connection(), {"control": controls})
+    return control_ids, len(new_ids)
+
+
+def _link_controls_to_framework_versions(db, sheet):
+    pairs = set(zip(sheet["control_id"].tolist(), sheet["framework_version_id"].tolist()))
+    existing = set(
+        db.execute(
+            select(
+                ControlFrameworkVersion.control_id, ControlFrameworkVersion.framework_version_id
+            ).where(ControlFrameworkVersion.control_id.in_({pair[0] for pair in pairs}))
+        ).all()
+    )
+    _bulk_insert(
+        db,
+        ControlFrameworkVersion,
+        [
+            {"control_id": control_id, "framework_version_id": framework_version_id}
+            for control_id, framework_version_id in sorted(pairs - existing)
+        ],
     )
-    if not exists:
-        db_control.add_single_control_to_framework_version_relationship(
-            db=db, framework_version_id=framework_version_id, control_id=control_id
-        )
 
 
 def remove_data_from_dataframe(my_data_frame):
@@ -114,9 +114,12 @@ async def update_task(
 
 
 async def load_data_from_dataframe_tasks(
-    my_data_frame, tenant_id, is_superuser, user_id, project_id, wbs_id, import_id
+    my_data_frame, tenant_id, is_superuser, user_id, project_id, wbs_id, import_id, progress=None
 ):
-    """Processes a DataFrame and loads tasks, links, and resources into the database."""
+    """Processes a DataFrame and loads tasks, links, and resources into the database.
+
+    progress(done, total) is called after each row of the task and the link passes.
+    """
     try:
         db = next(get_db())
     except Exception as e:
@@ -125,8 +128,11 @@ async def load_data_from_dataframe_tasks(
     num_tasks = 0
     parent_task_map = {}
     my_data_frame.sort_values(by=["Parent Task"], inplace=True, na_position="last")
+    report_progress = progress or (lambda done, total: None)
+    total_steps = 2 * len(my_data_frame)
     try:
-        for _, row in my_data_frame.iterrows():
+        for index, (_, row) in enumerate(my_data_frame.iterrows(), 1):
+            report_progress(index, total_steps)
             task_name = sanitize_text(row.get("Task Name", ""))
             if not task_name:
                 continue
@@ -156,7 +162,8 @@ async def load_data_from_dataframe_tasks(
             parent_task_map[task_name] = new_task.id
             num_tasks += 1
         LOGGER.debug(f"Task Map: {parent_task_map}")
-        for _, row in my_data_frame.iterrows():
+        for index, (_, row) in enumerate(my_data_frame.iterrows(), len(my_data_frame) + 1):
+            report_progress(index, total_steps)
             task_name, parent_name = sanitize_text(row.get("Task Name", "")), sanitize_text(
                 row.get("Parent Task", "")
             )
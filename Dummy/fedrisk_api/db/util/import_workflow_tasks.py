@@ -54,9 +54,10 @@ def safe_import_spreadsheet(file_path):
 
 
 def import_workflow_flowchart_from_excel(
-    file_path: str, db: Session, user_id: int, tenant_id: int, project_id: int
+    file_path: str, db: Session, user_id: int, tenant_id: int, project_id: int, progress=None
 ):
     df = pd.read_excel(file_path)
+    report_progress = progress or (lambda done, total: None)
     print("Excel columns:", list(df.columns))
     now = datetime.utcnow()
     workflows = []
@@ -67,7 +68,8 @@ def import_workflow_flowchart_from_excel(
 
     grouped = df.groupby("Workflow Name")
 
-    for workflow_base_name, group in grouped:
+    for workflow_index, (workflow_base_name, group) in enumerate(grouped):
+        report_progress(workflow_index, grouped.ngroups)
         task_map = {}
         parent_relations = {}
         conditional_nodes = {}
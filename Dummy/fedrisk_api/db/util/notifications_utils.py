@@ -1,38 +1,38 @@
 import logging
 import os
 
+from sqlalchemy import insert
+
+from fedrisk_api.db.enums import NotificationChannel
 from fedrisk_api.db.models import (
     User,
     UserNotifications,
     UserNotificationSettings,
 )
 
-from fedrisk_api.utils.email_util import send_watch_email
-from fedrisk_api.utils.email_util import send_assigned_to_email
-from fedrisk_api.utils.sms_util import publish_notification
+from fedrisk_api.db.notification_inbox import count_new_notifications
+from fedrisk_api.db.notification_outbox import enqueue_email, enqueue_many, enqueue_sms
+from fedrisk_api.utils.email_util import assigned_email_body, watch_email_body
 
 LOGGER = logging.getLogger(__name__)
 
 frontend_server_url = os.getenv("FRONTEND_SERVER_URL", "")
 
 # Notification Functions
-async def notify_user(user, message, link, settings):
-    """Send notification emails and/or SMS to user if enabled in settings."""
+async def notify_user(db, user, message, link, settings):
+    """Queue notification emails and/or SMS to user if enabled in settings.
+
+    They are sent by the outbox dispatcher once the caller commits.
+    """
     full_link = frontend_server_url + link
     LOGGER.info(f"link {full_link}")
     if settings is not None:
         if settings.assigned_email and user.email:
-            await send_watch_email(
-                {"subject": message, "email": user.email, "message": f"{message} Link: {full_link}"}
-            )
+            enqueue_email(db, user.email, message, watch_email_body(f"{message} Link: {full_link}"))
         if settings.assigned_sms and user.phone_no:
-            await publish_notification(
-                {"phone_no": user.phone_no, "message": f"{message} Link: {full_link}"}
-            )
+            enqueue_sms(db, user.phone_no, f"{message} Link: {full_link}")
     if settings is None:
-        await send_watch_email(
-            {"subject": message, "email": user.email, "message": f"{message} Link: {full_link}"}
-        )
+        enqueue_email(db, user.email, message, watch_email_body(f"{message} Link: {full_link}"))
 
 
 async def add_notification(db, user_id, data_type, data_id, path, message, project_id):
@@ -50,40 +50,80 @@ async def add_notification(db, user_id, data_type, data_id, path, message, proje
     db.commit()
 
 
+def notify_watchers(db, user_ids, data_type, message, link, project_id, id):
+    """Adds the in-app notification for every watching user and queues their emails and sms.
+
+    Loads the users with their settings in one query and writes each kind of row with one
+    multi-row insert; the caller commits.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return 0
+    users = (
+        db.query(User, UserNotificationSettings)
+        .outerjoin(UserNotificationSettings, UserNotificationSettings.user_id == User.id)
+        .filter(User.id.in_(user_ids))
+        .all()
+    )
+    full_link = frontend_server_url + link
+    email_body = watch_email_body(f"{message} Link: {full_link}")
+    sms_body = f"{message} Link: {full_link}"
+    # same preferences as notify_user: without settings users only get the email
+    emails = [
+        (user.email, message, email_body)
+        for user, settings in users
+        if settings is None or settings.assigned_email
+    ]
+    sms = [
+        (user.phone_no, None, sms_body)
+        for user, settings in users
+        if settings is not None and settings.assigned_sms
+    ]
+    enqueue_many(db, NotificationChannel.email, emails)
+    enqueue_many(db, NotificationChannel.sms, sms)
+    notifications = [
+        {
+            "user_id": user.id,
+            "notification_data_type": data_type,
+            "notification_data_id": id,
+            "notification_data_path": link,
+            "notification_message": message,
+            "project_id": project_id,
+        }
+        for user, _ in users
+    ]
+    db.execute(insert(UserNotifications), notifications)
+    count_new_notifications(db, notifications)
+    return len(users)
+
+
 async def manage_notifications(db, users_watching, data_type, message, link, project_id, id):
     """Batch notification handler for multiple users."""
-    for userwatch in users_watching:
-        try:
-            # Add a notification for the user
-            await add_notification(db, userwatch.user_id, data_type, id, link, message, project_id)
-
-            # Query the user's notification settings and user info in parallel if possible.
-            # If your ORM supports asynchronous queries, consider using them.
-            user_notification_settings = (
-                db.query(UserNotificationSettings).filter_by(user_id=userwatch.user_id).first()
+    try:
+        # a failure only rolls back the savepoint, never the caller's pending changes
+        with db.begin_nested():
+            notified = notify_watchers(
+                db,
+                [userwatch.user_id for userwatch in users_watching],
+                data_type,
+                message,
+                link,
+                project_id,
+                id,
             )
-            user = db.query(User).filter_by(id=userwatch.user_id).first()
-
-            # Notify the user based on their settings
-            await notify_user(user, message, link, user_notification_settings)
-        except Exception as e:
-            # Log error for this user and continue with next user
-            # Use your logging framework if available
-            print(f"Error managing notifications for user {userwatch.user_id}: {e}")
-
-
-async def send_assigned_email(subject: str, email: str, message: str):
-    payload = {
-        "subject": subject,
-        "email": email,
-        "message": message,
-    }
-    await send_assigned_to_email(payload)
-
-
-async def send_sms(phone_no: str, message: str):
-    payload = {
-        "phone_no": phone_no,
-        "message": message,
-    }
-    await publish_notification(payload)
+    except Exception:
+        LOGGER.exception(f"Error managing notifications for {data_type} {id}")
+        notified = 0
+    # commit the notifications together with the queued messages
+    db.commit()
+    LOGGER.info(f"Notified {notified} users watching {data_type} {id}")
+
+
+async def send_assigned_email(db, subject: str, email: str, message: str):
+    """Queues an assignment email; it is sent once the caller commits"""
+    enqueue_email(db, email, subject, assigned_email_body(message))
+
+
+async def send_sms(db, phone_no: str, message: str):
+    """Queues a text message; it is sent once the caller commits"""
+    enqueue_sms(db, phone_no, message)
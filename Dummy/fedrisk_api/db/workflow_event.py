@@ -1,9 +1,14 @@
+import json
 import logging
+import operator
+import os
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
 
+from sqlalchemy import DateTime, exists, func, or_, select, type_coerce
 from sqlalchemy.orm import Session
 
-from datetime import datetime
-
 from fedrisk_api.db.models import (
     AuditTest,
     AuditTestStakeHolder,
@@ -15,14 +20,16 @@ from fedrisk_api.db.models import (
     Project,
     Risk,
     RiskStakeholder,
+    WorkflowEventSweep,
     WorkflowFlowchart,
 )
+from fedrisk_api.db.notification_outbox import enqueue_email
 from fedrisk_api.schema.workflow_event import (
     CreateWorkflowEvent,
     UpdateWorkflowEvent,
 )
 
-from fedrisk_api.utils.email_util import send_event_trigger_email
+from fedrisk_api.utils.email_util import event_trigger_email_body
 
 LOGGER = logging.getLogger(__name__)
 
@@ -94,70 +101,88 @@ def get_config_value(config: dict, field_name: str, default=None):
     return default
 
 
-def evaluate_condition(condition: dict, task: Task) -> bool:
-    # Map trigger field names to Task attributes
-    field = condition["field"]
-    operator = condition["operator"]
-    expected_value = condition["value"]
+# trigger field names that don't match a Task attribute of the lower-cased name
+TRIGGER_FIELD_ATTRIBUTES = {
+    "Priority": "priority",
+    "Status": "task_status_id",
+    "Category": "task_category_id",
+}
+TRIGGER_OPERATORS = {
+    "Equals": operator.eq,
+    "Does Not Equal": operator.ne,
+}
+WORKFLOW_TRIGGER_BATCH_SIZE = int(os.getenv("WORKFLOW_TRIGGER_BATCH_SIZE", "500"))
+WORKFLOW_TRIGGER_PREDICATE_CACHE_SIZE = 1024
 
-    # You may need to adjust this mapping to match your Task model
-    if field == "Priority":
-        # assuming task.priority is a string (or convert as needed)
-        task_value = task.priority
-    elif field == "Status":
-        # mapping "Status" to task_status_id, for example
-        task_value = task.task_status_id
-    elif field == "Category":
-        task_value = task.task_category_id
-    else:
-        # default: try to get the attribute with lower-case field name
-        task_value = getattr(task, field.lower(), None)
-
-    # Evaluate based on the operator
-    if operator == "Equals":
-        return task_value == expected_value
-    elif operator == "Does Not Equal":
-        return task_value != expected_value
-    else:
+
+def _condition_predicate(condition: dict):
+    attribute = TRIGGER_FIELD_ATTRIBUTES.get(condition["field"], condition["field"].lower())
+    compare = TRIGGER_OPERATORS.get(condition["operator"])
+    expected_value = condition["value"]
+    if compare is None:
         # Add more operators as needed
-        return False
+        return lambda task: False
+    return lambda task: compare(getattr(task, attribute, None), expected_value)
 
 
-def evaluate_trigger_logic(logic: list, task: Task) -> bool:
+@lru_cache(maxsize=WORKFLOW_TRIGGER_PREDICATE_CACHE_SIZE)
+def _compile_logic_key(logic_key: str):
+    logic = json.loads(logic_key)
+    if not logic:
+        return lambda task: True
+
+    # Ensure the logic is sorted by weight if order matters
+    sorted_logic = sorted(logic, key=lambda c: int(c.get("weight", 0)))
+    first = _condition_predicate(sorted_logic[0])
+    # (combine with OR, predicate) for the subsequent conditions, AND unless stated otherwise
+    rest = [
+        (
+            (condition.get("comparison") or {}).get("value", "AND") == "OR",
+            _condition_predicate(condition),
+        )
+        for condition in sorted_logic[1:]
+    ]
+
+    def predicate(task) -> bool:
+        result = first(task)
+        for combine_with_or, condition_predicate in rest:
+            condition_result = condition_predicate(task)
+            if combine_with_or:
+                result = result or condition_result
+            else:
+                result = result and condition_result
+        return result
+
+    return predicate
+
+
+def _logic_key(logic: list) -> str:
+    return json.dumps(logic or [], sort_keys=True, default=str)
+
+
+def compile_trigger_logic(logic: list):
     """
-    Evaluate a list of trigger logic conditions against a task.
+    Compiles a list of trigger logic conditions into a predicate(task) -> bool.
     The first condition's result is used as the initial value,
     then subsequent conditions are combined using the comparison operator.
+    Predicates are cached per logic, so events sharing logic share one predicate.
     """
-    if not logic:
-        return True
+    return _compile_logic_key(_logic_key(logic))
 
-    # Ensure the logic is sorted by weight if order matters
-    sorted_logic = sorted(logic, key=lambda c: int(c.get("weight", 0)))
 
-    # Evaluate the first condition
-    result = evaluate_condition(sorted_logic[0], task)
+def evaluate_condition(condition: dict, task: Task) -> bool:
+    return _condition_predicate(condition)(task)
 
-    # Evaluate subsequent conditions with their comparison operator
-    for condition in sorted_logic[1:]:
-        comp = condition.get("comparison", {})
-        # Determine the operator to combine with previous result (default to AND)
-        comp_operator = comp.get("value", "AND")
-        condition_result = evaluate_condition(condition, task)
-        if comp_operator == "AND":
-            result = result and condition_result
-        elif comp_operator == "OR":
-            result = result or condition_result
-        else:
-            # Default to AND if operator is unrecognized
-            result = result and condition_result
 
-    return result
+def evaluate_trigger_logic(logic: list, task: Task) -> bool:
+    """Evaluate a list of trigger logic conditions against a task."""
+    return compile_trigger_logic(logic)(task)
 
 
 def log_event(
     db: Session, event: WorkflowEvent, event_type: str, description: str, link: str = None
 ) -> WorkflowEventLog:
+    """Logs the processed event; the sweep commits it with the event's side effects"""
     new_log = WorkflowEventLog(
         workflow_event_id=event.id,
         event_type=event_type,
@@ -165,25 +190,36 @@ def log_event(
         link=link,
     )
     db.add(new_log)
-    db.commit()
+    db.flush()
     return new_log
 
 
+def _user_by_email(db: Session, email: str, users_by_email: dict = None):
+    if users_by_email is not None:
+        return users_by_email.get(email)
+    return db.query(User).filter(User.email == email).first()
+
+
 def process_task_event(
-    db: Session, event: WorkflowEvent, project: Project, config: dict, stakeholder_user_ids: list
+    db: Session,
+    event: WorkflowEvent,
+    project: Project,
+    config: dict,
+    stakeholder_user_ids: list,
+    users_by_email: dict = None,
 ) -> WorkflowEventLog:
     # Extract values from config using the helper
     name = get_config_value(config, "name", "")
     title = name[:20]  # trim to 20 chars
     description_value = get_config_value(config, "description", "")
     owner_id = get_config_value(config, "owner_id")
-    owner_user_id = db.query(User).filter(User.email == owner_id).first()
+    owner_user_id = _user_by_email(db, owner_id, users_by_email)
     due_date_value = get_config_value(config, "due_date")
     if due_date_value is not None:
         try:
             # Assuming due_date_value is a Unix timestamp in seconds.
             due_date = datetime.fromtimestamp(int(due_date_value)).date()
-        except Exception as e:
+        except Exception:
             due_date = None
     else:
         due_date = None
@@ -200,31 +236,31 @@ def process_task_event(
     db.add(new_task)
     db.flush()  # Flush to assign new_task.id without ending the transaction
 
-    added_task = db.query(Task).filter(Task.id == new_task.id).first()
-
     # Add stakeholders for the task
-    for stakeholder in stakeholder_user_ids:
-        new_stakeholder = TaskStakeholder(
-            task_id=added_task.id,
-            user_id=stakeholder,
-        )
-        db.add(new_stakeholder)
-        db.flush()
+    db.add_all(
+        [
+            TaskStakeholder(task_id=new_task.id, user_id=stakeholder)
+            for stakeholder in stakeholder_user_ids
+        ]
+    )
 
-    desc = f"Created a new task {added_task.name} with description {added_task.description}."
+    desc = f"Created a new task {new_task.name} with description {new_task.description}."
     link = f"/projects/{project.id}/tasks/{new_task.id}"
-    event_log = log_event(db, event, "Create Task", desc, link)
-    db.commit()  # Commit the whole transaction
-    return event_log
+    return log_event(db, event, "Create Task", desc, link)
 
 
 def process_audit_test_event(
-    db: Session, event: WorkflowEvent, project: Project, config: dict, stakeholder_user_ids: list
+    db: Session,
+    event: WorkflowEvent,
+    project: Project,
+    config: dict,
+    stakeholder_user_ids: list,
+    users_by_email: dict = None,
 ) -> WorkflowEventLog:
     name = get_config_value(config, "name", "")
     description_value = get_config_value(config, "description", "")
     tester_id = get_config_value(config, "owner_id")
-    tester_user_id = db.query(User).filter(User.email == tester_id).first()
+    tester_user_id = _user_by_email(db, tester_id, users_by_email)
 
     new_audit_test = AuditTest(
         name=name,
@@ -235,30 +271,33 @@ def process_audit_test_event(
     )
     db.add(new_audit_test)
     db.flush()  # Flush to assign an ID without committing
-    added_audit_test = db.query(AuditTest).filter(AuditTest.id == new_audit_test.id).first()
 
     # Add stakeholders for the audit test
-    for stakeholder in stakeholder_user_ids:
-        new_stakeholder = AuditTestStakeHolder(
-            audit_test_id=added_audit_test.id,
-            user_id=stakeholder,
-        )
-        db.add(new_stakeholder)
-        db.flush()
+    db.add_all(
+        [
+            AuditTestStakeHolder(audit_test_id=new_audit_test.id, user_id=stakeholder)
+            for stakeholder in stakeholder_user_ids
+        ]
+    )
 
-    description_text = f"Created a new audit test {added_audit_test.name} with description {added_audit_test.description}."
+    description_text = f"Created a new audit test {new_audit_test.name} with description {new_audit_test.description}."
     link = f"/projects/{project.id}/audit_tests/{new_audit_test.id}"
     return log_event(db, event, "Create Audit Test", description_text, link)
 
 
 def process_risk_event(
-    db: Session, event: WorkflowEvent, project: Project, config: dict, stakeholder_user_ids: list
+    db: Session,
+    event: WorkflowEvent,
+    project: Project,
+    config: dict,
+    stakeholder_user_ids: list,
+    users_by_email: dict = None,
 ) -> WorkflowEventLog:
     # Extract values using the helper function
     name = get_config_value(config, "name", "")
     description_value = get_config_value(config, "description", "")
     owner_id = get_config_value(config, "owner_id")
-    owner_user_id = db.query(User).filter(User.email == owner_id).first()
+    owner_user_id = _user_by_email(db, owner_id, users_by_email)
 
     new_risk = Risk(
         name=name,
@@ -269,25 +308,23 @@ def process_risk_event(
     )
     db.add(new_risk)
     db.flush()  # Flush to get new_risk.id
-    added_risk = db.query(Risk).filter(Risk.id == new_risk.id).first()
 
     # Add stakeholders for the risk
-    for stakeholder in stakeholder_user_ids:
-        new_stakeholder = RiskStakeholder(
-            risk_id=added_risk.id,
-            user_id=stakeholder,
-        )
-        db.add(new_stakeholder)
-        db.flush()
+    db.add_all(
+        [
+            RiskStakeholder(risk_id=new_risk.id, user_id=stakeholder)
+            for stakeholder in stakeholder_user_ids
+        ]
+    )
 
     description_text = (
-        f"Created a new risk {added_risk.name} with description {added_risk.description}."
+        f"Created a new risk {new_risk.name} with description {new_risk.description}."
     )
     link = f"/projects/{project.id}/risks/{new_risk.id}"
     return log_event(db, event, "Create Risk", description_text, link)
 
 
-async def process_email_event(db: Session, event: WorkflowEvent, config: dict) -> WorkflowEventLog:
+def process_email_event(db: Session, event: WorkflowEvent, config: dict) -> WorkflowEventLog:
     # Extract email configuration values from the nested fields
     email_subject = get_config_value(config, "email-subject", "No subject")
     email_body = get_config_value(config, "email-body", "No email body provided.")
@@ -295,75 +332,161 @@ async def process_email_event(db: Session, event: WorkflowEvent, config: dict) -
     internal_ccs = get_config_value(config, "internal_cc_recipient_list", [])
     external_ccs = get_config_value(config, "external_cc_recipient_list", [])
 
-    # Prepare a new dictionary for sending the email
-    email_data = {
-        "recipient_id": recipient_id,
-        "email-subject": email_subject,
-        "email-body": email_body,
-        "internal_cc_recipient_list": internal_ccs,
-        "external_cc_recipient_list": external_ccs,
-    }
-
-    # Send the email asynchronously
-    await send_event_trigger_email(email_data)
+    # Queue the email to the recipient and both cc lists; the outbox dispatcher sends it
+    # once the sweep commits
+    body = event_trigger_email_body(email_body)
+    for email in [recipient_id, *internal_ccs, *external_ccs]:
+        enqueue_email(db, email, email_subject, body)
 
     description = f"Sent a new email with subject {email_subject} and body {email_body}."
     return log_event(db, event, "Send Email", description)
 
 
-async def process_workflow_event_triggers(db: Session):
-    # Query events that do not have any logs (i.e. not processed)
-    all_workflow_events = (
-        db.query(WorkflowEvent)
-        .outerjoin(WorkflowEventLog)
-        .filter(WorkflowEventLog.id == None)
-        .all()
-    )
-    event_logs = []
+def _config_emails(config: dict):
+    """User emails an event's config refers to"""
+    emails = set(config.get("additional_stakeholder_ids", []))
+    owner_email = get_config_value(config, "owner_id")
+    if owner_email is not None:
+        emails.add(owner_email)
+    return emails
+
+
+def _process_event(db: Session, event: WorkflowEvent, project: Project, users_by_email: dict):
+    config = event.event_config
+    # Retrieve stakeholder user IDs from emails in config
+    stakeholder_user_ids = [
+        users_by_email[stakeholder].id
+        for stakeholder in config.get("additional_stakeholder_ids", [])
+        if stakeholder in users_by_email
+    ]
+
+    data_type = config.get("data_type")
+    if data_type == "task":
+        return process_task_event(
+            db, event, project, config, stakeholder_user_ids, users_by_email
+        )
+    elif data_type == "audit_test":
+        return process_audit_test_event(
+            db, event, project, config, stakeholder_user_ids, users_by_email
+        )
+    elif data_type == "risk":
+        return process_risk_event(
+            db, event, project, config, stakeholder_user_ids, users_by_email
+        )
+    elif data_type == "email":
+        return process_email_event(db, event, config)
+    LOGGER.warning(f"Unknown data type {data_type} for event {event.id}")
+    return None
 
-    for event in all_workflow_events:
-        task_id = event.workflow_flowchart_node_id
 
-        # Get the associated project by joining WorkflowFlowchart and WorkflowEvent
-        project = (
-            db.query(Project)
-            .join(WorkflowFlowchart, WorkflowFlowchart.project_id == Project.id)
-            .join(WorkflowEvent, WorkflowEvent.workflow_flowchart_id == WorkflowFlowchart.id)
-            .filter(WorkflowEvent.id == event.id)
-            .first()
+def _pending_events_query(db: Session, watermark: datetime = None):
+    """Events without a log; with a watermark only those whose event or task changed since"""
+    query = db.query(WorkflowEvent).filter(
+        ~exists().where(WorkflowEventLog.workflow_event_id == WorkflowEvent.id)
+    )
+    if watermark is not None:
+        query = query.filter(
+            or_(
+                WorkflowEvent.last_updated_date >= watermark,
+                WorkflowEvent.workflow_flowchart_node_id.in_(
+                    select(Task.id).where(Task.updated_at >= watermark)
+                ),
+            )
         )
+    return query
+
+
+def _process_event_batch(db: Session, events: list):
+    """Evaluates a batch of events against their tasks and processes the triggered ones"""
+    task_ids = {event.workflow_flowchart_node_id for event in events}
+    tasks = {task.id: task for task in db.query(Task).filter(Task.id.in_(task_ids))}
+
+    # events sharing trigger logic are evaluated together with one compiled predicate
+    events_by_logic = defaultdict(list)
+    for event in events:
+        task = tasks.get(event.workflow_flowchart_node_id)
+        if task is None:
+            LOGGER.info(
+                f"Task with id {event.workflow_flowchart_node_id} not found for event {event.id}."
+            )
+            continue
+        events_by_logic[_logic_key(event.trigger_logic)].append((event, task))
+    triggered = []
+    for logic_key, event_tasks in events_by_logic.items():
+        predicate = _compile_logic_key(logic_key)
+        triggered.extend(event for event, task in event_tasks if predicate(task))
+    if not triggered:
+        return []
+    triggered.sort(key=lambda event: event.id)
+
+    flowchart_ids = {event.workflow_flowchart_id for event in triggered}
+    projects = dict(
+        db.query(WorkflowFlowchart.id, Project)
+        .join(Project, WorkflowFlowchart.project_id == Project.id)
+        .filter(WorkflowFlowchart.id.in_(flowchart_ids))
+    )
+    emails = set().union(*(_config_emails(event.event_config) for event in triggered))
+    users_by_email = (
+        {user.email: user for user in db.query(User).filter(User.email.in_(emails))}
+        if emails
+        else {}
+    )
 
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if not task:
-            print(f"Task with id {task_id} not found for event {event.id}.")
+    event_logs = []
+    for event in triggered:
+        try:
+            with db.begin_nested():
+                log = _process_event(
+                    db, event, projects.get(event.workflow_flowchart_id), users_by_email
+                )
+        except Exception:
+            # the event stays pending and is retried by the next full sweep
+            LOGGER.exception(f"Could not process workflow event {event.id}")
             continue
+        if log is not None:
+            event_logs.append(log)
+    return event_logs
 
-        logic = event.trigger_logic  # List of conditions
-        if evaluate_trigger_logic(logic, task):
-            config = event.event_config
-            # Retrieve stakeholder user IDs from emails in config
-            stakeholder_user_ids = []
-            for stakeholder in config.get("additional_stakeholder_ids", []):
-                user = db.query(User).filter(User.email == stakeholder).first()
-                if user:
-                    stakeholder_user_ids.append(user.id)
-
-            data_type = config.get("data_type")
-            if data_type == "task":
-                log = process_task_event(db, event, project, config, stakeholder_user_ids)
-                event_logs.append(log)
-            elif data_type == "audit_test":
-                log = process_audit_test_event(db, event, project, config, stakeholder_user_ids)
-                event_logs.append(log)
-            elif data_type == "risk":
-                log = process_risk_event(db, event, project, config, stakeholder_user_ids)
-                event_logs.append(log)
-            elif data_type == "email":
-                log = await process_email_event(db, event, config)
-                event_logs.append(log)
-            else:
-                print(f"Unknown data type {data_type} for event {event.id}")
-        else:
-            print(f"Event {event.id} conditions not met for task {task.id}.")
 
+def process_workflow_event_triggers(
+    db: Session, incremental: bool = False, batch_size: int = WORKFLOW_TRIGGER_BATCH_SIZE
+):
+    """Processes the pending workflow events whose trigger logic holds for their task.
+
+    Incremental sweeps only evaluate events and tasks changed since the previous sweep
+    started; a full sweep re-evaluates every pending event. Each batch of events is committed
+    with its side effects, emails go through the notification outbox.
+    """
+    # database time, comparable with the server-side updated timestamps
+    sweep_started = db.execute(select(type_coerce(func.current_timestamp(), DateTime))).scalar()
+    sweep = db.query(WorkflowEventSweep).with_for_update().first()
+    if sweep is None:
+        sweep = WorkflowEventSweep()
+        db.add(sweep)
+    watermark = sweep.watermark if incremental else None
+
+    query = _pending_events_query(db, watermark).order_by(WorkflowEvent.id)
+    if db.get_bind().dialect.name == "postgresql":
+        # concurrent sweeps skip each other's events instead of processing them twice
+        query = query.with_for_update(skip_locked=True)
+    event_logs = []
+    evaluated = 0
+    last_id = 0
+    while True:
+        events = query.filter(WorkflowEvent.id > last_id).limit(batch_size).all()
+        if not events:
+            break
+        last_id = events[-1].id
+        evaluated += len(events)
+        event_logs.extend(_process_event_batch(db, events))
+        db.commit()
+
+    sweep = db.query(WorkflowEventSweep).with_for_update().first() or sweep
+    sweep.watermark = sweep_started
+    sweep.last_run_date = sweep_started
+    sweep.events_evaluated = evaluated
+    sweep.events_triggered = len(event_logs)
+    db.add(sweep)
+    db.commit()
+    LOGGER.info(f"Workflow event sweep evaluated {evaluated} events, triggered {len(event_logs)}")
     return event_logs
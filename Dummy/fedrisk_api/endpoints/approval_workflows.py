@@ -8,6 +8,7 @@ from typing import List
 
 from fedrisk_api.db import approval_workflows as db_approval_workflow
 from fedrisk_api.db.database import get_db
+from fedrisk_api.db.util.encrypt_pii_utils import pii_decryption_memo, prefetch_users_pii
 from fedrisk_api.schema.approval_workflows import (
     CreateApprovalWorkflowUseTemplate,
     CreateApprovalWorkflow,
@@ -69,7 +70,11 @@ from fedrisk_api.utils.permissions import (
 )
 
 
-router = APIRouter(prefix="/approval_workflows", tags=["approval_workflows"])
+router = APIRouter(
+    prefix="/approval_workflows",
+    tags=["approval_workflows"],
+    dependencies=[Depends(pii_decryption_memo)],
+)
 LOGGER = logging.getLogger(__name__)
 
 ############# Approval Workflows ##################
@@ -138,9 +143,11 @@ def get_all_approval_workflows_for_project_endpoint(
     user=Depends(custom_auth),
     project_id: str = None,
 ):
-    return db_approval_workflow.get_all_approval_workflows_project(
+    approval_workflows = db_approval_workflow.get_all_approval_workflows_project(
         db, user["tenant_id"], project_id, user["user_id"]
     )
+    prefetch_users_pii([approval_workflow.owner for approval_workflow in approval_workflows or []])
+    return approval_workflows
 
 
 # GET all approval workflows for a user - approval_workflows/
@@ -153,7 +160,9 @@ def get_all_approval_workflows_for_user_endpoint(
     db: Session = Depends(get_db),
     user=Depends(custom_auth),
 ):
-    return db_approval_workflow.get_all_approval_workflows_user(db, user["user_id"])
+    approval_workflows = db_approval_workflow.get_all_approval_workflows_user(db, user["user_id"])
+    prefetch_users_pii([approval_workflow.owner for approval_workflow in approval_workflows])
+    return approval_workflows
 
 
 # GET one approval workflow by ID - approval_workflows/{id}
@@ -398,7 +407,9 @@ def get_all_approvals_for_workflow_endpoint(
     user=Depends(custom_auth),
     id: str = None,
 ):
-    return db_approval_workflow.get_all_approvals_for_approval_workflow(db, id, user["user_id"])
+    approvals = db_approval_workflow.get_all_approvals_for_approval_workflow(db, id, user["user_id"])
+    prefetch_users_pii([approval.user for approval in approvals])
+    return approvals
 
 
 # GET one approval by ID - approval_workflows/templates/{id}
@@ -497,9 +508,13 @@ def get_all_approval_stakeholders_for_workflow_endpoint(
     user=Depends(custom_auth),
     id: str = None,
 ):
-    return db_approval_workflow.get_all_approval_stakeholders_for_approval_workflow(
-        db, id, user["user_id"]
+    approval_stakeholders = (
+        db_approval_workflow.get_all_approval_stakeholders_for_approval_workflow(
+            db, id, user["user_id"]
+        )
     )
+    prefetch_users_pii([approval_stakeholder.user for approval_stakeholder in approval_stakeholders])
+    return approval_stakeholders
 
 
 # GET one approval stakeholder by ID - approval_workflows/approval_stakeholders/{id}
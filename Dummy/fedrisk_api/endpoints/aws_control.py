@@ -14,7 +14,9 @@ from fastapi.datastructures import UploadFile
 from fastapi.param_functions import File
 
 from fedrisk_api.db import aws_control as db_aws_control
+from fedrisk_api.db import import_job as db_import_job
 from fedrisk_api.db.database import get_db
+from fedrisk_api.db.enums import ImportJobType
 from fedrisk_api.schema.aws_control import (
     CreateAWSControl,
     DisplayAWSControl,
@@ -26,6 +28,7 @@ from fedrisk_api.schema.aws_control import (
 from fedrisk_api.s3 import S3Service
 
 from fedrisk_api.utils.authentication import custom_auth
+from fedrisk_api.utils.import_queue import import_job_queue
 from fedrisk_api.utils.permissions import (
     create_aws_control_permission,
     delete_aws_control_permission,
@@ -210,13 +213,17 @@ async def create_import_aws_controls(
             bucket=tenant.s3_bucket, key=my_file_key, fileobject=data
         )
         if uploads3:
-            # import file data using util
-            # my_data_frame = pd.read_csv(datacsv)
-            # aws_control_num = load_aws_control_data_from_dataframe_util(my_data_frame, project_id)
-            # LOGGER.info(f"Successfully loaded {aws_control_num[0]} aws controls.")
-            # LOGGER.info(
-            #     f"Successfully loaded {aws_control_num[1]} aws control to project control mappings."
-            # )
+            # imported in the background once the upload has been scanned
+            import_job = db_import_job.create_import_job(
+                db,
+                ImportJobType.aws_control,
+                user["tenant_id"],
+                my_file_key,
+                user_id=user["user_id"],
+                source_id=new_importawscontrol.id,
+            )
+            import_job_queue.submit(import_job.id)
+            new_importawscontrol.import_job_id = import_job.id
             return new_importawscontrol  # response added
         else:
             raise HTTPException(status_code=400, detail="Failed to upload in S3")
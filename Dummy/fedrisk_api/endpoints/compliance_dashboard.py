@@ -8,6 +8,8 @@ from fedrisk_api.db.compliance_dashboard import (
     get_compliance_dashboard_metrics_cap_poam,
     get_compliance_audit_test_by_month_for_year,
 )
+from fedrisk_api.db.dashboard import get_project
+from fedrisk_api.db.dashboard_metrics import get_dashboard_metric, with_computed_date
 from fedrisk_api.db.database import get_db
 from fedrisk_api.schema.compliance_dashboard import (
     DisplayComplianceMetrics,
@@ -19,6 +21,25 @@ from fedrisk_api.utils.permissions import view_compliance_dashboard
 router = APIRouter(prefix="/dashboards/compliance", tags=["dashboards"])
 
 
+def _stored_metrics(db: Session, project_id: int, metric: str, compute, scope: str = ""):
+    """Serve compliance metrics from the dashboard metric store.
+
+    compute returns the "project_id": -1 shape for unknown projects; that is
+    passed through without being stored.
+    """
+    missing = {}
+
+    def compute_existing():
+        metrics = compute()
+        if metrics["project_id"] == -1:
+            missing.update(metrics)
+            return None
+        return metrics
+
+    payload, computed_date = get_dashboard_metric(db, project_id, metric, compute_existing, scope)
+    return with_computed_date(payload, computed_date) if payload else missing
+
+
 @router.get(
     "/metrics",
     response_model=DisplayComplianceMetrics,
@@ -30,10 +51,21 @@ def get_compliance_matrics(
     db: Session = Depends(get_db),
     user: Dict = Depends(custom_auth),
 ):
-    response = get_compliance_dashboard_metrics(
-        db=db, project_id=project_id, framework_id=framework_id, user=user
+    project = get_project(db=db, project_id=project_id, user=user)
+    if not project:
+        return get_compliance_dashboard_metrics(
+            db=db, project_id=project_id, framework_id=framework_id, user=user
+        )
+
+    return _stored_metrics(
+        db,
+        project.id,
+        "compliance",
+        lambda: get_compliance_dashboard_metrics(
+            db=db, project_id=project.id, framework_id=framework_id, user=user
+        ),
+        scope=f"framework:{framework_id}",
     )
-    return response
 
 
 @router.get(
@@ -46,8 +78,15 @@ def get_compliance_metrics_cap_poam(
     db: Session = Depends(get_db),
     user: Dict = Depends(custom_auth),
 ):
-    response = get_compliance_dashboard_metrics_cap_poam(db=db, project_id=project_id, user=user)
-    return response
+    if not project_id:
+        return get_compliance_dashboard_metrics_cap_poam(db=db, project_id=project_id, user=user)
+
+    return _stored_metrics(
+        db,
+        project_id,
+        "compliance_cap_poam",
+        lambda: get_compliance_dashboard_metrics_cap_poam(db=db, project_id=project_id, user=user),
+    )
 
 
 @router.get(
@@ -60,5 +99,15 @@ def get_audit_test_by_month_for_year(
     db: Session = Depends(get_db),
     user: Dict = Depends(custom_auth),
 ):
-    response = get_compliance_audit_test_by_month_for_year(db=db, project_id=project_id, year=year)
-    return response
+    if not project_id:
+        return get_compliance_audit_test_by_month_for_year(db=db, project_id=project_id, year=year)
+
+    return _stored_metrics(
+        db,
+        project_id,
+        "compliance_audit_test_by_month",
+        lambda: get_compliance_audit_test_by_month_for_year(
+            db=db, project_id=project_id, year=year
+        ),
+        scope=f"year:{year}",
+    )
@@ -5,17 +5,23 @@ from typing import List
 import uuid
 
 from botocore.exceptions import ClientError
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.datastructures import UploadFile
 from fastapi.param_functions import File
-from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from fedrisk_api.db import document as db_document
 from fedrisk_api.db.database import get_db
 from fedrisk_api.s3 import S3Service
-from fedrisk_api.schema.document import CreateDocument, DisplayDocument, UpdateDocument
+from fedrisk_api.s3.delivery import DOCUMENT_DOWNLOAD_REDIRECT, download_response
+from fedrisk_api.s3.upload import presigned_upload, upload_file
+from fedrisk_api.schema.document import (
+    CreateDocument,
+    DisplayDocument,
+    DisplayDocumentUploadUrl,
+    UpdateDocument,
+)
 from fedrisk_api.utils.authentication import custom_auth
 
 from fedrisk_api.utils.permissions import (
@@ -44,33 +50,31 @@ except Exception as e:
     LOGGER.warning("S3 Service Error - %s", e)
 
 
-# Create document
-@router.post("/", dependencies=[Depends(create_document_permission)])
-async def create_document(
-    fileobject: UploadFile = File(...),
-    db: Session = Depends(get_db),
+def _stored_filename(filename: str) -> str:
+    return (
+        filename.split(".")[0]
+        + (datetime.utcnow().strftime("_%Y_%m_%d-%I:%M:%S"))
+        + "."
+        + str(uuid.uuid4())
+        + "."
+        + filename.split(".")[1]
+    )
+
+
+async def _create_document_record(
+    db: Session,
+    user,
+    new_filename: str,
+    file_content_type: str,
     title: str = None,
     description: str = None,
     fedrisk_object_type: str = None,
     fedrisk_object_id: int = None,
     owner_id: int = None,
     version: str = None,
-    user=Depends(custom_auth),
     keywords: str = None,
     project_id: int = None,
 ):
-    my_file_key = None
-    filename = fileobject.filename
-    new_filename = (
-        filename.split(".")[0]
-        + (datetime.utcnow().strftime("_%Y_%m_%d-%I:%M:%S"))
-        + "."
-        + str(uuid.uuid4())
-        + "."
-        + filename.split(".")[1]
-    )
-    file_content_type = fileobject.content_type
-    data = fileobject.file._file  # Converting tempfile.SpooledTemporaryFile to io.BytesIO
     try:
         document = CreateDocument(
             name=new_filename,
@@ -95,14 +99,6 @@ async def create_document(
             user["user_id"],
             project_id,
         )
-
-        if not new_document:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"tenant id {user['tenant_id']} cannot create this document",
-            )
-
-        my_file_key = f"documents/{new_document.id}-{new_document.name}"
     except IntegrityError as ie:
         LOGGER.exception("Create Document Error - Invalid Request")
         detail_message = str(ie)
@@ -110,21 +106,121 @@ async def create_document(
             detail_message = f"Document with name '{new_filename}' already exists"
         raise HTTPException(status_code=409, detail=detail_message)
 
+    if not new_document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"tenant id {user['tenant_id']} cannot create this document",
+        )
+    return new_document
+
+
+async def _upload_document_file(db: Session, tenant_id: int, fileobject: UploadFile, key: str):
+    # get s3 bucket for tenant
+    tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
     try:
-        # get s3 bucket for tenant
-        tenant = db.query(Tenant).filter(Tenant.id == user["tenant_id"]).first()
-        uploaded_file = await s3_service.upload_fileobj(
-            bucket=tenant.s3_bucket, key=my_file_key, fileobject=data
+        uploaded = await upload_file(
+            fileobject, bucket=tenant.s3_bucket, key=key, content_type=fileobject.content_type
         )
-        if uploaded_file:
-            return new_document  # response added
-        else:
-            raise HTTPException(status_code=400, detail="Failed to upload in S3")
     except ClientError:
         LOGGER.exception("S3 Upload Document  Error - Invalid Request")
         raise HTTPException(
             status_code=400, detail="Unable to Create Document Due to connection error"
         )
+    LOGGER.info(f"Uploaded document {key}: {uploaded['size']} bytes, sha256 {uploaded['sha256']}")
+
+
+# Create document
+@router.post("/", dependencies=[Depends(create_document_permission)])
+async def create_document(
+    fileobject: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    title: str = None,
+    description: str = None,
+    fedrisk_object_type: str = None,
+    fedrisk_object_id: int = None,
+    owner_id: int = None,
+    version: str = None,
+    user=Depends(custom_auth),
+    keywords: str = None,
+    project_id: int = None,
+):
+    new_document = await _create_document_record(
+        db,
+        user,
+        _stored_filename(fileobject.filename),
+        fileobject.content_type,
+        title=title,
+        description=description,
+        fedrisk_object_type=fedrisk_object_type,
+        fedrisk_object_id=fedrisk_object_id,
+        owner_id=owner_id,
+        version=version,
+        keywords=keywords,
+        project_id=project_id,
+    )
+    # the file is streamed to S3 in parts, it is never held in memory as a whole
+    await _upload_document_file(
+        db,
+        user["tenant_id"],
+        fileobject,
+        f"documents/{new_document.id}-{new_document.name}",
+    )
+    return new_document  # response added
+
+
+# Create a document whose file the browser uploads straight to S3
+@router.post(
+    "/upload_url",
+    response_model=DisplayDocumentUploadUrl,
+    dependencies=[Depends(create_document_permission)],
+)
+async def create_document_upload_url(
+    filename: str,
+    db: Session = Depends(get_db),
+    content_type: str = None,
+    title: str = None,
+    description: str = None,
+    fedrisk_object_type: str = None,
+    fedrisk_object_id: int = None,
+    owner_id: int = None,
+    version: str = None,
+    user=Depends(custom_auth),
+    keywords: str = None,
+    project_id: int = None,
+):
+    new_document = await _create_document_record(
+        db,
+        user,
+        _stored_filename(filename),
+        content_type,
+        title=title,
+        description=description,
+        fedrisk_object_type=fedrisk_object_type,
+        fedrisk_object_id=fedrisk_object_id,
+        owner_id=owner_id,
+        version=version,
+        keywords=keywords,
+        project_id=project_id,
+    )
+    # get s3 bucket for tenant
+    tenant = db.query(Tenant).filter(Tenant.id == user["tenant_id"]).first()
+    try:
+        upload = await presigned_upload(
+            tenant.s3_bucket,
+            f"documents/{new_document.id}-{new_document.name}",
+            content_type=content_type,
+        )
+    except ClientError:
+        LOGGER.exception("S3 Upload URL Error - Invalid Request")
+        raise HTTPException(
+            status_code=400, detail="Unable to Create Document Due to connection error"
+        )
+    return {
+        "document_id": new_document.id,
+        "name": new_document.name,
+        "url": upload["url"],
+        "fields": upload["fields"],
+    }
 
 
 # Read all documents
@@ -169,17 +265,8 @@ async def update_document_by_id(
     keywords: str = None,
 ):
     my_file_key = None
-    filename = fileobject.filename
-    new_filename = (
-        filename.split(".")[0]
-        + (datetime.utcnow().strftime("_%Y_%m_%d-%I:%M:%S"))
-        + "."
-        + str(uuid.uuid4())
-        + "."
-        + filename.split(".")[1]
-    )
+    new_filename = _stored_filename(fileobject.filename)
     file_content_type = fileobject.content_type
-    data = fileobject.file._file  # Converting tempfile.SpooledTemporaryFile to io.BytesIO
     try:
         document = UpdateDocument(
             # id=id,
@@ -219,21 +306,8 @@ async def update_document_by_id(
             detail_message = f"Document with name '{new_filename}' already exists"
         raise HTTPException(status_code=409, detail=detail_message)
 
-    try:
-        # get s3 bucket for tenant
-        tenant = db.query(Tenant).filter(Tenant.id == user["tenant_id"]).first()
-        uploaded_file = await s3_service.upload_fileobj(
-            bucket=tenant.s3_bucket, key=my_file_key, fileobject=data
-        )
-        if uploaded_file:
-            return db_status  # response added
-        else:
-            raise HTTPException(status_code=400, detail="Failed to upload in S3")
-    except ClientError:
-        LOGGER.exception("S3 Upload Document  Error - Invalid Request")
-        raise HTTPException(
-            status_code=400, detail="Unable to Create Document Due to connection error"
-        )
+    await _upload_document_file(db, user["tenant_id"], fileobject, my_file_key)
+    return db_status  # response added
 
 
 # Delete document
@@ -266,7 +340,13 @@ async def delete_document_by_id(id: int, db: Session = Depends(get_db), user=Dep
 
 
 @router.get("/download/{id}", dependencies=[Depends(download_document_permission)])
-async def download_file(id: int, db: Session = Depends(get_db), user=Depends(custom_auth)):
+async def download_file(
+    id: int,
+    request: Request,
+    redirect: bool = DOCUMENT_DOWNLOAD_REDIRECT,
+    db: Session = Depends(get_db),
+    user=Depends(custom_auth),
+):
     LOGGER.info(f"Download File - about to get document: {id} from database . . .")
     document = db_document.get_document(
         db=db, id=id, tenant_id=user["tenant_id"], user_id=user["user_id"]
@@ -277,28 +357,13 @@ async def download_file(id: int, db: Session = Depends(get_db), user=Depends(cus
             detail=f"Document with id {id} does not exist",
         )
 
-    my_file_key = f"documents/{id}-{document.name}"
-
-    async def s3_stream(chunk_size: int = 4096):
-        try:
-            # get s3 bucket for tenant
-            tenant = db.query(Tenant).filter(Tenant.id == user["tenant_id"]).first()
-            # s3_obj = boto3_s3_client.get_object(Bucket=BUCKET_NAME, Key=my_file_key)
-            s3_obj = await s3_service.get_file_object(bucket=tenant.s3_bucket, key=my_file_key)
-
-            stream = s3_obj["Body"]
-            chunk = stream.read(chunk_size)
-            while chunk:
-                yield chunk
-                chunk = stream.read(chunk_size)
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "NoSuchKey":
-                raise HTTPException(status_code=404, detail="Item not found")
-            else:
-                raise e
-
-    return StreamingResponse(
-        s3_stream(),
+    # get s3 bucket for tenant
+    tenant = db.query(Tenant).filter(Tenant.id == user["tenant_id"]).first()
+    return await download_response(
+        request,
+        bucket=tenant.s3_bucket,
+        key=f"documents/{id}-{document.name}",
+        filename=document.name,
         media_type=document.file_content_type,
-        headers={"Content-Disposition": f"attachment;filename={document.name}"},
+        redirect=redirect,
     )
@@ -0,0 +1,56 @@
+import asyncio
+import json
+import logging
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from fedrisk_api.utils.authentication import custom_auth
+from fedrisk_api.utils.event_stream import (
+    EVENT_STREAM_HEARTBEAT_SECONDS,
+    Subscription,
+    event_broker,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+def _server_sent_event(name: str, data: dict) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _stream(request: Request, subscription: Subscription):
+    try:
+        # clients reconnect after this many milliseconds when the connection drops
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                stream_event = await asyncio.wait_for(
+                    subscription.queue.get(), EVENT_STREAM_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": heartbeat\n\n"
+                continue
+            if subscription.overflowed:
+                # events were dropped, the client reloads what it shows instead
+                subscription.overflowed = False
+                yield _server_sent_event("resync", {})
+            yield _server_sent_event(stream_event["event"], stream_event["data"])
+    finally:
+        event_broker.unsubscribe(subscription)
+
+
+# Server-sent events for the user: notifications_changed, import_job and dashboard_invalidated
+@router.get("/stream")
+async def stream_events(request: Request, user=Depends(custom_auth)):
+    subscription = event_broker.subscribe(user["tenant_id"], user["user_id"])
+    return StreamingResponse(
+        _stream(request, subscription),
+        media_type="text/event-stream",
+        # keeps proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy import Integer, case, func, literal_column, or_, union_all
 from sqlalchemy.orm import Session, contains_eager
 
 import logging
 
+from fedrisk_api.db import governance_dashboard as db_governance_dashboard
 from fedrisk_api.db.dashboard import get_framework, get_project
+from fedrisk_api.db.dashboard_metrics import get_dashboard_metric, with_computed_date
 from fedrisk_api.db.database import get_db
 from fedrisk_api.db.models import (
     Assessment,
@@ -28,11 +30,13 @@ from fedrisk_api.schema.exception import DisplayExceptionReview
 from fedrisk_api.utils.authentication import custom_auth
 from fedrisk_api.utils.enumsdata import (
     AssessmentsFilterBy,
+    ControlBreakdownDimension,
     ControlFilterByOperation,
     ControlsFilterBy,
     ExceptionsFilterBy,
 )
 from fedrisk_api.utils.permissions import view_governance_dashboard
+from fedrisk_api.utils.response_cache import cached_response
 from fedrisk_api.utils.utils import PaginateResponse, pagination
 
 LOGGER = logging.getLogger(__name__)
@@ -171,11 +175,23 @@ STATUS_TYPE_VALUE = {
     dependencies=[Depends(view_governance_dashboard)],
 )
 def get_project_framework_metrics(
+    request: Request,
     project_id: int = None,
     framework_id: int = None,
     db: Session = Depends(get_db),
     user=Depends(custom_auth),
 ):
+    return cached_response(
+        request,
+        user,
+        lambda: _project_framework_metrics(db, user, project_id, framework_id),
+        project_id=project_id,
+        per_user=True,
+        response_model=DisplayGovernanceDashboardMetrics,
+    )
+
+
+def _project_framework_metrics(db: Session, user, project_id: int, framework_id: int):
     project = get_project(db, project_id=project_id, user=user)
     if not project:
         return DisplayGovernanceDashboardMetrics(
@@ -209,6 +225,17 @@ def get_project_framework_metrics(
             control_exception_count=0,
         )
 
+    payload, computed_date = get_dashboard_metric(
+        db,
+        project.id,
+        "governance",
+        lambda: _compute_governance_metrics(db, project, framework, user),
+        scope=f"framework:{framework.id}",
+    )
+    return with_computed_date(payload, computed_date)
+
+
+def _compute_governance_metrics(db: Session, project, framework, user):
     control_project_framework_subquery = (
         db.query(Control)
         .join(ProjectControl, ProjectControl.control_id == Control.id)
@@ -652,10 +679,17 @@ def get_all_project_assessments(
     "/project_controls/mit-percentage/",
 )
 def get_mit_percentage(
+    request: Request,
     project_id: int = None,
     db: Session = Depends(get_db),
     user=Depends(custom_auth),
 ):
+    return cached_response(
+        request, user, lambda: _mit_percentage(db, project_id), project_id=project_id
+    )
+
+
+def _mit_percentage(db: Session, project_id: int):
     mit_perc_joins = db.query(ProjectControl).join(Control)
     mit_perc_filter = mit_perc_joins.filter(ProjectControl.project_id == project_id)
     mit_perc_filter_subquery = mit_perc_filter.with_entities(
@@ -670,177 +704,73 @@ def get_mit_percentage(
     return chart_data
 
 
+def _cached_control_breakdown(request: Request, db: Session, user, project_id: int, dimension):
+    return cached_response(
+        request,
+        user,
+        lambda: db_governance_dashboard.get_control_breakdown(
+            db, project_id, user["tenant_id"], dimension
+        ),
+        project_id=project_id,
+    )
+
+
+@router.get(
+    "/project_controls/breakdown/",
+)
+def get_control_breakdown(
+    request: Request,
+    dimension: ControlBreakdownDimension,
+    project_id: int = None,
+    db: Session = Depends(get_db),
+    user=Depends(custom_auth),
+):
+    return _cached_control_breakdown(request, db, user, project_id, dimension.value)
+
+
 @router.get(
     "/project_controls/class-names-percentage/",
 )
 def get_class_names_percentage(
+    request: Request,
     project_id: int = None,
     db: Session = Depends(get_db),
     user=Depends(custom_auth),
 ):
-    # get all the project controls
-    class_perc_joins = db.query(ProjectControl)
-    class_perc_filter = class_perc_joins.filter(ProjectControl.project_id == project_id)
-    class_perc_filter_subquery = class_perc_filter.with_entities(
-        ProjectControl.mitigation_percentage,
-        ProjectControl.control_class_id,
-    ).subquery()
-    class_perc_results = db.query(class_perc_filter_subquery).all()
-    # get all the control class ids and names
-    classes = db.query(ControlClass)
-    class_filter = classes.filter(ControlClass.tenant_id == user["tenant_id"])
-    class_filter_subquery = class_filter.with_entities(
-        ControlClass.name,
-        ControlClass.id,
-    ).subquery()
-    class_results = db.query(class_filter_subquery).all()
-    chart_data = []
-    matches = 0
-    percent = 0
-    for classres in class_results:
-        for classperc in class_perc_results:
-            if classres.id == classperc.control_class_id:
-                percent = percent + classperc.mitigation_percentage
-                matches = matches + 1
-        if matches > 1:
-            average = percent / round(matches, 2)
-            datapoint = {"x": classres.name, "y": matches, "percent": round(average, 2)}
-            chart_data.append(datapoint)
-        else:
-            datapoint = {"x": classres.name, "y": matches, "percent": percent}
-            chart_data.append(datapoint)
-        matches = 0
-        percent = 0
-    return chart_data
+    return _cached_control_breakdown(request, db, user, project_id, "class")
 
 
 @router.get(
     "/project_controls/class-family-percentage/",
 )
 def get_class_family_percentage(
+    request: Request,
     project_id: int = None,
     db: Session = Depends(get_db),
     user=Depends(custom_auth),
 ):
-    # get all the project controls
-    class_perc_joins = db.query(ProjectControl)
-    class_perc_filter = class_perc_joins.filter(ProjectControl.project_id == project_id)
-    class_perc_filter_subquery = class_perc_filter.with_entities(
-        ProjectControl.mitigation_percentage,
-        ProjectControl.control_family_id,
-    ).subquery()
-    class_perc_results = db.query(class_perc_filter_subquery).all()
-    # get all the control class ids and names
-    classes = db.query(ControlFamily)
-    class_filter = classes.filter(ControlFamily.tenant_id == user["tenant_id"])
-    class_filter_subquery = class_filter.with_entities(
-        ControlFamily.name,
-        ControlFamily.id,
-    ).subquery()
-    class_results = db.query(class_filter_subquery).all()
-    chart_data = []
-    matches = 0
-    percent = 0
-    for classres in class_results:
-        for classperc in class_perc_results:
-            if classres.id == classperc.control_family_id:
-                percent = percent + classperc.mitigation_percentage
-                matches = matches + 1
-        if matches > 1:
-            average = percent / round(matches, 2)
-            datapoint = {"x": classres.name, "y": matches, "percent": round(average, 2)}
-            chart_data.append(datapoint)
-        else:
-            datapoint = {"x": classres.name, "y": matches, "percent": percent}
-            chart_data.append(datapoint)
-        matches = 0
-        percent = 0
-    return chart_data
+    return _cached_control_breakdown(request, db, user, project_id, "family")
 
 
 @router.get(
     "/project_controls/class-phase-percentage/",
 )
 def get_class_phase_percentage(
+    request: Request,
     project_id: int = None,
     db: Session = Depends(get_db),
     user=Depends(custom_auth),
 ):
-    # get all the project controls
-    class_perc_joins = db.query(ProjectControl)
-    class_perc_filter = class_perc_joins.filter(ProjectControl.project_id == project_id)
-    class_perc_filter_subquery = class_perc_filter.with_entities(
-        ProjectControl.mitigation_percentage,
-        ProjectControl.control_phase_id,
-    ).subquery()
-    class_perc_results = db.query(class_perc_filter_subquery).all()
-    # get all the control class ids and names
-    classes = db.query(ControlPhase)
-    class_filter = classes.filter(ControlPhase.tenant_id == user["tenant_id"])
-    class_filter_subquery = class_filter.with_entities(
-        ControlPhase.name,
-        ControlPhase.id,
-    ).subquery()
-    class_results = db.query(class_filter_subquery).all()
-    chart_data = []
-    matches = 0
-    percent = 0
-    for classres in class_results:
-        for classperc in class_perc_results:
-            if classres.id == classperc.control_phase_id:
-                percent = percent + classperc.mitigation_percentage
-                matches = matches + 1
-        if matches > 1:
-            average = percent / round(matches, 2)
-            datapoint = {"x": classres.name, "y": matches, "percent": round(average, 2)}
-            chart_data.append(datapoint)
-        else:
-            datapoint = {"x": classres.name, "y": matches, "percent": percent}
-            chart_data.append(datapoint)
-        matches = 0
-        percent = 0
-    return chart_data
+    return _cached_control_breakdown(request, db, user, project_id, "phase")
 
 
 @router.get(
     "/project_controls/class-status-percentage/",
 )
 def get_class_status_percentage(
+    request: Request,
     project_id: int = None,
     db: Session = Depends(get_db),
     user=Depends(custom_auth),
 ):
-    # get all the project controls
-    class_perc_joins = db.query(ProjectControl)
-    class_perc_filter = class_perc_joins.filter(ProjectControl.project_id == project_id)
-    class_perc_filter_subquery = class_perc_filter.with_entities(
-        ProjectControl.mitigation_percentage,
-        ProjectControl.control_status_id,
-    ).subquery()
-    class_perc_results = db.query(class_perc_filter_subquery).all()
-    # get all the control class ids and names
-    classes = db.query(ControlStatus)
-    class_filter = classes.filter(ControlStatus.tenant_id == user["tenant_id"])
-    class_filter_subquery = class_filter.with_entities(
-        ControlStatus.name,
-        ControlStatus.id,
-    ).subquery()
-    class_results = db.query(class_filter_subquery).all()
-    chart_data = []
-    matches = 0
-    percent = 0
-    for classres in class_results:
-        for classperc in class_perc_results:
-            if classres.id == classperc.control_status_id:
-                percent = percent + classperc.mitigation_percentage
-                matches = matches + 1
-        if matches > 1:
-            average = percent / round(matches, 2)
-            datapoint = {"x": classres.name, "y": matches, "percent": round(average, 2)}
-            chart_data.append(datapoint)
-        else:
-            datapoint = {"x": classres.name, "y": matches, "percent": percent}
-            chart_data.append(datapoint)
-        matches = 0
-        percent = 0
-    return chart_data
+    return _cached_control_breakdown(request, db, user, project_id, "status")
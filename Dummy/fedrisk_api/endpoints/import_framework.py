@@ -7,22 +7,25 @@ from typing import List
 # import subprocess
 
 import pandas as pd
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.datastructures import UploadFile
 from fastapi.param_functions import File
-from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from fedrisk_api.db import import_framework as db_import_framework
+from fedrisk_api.db import import_job as db_import_job
 from fedrisk_api.db.database import get_db
+from fedrisk_api.db.enums import ImportJobType
 
 from fedrisk_api.db.util.import_framework_utils import (
     remove_data_from_dataframe as remove_data_from_dataframe_util,
 )
 from fedrisk_api.s3 import S3Service
+from fedrisk_api.s3.delivery import download_response
 from fedrisk_api.schema.import_framework import CreateImportFramework, DisplayImportFramework
 from fedrisk_api.utils.authentication import custom_auth
+from fedrisk_api.utils.import_queue import import_job_queue
 from fedrisk_api.utils.permissions import (
     create_import_framework_permission,
     delete_import_framework_permission,
@@ -92,19 +95,17 @@ async def create_import_framework(
             bucket=tenant.s3_bucket, key=my_file_key, fileobject=data
         )
         if uploads3:
-            # # get user is_superuser
-            # user_details = db_import_framework.get_user_framework_import(
-            #     db=db, user_id=user["user_id"]
-            # )
-            # LOGGER.info(f"{user_details}")
-            # # import file data using util
-            # my_data_frame = pd.read_excel(data)
-            # framework_control_num = load_data_from_dataframe_util(
-            #     my_data_frame, user["tenant_id"], user_details.is_superuser
-            # )
-            # LOGGER.info(f"Successfully loaded {framework_control_num[0]} frameworks.")
-            # LOGGER.info(f"Successfully loaded {framework_control_num[1]} controls.")
-            # LOGGER.info(f"Successfully loaded {framework_control_num[2]} framework_versions.")
+            # imported in the background once the upload has been scanned
+            import_job = db_import_job.create_import_job(
+                db,
+                ImportJobType.framework,
+                user["tenant_id"],
+                my_file_key,
+                user_id=user["user_id"],
+                source_id=new_importframework.id,
+            )
+            import_job_queue.submit(import_job.id)
+            new_importframework.import_job_id = import_job.id
             return new_importframework  # response added
         else:
             raise HTTPException(status_code=400, detail="Failed to upload in S3")
@@ -192,9 +193,8 @@ def delete_import_framework_by_id(
 
 @router.get("/download/{id}", dependencies=[Depends(download_import_framework_permission)])
 async def download_import_framework_file(
-    id: int, db: Session = Depends(get_db), user=Depends(custom_auth)
+    id: int, request: Request, db: Session = Depends(get_db), user=Depends(custom_auth)
 ):
-    s3_service = S3Service()
     LOGGER.info(f"Download File - about to get document: {id} from database . . .")
     importframework = db_import_framework.get_import_framework(
         db=db, id=id, tenant_id=user["tenant_id"]
@@ -205,24 +205,12 @@ async def download_import_framework_file(
             detail=f"Import framework with id {id} does not exist",
         )
 
-    my_file_key = f"frameworks/{id}-{importframework.name}"
     # get s3 bucket for tenant
     tenant = db.query(Tenant).filter(Tenant.id == user["tenant_id"]).first()
-
-    async def s3_stream(chunk_size: int = 4096):
-        try:
-            s3_obj = await s3_service.get_file_object(bucket=tenant.s3_bucket, key=my_file_key)
-
-            stream = s3_obj["Body"]
-            chunk = stream.read(chunk_size)
-            while chunk:
-                yield chunk
-                chunk = stream.read(chunk_size)
-        except Exception as e:
-            raise e
-
-    return StreamingResponse(
-        s3_stream(),
+    return await download_response(
+        request,
+        bucket=tenant.s3_bucket,
+        key=f"frameworks/{id}-{importframework.name}",
+        filename=importframework.name,
         media_type=importframework.file_content_type,
-        headers={"Content-Disposition": f"attachment;filename={importframework.name}"},
     )
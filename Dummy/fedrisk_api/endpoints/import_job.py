@@ -0,0 +1,43 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from fedrisk_api.db import import_job as db_import_job
+from fedrisk_api.db.database import get_db
+from fedrisk_api.db.enums import ImportJobStatus, ImportJobType
+from fedrisk_api.schema.import_job import DisplayImportJob
+from fedrisk_api.utils.authentication import custom_auth
+from fedrisk_api.utils.utils import PaginateResponse, pagination
+
+LOGGER = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/import_jobs", tags=["import_jobs"])
+
+
+# Read all import jobs of the tenant, newest first
+@router.get("/", response_model=PaginateResponse[DisplayImportJob])
+def get_all_import_jobs(
+    job_status: ImportJobStatus = None,
+    import_type: ImportJobType = None,
+    offset: int = 0,
+    limit: int = 10,
+    db: Session = Depends(get_db),
+    user=Depends(custom_auth),
+):
+    queryset = db_import_job.get_all_import_jobs(
+        db, user["tenant_id"], status=job_status, import_type=import_type
+    )
+    return pagination(query=queryset, offset=offset, limit=limit)
+
+
+# Poll one import job for its status, progress and row errors
+@router.get("/{id}", response_model=DisplayImportJob)
+def get_import_job_by_id(id: int, db: Session = Depends(get_db), user=Depends(custom_auth)):
+    import_job = db_import_job.get_import_job(db=db, id=id, tenant_id=user["tenant_id"])
+    if not import_job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job with id {id} does not exist",
+        )
+    return import_job
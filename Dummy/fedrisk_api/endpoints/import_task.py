@@ -7,29 +7,32 @@ from typing import List
 # import subprocess
 
 import pandas as pd
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.datastructures import UploadFile
 from fastapi.param_functions import File
-from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from fedrisk_api.db import import_job as db_import_job
 from fedrisk_api.db import import_task as db_import_task
 from fedrisk_api.db.database import get_db
+from fedrisk_api.db.enums import ImportJobType
 
 # from fedrisk_api.db.util.import_task_utils import (
 #     remove_data_from_dataframe as remove_data_from_dataframe_util,
 # )
 from fedrisk_api.s3 import S3Service
+from fedrisk_api.s3.delivery import download_response
 from fedrisk_api.schema.import_task import CreateImportTask, DisplayImportTask
 from fedrisk_api.utils.authentication import custom_auth
+from fedrisk_api.utils.import_queue import import_job_queue
 from fedrisk_api.utils.permissions import (
     create_task_permission,
     delete_task_permission,
     view_task_permission,
 )
 
-from fedrisk_api.db.models import Tenant
+from fedrisk_api.db.models import Tenant, WBS
 
 # AWS_S3_BUCKET = "fedriskapi-tasks-bucket"
 
@@ -92,19 +95,19 @@ async def create_import_task(
             bucket=tenant.s3_bucket, key=my_file_key, fileobject=data
         )
         if uploads3:
-            # # get user is_superuser
-            # user_details = db_import_task.get_user_task_import(
-            #     db=db, user_id=user["user_id"]
-            # )
-            # LOGGER.info(f"{user_details}")
-            # # import file data using util
-            # my_data_frame = pd.read_excel(data)
-            # task_control_num = load_data_from_dataframe_util(
-            #     my_data_frame, user["tenant_id"], user_details.is_superuser
-            # )
-            # LOGGER.info(f"Successfully loaded {task_control_num[0]} tasks.")
-            # LOGGER.info(f"Successfully loaded {task_control_num[1]} controls.")
-            # LOGGER.info(f"Successfully loaded {task_control_num[2]} task_versions.")
+            # imported in the background once the upload has been scanned
+            project_id = db.query(WBS.project_id).filter(WBS.id == new_importtask.wbs_id).scalar()
+            import_job = db_import_job.create_import_job(
+                db,
+                ImportJobType.task,
+                user["tenant_id"],
+                my_file_key,
+                user_id=user["user_id"],
+                source_id=new_importtask.id,
+                params={"project_id": project_id, "wbs_id": new_importtask.wbs_id},
+            )
+            import_job_queue.submit(import_job.id)
+            new_importtask.import_job_id = import_job.id
             return new_importtask  # response added
         else:
             raise HTTPException(status_code=400, detail="Failed to upload in S3")
@@ -194,9 +197,8 @@ def get_import_task_by_id(id: int, db: Session = Depends(get_db), user=Depends(c
 
 @router.get("/download/{id}", dependencies=[Depends(view_task_permission)])
 async def download_import_task_file(
-    id: int, db: Session = Depends(get_db), user=Depends(custom_auth)
+    id: int, request: Request, db: Session = Depends(get_db), user=Depends(custom_auth)
 ):
-    s3_service = S3Service()
     LOGGER.info(f"Download File - about to get document: {id} from database . . .")
     importtask = db_import_task.get_import_task(db=db, id=id, tenant_id=user["tenant_id"])
     if not importtask:
@@ -205,24 +207,12 @@ async def download_import_task_file(
             detail=f"Import task with id {id} does not exist",
         )
 
-    my_file_key = f"tasks/{id}-{importtask.name}"
     # get s3 bucket for tenant
     tenant = db.query(Tenant).filter(Tenant.id == user["tenant_id"]).first()
-
-    async def s3_stream(chunk_size: int = 4096):
-        try:
-            s3_obj = await s3_service.get_file_object(bucket=tenant.s3_bucket, key=my_file_key)
-
-            stream = s3_obj["Body"]
-            chunk = stream.read(chunk_size)
-            while chunk:
-                yield chunk
-                chunk = stream.read(chunk_size)
-        except Exception as e:
-            raise e
-
-    return StreamingResponse(
-        s3_stream(),
+    return await download_response(
+        request,
+        bucket=tenant.s3_bucket,
+        key=f"tasks/{id}-{importtask.name}",
+        filename=importtask.name,
         media_type=importtask.file_content_type,
-        headers={"Content-Disposition": f"attachment;filename={importtask.name}"},
     )
@@ -0,0 +1,52 @@
+import logging
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from fedrisk_api.db import scheduled_job_run as db_scheduled_job_run
+from fedrisk_api.db.database import get_db
+from fedrisk_api.schema.job_scheduler import DisplayScheduledJob, DisplayScheduledJobRun
+from fedrisk_api.utils.authentication import custom_auth
+from fedrisk_api.utils.job_scheduler import job_scheduler
+from fedrisk_api.utils.permissions import view_job_scheduler_permission
+from fedrisk_api.utils.utils import PaginateResponse, pagination
+
+LOGGER = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/job_scheduler", tags=["job_scheduler"])
+
+
+# Read the periodic jobs with their intervals, timing metrics and latest run
+@router.get(
+    "/jobs",
+    response_model=List[DisplayScheduledJob],
+    dependencies=[Depends(view_job_scheduler_permission)],
+)
+def get_scheduled_jobs(db: Session = Depends(get_db), user=Depends(custom_auth)):
+    last_runs = db_scheduled_job_run.get_last_scheduled_job_runs(db, list(job_scheduler.jobs))
+    return [
+        {**job, "last_run": last_runs.get(job["name"])} for job in job_scheduler.describe()
+    ]
+
+
+# Read the run history of one job, newest first
+@router.get(
+    "/jobs/{job_name}/runs",
+    response_model=PaginateResponse[DisplayScheduledJobRun],
+    dependencies=[Depends(view_job_scheduler_permission)],
+)
+def get_scheduled_job_runs(
+    job_name: str,
+    offset: int = 0,
+    limit: int = 10,
+    db: Session = Depends(get_db),
+    user=Depends(custom_auth),
+):
+    if job_name not in job_scheduler.jobs:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Scheduled job {job_name} does not exist",
+        )
+    queryset = db_scheduled_job_run.get_scheduled_job_runs(db, job_name)
+    return pagination(query=queryset, offset=offset, limit=limit)
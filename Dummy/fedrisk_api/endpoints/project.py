@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 
 from fedrisk_api.db import project as db_project
 from fedrisk_api.db.database import get_db
-from fedrisk_api.db.models import ProjectUser, Role
+from fedrisk_api.db.models import Project
 from fedrisk_api.schema.control import DisplayControl
 from fedrisk_api.schema.wbs import DisplayWBS
 from fedrisk_api.schema.project import (
@@ -20,6 +20,7 @@ from fedrisk_api.schema.project import (
     ChangeProjectUserRole,
     CreateProject,
     DisplayProject,
+    DisplayProjectListItem,
     DisplayProjectUsers,
     ProjectPendingTasks,
     RemoveProjectUser,
@@ -43,16 +44,18 @@ from fedrisk_api.utils.permissions import (
     update_project_permission,
     view_project_permission,
 )
+from fedrisk_api.utils.enumsdata import PaginationTotal
 from fedrisk_api.utils.utils import (
     PaginateResponse,
     delete_documents_for_fedrisk_object,
     # get_modify_objects,
+    keyset_order,
     pagination,
     verify_add_user_to_multiple_project,
     verify_add_user_to_project,
 )
 
-from fedrisk_api.db.util.encrypt_pii_utils import decrypt_user_fields
+from fedrisk_api.db.util.encrypt_pii_utils import decrypt_users_fields
 
 from fedrisk_api.schema.user import DisplayUser, DisplayRole
 
@@ -60,6 +63,8 @@ router = APIRouter(prefix="/projects", tags=["projects"])
 LOGGER = logging.getLogger(__name__)
 
 PROJECT_ADMIN_ROLE = "Project Administrator"
+# sort columns with a (tenant_id, column, id) index that can back a pagination cursor
+PROJECT_KEYSET_COLUMNS = ("name", "created_date")
 
 
 # Create project
@@ -92,7 +97,7 @@ async def create_project(
 # Read all projects
 @router.get(
     "/",
-    response_model=PaginateResponse[DisplayProject],
+    response_model=PaginateResponse[DisplayProjectListItem],
     dependencies=[Depends(view_project_permission)],
 )
 def get_all_projects(
@@ -103,6 +108,8 @@ def get_all_projects(
     limit: int = 10,
     sort_by: str = "name",
     get_role: bool = False,
+    after: str = None,
+    total: PaginationTotal = PaginationTotal.exact,
     db: Session = Depends(get_db),
     user=Depends(custom_auth),
 ):
@@ -116,21 +123,19 @@ def get_all_projects(
             filter_by=filter_by,
             filter_value=filter_value,
             sort_by=sort_by,
+            with_role=get_role,
+        )
+        response = pagination(
+            query=queryset,
+            offset=offset,
+            limit=limit,
+            after=after,
+            total=total,
+            keyset=keyset_order(Project, sort_by, PROJECT_KEYSET_COLUMNS),
         )
-        response = pagination(query=queryset, offset=offset, limit=limit)
-        # Adding user_role in project
-        all_roles = {role.id: role.name for role in db.query(Role).all()}
-        project_users = db.query(ProjectUser).filter(ProjectUser.user_id == user["user_id"]).all()
-
-        if get_role:
-            for project in response["items"]:
-                for project_user in project_users:
-                    if project_user.project_id == project.id:
-                        setattr(project, "my_role", all_roles.get(project_user.role_id))
-                        break
-                else:
-                    setattr(project, "my_role", None)
         return response
+    except HTTPException:
+        raise
     except Exception:
         LOGGER.exception("List Project Error Invalid Request")
         raise HTTPException(
@@ -524,9 +529,12 @@ def get_project_associated_user(
         paginated = pagination(query=queryset, limit=limit, offset=offset)
 
         # Decrypt user fields and convert to schemas
+        # decrypt the whole page at once instead of one user at a time
+        decrypted_user_dicts = decrypt_users_fields(
+            [user_obj for user_obj, _ in paginated["items"]]
+        )
         items = []
-        for user_obj, role_obj in paginated["items"]:
-            decrypted_user_dict = decrypt_user_fields(user_obj)  # your custom decryption logic
+        for decrypted_user_dict, (_, role_obj) in zip(decrypted_user_dicts, paginated["items"]):
             decrypted_user = DisplayUser(**decrypted_user_dict)
             role = DisplayRole(id=role_obj.id, name=role_obj.name)
             items.append({"user": decrypted_user, "role": role})
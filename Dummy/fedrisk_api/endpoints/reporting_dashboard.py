@@ -1,7 +1,7 @@
 from typing import Dict
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 # from fedrisk_api.db.compliance_dashboard import get_compliance_dashboard_metrics
@@ -9,6 +9,7 @@ from fedrisk_api.db.database import get_db
 
 from sqlalchemy.exc import IntegrityError
 from fedrisk_api.utils.authentication import custom_auth
+from fedrisk_api.utils.response_cache import cached_response
 
 from fedrisk_api.schema.reporting_dashboard import (
     CreateReportingSettings,
@@ -51,11 +52,16 @@ def get_risk_by_category_count_per_month(
     # dependencies=[Depends(view_compliance_dashboard)],
 )
 def get_project_data_for_pivot(
+    request: Request,
     db: Session = Depends(get_db),
     user: Dict = Depends(custom_auth),
 ):
-    response = get_data_for_pivot(db=db, tenant_id=user["tenant_id"], user_id=user["user_id"])
-    return response
+    return cached_response(
+        request,
+        user,
+        lambda: get_data_for_pivot(db=db, tenant_id=user["tenant_id"], user_id=user["user_id"]),
+        per_user=True,
+    )
 
 
 # POST endpoint for reporting settings
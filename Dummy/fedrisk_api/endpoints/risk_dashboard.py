@@ -3,6 +3,7 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from fedrisk_api.db.dashboard import get_project
+from fedrisk_api.db.dashboard_metrics import get_dashboard_metric, with_computed_date
 from fedrisk_api.db.database import get_db
 from fedrisk_api.db.models import (
     Risk,
@@ -12,15 +13,13 @@ from fedrisk_api.db.models import (
     RiskScore,
     RiskStatus,
 )
+from fedrisk_api.db.risk_matrix import RISK_LEVEL_DISPLAY_NAMES, count_risk_levels
 from fedrisk_api.schema.risk_dashboard import DisplayRiskDashboardMetrics
 from fedrisk_api.utils.authentication import custom_auth
 from fedrisk_api.utils.permissions import view_risk_dashboard
-from fedrisk_api.utils.utils import get_risk_mapping_metrics
 
 router = APIRouter(prefix="/dashboards", tags=["dashboards"])
 
-risk_mapping_metrics = get_risk_mapping_metrics()
-
 RISK_ATTRIBUTES = {
     "risk_score": {"10", "5", "1"},
     "risk_status": {"Active", "On Hold", "Completed", "Cancelled"},
@@ -62,10 +61,13 @@ def get_risk_metrics(
             risk_mapping=[],
         )
 
-    project_risk = db.query(Risk).filter(Risk.project_id == project.id).distinct().all()
+    payload, computed_date = get_dashboard_metric(
+        db, project.id, "risk", lambda: _compute_risk_metrics(db, project)
+    )
+    return with_computed_date(payload, computed_date)
 
-    all_risks_ids = {risk.id for risk in project_risk}
 
+def _compute_risk_metrics(db: Session, project):
     risk_status = (
         db.query(
             RiskStatus.name,
@@ -73,7 +75,7 @@ def get_risk_metrics(
         )
         .select_from(Risk)
         .join(RiskStatus, RiskStatus.id == Risk.risk_status_id)
-        .filter(Risk.id.in_(all_risks_ids))
+        .filter(Risk.project_id == project.id)
         .group_by(RiskStatus.name)
         .all()
     )
@@ -85,7 +87,7 @@ def get_risk_metrics(
         )
         .select_from(Risk)
         .join(RiskCategory, RiskCategory.id == Risk.risk_category_id)
-        .filter(Risk.id.in_(all_risks_ids))
+        .filter(Risk.project_id == project.id)
         .group_by(RiskCategory.name)
         .all()
     )
@@ -97,7 +99,7 @@ def get_risk_metrics(
         )
         .select_from(Risk)
         .join(RiskScore, RiskScore.id == Risk.risk_score_id)
-        .filter(Risk.id.in_(all_risks_ids))
+        .filter(Risk.project_id == project.id)
         .group_by(RiskScore.name)
         .all()
     )
@@ -106,7 +108,7 @@ def get_risk_metrics(
         db.query(RiskImpact.name, func.count("*").label("count"))
         .select_from(Risk)
         .join(RiskImpact, RiskImpact.id == Risk.risk_impact_id)
-        .filter(Risk.id.in_(all_risks_ids))
+        .filter(Risk.project_id == project.id)
         .group_by(RiskImpact.name)
         .all()
     )
@@ -118,7 +120,7 @@ def get_risk_metrics(
         )
         .select_from(Risk)
         .join(RiskLikelihood, RiskLikelihood.id == Risk.current_likelihood_id)
-        .filter(Risk.id.in_(all_risks_ids))
+        .filter(Risk.project_id == project.id)
         .group_by(RiskLikelihood.name)
         .all()
     )
@@ -136,45 +138,10 @@ def get_risk_metrics(
         for missing_value in missing_values:
             risk_attr_value[0].append({"name": missing_value, "count": 0})
 
-    risks = (
-        db.query(
-            RiskLikelihood.name.label("current_likelihood"), RiskImpact.name.label("risk_impact")
-        )
-        .select_from(Risk)
-        .join(RiskLikelihood, RiskLikelihood.id == Risk.current_likelihood_id)
-        .join(RiskImpact, RiskImpact.id == Risk.risk_impact_id)
-        .filter(Risk.id.in_(all_risks_ids))
-        .all()
-    )
-
-    low_count = 0
-    low_medium_count = 0
-    medium_count = 0
-    medium_high_count = 0
-    high_count = 0
-    for risk in risks:
-        current_likelihood_name = "_".join(risk.current_likelihood.split(" "))
-        risk_matrics_key = f"{current_likelihood_name}__{risk.risk_impact}".lower()
-        for key, value in risk_mapping_metrics.items():
-            for risk_matrics in set(value):
-                if risk_matrics_key == risk_matrics:
-                    if key == "low":
-                        low_count += 1
-                    elif key == "low_medium":
-                        low_medium_count += 1
-                    elif key == "medium":
-                        medium_count += 1
-                    elif key == "medium_high":
-                        medium_high_count += 1
-                    elif key == "high":
-                        high_count += 1
-
+    risk_levels = count_risk_levels(db, Risk.project_id == project.id)
     risk_mapping = [
-        {"name": "Low", "count": low_count},
-        {"name": "Low-Medium", "count": low_medium_count},
-        {"name": "Medium", "count": medium_count},
-        {"name": "Medium-High", "count": medium_high_count},
-        {"name": "High", "count": high_count},
+        {"name": RISK_LEVEL_DISPLAY_NAMES[level], "count": count}
+        for level, count in risk_levels.items()
     ]
 
     return DisplayRiskDashboardMetrics(
@@ -0,0 +1,45 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import DataError
+from sqlalchemy.orm import Session
+
+from fedrisk_api.db import search as db_search
+from fedrisk_api.db.database import get_db
+from fedrisk_api.schema.search import DisplaySearchDocument
+from fedrisk_api.utils.authentication import custom_auth
+from fedrisk_api.utils.utils import PaginateResponse
+
+LOGGER = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+# Global search across projects, risks, controls, assessments, tasks, documents and evaluations
+@router.get("/", response_model=PaginateResponse[DisplaySearchDocument])
+def search(
+    q: str,
+    object_type: str = None,
+    limit: int = 10,
+    offset: int = 0,
+    db: Session = Depends(get_db),
+    user=Depends(custom_auth),
+):
+    object_types = [value.strip() for value in object_type.split(",")] if object_type else None
+    unknown_types = set(object_types or ()) - set(db_search.SEARCH_SPECS)
+    if unknown_types:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported object_type {', '.join(sorted(unknown_types))}",
+        )
+    try:
+        total, items = db_search.search_documents(
+            q, db, user["tenant_id"], user["user_id"], object_types, offset, limit
+        )
+    except DataError:
+        LOGGER.exception("Search Error - Invalid request")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="LIMIT and OFFSET must not be negative",
+        )
+    return {"items": items, "total": total, "limit": limit, "offset": offset}
@@ -416,6 +416,10 @@ async def webhook_received(
     settings = Settings()
     email_service = EmailService(config=Settings())
 
+    # mirror subscription state locally so authorization never calls stripe
+    if event_type.startswith("customer.subscription."):
+        db_subscription.sync_tenant_subscription_status(data["object"], db)
+
     if event_type == "invoice.paid":
         customer = payment_client.get_customer_by_id(data["object"]["customer"])
         subscription = payment_client.get_subscription_by_id(data["object"]["subscription"])
@@ -1,9 +1,10 @@
 import math
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session, selectinload
 
 from fedrisk_api.db import summary_dashboard as db_summary_dashboard
+from fedrisk_api.db.dashboard_metrics import get_dashboard_metric, with_computed_date
 from fedrisk_api.db.database import get_db
 from fedrisk_api.db.models import (
     Control,
@@ -26,6 +27,7 @@ from fedrisk_api.utils.permissions import (
     view_projecttasks_permission,
     view_riskitems_permission,
 )
+from fedrisk_api.utils.response_cache import cached_response
 from fedrisk_api.utils.utils import filter_by_tenant
 
 router = APIRouter(prefix="/summary_dashboards", tags=["summary_dashboards"])
@@ -37,6 +39,7 @@ router = APIRouter(prefix="/summary_dashboards", tags=["summary_dashboards"])
     dependencies=[Depends(view_governanceprojects_permission)],
 )
 def get_governance_projects(
+    request: Request,
     offset: int = 0,
     limit: int = 100,
     sort_by: str = "name",
@@ -44,6 +47,16 @@ def get_governance_projects(
     db: Session = Depends(get_db),
     user=Depends(custom_auth),
 ):
+    return cached_response(
+        request,
+        user,
+        lambda: _governance_projects(db, user, offset, limit, sort_by, order_type),
+        per_user=True,
+        response_model=DisplayGovernance,
+    )
+
+
+def _governance_projects(db: Session, user, offset: int, limit: int, sort_by: str, order_type: str):
     final_response = {}
     response = []
     user_obj = db.query(User).filter(User.id == user["user_id"]).first()
@@ -90,6 +103,7 @@ def get_governance_projects(
     dependencies=[Depends(view_riskitems_permission)],
 )
 def get_risk_items(
+    request: Request,
     offset: int = 0,
     limit: int = 100,
     sort_by: str = "name",
@@ -97,6 +111,16 @@ def get_risk_items(
     db: Session = Depends(get_db),
     user=Depends(custom_auth),
 ):
+    return cached_response(
+        request,
+        user,
+        lambda: _risk_items(db, user, offset, limit, sort_by, order_type),
+        per_user=True,
+        response_model=FinalDisplayRiskItems,
+    )
+
+
+def _risk_items(db: Session, user, offset: int, limit: int, sort_by: str, order_type: str):
     final_response = {}
     response = []
     total_risk_score = 0
@@ -149,6 +173,7 @@ def get_risk_items(
     dependencies=[Depends(view_compliance_permission)],
 )
 def get_compliance(
+    request: Request,
     offset: int = 0,
     limit: int = 100,
     sort_by: str = "name",
@@ -156,6 +181,16 @@ def get_compliance(
     db: Session = Depends(get_db),
     user=Depends(custom_auth),
 ):
+    return cached_response(
+        request,
+        user,
+        lambda: _compliance(db, user, offset, limit, sort_by, order_type),
+        per_user=True,
+        response_model=FinalCompilanceDisplay,
+    )
+
+
+def _compliance(db: Session, user, offset: int, limit: int, sort_by: str, order_type: str):
     final_response = {}
     response = []
 
@@ -195,6 +230,7 @@ def get_compliance(
     "/tasks/", response_model=FinalDisplayTask, dependencies=[Depends(view_projecttasks_permission)]
 )
 def get_project_tasks(
+    request: Request,
     offset: int = 0,
     limit: int = 100,
     sort_by: str = "name",
@@ -202,6 +238,16 @@ def get_project_tasks(
     db: Session = Depends(get_db),
     user=Depends(custom_auth),
 ):
+    return cached_response(
+        request,
+        user,
+        lambda: _project_tasks(db, user, offset, limit, sort_by, order_type),
+        per_user=True,
+        response_model=FinalDisplayTask,
+    )
+
+
+def _project_tasks(db: Session, user, offset: int, limit: int, sort_by: str, order_type: str):
     final_response = {}
     response = []
 
@@ -240,14 +286,32 @@ def get_project_tasks(
 
 @router.get("/{project_id}")
 def get_summary_chart_data_by_project(
-    project_id: int, db: Session = Depends(get_db), user=Depends(custom_auth)
+    request: Request,
+    project_id: int,
+    db: Session = Depends(get_db),
+    user=Depends(custom_auth),
 ):
-    chart_data = db_summary_dashboard.get_summary_chart_data_by_project(
-        db=db, project_id=project_id, tenant_id=user["tenant_id"], user_id=user["user_id"]
+    return cached_response(
+        request,
+        user,
+        lambda: _summary_chart_data_by_project(db, user, project_id),
+        project_id=project_id,
+        per_user=True,
+    )
+
+
+def _summary_chart_data_by_project(db: Session, user, project_id: int):
+    chart_data, computed_date = get_dashboard_metric(
+        db,
+        project_id,
+        "summary",
+        lambda: db_summary_dashboard.get_summary_chart_data_by_project(
+            db=db, project_id=project_id, tenant_id=user["tenant_id"], user_id=user["user_id"]
+        ),
     )
     if not chart_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with {project_id} do not exist",
         )
-    return chart_data
+    return with_computed_date(chart_data, computed_date)
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from fedrisk_api.db import task as db_task
 from fedrisk_api.db.database import get_db
+from fedrisk_api.db.models import Task
 from fedrisk_api.schema.task import CreateTask, DisplayTask, UpdateTask, DisplayCalendarTask
 from fedrisk_api.utils.authentication import custom_auth
 
@@ -17,13 +18,18 @@ from fedrisk_api.utils.permissions import (
     view_task_permission,
 )
 
+from fedrisk_api.utils.enumsdata import PaginationTotal
 from fedrisk_api.utils.utils import (
     PaginateResponse,
+    keyset_order,
     pagination,
 )
 
 LOGGER = logging.getLogger(__name__)
 
+# sort columns with a (tenant_id, column, id) index that can back a pagination cursor
+TASK_KEYSET_COLUMNS = ("created_at",)
+
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
@@ -70,6 +76,8 @@ def get_all_task(
     sort_by: str = None,
     task_status: str = None,
     assigned_to: int = None,
+    after: str = None,
+    total: PaginationTotal = PaginationTotal.exact,
     db: Session = Depends(get_db),
     user=Depends(custom_auth),
 ):
@@ -89,7 +97,14 @@ def get_all_task(
             status=task_status,
         )
         # LOGGER.info(queryset.all())
-        return pagination(query=queryset, offset=offset, limit=limit)
+        return pagination(
+            query=queryset,
+            offset=offset,
+            limit=limit,
+            after=after,
+            total=total,
+            keyset=keyset_order(Task, sort_by, TASK_KEYSET_COLUMNS),
+        )
         # return queryset.all()
     except DataError as e:
         LOGGER.exception("Get Task Error - Invalid request")
@@ -45,7 +45,7 @@ from fedrisk_api.utils.authentication import custom_auth
 from fedrisk_api.utils.cognito import CognitoIdentityProviderWrapper
 from fedrisk_api.utils.utils import PaginateResponse, pagination, filter_by_tenant
 
-from fedrisk_api.db.util.encrypt_pii_utils import decrypt_user_fields
+from fedrisk_api.db.util.encrypt_pii_utils import decrypt_users_fields
 
 from fedrisk_api.utils.email_util import send_temp_password
 
@@ -79,7 +79,7 @@ def get_all_users(
             # cognito_client=cognito_client,
         )
         result = pagination(query=queryset, limit=limit, offset=offset)
-        result["items"] = [decrypt_user_fields(u) for u in result["items"]]
+        result["items"] = decrypt_users_fields(result["items"])
         return result
 
     except DataError:
@@ -674,7 +674,7 @@ def delete_user(id: int, db: Session = Depends(get_db), user=Depends(custom_auth
 @router.get("/get_users_tenant")
 def get_users_tenant(db: Session = Depends(get_db), user=Depends(custom_auth)):
     users = filter_by_tenant(db, User, user["tenant_id"]).all()
-    decrypted_users = [decrypt_user_fields(u) for u in users]
+    decrypted_users = decrypt_users_fields(users)
     return decrypted_users
 
 
@@ -688,7 +688,7 @@ def get_active_users_tenant(db: Session = Depends(get_db), user=Depends(custom_a
         )  # Only load needed fields
         .all()
     )
-    decrypted_users = [decrypt_user_fields(u) for u in users]
+    decrypted_users = decrypt_users_fields(users)
     return decrypted_users
 
 
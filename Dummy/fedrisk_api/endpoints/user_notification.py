@@ -6,17 +6,22 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.exc import DataError, IntegrityError, ProgrammingError
 from sqlalchemy.orm import Session
 
+from fedrisk_api.db import notification_inbox as db_notification_inbox
 from fedrisk_api.db import user_notification as db_user_notification
 from fedrisk_api.db.database import get_db
 from fedrisk_api.schema.user_notification import (
     CreateUserNotification,
+    DisplayMarkedNotificationsRead,
+    DisplayUnreadNotificationCount,
     DisplayUserNotification,
+    MarkUserNotificationsRead,
     CreateUserNotificationSettings,
     UpdateUserNotificationSettings,
     # DisplayUserNotificationSettings,
 )
 from fedrisk_api.utils.authentication import custom_auth
 
+from fedrisk_api.utils.enumsdata import PaginationTotal
 from fedrisk_api.utils.utils import PaginateResponse, pagination
 
 LOGGER = logging.getLogger(__name__)
@@ -51,6 +56,51 @@ def get_all_user_notifications(
     return queryset
 
 
+# Newest notifications of the user first; pass next_cursor back as after for the next page
+@router.get("/inbox", response_model=PaginateResponse[DisplayUserNotification])
+def get_user_notification_inbox(
+    unread_only: bool = False,
+    after: str = None,
+    limit: int = 20,
+    total: PaginationTotal = PaginationTotal.none,
+    db: Session = Depends(get_db),
+    user=Depends(custom_auth),
+):
+    queryset = db_notification_inbox.get_inbox(
+        db=db, user_id=user["user_id"], unread_only=unread_only
+    )
+    return pagination(
+        query=queryset,
+        offset=0,
+        limit=limit,
+        after=after,
+        total=total,
+        keyset=db_notification_inbox.INBOX_KEYSET,
+    )
+
+
+# Unread badge count, read from the user's counter row
+@router.get("/unread_count", response_model=DisplayUnreadNotificationCount)
+def get_unread_user_notification_count(
+    db: Session = Depends(get_db), user=Depends(custom_auth)
+):
+    return {"unread_count": db_notification_inbox.get_unread_count(db=db, user_id=user["user_id"])}
+
+
+# Mark the given notifications, or all of them, read
+@router.post("/mark_read", response_model=DisplayMarkedNotificationsRead)
+def mark_user_notifications_read(
+    request: MarkUserNotificationsRead, db: Session = Depends(get_db), user=Depends(custom_auth)
+):
+    marked_read = db_notification_inbox.mark_notifications_read(
+        db=db, user_id=user["user_id"], ids=request.ids
+    )
+    return {
+        "marked_read": marked_read,
+        "unread_count": db_notification_inbox.get_unread_count(db=db, user_id=user["user_id"]),
+    }
+
+
 @router.delete("/{id}")
 def delete_user_notification_by_id(
     id: int, db: Session = Depends(get_db), user=Depends(custom_auth)
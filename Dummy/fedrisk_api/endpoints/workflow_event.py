@@ -135,9 +135,13 @@ def delete_workflow_event_by_id(id: int, db: Session = Depends(get_db), user=Dep
     "/run_triggers",
     response_model=List[DisplayWorkflowEventLog],
 )
-async def run_workflow_event_triggers(db: Session = Depends(get_db), user=Depends(custom_auth)):
+async def run_workflow_event_triggers(
+    incremental: bool = False, db: Session = Depends(get_db), user=Depends(custom_auth)
+):
     try:
-        workflow_event_trigger_logs = await db_workflow_event.process_workflow_event_triggers(db=db)
+        workflow_event_trigger_logs = db_workflow_event.process_workflow_event_triggers(
+            db=db, incremental=incremental
+        )
     except IntegrityError as ie:
         LOGGER.exception("Run Workflow Event Triggers Error. Invalid request")
         detail_message = str(ie)
@@ -24,14 +24,15 @@ from fedrisk_api.utils.permissions import (
 
 from fastapi.datastructures import UploadFile
 from fastapi.param_functions import File
-import shutil
+import uuid
 from pathlib import Path
-from tempfile import NamedTemporaryFile
 
-from fedrisk_api.db.util.import_workflow_tasks import (
-    safe_import_spreadsheet as safe_import_spreadsheet_util,
-    import_workflow_flowchart_from_excel as import_workflow_flowchart_from_excel_util,
-)
+from fedrisk_api.db import import_job as db_import_job
+from fedrisk_api.db.enums import ImportJobType
+from fedrisk_api.db.models import Tenant
+from fedrisk_api.s3 import S3Service
+from fedrisk_api.schema.import_job import DisplayImportJob
+from fedrisk_api.utils.import_queue import import_job_queue
 
 
 LOGGER = logging.getLogger(__name__)
@@ -157,10 +158,11 @@ async def create_workflow_flowchart_for_project_from_template(
     return workflow_flowchart
 
 
-# Create import framework
+# Create import workflow; the spreadsheet is imported in the background, poll the returned job
 @router.put(
     "/import/{project_id}",
-    # response_model=DisplayImportFramework,
+    response_model=DisplayImportJob,
+    status_code=status.HTTP_202_ACCEPTED,
     # dependencies=[Depends(create_import_framework_permission)],
 )
 async def create_import_workflow(
@@ -170,17 +172,23 @@ async def create_import_workflow(
     user=Depends(custom_auth),
 ):
     try:
-        suffix = Path(fileobject.filename).suffix
-        with NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            shutil.copyfileobj(fileobject.file, tmp)
-            tmp_path = Path(tmp.name)
-        fileobject.file.close()
-        if safe_import_spreadsheet_util(tmp_path) is True:
-            new_workflow_flowchart = import_workflow_flowchart_from_excel_util(
-                tmp_path, db, user["user_id"], user["tenant_id"], project_id
-            )
-        tmp_path.unlink()  # Delete the temp file
-        return new_workflow_flowchart
+        file_key = f"workflows/{project_id}-{uuid.uuid4().hex}-{Path(fileobject.filename).name}"
+        tenant = db.query(Tenant).filter(Tenant.id == user["tenant_id"]).first()
+        uploads3 = await S3Service().upload_fileobj(
+            bucket=tenant.s3_bucket, key=file_key, fileobject=fileobject.file._file
+        )
+        if not uploads3:
+            raise HTTPException(status_code=400, detail="Failed to upload in S3")
+        import_job = db_import_job.create_import_job(
+            db,
+            ImportJobType.workflow,
+            user["tenant_id"],
+            file_key,
+            user_id=user["user_id"],
+            params={"project_id": project_id},
+        )
+        import_job_queue.submit(import_job.id)
+        return import_job
     except Exception as e:
         LOGGER.exception("Import Workflow Error - Invalid Request")
         raise HTTPException(
@@ -1,6 +1,10 @@
+import asyncio
 import logging
+import os
+from contextlib import AsyncExitStack
 
 import boto3
+from aiobotocore.config import AioConfig
 from aiobotocore.session import get_session
 
 from config.config import Settings
@@ -22,6 +26,9 @@ PROFILE_FOLDER = "profile"
 
 BUCKET_NAME = "fedriskapi-documents-bucket"
 
+# concurrent requests the shared async client keeps connections open for
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "50"))
+
 
 def get_profile_s3_key(profile_picture_name: str):
     return f"{profile_picture_name}"
@@ -34,36 +41,33 @@ class S3Service:
         self.aws_access_key_id = conf.AWS_ACCESS_KEY_ID
         self.aws_secret_access_key = conf.AWS_SECRET_ACCESS_KEY
         self.region = conf.AWS_DEFAULT_REGION
+        self.endpoint_url = conf.S3_ENDPOINT_URL
         self.session = boto3.Session(
             aws_access_key_id=self.aws_access_key_id,
             aws_secret_access_key=self.aws_secret_access_key,
         )
-        self.s3 = self.session.resource("s3")
-        self.s3_resource = self.session.resource("s3")
+        self.s3 = self.session.resource("s3", endpoint_url=self.endpoint_url)
+        self.s3_resource = self.session.resource("s3", endpoint_url=self.endpoint_url)
         self.s3_client = boto3.client(
             "s3",
             region_name=self.region,
+            endpoint_url=self.endpoint_url,
             aws_access_key_id=self.aws_access_key_id,
             aws_secret_access_key=self.aws_secret_access_key,
             config=Config(signature_version="s3v4"),  # <-- explicitly set Signature Version 4
         )
 
     async def upload_fileobj(self, fileobject, bucket, key):
-        session = get_session()
-        LOGGER.info(f"aws acess key {self.aws_access_key_id}")
-        async with session.create_client(
-            "s3",
-            region_name=self.region,
-            aws_secret_access_key=self.aws_secret_access_key,
-            aws_access_key_id=self.aws_access_key_id,
-        ) as client:
-            file_upload_response = await client.put_object(Bucket=bucket, Key=key, Body=fileobject)
-
-            if file_upload_response["ResponseMetadata"]["HTTPStatusCode"] == 200:
-                LOGGER.info(
-                    f"File uploaded path : https://{bucket}.s3.{self.region}.amazonaws.com/{key}"
-                )
-                return True
+        """Uploads a small file with a single put_object; see fedrisk_api.s3.upload for
+        user uploads of any size"""
+        client = await s3_client_pool.get()
+        file_upload_response = await client.put_object(Bucket=bucket, Key=key, Body=fileobject)
+
+        if file_upload_response["ResponseMetadata"]["HTTPStatusCode"] == 200:
+            LOGGER.info(
+                f"File uploaded path : https://{bucket}.s3.{self.region}.amazonaws.com/{key}"
+            )
+            return True
         return False
 
     async def delete_fileobj(self, bucket, key):
@@ -71,6 +75,7 @@ class S3Service:
         async with session.create_client(
             "s3",
             region_name=self.region,
+            endpoint_url=self.endpoint_url,
             aws_secret_access_key=self.aws_secret_access_key,
             aws_access_key_id=self.aws_access_key_id,
         ) as client:
@@ -206,3 +211,65 @@ class S3Service:
         except ClientError as e:
             LOGGER.error(f"Failed to fetch S3 file {key} from bucket {bucket}: {e}")
             raise
+
+
+class AsyncS3ClientPool:
+    """Long-lived aiobotocore clients, and with them pools of open connections, shared by the
+    requests of an event loop.
+
+    Clients are bound to the loop they were created on, so each loop gets its own. A client is
+    closed when its loop cancels its remaining tasks, as asyncio.run does before closing the
+    loop, or by close().
+    """
+
+    def __init__(self):
+        # loop -> (client, exit stack, task closing the client when cancelled)
+        self._clients = {}
+        self._locks = {}
+
+    async def get(self):
+        loop = asyncio.get_running_loop()
+        lock = self._locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            if loop not in self._clients:
+                conf = Settings()
+                exit_stack = AsyncExitStack()
+                client = await exit_stack.enter_async_context(
+                    get_session().create_client(
+                        "s3",
+                        region_name=conf.AWS_DEFAULT_REGION,
+                        endpoint_url=conf.S3_ENDPOINT_URL,
+                        aws_secret_access_key=conf.AWS_SECRET_ACCESS_KEY,
+                        aws_access_key_id=conf.AWS_ACCESS_KEY_ID,
+                        config=AioConfig(
+                            signature_version="s3v4",
+                            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                        ),
+                    )
+                )
+                closer = loop.create_task(self._close_when_cancelled(loop))
+                self._clients[loop] = (client, exit_stack, closer)
+        return self._clients[loop][0]
+
+    async def _close_when_cancelled(self, loop):
+        try:
+            await loop.create_future()
+        finally:
+            await self._close(loop)
+
+    async def _close(self, loop):
+        entry = self._clients.pop(loop, None)
+        self._locks.pop(loop, None)
+        if entry is not None:
+            await entry[1].aclose()
+
+    async def close(self):
+        """Closes the client of the running loop"""
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        await self._close(loop)
+        if entry is not None:
+            entry[2].cancel()
+
+
+s3_client_pool = AsyncS3ClientPool()
@@ -0,0 +1,112 @@
+import inspect
+import logging
+import os
+from email.utils import format_datetime
+from urllib.parse import quote
+
+from botocore.exceptions import ClientError
+from fastapi import HTTPException, Request, status
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+
+from fedrisk_api.s3 import s3_client_pool
+
+LOGGER = logging.getLogger(__name__)
+
+DOCUMENT_DOWNLOAD_CHUNK_BYTES = int(os.getenv("DOCUMENT_DOWNLOAD_CHUNK_BYTES", str(1024 * 1024)))
+# set to 1 to answer downloads with a redirect to a presigned S3 URL, so that the file
+# bytes don't pass through the API at all
+DOCUMENT_DOWNLOAD_REDIRECT = bool(int(os.getenv("DOCUMENT_DOWNLOAD_REDIRECT", "0")))
+DOCUMENT_DOWNLOAD_URL_EXPIRE_SECONDS = int(
+    os.getenv("DOCUMENT_DOWNLOAD_URL_EXPIRE_SECONDS", "300")
+)
+
+
+def content_disposition(filename: str) -> str:
+    # headers are latin-1, non-ascii names only survive in the RFC 5987 form
+    fallback = filename.encode("ascii", "replace").decode().replace('"', "'")
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+async def _iter_body(body, chunk_size: int):
+    try:
+        async for chunk in body.iter_chunks(chunk_size):
+            yield chunk
+    finally:
+        # returns the connection to the pool when the client goes away mid download
+        closed = body.close()
+        if inspect.isawaitable(closed):
+            await closed
+
+
+async def download_response(
+    request: Request,
+    bucket: str,
+    key: str,
+    filename: str,
+    media_type: str = None,
+    redirect: bool = DOCUMENT_DOWNLOAD_REDIRECT,
+    client=None,
+    chunk_size: int = DOCUMENT_DOWNLOAD_CHUNK_BYTES,
+):
+    """Response delivering an S3 object, or a redirect to a presigned URL of it.
+
+    Range and If-None-Match are passed on to S3, so partial and conditional downloads are
+    answered with 206 and 304 like S3 answers them.
+    """
+    client = client or await s3_client_pool.get()
+    disposition = content_disposition(filename)
+    if redirect:
+        params = {"Bucket": bucket, "Key": key, "ResponseContentDisposition": disposition}
+        if media_type:
+            params["ResponseContentType"] = media_type
+        url = await client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=DOCUMENT_DOWNLOAD_URL_EXPIRE_SECONDS
+        )
+        return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    params = {"Bucket": bucket, "Key": key}
+    if "range" in request.headers:
+        params["Range"] = request.headers["range"]
+    if "if-none-match" in request.headers:
+        params["IfNoneMatch"] = request.headers["if-none-match"]
+    try:
+        s3_object = await client.get_object(**params)
+    except ClientError as e:
+        code = e.response["Error"]["Code"]
+        if code in ("NoSuchKey", "404"):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+        if code == "304":
+            # the object's own ETag; If-None-Match may list several or be *
+            etag = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {}).get("etag")
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag} if etag else None,
+            )
+        if code == "InvalidRange":
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                detail="Requested range is not satisfiable",
+            )
+        raise
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": disposition,
+        "Content-Length": str(s3_object["ContentLength"]),
+    }
+    if s3_object.get("ETag"):
+        headers["ETag"] = s3_object["ETag"]
+    if s3_object.get("LastModified"):
+        headers["Last-Modified"] = format_datetime(s3_object["LastModified"], usegmt=True)
+    if s3_object.get("ContentRange"):
+        headers["Content-Range"] = s3_object["ContentRange"]
+    return StreamingResponse(
+        _iter_body(s3_object["Body"], chunk_size),
+        status_code=(
+            status.HTTP_206_PARTIAL_CONTENT
+            if s3_object.get("ContentRange")
+            else status.HTTP_200_OK
+        ),
+        media_type=media_type or s3_object.get("ContentType"),
+        headers=headers,
+    )
@@ -0,0 +1,120 @@
+import asyncio
+import base64
+import hashlib
+import logging
+import os
+
+from fedrisk_api.s3 import s3_client_pool
+
+LOGGER = logging.getLogger(__name__)
+
+# S3 requires parts of at least 5 MiB, except for the last one
+DOCUMENT_UPLOAD_PART_BYTES = max(
+    int(os.getenv("DOCUMENT_UPLOAD_PART_BYTES", str(8 * 1024 * 1024))), 5 * 1024 * 1024
+)
+# parts uploaded at once; also the number of parts held in memory per upload
+DOCUMENT_UPLOAD_CONCURRENCY = int(os.getenv("DOCUMENT_UPLOAD_CONCURRENCY", "4"))
+DOCUMENT_UPLOAD_MAX_BYTES = int(os.getenv("DOCUMENT_UPLOAD_MAX_BYTES", str(5 * 1024**3)))
+DOCUMENT_UPLOAD_URL_EXPIRE_SECONDS = int(os.getenv("DOCUMENT_UPLOAD_URL_EXPIRE_SECONDS", "900"))
+
+
+def _content_md5(data: bytes) -> str:
+    # S3 rejects a part whose body does not match
+    return base64.b64encode(hashlib.md5(data).digest()).decode()
+
+
+async def _upload_part(client, semaphore, bucket, key, upload_id, part_number, data):
+    try:
+        response = await client.upload_part(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+            ContentMD5=_content_md5(data),
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+    finally:
+        semaphore.release()
+
+
+async def upload_file(
+    fileobject,
+    bucket: str,
+    key: str,
+    content_type: str = None,
+    client=None,
+    part_size: int = DOCUMENT_UPLOAD_PART_BYTES,
+    concurrency: int = DOCUMENT_UPLOAD_CONCURRENCY,
+) -> dict:
+    """Streams an UploadFile to S3 and returns its size and SHA-256.
+
+    Files larger than one part are sent with a multipart upload, with up to concurrency parts
+    in flight and in memory. A failed multipart upload is aborted, so no parts are left behind.
+    """
+    client = client or await s3_client_pool.get()
+    extra = {"ContentType": content_type} if content_type else {}
+    sha256 = hashlib.sha256()
+    data = await fileobject.read(part_size)
+    sha256.update(data)
+    if len(data) < part_size:
+        await client.put_object(
+            Bucket=bucket, Key=key, Body=data, ContentMD5=_content_md5(data), **extra
+        )
+        return {"size": len(data), "sha256": sha256.hexdigest(), "parts": 1}
+
+    upload_id = (await client.create_multipart_upload(Bucket=bucket, Key=key, **extra))[
+        "UploadId"
+    ]
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = []
+    size = 0
+    try:
+        while data:
+            size += len(data)
+            await semaphore.acquire()
+            tasks.append(
+                asyncio.create_task(
+                    _upload_part(client, semaphore, bucket, key, upload_id, len(tasks) + 1, data)
+                )
+            )
+            failed = [task for task in tasks if task.done() and task.exception()]
+            if failed:
+                raise failed[0].exception()
+            data = await fileobject.read(part_size)
+            sha256.update(data)
+        parts = await asyncio.gather(*tasks)
+        await client.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+        )
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        LOGGER.exception(f"Aborting multipart upload of {key}")
+        try:
+            await client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        except Exception:
+            # the bucket's lifecycle rule for incomplete uploads removes the parts
+            LOGGER.exception(f"Could not abort multipart upload {upload_id} of {key}")
+        raise
+    LOGGER.info(f"Uploaded {size} bytes in {len(parts)} parts to {bucket}/{key}")
+    return {"size": size, "sha256": sha256.hexdigest(), "parts": len(parts)}
+
+
+async def presigned_upload(
+    bucket: str, key: str, content_type: str = None, client=None, max_bytes: int = None
+) -> dict:
+    """URL and form fields for a browser to POST a file straight to S3"""
+    client = client or await s3_client_pool.get()
+    fields, conditions = {}, [["content-length-range", 0, max_bytes or DOCUMENT_UPLOAD_MAX_BYTES]]
+    if content_type:
+        fields["Content-Type"] = content_type
+        conditions.append({"Content-Type": content_type})
+    return await client.generate_presigned_post(
+        bucket,
+        key,
+        Fields=fields,
+        Conditions=conditions,
+        ExpiresIn=DOCUMENT_UPLOAD_URL_EXPIRE_SECONDS,
+    )
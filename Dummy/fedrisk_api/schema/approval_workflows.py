@@ -3,7 +3,7 @@ from datetime import date, datetime
 from pydantic import BaseModel, root_validator
 from typing import Optional, List
 
-from fedrisk_api.db.util.encrypt_pii_utils import decrypt_value
+from fedrisk_api.db.util.encrypt_pii_utils import decrypt_pii, is_encrypted
 
 from fedrisk_api.schema.digital_signature import DisplayDigitalSignature
 
@@ -22,8 +22,8 @@ class DisplayUser(BaseModel):
         real_values = dict(values)
 
         for field, value in real_values.items():
-            if isinstance(value, str) and value.startswith("ENC::"):
-                real_values[field] = decrypt_value(value[5:])
+            if is_encrypted(value):
+                real_values[field] = decrypt_pii(value)
 
         return real_values
 
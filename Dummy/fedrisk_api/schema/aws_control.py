@@ -1,6 +1,7 @@
 from datetime import datetime
 
 from pydantic import BaseModel
+from typing import Optional
 
 
 class CreateAWSControl(BaseModel):
@@ -69,6 +70,8 @@ class DisplayImportAWSControl(BaseModel):
     last_updated_date: datetime = None
     imported: bool = None
     import_results: str = None
+    # set on upload, for polling /import_jobs/{import_job_id}
+    import_job_id: Optional[int] = None
 
     class Config:
         orm_mode = True
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List
 
 from pydantic import BaseModel
@@ -35,6 +36,7 @@ class DisplayComplianceMetrics(BaseModel):
     total: int = None
     monthly: List[DisplayComplianceCount] = []
     status: List[DisplayComplianceCount] = []
+    metrics_computed_date: datetime = None
 
     class Config:
         orm_mode = True
@@ -47,6 +49,7 @@ class DisplayComplianceMetricsCapPoam(BaseModel):
     monthly: List[DisplayComplianceCount] = []
     status: List[DisplayComplianceCount] = []
     criticality: List[DisplayComplianceCount] = []
+    metrics_computed_date: datetime = None
 
     class Config:
         orm_mode = True
@@ -1,7 +1,7 @@
 from datetime import datetime
 
 from pydantic import BaseModel, validator
-from typing import Optional, List
+from typing import Dict, Optional, List
 from fedrisk_api.schema.assessment import DisplayAssessment
 from fedrisk_api.schema.audit_test import DisplayAuditTest
 from fedrisk_api.schema.project import DisplayProject, DisplayProjectControl
@@ -245,3 +245,11 @@ class DisplayDocument(BaseModel):
             value = "Not Scanned"
 
         return value
+
+
+class DisplayDocumentUploadUrl(BaseModel):
+    document_id: int
+    name: str
+    # POST the fields and then the file, as multipart/form-data, to url
+    url: str
+    fields: Dict[str, str]
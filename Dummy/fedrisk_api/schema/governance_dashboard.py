@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List
 
 from pydantic import BaseModel
@@ -51,6 +52,7 @@ class DisplayGovernanceDashboardMetrics(BaseModel):
     control_mitigation: List[DisplayControlMitigation]
     control_assessment: List[DisplayControlAssessment]
     control_exception_count: int
+    metrics_computed_date: datetime = None
 
 
 class DisplayFramework(BaseModel):
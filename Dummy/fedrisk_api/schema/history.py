@@ -351,7 +351,8 @@ class UpdateUserWatching(BaseModel):
 # CreateApprovalWorkflowHistory
 class CreateApprovalWorkflowHistory(BaseModel):
     approval_workflow_id: int
-    author_id: int
+    # None for changes made by scheduled jobs
+    author_id: Optional[int]
     history: str = None
 
 
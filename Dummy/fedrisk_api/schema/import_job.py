@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Any, List, Optional
+
+from pydantic import BaseModel
+
+from fedrisk_api.db.enums import ImportJobStatus, ImportJobType
+
+
+class DisplayImportJobRowError(BaseModel):
+    row: int
+    error: str
+
+
+class DisplayImportJob(BaseModel):
+    id: int
+    tenant_id: int
+    user_id: Optional[int]
+    import_type: ImportJobType
+    source_id: Optional[int]
+    params: Optional[Any]
+    status: ImportJobStatus
+    progress: int
+    total_rows: Optional[int]
+    processed_rows: Optional[int]
+    error_rows: Optional[int]
+    errors: Optional[List[DisplayImportJobRowError]]
+    result: Optional[str]
+    created_date: datetime = None
+    last_updated_date: datetime = None
+    started_date: Optional[datetime]
+    finished_date: Optional[datetime]
+
+    class Config:
+        orm_mode = True
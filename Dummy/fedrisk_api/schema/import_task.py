@@ -19,6 +19,8 @@ class DisplayImportTask(BaseModel):
     last_updated_date: datetime = None
     imported: bool = None
     import_results: str = None
+    # set on upload, for polling /import_jobs/{import_job_id}
+    import_job_id: Optional[int] = None
 
     class Config:
         orm_mode = True
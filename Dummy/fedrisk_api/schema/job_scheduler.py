@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+from fedrisk_api.db.enums import ScheduledJobRunStatus
+
+
+class DisplayScheduledJobRun(BaseModel):
+    id: int
+    job_name: str
+    host: Optional[str]
+    started_date: datetime
+    finished_date: Optional[datetime]
+    duration_seconds: Optional[float]
+    status: ScheduledJobRunStatus
+    result: Optional[str]
+    error: Optional[str]
+
+    class Config:
+        orm_mode = True
+
+
+class DisplayScheduledJob(BaseModel):
+    name: str
+    interval_seconds: int
+    jitter_seconds: int
+    # metrics of the runs on the replica that answered
+    running: bool
+    next_run_date: Optional[datetime]
+    runs: int
+    failures: int
+    skipped: int
+    last_started_date: Optional[datetime]
+    last_status: Optional[ScheduledJobRunStatus]
+    last_error: Optional[str]
+    last_seconds: Optional[float]
+    average_seconds: Optional[float]
+    max_seconds: Optional[float]
+    # latest run on any replica
+    last_run: Optional[DisplayScheduledJobRun]
@@ -633,3 +633,25 @@ class DisplayProject(BaseModel):
     class Config:
         orm_mode = True
         extra = "allow"
+
+
+class DisplayProjectListItem(BaseModel):
+    id: str = None
+    name: str = None
+    description: str = None
+    tenant_id: str = None
+    created_date: datetime = None
+    last_updated_date: datetime = None
+    status: str = None
+    project_group_id: str = None
+    project_group_name: str = None
+    project_admin_id: str = None
+    my_role: str = None
+    project_control_count: int = 0
+    risk_count: int = 0
+    audit_test_count: int = 0
+    document_count: int = 0
+    project_evaluation_count: int = 0
+
+    class Config:
+        orm_mode = True
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List
 
 from pydantic import BaseModel
@@ -42,3 +43,4 @@ class DisplayRiskDashboardMetrics(BaseModel):
     risk_impact: List[DisplayRiskImpactMetrics]
     risk_likelihood: List[DisplayRiskLikelihoodMetrics]
     risk_mapping: List[DisplayRiskMappingMetrics]
+    metrics_computed_date: datetime = None
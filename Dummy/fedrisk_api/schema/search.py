@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -13,6 +13,18 @@ class DisplayObjectReference(BaseModel):
         extra = "allow"
 
 
+class DisplaySearchDocument(BaseModel):
+    object_type: str
+    object_id: int
+    project_id: Optional[int]
+    title: Optional[str]
+    body: Optional[str]
+    last_updated_date: datetime = None
+
+    class Config:
+        orm_mode = True
+
+
 class ObjectSearchResults(BaseModel):
     search_string: str
     object_type: str
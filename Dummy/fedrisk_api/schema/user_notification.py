@@ -2,7 +2,7 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
-from typing import Optional
+from typing import List, Optional
 
 from fedrisk_api.db.enums import UpcomingEventDeadline
 
@@ -35,6 +35,7 @@ class DisplayUserNotification(BaseModel):
     notification_data_path: str = None
     notification_message: str = None
     created: datetime = None
+    read_date: Optional[datetime] = None
     project_id: int = None
     project: DisplayObj = None
 
@@ -42,6 +43,20 @@ class DisplayUserNotification(BaseModel):
         orm_mode = True
 
 
+class MarkUserNotificationsRead(BaseModel):
+    # None marks every notification of the user read
+    ids: Optional[List[int]] = None
+
+
+class DisplayUnreadNotificationCount(BaseModel):
+    unread_count: int
+
+
+class DisplayMarkedNotificationsRead(BaseModel):
+    marked_read: int
+    unread_count: int
+
+
 class CreateUserNotificationSettings(BaseModel):
     user_id: str = None
     watch_email: bool = None
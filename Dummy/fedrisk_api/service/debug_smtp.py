@@ -0,0 +1,107 @@
+import logging
+import socketserver
+import threading
+from email import message_from_bytes
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _DebuggingSMTPHandler(socketserver.StreamRequestHandler):
+    """Speaks enough SMTP for smtplib: EHLO, AUTH PLAIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def reply(self, *lines):
+        for line in lines[:-1]:
+            self.wfile.write(f"{line[:3]}-{line[4:]}\r\n".encode())
+        self.wfile.write(f"{lines[-1]}\r\n".encode())
+
+    def read_data(self):
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line == b".\r\n":
+                return b"".join(lines)
+            # undo dot-stuffing
+            lines.append(line[1:] if line.startswith(b"..") else line)
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        sent = 0
+        mail_from, rcpt_to = None, []
+        self.reply("220 localhost debugging SMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command, _, argument = line.decode().strip().partition(" ")
+            command = command.upper()
+            if command == "EHLO":
+                self.reply("250 localhost", "250 AUTH PLAIN", "250 8BITMIME")
+            elif command == "HELO":
+                self.reply("250 localhost")
+            elif command == "AUTH":
+                self.reply("235 Authentication successful")
+            elif command == "MAIL":
+                mail_from, rcpt_to = argument.partition(":")[2].strip("<> "), []
+                self.reply("250 OK")
+            elif command == "RCPT":
+                rcpt_to.append(argument.partition(":")[2].strip("<> "))
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = self.read_data()
+                with server.lock:
+                    server.messages.append((mail_from, rcpt_to, message_from_bytes(data)))
+                LOGGER.info(f"Received message from {mail_from} to {', '.join(rcpt_to)}")
+                self.reply("250 OK")
+                sent += 1
+                if server.max_messages_per_session and sent >= server.max_messages_per_session:
+                    # like servers that drop long sessions, without a goodbye
+                    return
+            elif command in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class DebuggingSMTPServer(socketserver.ThreadingTCPServer):
+    """Local SMTP server that keeps what it receives instead of delivering it.
+
+    Stand-in for the real SMTP server in tests and local development, where
+    SMTP_HOST/SMTP_PORT point at it. messages holds (sender, recipients, email.message.Message)
+    tuples and connections counts the sessions opened.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, max_messages_per_session=None):
+        super().__init__((host, port), _DebuggingSMTPHandler)
+        self.lock = threading.Lock()
+        self.messages = []
+        self.connections = 0
+        self.max_messages_per_session = max_messages_per_session
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
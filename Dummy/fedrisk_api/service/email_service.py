@@ -1,10 +1,186 @@
+import asyncio
+import logging
+import os
 import ssl
+import threading
+import time
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from smtplib import SMTP
+from smtplib import SMTP, SMTPException, SMTPRecipientsRefused, SMTPServerDisconnected
+
+LOGGER = logging.getLogger(__name__)
 
 PRODUCTION_ENVIRONMENT_NAME = "prod"
 
+# authenticated sessions kept open per SMTP server and account
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))
+# idle sessions older than this are closed instead of reused, before the server drops them
+SMTP_IDLE_SECONDS = int(os.getenv("SMTP_IDLE_SECONDS", "60"))
+# sessions are reopened after this many messages, below common per-session limits
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+SMTP_TIMEOUT_SECONDS = int(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
+
+
+class _PooledConnection:
+    def __init__(self, server: SMTP):
+        self.server = server
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """Authenticated SMTP sessions reused across messages, at most size of them at a time"""
+
+    def __init__(
+        self,
+        host: str,
+        port,
+        username: str = "",
+        password: str = "",
+        use_ssl: bool = True,
+        size: int = SMTP_POOL_SIZE,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.size = max(size, 1)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def _connect(self):
+        server = SMTP(self.host, self.port, timeout=SMTP_TIMEOUT_SECONDS)
+        try:
+            if self.use_ssl:
+                server.starttls(context=ssl.create_default_context())
+            if self.username:
+                server.login(user=self.username, password=self.password)
+        except BaseException:
+            server.close()
+            raise
+        return _PooledConnection(server)
+
+    @staticmethod
+    def _close(connection: _PooledConnection):
+        try:
+            connection.server.quit()
+        except (SMTPException, OSError):
+            connection.server.close()
+
+    def _checkout(self):
+        stale = []
+        connection = None
+        with self._lock:
+            while self._idle:
+                candidate = self._idle.pop()
+                if time.monotonic() - candidate.last_used < SMTP_IDLE_SECONDS:
+                    connection = candidate
+                    break
+                stale.append(candidate)
+        for candidate in stale:
+            self._close(candidate)
+        return connection or self._connect()
+
+    def _checkin(self, connection: _PooledConnection):
+        if connection.sent >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+            self._close(connection)
+            return
+        connection.last_used = time.monotonic()
+        with self._lock:
+            self._idle.append(connection)
+
+    def send_many(self, messages):
+        """Sends (sender, recipients, message string) tuples over one pooled session.
+
+        A dropped session is reopened and the message retried once. Returns, for each
+        message, None once sent or the exception that kept it from being sent.
+        """
+        errors = []
+        with self._slots:
+            connection = None
+            try:
+                for index, (sender, recipients, message) in enumerate(messages):
+                    error = None
+                    for _ in range(2):
+                        if connection is None:
+                            try:
+                                connection = self._checkout()
+                            except (SMTPException, OSError) as e:
+                                # the server can't be reached, so neither can the rest
+                                errors.extend([e] * (len(messages) - index))
+                                return errors
+                        try:
+                            refused = connection.server.sendmail(sender, recipients, message)
+                        except (SMTPServerDisconnected, OSError) as e:
+                            self._close(connection)
+                            connection = None
+                            error = e
+                            continue
+                        except SMTPException as e:
+                            # refusals leave the session usable
+                            error = e
+                            break
+                        connection.sent += 1
+                        error = SMTPRecipientsRefused(refused) if refused else None
+                        break
+                    errors.append(error)
+                    if connection is not None and (
+                        connection.sent >= SMTP_MAX_MESSAGES_PER_CONNECTION
+                    ):
+                        self._close(connection)
+                        connection = None
+            except BaseException:
+                if connection is not None:
+                    self._close(connection)
+                    connection = None
+                raise
+            finally:
+                if connection is not None:
+                    self._checkin(connection)
+        return errors
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._close(connection)
+
+
+_smtp_pools = {}
+_smtp_pools_lock = threading.Lock()
+
+
+def get_smtp_pool(config, use_ssl: bool = True):
+    """Process-wide pool for the SMTP server and account in config"""
+    key = (
+        config.SMTP_HOST,
+        str(config.SMTP_PORT),
+        config.SMTP_USERNAME,
+        config.SMTP_PASSWORD,
+        use_ssl,
+    )
+    with _smtp_pools_lock:
+        pool = _smtp_pools.get(key)
+        if pool is None:
+            pool = _smtp_pools[key] = SMTPConnectionPool(
+                config.SMTP_HOST,
+                config.SMTP_PORT,
+                config.SMTP_USERNAME,
+                config.SMTP_PASSWORD,
+                use_ssl,
+            )
+        return pool
+
+
+def close_smtp_pools():
+    with _smtp_pools_lock:
+        pools = list(_smtp_pools.values())
+        _smtp_pools.clear()
+    for pool in pools:
+        pool.close()
+
 
 class EmailService:
     def __init__(self, config):
@@ -37,6 +213,20 @@ class EmailService:
         # print(f"Message:\n{message}")
         return message
 
+    def build_message(self, to_email_addresses, message, subject, type="plain"):
+        message_object = MIMEMultipart("alternative")
+        message_object["Subject"] = self.environment_specific_subject(subject)
+        message_object["From"] = self.config.SMTP_SENDER_EMAIL
+        message_object["To"] = to_email_addresses
+
+        if type == "html":
+            body = MIMEText(message, "html")
+        else:
+            body = MIMEText(message, "plain")
+
+        message_object.attach(body)
+        return message_object.as_string()
+
     async def send_email(self, to_email_addresses, message, subject, type="plain", use_ssl=True):
         # if isinstance(to_email_addresses, str):
         #     to_email_addresses = [
@@ -48,36 +238,40 @@ class EmailService:
         # original_to_email_addresses = to_email_addresses
         # to_email_addresses = self.environment_specific_to_email_addresses(to_email_addresses)
 
-        print(f"Sending email to {to_email_addresses}")
-
-        message_object = MIMEMultipart("alternative")
-        message_object["Subject"] = self.environment_specific_subject(subject)
-        message_object["From"] = self.config.SMTP_SENDER_EMAIL
-        message_object["To"] = to_email_addresses
-
         # message = self.add_non_prod_messaging_if_not_production(
         #     message, original_to_email_addresses
         # )
 
-        print(f"Message:\n{message}")
+        LOGGER.info(f"Sending email to {to_email_addresses}")
+        errors = await self.send_emails([(to_email_addresses, message, subject)], type, use_ssl)
+        if errors[0] is not None:
+            raise Exception(f"Email not sent - {errors[0]}")
 
-        if type == "html":
-            body = MIMEText(message, "html")
-        else:
-            body = MIMEText(message, "plain")
+    async def send_emails(self, emails, type="plain", use_ssl=True):
+        """Sends (to_email_addresses, message, subject) tuples, e.g. a digest run.
 
-        message_object.attach(body)
-
-        with SMTP(self.config.SMTP_HOST, self.config.SMTP_PORT) as server:
-            server.set_debuglevel(1)
-            if use_ssl:
-                server.starttls(context=ssl.create_default_context())
-            server.login(user=self.config.SMTP_USERNAME, password=self.config.SMTP_PASSWORD)
-            response = server.sendmail(
+        The emails are spread over the pooled sessions and sent off the event loop. Returns,
+        for each email, None once sent or the exception that kept it from being sent.
+        """
+        pool = get_smtp_pool(self.config, use_ssl)
+        messages = [
+            (
                 self.config.SMTP_SENDER_EMAIL,
                 to_email_addresses,
-                message_object.as_string(),
+                self.build_message(to_email_addresses, message, subject, type),
             )
-            if len(response) != 0:
-                raise Exception(f"Email not sent - {response}")
-        assert True
+            for to_email_addresses, message, subject in emails
+        ]
+        if not messages:
+            return []
+        chunk_size = -(-len(messages) // pool.size)
+        chunks = [messages[i : i + chunk_size] for i in range(0, len(messages), chunk_size)]
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *[loop.run_in_executor(None, pool.send_many, chunk) for chunk in chunks]
+        )
+        errors = [error for chunk_errors in results for error in chunk_errors]
+        for (_, to_email_addresses, _), error in zip(messages, errors):
+            if error is not None:
+                LOGGER.error(f"Could not send email to {to_email_addresses}: {error}")
+        return errors
@@ -212,29 +212,39 @@ async def send_control_exception_email(control_exception_data):
         )
 
 
-async def send_watch_email(email_data):
+def watch_email_body(message):
+    new_line = "\n"
+    return f"You are receiving this notification as you have your email watch notifications switched on.{new_line}{message}{new_line}Best Regards{new_line}Riskuity Team"
+
+
+def assigned_email_body(message):
     new_line = "\n"
-    body = f'You are receiving this notification as you have your email watch notifications switched on.{new_line}{email_data["message"]}{new_line}Best Regards{new_line}Riskuity Team'
+    return f"You are receiving this notification as you have your email assigned notifications switched on.{new_line}{message}{new_line}Best Regards{new_line}Riskuity Team"
+
+
+async def send_watch_email(email_data):
     EmailService().send_email(
         to_email=email_data["email"],
         subject=email_data["subject"],
-        message=body,
+        message=watch_email_body(email_data["message"]),
     )
 
 
 async def send_assigned_to_email(email_data):
-    new_line = "\n"
-    body = f'You are receiving this notification as you have your email assigned notifications switched on.{new_line}{email_data["message"]}{new_line}Best Regards{new_line}Riskuity Team'
     EmailService().send_email(
         to_email=email_data["email"],
         subject=email_data["subject"],
-        message=body,
+        message=assigned_email_body(email_data["message"]),
     )
 
 
-async def send_event_trigger_email(email_data):
+def event_trigger_email_body(message):
     new_line = "\n"
-    body = f'{email_data["email-body"]}{new_line}Best Regards{new_line}Riskuity Team'
+    return f"{message}{new_line}Best Regards{new_line}Riskuity Team"
+
+
+async def send_event_trigger_email(email_data):
+    body = event_trigger_email_body(email_data["email-body"])
     # Send single email
     EmailService().send_email(
         to_email=email_data["recipient_id"],
@@ -39,3 +39,17 @@ class AssessmentsFilterBy(str, enum.Enum):
 class ControlFilterByOperation(str, enum.Enum):
     contains = "contains"
     equals = "equals"
+
+
+class ControlBreakdownDimension(str, enum.Enum):
+    control_class = "class"
+    control_family = "family"
+    control_phase = "phase"
+    control_status = "status"
+    framework = "framework"
+
+
+class PaginationTotal(str, enum.Enum):
+    exact = "exact"
+    estimate = "estimate"
+    none = "none"
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from fedrisk_api.db.database import get_db
+
+LOGGER = logging.getLogger(__name__)
+
+# set to 0 to stop pushing events; the stream endpoint then only sends heartbeats
+EVENT_STREAM_ENABLED = bool(int(os.getenv("EVENT_STREAM_ENABLED", "1")))
+# events a slow client may fall behind by before it is told to resync
+EVENT_STREAM_QUEUE_SIZE = int(os.getenv("EVENT_STREAM_QUEUE_SIZE", "100"))
+EVENT_STREAM_HEARTBEAT_SECONDS = int(os.getenv("EVENT_STREAM_HEARTBEAT_SECONDS", "15"))
+EVENT_STREAM_CHANNEL = "riskdash_events"
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+EVENT_STREAM_MAX_PAYLOAD_BYTES = 7900
+PENDING_EVENTS_KEY = "pending_stream_events"
+
+
+def queue_event(session: Session, name: str, tenant_id: int = None, user_id: int = None, **data):
+    """Publishes an event to the tenant's, or only the user's, streams once the session commits.
+
+    On PostgreSQL the event is sent with NOTIFY, which delivers it to the listeners of every
+    replica on commit and drops it on rollback. Identical events of one transaction are
+    delivered once. Other databases only reach the streams of this process.
+    """
+    if not EVENT_STREAM_ENABLED:
+        return
+    stream_event = {"event": name, "tenant_id": tenant_id, "user_id": user_id, "data": data}
+    payload = json.dumps(stream_event, default=str, sort_keys=True)
+    if len(payload.encode()) > EVENT_STREAM_MAX_PAYLOAD_BYTES:
+        LOGGER.warning(f"Not publishing {name} event of {len(payload)} bytes")
+        return
+    # begins the transaction the event belongs to
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": EVENT_STREAM_CHANNEL, "payload": payload},
+        )
+    else:
+        session.info.setdefault(PENDING_EVENTS_KEY, []).append(payload)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_events(session):
+    for payload in session.info.pop(PENDING_EVENTS_KEY, []):
+        event_broker.publish_local(payload)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_events(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(PENDING_EVENTS_KEY, None)
+
+
+class Subscription:
+    """The queue of events for one connected stream"""
+
+    def __init__(self, tenant_id: int, user_id: int):
+        self.tenant_id = tenant_id
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=EVENT_STREAM_QUEUE_SIZE)
+        # set when events were dropped because the client fell behind
+        self.overflowed = False
+
+    def matches(self, stream_event: dict) -> bool:
+        tenant_id, user_id = stream_event.get("tenant_id"), stream_event.get("user_id")
+        if tenant_id is None and user_id is None:
+            return False
+        return tenant_id in (None, self.tenant_id) and user_id in (None, self.user_id)
+
+    def put(self, stream_event: dict):
+        # runs on the subscription's event loop
+        try:
+            self.queue.put_nowait(stream_event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventBroker:
+    """Fans events out to the streams connected to this process.
+
+    With PostgreSQL a listener thread receives the events committed by every replica and
+    worker process.
+    """
+
+    def __init__(self, session_factory=get_db):
+        self._session_factory = session_factory
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._listener = None
+
+    def subscribe(self, tenant_id: int, user_id: int) -> Subscription:
+        subscription = Subscription(tenant_id, user_id)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish_local(self, payload: str):
+        """Hands a serialized event to the matching streams; safe to call from any thread"""
+        stream_event = json.loads(payload)
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.matches(stream_event)]
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, stream_event)
+            except RuntimeError:
+                # the loop of a stream that is shutting down
+                self.unsubscribe(subscription)
+
+    def start(self):
+        with next(self._session_factory()) as db:
+            engine = db.get_bind()
+        if engine.dialect.name != "postgresql":
+            return
+        self._stopping.clear()
+        self._listener = threading.Thread(
+            target=self._listen, args=(engine,), name="event-stream-listener", daemon=True
+        )
+        self._listener.start()
+        LOGGER.info(f"Listening for {EVENT_STREAM_CHANNEL} events")
+
+    def stop(self):
+        self._stopping.set()
+        if self._listener is not None:
+            self._listener.join(timeout=5)
+            self._listener = None
+
+    def _listen(self, engine):
+        retry_seconds = 1
+        while not self._stopping.is_set():
+            pooled_connection = None
+            try:
+                # a connection of its own, outside the pool, kept in autocommit for LISTEN
+                pooled_connection = engine.raw_connection()
+                pooled_connection.detach()
+                connection = pooled_connection.dbapi_connection
+                connection.autocommit = True
+                connection.cursor().execute(f"LISTEN {EVENT_STREAM_CHANNEL}")
+                retry_seconds = 1
+                while not self._stopping.is_set():
+                    if select.select([connection], [], [], 1) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self.publish_local(connection.notifies.pop(0).payload)
+            except Exception:
+                LOGGER.exception(f"Lost the {EVENT_STREAM_CHANNEL} listener connection")
+                self._stopping.wait(retry_seconds)
+                retry_seconds = min(retry_seconds * 2, 60)
+            finally:
+                if pooled_connection is not None:
+                    pooled_connection.close()
+
+
+event_broker = EventBroker()
@@ -0,0 +1,59 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from fedrisk_api.db.import_job import run_import_job
+
+LOGGER = logging.getLogger(__name__)
+
+# spreadsheet parsing is CPU-bound, so jobs run in worker processes; 0 runs them on one
+# background thread of the API process instead
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", "2"))
+
+
+def _log_crashed_job(job_id: int, future):
+    # run_import_job records its own failures; this only sees crashed workers
+    if not future.cancelled() and future.exception() is not None:
+        LOGGER.error(f"Import job {job_id} crashed: {future.exception()}")
+
+
+class LocalImportJobQueue:
+    """Runs import jobs on a pool owned by this process; the job rows are the queue state"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    # spawned workers open their own database connections instead of
+                    # inheriting the pooled connections of this process
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="import-job"
+                    )
+            return self._executor
+
+    def submit(self, job_id: int):
+        future = self._get_executor().submit(run_import_job, job_id)
+        future.add_done_callback(partial(_log_crashed_job, job_id))
+        return future
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+import_job_queue = LocalImportJobQueue(IMPORT_JOB_WORKERS)
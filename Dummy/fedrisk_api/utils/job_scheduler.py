@@ -0,0 +1,231 @@
+import asyncio
+import inspect
+import logging
+import os
+import random
+import socket
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, text
+
+from fedrisk_api.db.database import get_db
+from fedrisk_api.db.enums import ScheduledJobRunStatus
+from fedrisk_api.db.models import ScheduledJobRun
+
+LOGGER = logging.getLogger(__name__)
+
+# set to 0 on replicas that should not run the periodic jobs at all
+JOB_SCHEDULER_ENABLED = bool(int(os.getenv("JOB_SCHEDULER_ENABLED", "1")))
+# jobs run on their own threads, never on the event loop
+JOB_SCHEDULER_WORKERS = int(os.getenv("JOB_SCHEDULER_WORKERS", "4"))
+JOB_SCHEDULER_HISTORY_DAYS = int(os.getenv("JOB_SCHEDULER_HISTORY_DAYS", "14"))
+# high half of the advisory lock keys, keeping them apart from any other advisory locks
+JOB_SCHEDULER_LOCK_NAMESPACE = 0x6A6F62
+
+
+class ScheduledJob:
+    """A periodic job and the timing metrics of its runs in this process"""
+
+    def __init__(self, name: str, func, interval_seconds: int, jitter_seconds: int = 0):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.jitter_seconds = jitter_seconds
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seconds = None
+        self.last_started_date = None
+        self.last_status = None
+        self.last_error = None
+        self.next_run_date = None
+        self.running = False
+
+    @property
+    def lock_key(self) -> int:
+        # crc32 is stable across processes, unlike hash()
+        return JOB_SCHEDULER_LOCK_NAMESPACE << 32 | zlib.crc32(self.name.encode())
+
+    def record(self, run: ScheduledJobRun):
+        self.runs += 1
+        if run.status == ScheduledJobRunStatus.failed:
+            self.failures += 1
+        self.total_seconds += run.duration_seconds
+        self.max_seconds = max(self.max_seconds, run.duration_seconds)
+        self.last_seconds = run.duration_seconds
+        self.last_started_date = run.started_date
+        self.last_status = run.status
+        self.last_error = run.error
+
+    def describe(self) -> dict:
+        return {
+            "name": self.name,
+            "interval_seconds": self.interval_seconds,
+            "jitter_seconds": self.jitter_seconds,
+            "running": self.running,
+            "next_run_date": self.next_run_date,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_started_date": self.last_started_date,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "last_seconds": self.last_seconds,
+            "average_seconds": self.total_seconds / self.runs if self.runs else None,
+            "max_seconds": self.max_seconds if self.runs else None,
+        }
+
+
+class JobScheduler:
+    """Runs registered jobs periodically from the API process.
+
+    Every replica runs the scheduler; a PostgreSQL advisory lock per job and the recorded run
+    history make a job run once per interval across all of them. Runs are recorded in
+    scheduled_job_run.
+    """
+
+    def __init__(self, session_factory=get_db):
+        self.jobs = {}
+        self.host = socket.gethostname()
+        self._session_factory = session_factory
+        self._executor = None
+        self._tasks = []
+
+    def register(self, name: str, func, interval_seconds: int, jitter_seconds: int = 0):
+        """Registers func(db), a function or coroutine function, to run every interval_seconds
+        plus up to jitter_seconds"""
+        if name in self.jobs:
+            raise ValueError(f"Job {name} is already registered")
+        job = ScheduledJob(name, func, interval_seconds, jitter_seconds)
+        self.jobs[name] = job
+        return job
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(
+            max_workers=JOB_SCHEDULER_WORKERS, thread_name_prefix="scheduled-job"
+        )
+        self._tasks = [
+            loop.create_task(self._run_periodically(job)) for job in self.jobs.values()
+        ]
+        LOGGER.info(f"Started job scheduler with jobs {', '.join(self.jobs)}")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            # runs in progress finish in the background; they commit their own work
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run_periodically(self, job: ScheduledJob):
+        loop = asyncio.get_running_loop()
+        # spread the first runs of the jobs and replicas over the jitter window
+        delay = random.uniform(0, job.jitter_seconds)
+        while True:
+            job.next_run_date = datetime.utcnow() + timedelta(seconds=delay)
+            await asyncio.sleep(delay)
+            try:
+                await loop.run_in_executor(self._executor, self.run_job, job.name)
+            except Exception:
+                LOGGER.exception(f"Could not run scheduled job {job.name}")
+            delay = job.interval_seconds + random.uniform(0, job.jitter_seconds)
+
+    def run_job(self, name: str, force: bool = False):
+        """Runs a job now and returns its recorded run.
+
+        Returns None without running it when another replica is running it or, unless force,
+        ran it within its interval.
+        """
+        job = self.jobs[name]
+        with next(self._session_factory()) as db:
+            lock_connection = None
+            if db.get_bind().dialect.name == "postgresql":
+                # a session level lock on a connection of its own, so that the job's commits
+                # don't release it
+                lock_connection = db.get_bind().connect()
+                locked = lock_connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": job.lock_key}
+                ).scalar()
+                if not locked:
+                    lock_connection.close()
+                    job.skipped += 1
+                    return None
+            try:
+                if not force and self._ran_recently(db, job):
+                    job.skipped += 1
+                    return None
+                return self._run(db, job)
+            finally:
+                if lock_connection is not None:
+                    try:
+                        lock_connection.execute(
+                            text("SELECT pg_advisory_unlock(:key)"), {"key": job.lock_key}
+                        )
+                    except Exception:
+                        # never return a connection that may still hold the lock to the pool
+                        lock_connection.invalidate()
+                    lock_connection.close()
+
+    def _ran_recently(self, db, job: ScheduledJob) -> bool:
+        last_started_date = (
+            db.query(func.max(ScheduledJobRun.started_date))
+            .filter(ScheduledJobRun.job_name == job.name)
+            .scalar()
+        )
+        return last_started_date is not None and last_started_date > (
+            datetime.utcnow() - timedelta(seconds=job.interval_seconds)
+        )
+
+    def _run(self, db, job: ScheduledJob) -> ScheduledJobRun:
+        started_date = datetime.utcnow()
+        started = time.monotonic()
+        job.running = True
+        result, error = None, None
+        try:
+            if inspect.iscoroutinefunction(job.func):
+                result = asyncio.run(job.func(db))
+            else:
+                result = job.func(db)
+            status = ScheduledJobRunStatus.succeeded
+        except Exception as e:
+            LOGGER.exception(f"Scheduled job {job.name} failed")
+            db.rollback()
+            status, error = ScheduledJobRunStatus.failed, str(e)
+        finally:
+            job.running = False
+
+        run = ScheduledJobRun(
+            job_name=job.name,
+            host=self.host,
+            started_date=started_date,
+            finished_date=datetime.utcnow(),
+            duration_seconds=time.monotonic() - started,
+            status=status,
+            result=None if result is None else str(result)[:1000],
+            error=None if error is None else error[:1000],
+        )
+        db.add(run)
+        db.query(ScheduledJobRun).filter(
+            ScheduledJobRun.job_name == job.name,
+            ScheduledJobRun.started_date
+            < started_date - timedelta(days=JOB_SCHEDULER_HISTORY_DAYS),
+        ).delete(synchronize_session=False)
+        db.commit()
+        db.refresh(run)
+        job.record(run)
+        LOGGER.info(f"Scheduled job {job.name} {status.value} in {run.duration_seconds:.2f}s")
+        return run
+
+    def describe(self):
+        return [job.describe() for job in self.jobs.values()]
+
+
+job_scheduler = JobScheduler()
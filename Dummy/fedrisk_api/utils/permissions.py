@@ -1,6 +1,5 @@
 from starlette.requests import Request
 
-from datetime import datetime
 from typing import Dict
 
 from fastapi import Depends, HTTPException, Request, status
@@ -10,10 +9,7 @@ from fedrisk_api.db.database import get_db
 from fedrisk_api.db.models import *
 from fedrisk_api.utils.authentication import custom_auth
 
-from fedrisk_api.service.payment_service import PaymentService
-from config.config import Settings
-
-from fedrisk_api.schema.subscription import ListSubscriptions
+from fedrisk_api.db.subscription import is_tenant_trial_expired
 import logging
 
 LOGGER = logging.getLogger(__name__)
@@ -93,22 +89,12 @@ class TenantAdminBasePermission(SuperUserBasePermission):
                         detail="The user does not have a license.",
                     )
                 if not tenant.is_active:
-                    # check subscription end
-                    todays_date_time = datetime.now()
-                    payment_client = PaymentService(config=Settings())
-                    data = {
-                        "customer": tenant.customer_id,
-                        "status": "trialing",
-                    }
-                    payment_model = ListSubscriptions(**data)
-                    trial = payment_client.list_subscriptions(payment_model)
-                    if trial:
-                        datetime_obj = datetime.fromtimestamp(trial.data[0].current_period_end)
-                        if datetime_obj < todays_date_time:
-                            raise HTTPException(
-                                status_code=status.HTTP_402_PAYMENT_REQUIRED,
-                                detail="Subscription has reached its end date.",
-                            )
+                    # check subscription end against the locally mirrored stripe state
+                    if is_tenant_trial_expired(tenant_id=tenant.id, db=db):
+                        raise HTTPException(
+                            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+                            detail="Subscription has reached its end date.",
+                        )
             return auth_user["is_tenant_admin"]
         return True
 
@@ -601,3 +587,6 @@ delete_audit_evidence_permission = PermissionChecker(AuditEvidence, "delete_audi
 update_audit_evidence_permission = PermissionChecker(AuditEvidence, "update_audit_evidence")
 # view_audit_evidence_permission
 view_audit_evidence_permission = PermissionChecker(AuditEvidence, "view_audit_evidence")
+
+# view_job_scheduler_permission, super users only
+view_job_scheduler_permission = TenantPermissionChecker(ScheduledJobRun, "view_job_scheduler")
@@ -0,0 +1,266 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from fedrisk_api.db.dashboard_metrics import PROJECT_ID_SOURCES, changed_project_ids
+from fedrisk_api.db.models import (
+    ControlClass,
+    ControlFamily,
+    ControlPhase,
+    ControlStatus,
+    FrameworkTenant,
+    Project,
+    ProjectUser,
+    Task,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+RESPONSE_CACHE_MAX_SIZE = int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "2048"))
+# upper bound on staleness for changes the version counters can't see (writes handled by
+# another process on the in-process backend, bulk updates, user role changes); 0 disables
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+# share entries and versions between processes through a Redis-compatible server
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL")
+
+# writes to these bump the version of the owning project and of its tenant
+RESPONSE_CACHE_PROJECT_SOURCES = {
+    **PROJECT_ID_SOURCES,
+    ProjectUser: ("project_id", None),
+    Task: ("project_id", None),
+}
+# tenant reference data the dashboards list even without project rows pointing at it
+RESPONSE_CACHE_TENANT_SOURCES = (
+    ControlClass,
+    ControlFamily,
+    ControlPhase,
+    ControlStatus,
+    FrameworkTenant,
+)
+
+PENDING_VERSIONS_KEY = "response_cache_versions"
+
+
+class LRUResponseCache:
+    """Bounded, thread-safe TTL cache of serialized responses and their version counters"""
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_versions(self, names):
+        with self._lock:
+            return [self._versions.get(name, 0) for name in names]
+
+    def bump_versions(self, names):
+        with self._lock:
+            for name in names:
+                self._versions[name] = self._versions.get(name, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+class RedisResponseCache:
+    """Response cache on a Redis-compatible server; errors degrade to cache misses"""
+
+    KEY_PREFIX = "response_cache:"
+
+    def __init__(self, url: str, ttl_seconds: int):
+        # optional dependency, only needed when RESPONSE_CACHE_REDIS_URL is set
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self._errors = redis.RedisError
+
+    def get(self, key: str):
+        try:
+            return self.client.get(f"{self.KEY_PREFIX}entry:{key}")
+        except self._errors:
+            LOGGER.exception("Could not read response cache entry")
+            return None
+
+    def set(self, key: str, value: bytes):
+        try:
+            self.client.set(f"{self.KEY_PREFIX}entry:{key}", value, ex=self.ttl_seconds)
+        except self._errors:
+            LOGGER.exception("Could not store response cache entry")
+
+    def get_versions(self, names):
+        try:
+            values = self.client.mget([f"{self.KEY_PREFIX}version:{name}" for name in names])
+        except self._errors:
+            LOGGER.exception("Could not read response cache versions")
+            # a key nobody else can produce, so the response is computed and not reused
+            return [f"error:{time.time_ns()}"] * len(names)
+        return [int(value) if value else 0 for value in values]
+
+    def bump_versions(self, names):
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for name in names:
+                pipeline.incr(f"{self.KEY_PREFIX}version:{name}")
+            pipeline.execute()
+        except self._errors:
+            LOGGER.exception("Could not bump response cache versions")
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.KEY_PREFIX}*"):
+            self.client.delete(key)
+
+
+def _create_response_cache():
+    if RESPONSE_CACHE_REDIS_URL:
+        return RedisResponseCache(RESPONSE_CACHE_REDIS_URL, RESPONSE_CACHE_TTL_SECONDS)
+    return LRUResponseCache(RESPONSE_CACHE_MAX_SIZE, RESPONSE_CACHE_TTL_SECONDS)
+
+
+response_cache = _create_response_cache()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_response_cache_versions(session, flush_context):
+    if RESPONSE_CACHE_TTL_SECONDS <= 0:
+        return
+    project_ids, project_id_selects = changed_project_ids(session, RESPONSE_CACHE_PROJECT_SOURCES)
+    tenant_ids = set()
+    reference_tenant_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, RESPONSE_CACHE_TENANT_SOURCES) and obj.tenant_id:
+            reference_tenant_ids.add(obj.tenant_id)
+        elif type(obj) in RESPONSE_CACHE_PROJECT_SOURCES and getattr(obj, "tenant_id", None):
+            tenant_ids.add(obj.tenant_id)
+    if not (project_ids or project_id_selects or reference_tenant_ids):
+        return
+
+    connection = session.connection()
+    for query in project_id_selects:
+        project_ids.update(connection.execute(query).scalars())
+    project_ids.discard(None)
+    if project_ids:
+        tenant_ids.update(
+            connection.execute(
+                select(Project.tenant_id).where(Project.id.in_(project_ids)).distinct()
+            ).scalars()
+        )
+    tenant_ids.update(reference_tenant_ids)
+    tenant_ids.discard(None)
+
+    names = session.info.setdefault(PENDING_VERSIONS_KEY, set())
+    names.update(f"project:{project_id}" for project_id in project_ids)
+    names.update(f"tenant:{tenant_id}" for tenant_id in tenant_ids)
+    names.update(f"reference:{tenant_id}" for tenant_id in reference_tenant_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_response_cache_versions(session):
+    names = session.info.pop(PENDING_VERSIONS_KEY, None)
+    if names:
+        response_cache.bump_versions(sorted(names))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_response_cache_versions(session):
+    session.info.pop(PENDING_VERSIONS_KEY, None)
+
+
+def response_cache_key(request: Request, user, project_id: int = None, per_user: bool = False):
+    """Cache key for a response of the requested path and normalized query params.
+
+    Project responses are keyed on the project's version, everything else on the tenant's;
+    per_user responses (visibility depends on the user's projects or admin flags) are
+    additionally keyed on the user.
+    """
+    tenant_id = user["tenant_id"]
+    if project_id:
+        version_names = [f"project:{project_id}", f"reference:{tenant_id}"]
+    else:
+        version_names = [f"tenant:{tenant_id}"]
+    versions = response_cache.get_versions(version_names)
+    query = sorted((name, value) for name, value in request.query_params.multi_items() if value)
+    parts = [
+        request.url.path,
+        json.dumps(query),
+        f"tenant:{tenant_id}",
+        f"project:{project_id or ''}",
+        f"user:{user['user_id'] if per_user else ''}",
+        json.dumps(list(zip(version_names, versions))),
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def _etag_matches(if_none_match: str, etag: str):
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def cached_response(
+    request: Request,
+    user,
+    compute,
+    project_id: int = None,
+    per_user: bool = False,
+    response_model=None,
+):
+    """JSON response for compute(), reused until something it depends on is written.
+
+    compute() returns what the endpoint would return; response_model, when given, is
+    applied to it the way FastAPI would. Responses carry an ETag and a matching
+    If-None-Match is answered with 304 Not Modified.
+    """
+    if RESPONSE_CACHE_TTL_SECONDS <= 0:
+        return compute()
+
+    key = response_cache_key(request, user, project_id, per_user)
+    cached = response_cache.get(key)
+    if cached is not None:
+        etag, body = cached.split(b"\n", 1)
+        etag = etag.decode()
+    else:
+        payload = compute()
+        if response_model is not None:
+            payload = response_model.validate(payload)
+        body = json.dumps(jsonable_encoder(payload)).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        response_cache.set(key, etag.encode() + b"\n" + body)
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
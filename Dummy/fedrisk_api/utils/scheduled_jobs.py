@@ -0,0 +1,63 @@
+import logging
+import os
+
+from config.config import Settings
+from fedrisk_api.db.approval_workflows import (
+    check_due_date_approval_workflow_automate_status_rejected,
+)
+from fedrisk_api.db.notification_inbox import archive_user_notifications
+from fedrisk_api.db.notification_outbox import drain_notification_outbox
+from fedrisk_api.db.subscription import reconcile_tenant_subscription_statuses
+from fedrisk_api.db.user_notification import post_scheduled_notifications, queue_due_reminders
+from fedrisk_api.db.workflow_event import process_workflow_event_triggers
+from fedrisk_api.service.payment_service import PaymentService
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _interval_seconds(name: str, default: int) -> int:
+    # e.g. JOB_NOTIFICATION_OUTBOX_INTERVAL_SECONDS
+    return int(os.getenv(f"JOB_{name.upper()}_INTERVAL_SECONDS", str(default)))
+
+
+def dispatch_notifications(db):
+    return drain_notification_outbox(db)
+
+
+def process_changed_workflow_events(db):
+    return len(process_workflow_event_triggers(db, incremental=True))
+
+
+def process_all_workflow_events(db):
+    # picks up events whose side effects failed, which incremental sweeps don't revisit
+    return len(process_workflow_event_triggers(db))
+
+
+async def reject_overdue_approval_workflows(db):
+    return await check_due_date_approval_workflow_automate_status_rejected(db, user_id=None)
+
+
+def post_due_date_notifications(db):
+    return len(post_scheduled_notifications(db))
+
+
+def reconcile_subscriptions(db):
+    return reconcile_tenant_subscription_statuses(PaymentService(config=Settings()), db)
+
+
+# (name, job, default interval in seconds, jitter in seconds)
+SCHEDULED_JOBS = [
+    ("notification_outbox", dispatch_notifications, 15, 5),
+    ("workflow_event_triggers", process_changed_workflow_events, 60, 15),
+    ("workflow_event_triggers_full", process_all_workflow_events, 3600, 300),
+    ("due_date_reminders", queue_due_reminders, 3600, 300),
+    ("due_date_notifications", post_due_date_notifications, 3600, 300),
+    ("approval_workflow_due_dates", reject_overdue_approval_workflows, 3600, 300),
+    ("subscription_reconciliation", reconcile_subscriptions, 6 * 3600, 600),
+    ("user_notification_archive", archive_user_notifications, 24 * 3600, 3600),
+]
+
+
+def register_scheduled_jobs(scheduler):
+    for name, job, interval_seconds, jitter_seconds in SCHEDULED_JOBS:
+        scheduler.register(name, job, _interval_seconds(name, interval_seconds), jitter_seconds)
@@ -1,15 +1,20 @@
+import base64
+import binascii
+import json
 import logging
 import math
+import os
 import random
 import string
-from datetime import datetime, timedelta
-from typing import Generic, List, TypeVar
+from datetime import date, datetime, timedelta
+from typing import Generic, List, Optional, TypeVar
 
 from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
 from jose import jwt
 from pydantic import BaseModel
 from pydantic.generics import GenericModel
-from sqlalchemy import text
+from sqlalchemy import Date, DateTime, and_, func, literal, or_, text, tuple_
 from sqlalchemy.orm import Session
 
 from config.config import Settings
@@ -18,6 +23,8 @@ from fedrisk_api.db.models import (
     Control,
     Document,
     Exception,
+    Keyword,
+    KeywordMapping,
     Project,
     ProjectUser,
     Risk,
@@ -29,6 +36,7 @@ from fedrisk_api.db.models import (
     WBS,
 )
 from fedrisk_api.s3 import BUCKET_NAME, S3Service
+from fedrisk_api.utils.enumsdata import PaginationTotal
 
 from fedrisk_api.db.util.encrypt_pii_utils import decrypt_user_fields
 
@@ -37,28 +45,194 @@ LOGGER = logging.getLogger(__name__)
 LINK_EXPIRE_TIME_AFTER_VERIFY_IN_MIN = 20
 
 
+# below this planner estimate an exact count is cheap, so estimate mode runs it anyway
+PAGINATION_EXACT_COUNT_THRESHOLD = int(os.getenv("PAGINATION_EXACT_COUNT_THRESHOLD", "1000"))
+
+
 class PaginateResponse(GenericModel, Generic[ResponseType]):
     items: List[ResponseType] = []
-    total: int = 0
+    # None when the caller asked for no total
+    total: Optional[int] = 0
     offset: int
     limit: int
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
     class Config:
         orm_mode = True
 
 
-def pagination(query, offset, limit):
-    total = query.count()
-    items = query.offset(offset).limit(limit).all()
+def pagination(query, offset, limit, after: str = None, total=PaginationTotal.exact, keyset=None):
+    """Page of query in the PaginateResponse shape.
+
+    With keyset (see keyset_order) the page is ordered on those columns and next_cursor
+    points past its last row; passing it back as after continues from there instead of
+    skipping rows with OFFSET. total picks an exact count, the planner's estimate
+    (see estimate_count) or no count at all.
+    """
+    total_is_estimate = False
+    if total == PaginationTotal.exact:
+        total_count = query.count()
+    elif total == PaginationTotal.estimate:
+        total_count, total_is_estimate = estimate_count(query)
+    else:
+        total_count = None
+
+    next_cursor = None
+    if keyset is None:
+        if after:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination is not supported for this sort order",
+            )
+        items = query.offset(offset).limit(limit).all()
+    else:
+        query = query.order_by(None).order_by(
+            *[column.desc() if descending else column.asc() for column, descending in keyset]
+        )
+        if after:
+            query = query.filter(keyset_predicate(keyset, decode_cursor(after, keyset)))
+        else:
+            query = query.offset(offset)
+        # one extra row tells whether there is a next page
+        items = query.limit(limit + 1 if limit else None).all()
+        if limit and len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(keyset, items[-1])
 
     return {
         "items": items,
-        "total": total,
+        "total": total_count,
         "limit": limit,
         "offset": offset,
+        "next_cursor": next_cursor,
+        "total_is_estimate": total_is_estimate,
     }
 
 
+def keyset_order(model, sort_by, columns):
+    """[(column, descending)] for sort_by ("name" or "-name") with an id tie-breaker.
+
+    Only id and the given columns, which should be indexed, can back a cursor; returns
+    None for any other sort_by.
+    """
+    sort_by = (sort_by or "id").strip()
+    descending = sort_by.startswith("-")
+    name = sort_by.lstrip("-")
+    if name != "id" and name not in columns:
+        return None
+    keyset = [(getattr(model, name), descending)]
+    if name != "id":
+        keyset.append((model.id, descending))
+    return keyset
+
+
+def keyset_predicate(keyset, values):
+    """Rows that come after values in the keyset ordering"""
+    columns = [column for column, _ in keyset]
+    directions = {descending for _, descending in keyset}
+    if len(directions) == 1:
+        # a row value comparison resolves to one index range scan
+        if directions.pop():
+            return tuple_(*columns) < tuple_(*values)
+        return tuple_(*columns) > tuple_(*values)
+    clauses = []
+    for position, (column, descending) in enumerate(keyset):
+        after = column < values[position] if descending else column > values[position]
+        clauses.append(and_(*[columns[i] == values[i] for i in range(position)], after))
+    return or_(*clauses)
+
+
+def encode_cursor(keyset, item):
+    values = [getattr(item, column.key) for column, _ in keyset]
+    return base64.urlsafe_b64encode(json.dumps(jsonable_encoder(values)).encode()).decode()
+
+
+def decode_cursor(cursor: str, keyset):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(keyset):
+            raise ValueError(cursor)
+        return [_cursor_value(column, value) for (column, _), value in zip(keyset, values)]
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor"
+        )
+
+
+def _cursor_value(column, value):
+    if value is None:
+        return None
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Date):
+        return date.fromisoformat(value)
+    return value
+
+
+def estimate_count(query):
+    """(row count, is_estimate) for query from the PostgreSQL planner.
+
+    EXPLAIN estimates from pg_class.reltuples and the column statistics without scanning;
+    small estimates are replaced with an exact count, which is cheap at that size.
+    """
+    bind = query.session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return query.count(), False
+    compiled = query.statement.compile(dialect=bind.dialect)
+    plan = (
+        query.session.connection()
+        .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params)
+        .scalar()
+    )
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    if estimate < PAGINATION_EXACT_COUNT_THRESHOLD:
+        return query.count(), False
+    return estimate, True
+
+
+def search_predicate(model, lowercase_query):
+    """name/description/keyword match backed by the pg_trgm GIN indexes"""
+    return or_(
+        func.lower(model.name).contains(lowercase_query),
+        func.lower(model.description).contains(lowercase_query),
+        model.keywords.any(
+            KeywordMapping.keyword.has(func.lower(Keyword.name).contains(lowercase_query))
+        ),
+    )
+
+
+def search_rank(db, model, lowercase_query):
+    if db.get_bind().dialect.name != "postgresql":
+        return literal(0)
+    return func.greatest(
+        func.similarity(func.lower(model.name), lowercase_query),
+        func.similarity(func.coalesce(func.lower(model.description), ""), lowercase_query),
+    )
+
+
+def search_page(db, query, model, lowercase_query, offset, limit):
+    """Return (total, page) for a search, paginated and ranked in the database.
+
+    The total comes from a count(*) window over the same statement, so the
+    predicate is only evaluated once.
+    """
+    query = query.filter(search_predicate(model, lowercase_query))
+    rows = (
+        query.add_columns(func.count().over().label("total_count"))
+        .order_by(search_rank(db, model, lowercase_query).desc(), model.id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    if rows:
+        return rows[0][1], [row[0] for row in rows]
+    # past the last page the window has no rows to report the total on
+    return (query.count() if offset else 0), []
+
+
 def get_cognito_token(request):
     try:
         cognito_token = request.headers["authorization"].split(" ")[1]
@@ -260,7 +434,7 @@ def get_risk_mapping_metrics():
             "likely__major",
             "possible__major",
             "possible__extreme",
-            "Unlikely__extreme",
+            "unlikely__extreme",
         ],
         "high": ["very_likely__major", "very_likely__extreme", "likely__extreme"],
     }
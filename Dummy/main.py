@@ -34,6 +34,7 @@ from fedrisk_api.endpoints import (
     cost,
     digital_signature,
     document,
+    event_stream,
     evidence,
     exception,
     feature,
@@ -43,7 +44,9 @@ from fedrisk_api.endpoints import (
     help_section,
     history,
     import_framework,
+    import_job,
     import_task,
+    job_scheduler as job_scheduler_endpoints,
     keyword,
     permissions,
     project,
@@ -59,6 +62,7 @@ from fedrisk_api.endpoints import (
     risk_mapping,
     risk_score,
     risk_status,
+    search,
     role,
     service_provider,
     subscription,
@@ -79,6 +83,11 @@ from fedrisk_api.endpoints import (
     workflow_template,
     workflow_template_event,
 )
+from fedrisk_api.s3 import s3_client_pool
+from fedrisk_api.utils.event_stream import EVENT_STREAM_ENABLED, event_broker
+from fedrisk_api.utils.import_queue import import_job_queue
+from fedrisk_api.utils.job_scheduler import JOB_SCHEDULER_ENABLED, job_scheduler
+from fedrisk_api.utils.scheduled_jobs import register_scheduled_jobs
 
 
 NUM_DEMO_FRAMEWORKS = 3
@@ -89,15 +98,20 @@ CONSOLE_AND_FILE_LOGGING_CONFIG_FILE = "logging.conf"
 LOGGER = logging.getLogger(__name__)
 
 
-# async def cron_job_task():
-#     while True:
-#         try:
-#             LOGGER.info("Cron job is running")
-#         except Exception as e:
-#             LOGGER.error(f"Error in cron job: {e}")
-
-#         # Wait for 60 seconds before running the task again
-#         await asyncio.sleep(60)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # periodic maintenance jobs, see fedrisk_api.utils.scheduled_jobs
+    if JOB_SCHEDULER_ENABLED:
+        job_scheduler.start()
+    # delivers the events committed by other replicas to the streams of this one
+    if EVENT_STREAM_ENABLED:
+        event_broker.start()
+    yield
+    await job_scheduler.stop()
+    event_broker.stop()
+    await s3_client_pool.close()
+    # jobs left unfinished go stale and their uploads are queued again, see db.import_job
+    import_job_queue.shutdown(wait=False)
 
 
 def create_tables():
@@ -133,12 +147,13 @@ def start_application():
     if not settings.AWS_DEFAULT_REGION:
         raise ValueError("AWS_DEFAULT_REGION is not set")
 
-    app = FastAPI(title=settings.PROJECT_TITLE, version=settings.PROJECT_VERSION)
+    app = FastAPI(
+        title=settings.PROJECT_TITLE, version=settings.PROJECT_VERSION, lifespan=lifespan
+    )
 
     LOGGER.info("App has been created . . .")
 
-    # LOGGER.info("Starting cron job")
-    # asyncio.create_task(cron_job_task())
+    register_scheduled_jobs(job_scheduler)
 
     app.include_router(approval_workflows.router)
     app.include_router(assessment.router)
@@ -156,13 +171,16 @@ def start_application():
     app.include_router(cost.router)
     app.include_router(digital_signature.router)
     app.include_router(document.router)
+    app.include_router(event_stream.router)
     app.include_router(evidence.router)
     app.include_router(exception.router)
     app.include_router(feature.router)
     app.include_router(framework.router)
     app.include_router(framework_version.router)
     app.include_router(import_framework.router)
+    app.include_router(import_job.router)
     app.include_router(import_task.router)
+    app.include_router(job_scheduler_endpoints.router)
     app.include_router(governance_dashboard.router)
     app.include_router(help_section.router)
     app.include_router(history.router)
@@ -181,6 +199,7 @@ def start_application():
     app.include_router(risk_mapping.router)
     app.include_router(risk_score.router)
     app.include_router(risk_status.router)
+    app.include_router(search.router)
     app.include_router(role.router)
     app.include_router(service_provider.router)
     app.include_router(subscription.router)
@@ -2,6 +2,7 @@ import asyncio
 import io
 import logging
 import os
+import time
 
 import pandas as pd
 import uvicorn
@@ -84,6 +85,7 @@ from fedrisk_api.db.util.encrypt_pii_utils import (
     encrypt_user_by_id as encrypt_user_by_id_util,
     decrypt_user_by_id as decrypt_user_by_id_util,
     get_decrypted_user_display_by_id as get_decrypted_user_display_by_id_util,
+    migrate_user_data_to_envelope as migrate_user_data_to_envelope_util,
 )
 
 from fedrisk_api.db.util.import_workflow_tasks import (
@@ -103,8 +105,27 @@ from fedrisk_api.db.util.webhook_api_key_utils import (
     update_tenant_webhook_api_key as update_tenant_webhook_api_key_util,
 )
 
+from fedrisk_api.db.subscription import (
+    reconcile_tenant_subscription_statuses as reconcile_tenant_subscription_statuses_util,
+)
+
+from fedrisk_api.db.search import reindex_search_documents as reindex_search_documents_util
+
+from fedrisk_api.db.notification_outbox import (
+    NOTIFICATION_OUTBOX_BATCH_SIZE,
+    drain_notification_outbox as drain_notification_outbox_util,
+)
+
+from fedrisk_api.service.debug_smtp import DebuggingSMTPServer
+
+from fedrisk_api.service.payment_service import PaymentService
+
 from fedrisk_api.utils.cognito import CognitoIdentityProviderWrapper
 
+from fedrisk_api.utils.job_scheduler import JobScheduler
+
+from fedrisk_api.utils.scheduled_jobs import register_scheduled_jobs
+
 from fedrisk_api.utils.ses import EmailService
 
 from fedrisk_api.utils.sns import SnsWrapper
@@ -206,6 +227,14 @@ def decrypt_user_data():
         decrypt_user_data_util(db)
 
 
+# re-encrypt legacy ENC:: values with per-tenant envelope data keys (ENC2::)
+@app.command()
+def migrate_user_data_to_envelope(batch_size: int = 500):
+    with next(get_db()) as db:
+        migrated = migrate_user_data_to_envelope_util(db, batch_size)
+    print(f"[bold green]Migrated {migrated} users to envelope encryption[/bold green].")
+
+
 # encrypt_user_by_id
 @app.command()
 def encrypt_user_by_id(user_id: int):
@@ -248,6 +277,79 @@ def update_tenant_webhook_api_key(tenant_id: int, webhook_api_key: str):
         update_tenant_webhook_api_key_util(db, tenant_id, webhook_api_key)
 
 
+# reconcile locally mirrored stripe subscription state; run periodically
+@app.command()
+def reconcile_subscription_statuses():
+    with next(get_db()) as db:
+        reconciled = reconcile_tenant_subscription_statuses_util(
+            PaymentService(config=Settings()), db
+        )
+    print(f"[bold green]Reconciled {reconciled} tenant subscriptions[/bold green].")
+
+
+# refresh the global search index; --full rebuilds every document from scratch
+@app.command()
+def reindex_search_documents(full: bool = False, batch_size: int = 500):
+    with next(get_db()) as db:
+        written = reindex_search_documents_util(db, full=full, batch_size=batch_size)
+    print(f"[bold green]Indexed {sum(written.values())} search documents[/bold green].")
+
+
+# deliver the queued notification emails and text messages; runs until stopped unless --once
+@app.command()
+def dispatch_notifications(
+    once: bool = False, poll_seconds: int = 5, batch_size: int = NOTIFICATION_OUTBOX_BATCH_SIZE
+):
+    while True:
+        try:
+            with next(get_db()) as db:
+                totals = drain_notification_outbox_util(db, batch_size=batch_size)
+            if any(totals.values()):
+                print(
+                    f"Sent {totals['sent']} notifications, {totals['retried']} to retry, "
+                    f"{totals['dead']} dead-lettered."
+                )
+        except Exception:
+            if once:
+                raise
+            LOGGER.exception("Could not dispatch notifications")
+        if once:
+            return
+        time.sleep(poll_seconds)
+
+
+# run one periodic job now, e.g. with JOB_SCHEDULER_ENABLED=0 on the API replicas
+@app.command()
+def run_scheduled_job(name: str, force: bool = False):
+    scheduler = JobScheduler()
+    register_scheduled_jobs(scheduler)
+    if name not in scheduler.jobs:
+        print(f"[bold red]Unknown job {name}; jobs: {', '.join(scheduler.jobs)}[/bold red]")
+        return
+    run = scheduler.run_job(name, force=force)
+    if run is None:
+        print(f"Skipped {name}: running elsewhere or ran within its interval (see --force).")
+    else:
+        outcome = run.result if run.error is None else run.error
+        print(f"{name} {run.status.value} in {run.duration_seconds:.2f}s: {outcome}")
+
+
+# local SMTP server that prints what it receives; point SMTP_HOST/SMTP_PORT at it
+@app.command()
+def run_debug_smtp(host: str = "127.0.0.1", port: int = 1025):
+    with DebuggingSMTPServer(host, port) as server:
+        print(f"[bold green]Debugging SMTP server listening on {host}:{port}[/bold green]")
+        received = 0
+        try:
+            while True:
+                time.sleep(1)
+                for sender, recipients, message in server.messages[received:]:
+                    print(f"From {sender} to {', '.join(recipients)}:\n{message}")
+                received = len(server.messages)
+        except KeyboardInterrupt:
+            pass
+
+
 @app.command()
 def test(name: str):
     print(f"[bold green]Success[/bold green] {name}.")
@@ -374,6 +476,11 @@ def import_framework_spreadsheets(tenant_id: int, is_superuser: bool):
         framework_control_num = load_data_from_dataframe_util(
             my_data_frame, tenant_id, is_superuser
         )
+        if not isinstance(framework_control_num, list):
+            print(f"[bold red]{file}: {framework_control_num['error']}[/bold red]")
+            continue
+        for row_error in framework_control_num[3]:
+            print(f"[yellow]{file} row {row_error['row']}: {row_error['error']}[/yellow]")
         frameworks += framework_control_num[0]
         controls += framework_control_num[1]
         framework_versions += framework_control_num[2]
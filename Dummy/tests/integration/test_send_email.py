@@ -3,7 +3,7 @@ import pytest
 from config.config import Settings
 from fedrisk_api.service.email_service import EmailService
 
-# python -m smtpd -c DebuggingServer -n 127.0.0.1:1025
+# python manage.py run-debug-smtp --port 1025
 
 
 @pytest.fixture
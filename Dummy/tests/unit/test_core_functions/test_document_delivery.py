@@ -0,0 +1,154 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from fedrisk_api.s3 import AsyncS3ClientPool
+from fedrisk_api.s3.delivery import download_response
+
+CONTENT = b"0123456789" * 100
+ETAG = '"abc123"'
+
+
+class StreamingBody:
+    def __init__(self, data):
+        self.data = data
+        self.closed = False
+
+    async def iter_chunks(self, chunk_size):
+        for start in range(0, len(self.data), chunk_size):
+            yield self.data[start : start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class S3StandIn:
+    """Answers get_object like S3 does for a single stored object"""
+
+    def __init__(self):
+        self.bodies = []
+
+    async def get_object(self, Bucket, Key, Range=None, IfNoneMatch=None):
+        if Key != "documents/1-report.pdf":
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        if IfNoneMatch and (IfNoneMatch == "*" or ETAG in IfNoneMatch.split(", ")):
+            raise ClientError(
+                {"Error": {"Code": "304"}, "ResponseMetadata": {"HTTPHeaders": {"etag": ETAG}}},
+                "GetObject",
+            )
+        response = {"ETag": ETAG, "LastModified": datetime(2024, 1, 2, tzinfo=timezone.utc)}
+        data = CONTENT
+        if Range:
+            start, end = (int(part) for part in Range.split("=")[1].split("-"))
+            if start >= len(CONTENT):
+                raise ClientError({"Error": {"Code": "InvalidRange"}}, "GetObject")
+            data = CONTENT[start : end + 1]
+            response["ContentRange"] = f"bytes {start}-{end}/{len(CONTENT)}"
+        body = StreamingBody(data)
+        self.bodies.append(body)
+        return {**response, "ContentLength": len(data), "Body": body}
+
+    async def generate_presigned_url(self, method, Params, ExpiresIn):
+        return f"https://s3.example.com/{Params['Bucket']}/{Params['Key']}?expires={ExpiresIn}"
+
+
+def make_request(headers=None):
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/documents/download/1",
+            "headers": [
+                (name.lower().encode(), value.encode()) for name, value in (headers or {}).items()
+            ],
+        }
+    )
+
+
+async def download(headers=None, key="documents/1-report.pdf", **kwargs):
+    client = S3StandIn()
+    response = await download_response(
+        make_request(headers),
+        bucket="tenant-bucket",
+        key=key,
+        filename="report.pdf",
+        media_type="application/pdf",
+        client=client,
+        **kwargs,
+    )
+    chunks = []
+    if hasattr(response, "body_iterator"):
+        chunks = [chunk async for chunk in response.body_iterator]
+    return response, chunks, client
+
+
+@pytest.mark.asyncio
+async def test_streams_the_object_in_large_chunks():
+    response, chunks, client = await download(chunk_size=256)
+
+    assert response.status_code == 200
+    assert b"".join(chunks) == CONTENT
+    assert [len(chunk) for chunk in chunks] == [256, 256, 256, 232]
+    assert response.headers["content-length"] == "1000"
+    assert response.headers["etag"] == ETAG
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["last-modified"] == "Tue, 02 Jan 2024 00:00:00 GMT"
+    assert response.headers["content-disposition"].startswith('attachment; filename="report.pdf"')
+    assert client.bodies[0].closed
+
+
+@pytest.mark.asyncio
+async def test_range_and_conditional_requests():
+    response, chunks, _ = await download({"Range": "bytes=10-19"})
+    assert (response.status_code, b"".join(chunks)) == (206, b"0123456789")
+    assert response.headers["content-range"] == "bytes 10-19/1000"
+
+    for if_none_match in (ETAG, f'"older", {ETAG}', "*"):
+        response, chunks, _ = await download({"If-None-Match": if_none_match})
+        assert (response.status_code, chunks, response.headers["etag"]) == (304, [], ETAG)
+
+    with pytest.raises(HTTPException) as error:
+        await download({"Range": "bytes=5000-5001"})
+    assert error.value.status_code == 416
+
+    with pytest.raises(HTTPException) as error:
+        await download(key="documents/2-missing.pdf")
+    assert error.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_redirects_to_a_presigned_url():
+    response, _, client = await download(redirect=True)
+
+    assert response.status_code == 307
+    assert response.headers["location"].startswith(
+        "https://s3.example.com/tenant-bucket/documents/1-report.pdf"
+    )
+    assert client.bodies == []
+
+
+def test_client_pool_closes_the_client_of_each_loop():
+    pool = AsyncS3ClientPool()
+
+    async def use():
+        client = await pool.get()
+        assert await pool.get() is client
+        return client._endpoint.http_session._session
+
+    # asyncio.run cancels the pool's closing task before it closes the loop
+    sessions = [asyncio.run(use()), asyncio.run(use())]
+
+    assert sessions[0] is not sessions[1]
+    assert all(session.closed for session in sessions)
+    assert pool._clients == {}
+
+    async def close():
+        session = await use()
+        await pool.close()
+        return session
+
+    assert asyncio.run(close()).closed
@@ -0,0 +1,115 @@
+import asyncio
+import hashlib
+from io import BytesIO
+
+import pytest
+from botocore.exceptions import ClientError
+from starlette.datastructures import UploadFile
+
+from fedrisk_api.s3.upload import presigned_upload, upload_file
+
+PART_SIZE = 5 * 1024 * 1024
+
+
+class S3StandIn:
+    """Keeps uploaded objects and parts in memory like an S3 bucket"""
+
+    def __init__(self, fail_part=None):
+        self.objects = {}
+        self.uploads = {}
+        self.aborted = []
+        self.fail_part = fail_part
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def put_object(self, Bucket, Key, Body, ContentMD5, **kwargs):
+        self.objects[Key] = Body
+
+    async def create_multipart_upload(self, Bucket, Key, **kwargs):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    async def upload_part(self, Bucket, Key, UploadId, PartNumber, Body, ContentMD5):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if PartNumber == self.fail_part:
+                raise ClientError({"Error": {"Code": "InternalError"}}, "UploadPart")
+            self.uploads[UploadId][PartNumber] = Body
+            return {"ETag": f'"etag-{PartNumber}"'}
+        finally:
+            self.in_flight -= 1
+
+    async def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(UploadId)
+        self.objects[Key] = b"".join(parts[part["PartNumber"]] for part in MultipartUpload["Parts"])
+
+    async def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId)
+        self.aborted.append(UploadId)
+
+    async def generate_presigned_post(self, Bucket, Key, Fields, Conditions, ExpiresIn):
+        return {"url": f"https://{Bucket}.s3.example.com", "fields": {**Fields, "key": Key}}
+
+
+def upload(data: bytes):
+    return UploadFile(BytesIO(data), filename="evidence.pdf")
+
+
+@pytest.mark.asyncio
+async def test_large_files_are_uploaded_in_concurrent_parts():
+    data = bytes(range(256)) * (PART_SIZE * 5 // 256) + b"tail"
+    client = S3StandIn()
+
+    result = await upload_file(
+        upload(data),
+        "tenant-bucket",
+        "documents/1-evidence.pdf",
+        client=client,
+        part_size=PART_SIZE,
+        concurrency=2,
+    )
+
+    assert client.objects["documents/1-evidence.pdf"] == data
+    assert result == {"size": len(data), "sha256": hashlib.sha256(data).hexdigest(), "parts": 6}
+    assert client.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_small_files_are_put_in_one_request():
+    client = S3StandIn()
+
+    result = await upload_file(
+        upload(b"report"), "tenant-bucket", "documents/2-r.pdf", client=client
+    )
+
+    assert client.objects == {"documents/2-r.pdf": b"report"}
+    assert (result["size"], result["parts"]) == (6, 1)
+    assert client.uploads == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_uploads_are_aborted():
+    client = S3StandIn(fail_part=2)
+
+    with pytest.raises(ClientError):
+        await upload_file(
+            upload(b"x" * PART_SIZE * 4), "tenant-bucket", "documents/3-evidence.pdf", client=client
+        )
+
+    assert client.aborted == ["upload-1"]
+    assert client.objects == {}
+
+
+@pytest.mark.asyncio
+async def test_presigned_upload_limits_the_content_type():
+    upload_form = await presigned_upload(
+        "tenant-bucket", "documents/4-evidence.pdf", "application/pdf", client=S3StandIn()
+    )
+
+    assert upload_form["fields"] == {
+        "Content-Type": "application/pdf",
+        "key": "documents/4-evidence.pdf",
+    }
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# the session listeners that push dashboard and notification changes
+from fedrisk_api.db import dashboard_metrics, notification_inbox  # noqa: F401
+from fedrisk_api.db.models import Base, Project, Risk, User, UserNotifications
+from fedrisk_api.utils.event_stream import event_broker, queue_event
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            User(id=1, email="one@example.com", tenant_id=1),
+            User(id=2, email="two@example.com", tenant_id=1),
+            Project(id=1, name="Project", tenant_id=1),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def subscribe():
+    # subscriptions belong to the running event loop, so the tests subscribe themselves
+    subscribed = {}
+
+    def _subscribe():
+        subscribed.update(
+            user_one=event_broker.subscribe(tenant_id=1, user_id=1),
+            user_two=event_broker.subscribe(tenant_id=1, user_id=2),
+            other_tenant=event_broker.subscribe(tenant_id=2, user_id=3),
+        )
+        return subscribed
+
+    yield _subscribe
+    for subscription in subscribed.values():
+        event_broker.unsubscribe(subscription)
+
+
+async def received(subscription):
+    # lets the call_soon_threadsafe deliveries run
+    await asyncio.sleep(0)
+    events = []
+    while not subscription.queue.empty():
+        stream_event = subscription.queue.get_nowait()
+        events.append((stream_event["event"], stream_event["data"]))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_events_are_published_on_commit_to_their_scope(db_session, subscribe):
+    subscriptions = subscribe()
+    queue_event(db_session, "tenant_news", tenant_id=1, headline="hello")
+    queue_event(db_session, "private", user_id=2)
+    assert await received(subscriptions["user_one"]) == []
+
+    db_session.commit()
+
+    assert await received(subscriptions["user_one"]) == [("tenant_news", {"headline": "hello"})]
+    assert await received(subscriptions["user_two"]) == [
+        ("tenant_news", {"headline": "hello"}),
+        ("private", {}),
+    ]
+    assert await received(subscriptions["other_tenant"]) == []
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_events_are_dropped(db_session, subscribe):
+    subscriptions = subscribe()
+    queue_event(db_session, "tenant_news", tenant_id=1)
+    db_session.rollback()
+    db_session.commit()
+
+    assert await received(subscriptions["user_one"]) == []
+
+
+@pytest.mark.asyncio
+async def test_notification_and_dashboard_changes_are_pushed(db_session, subscribe):
+    subscriptions = subscribe()
+    db_session.add(UserNotifications(user_id=1, notification_message="Assigned"))
+    db_session.add(Risk(name="Risk", project_id=1, tenant_id=1))
+    db_session.commit()
+
+    assert sorted(await received(subscriptions["user_one"])) == [
+        ("dashboard_invalidated", {"project_ids": [1]}),
+        ("notifications_changed", {}),
+    ]
+    assert await received(subscriptions["user_two"]) == [
+        ("dashboard_invalidated", {"project_ids": [1]})
+    ]
+
+
+@pytest.mark.asyncio
+async def test_slow_streams_are_told_to_resync(subscribe):
+    subscriptions = subscribe()
+    subscription = subscriptions["user_one"]
+    for _ in range(subscription.queue.maxsize + 1):
+        event_broker.publish_local('{"event": "tick", "tenant_id": 1, "user_id": null}')
+    await asyncio.sleep(0)
+
+    assert subscription.queue.full()
+    assert subscription.overflowed
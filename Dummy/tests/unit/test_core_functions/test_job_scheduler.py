@@ -0,0 +1,134 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from fedrisk_api.db.enums import ApprovalWorkflowStatus, ScheduledJobRunStatus
+from fedrisk_api.db.models import (
+    ApprovalWorkflow,
+    ApprovalWorkflowHistory,
+    Base,
+    ScheduledJobRun,
+    Tenant,
+    User,
+)
+from fedrisk_api.utils.job_scheduler import JobScheduler
+from fedrisk_api.utils.scheduled_jobs import reject_overdue_approval_workflows
+
+
+@pytest.fixture
+def session_maker():
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def scheduler(session_maker):
+    def get_db():
+        db = session_maker()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return JobScheduler(session_factory=get_db)
+
+
+def test_runs_are_recorded_once_per_interval(scheduler, session_maker):
+    calls = []
+    scheduler.register("count", lambda db: calls.append(db) or len(calls), interval_seconds=3600)
+
+    run = scheduler.run_job("count")
+    assert (run.status, run.result) == (ScheduledJobRunStatus.succeeded, "1")
+    # another replica or an early wake-up within the interval skips the job
+    assert scheduler.run_job("count") is None
+    assert scheduler.run_job("count", force=True).result == "2"
+
+    metrics = scheduler.describe()[0]
+    assert (metrics["runs"], metrics["skipped"], metrics["failures"]) == (2, 1, 0)
+    assert metrics["max_seconds"] >= metrics["average_seconds"] >= 0
+    with session_maker() as db:
+        assert db.query(ScheduledJobRun).filter_by(job_name="count").count() == 2
+
+
+def test_failed_and_coroutine_jobs(scheduler, session_maker):
+    def fail(db):
+        db.add(ScheduledJobRun(job_name="partial", status="failed", started_date=None))
+        raise ValueError("no connection")
+
+    async def check(db):
+        return "checked"
+
+    scheduler.register("fail", fail, interval_seconds=60)
+    scheduler.register("check", check, interval_seconds=60)
+
+    run = scheduler.run_job("fail")
+    assert (run.status, run.error) == (ScheduledJobRunStatus.failed, "no connection")
+    assert scheduler.run_job("check").result == "checked"
+    assert scheduler.describe()[0]["failures"] == 1
+    with session_maker() as db:
+        # the failed job's own changes are rolled back
+        assert [run.job_name for run in db.query(ScheduledJobRun)] == ["fail", "check"]
+
+
+@pytest.mark.asyncio
+async def test_started_scheduler_runs_jobs_until_stopped(scheduler):
+    calls = []
+    scheduler.register("tick", lambda db: calls.append(1), interval_seconds=0.05)
+
+    scheduler.start()
+    await asyncio.sleep(0.3)
+    await scheduler.stop()
+    stopped_at = len(calls)
+    await asyncio.sleep(0.1)
+
+    assert stopped_at >= 2
+    assert len(calls) == stopped_at
+
+
+def test_overdue_approval_workflows_are_rejected(scheduler, session_maker):
+    with session_maker() as db:
+        db.add_all(
+            [
+                Tenant(id=1, name="Tenant"),
+                User(id=1, email="owner@example.com", tenant_id=1),
+                ApprovalWorkflow(
+                    id=1,
+                    name="Overdue",
+                    owner_id=1,
+                    tenant_id=1,
+                    status=ApprovalWorkflowStatus.in_progress,
+                    due_date=date.today() - timedelta(days=1),
+                ),
+                ApprovalWorkflow(
+                    id=2,
+                    name="Due later",
+                    owner_id=1,
+                    tenant_id=1,
+                    status=ApprovalWorkflowStatus.in_progress,
+                    due_date=date.today() + timedelta(days=1),
+                ),
+            ]
+        )
+        db.commit()
+    scheduler.register("approval_workflow_due_dates", reject_overdue_approval_workflows, 3600)
+
+    run = scheduler.run_job("approval_workflow_due_dates")
+
+    assert run.status == ScheduledJobRunStatus.succeeded, run.error
+    with session_maker() as db:
+        statuses = dict(db.query(ApprovalWorkflow.id, ApprovalWorkflow.status))
+        assert statuses == {
+            1: ApprovalWorkflowStatus.rejected,
+            2: ApprovalWorkflowStatus.in_progress,
+        }
+        history = db.query(ApprovalWorkflowHistory).one()
+        # written by the job, not by a user
+        assert (history.approval_workflow_id, history.author_id) == (1, None)
@@ -0,0 +1,62 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from fedrisk_api.db.models import Base, Project
+from fedrisk_api.utils.utils import keyset_order, pagination
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            Project(id=project_id, name=name, tenant_id=1)
+            for project_id, name in enumerate(["Delta", "Alpha", "Echo", "Bravo", "Charlie"], 1)
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_pagination_offset_mode_is_unchanged(db_session):
+    response = pagination(db_session.query(Project).order_by(Project.id), offset=1, limit=2)
+    assert [project.id for project in response["items"]] == [2, 3]
+    assert response["total"] == 5
+    assert response["next_cursor"] is None
+
+
+def test_pagination_follows_keyset_cursor(db_session):
+    keyset = keyset_order(Project, "-name", ("name",))
+    query = db_session.query(Project)
+
+    names = []
+    after = None
+    while True:
+        response = pagination(query, offset=0, limit=2, after=after, total="none", keyset=keyset)
+        names.extend(project.name for project in response["items"])
+        assert response["total"] is None
+        after = response["next_cursor"]
+        if after is None:
+            break
+    assert names == ["Echo", "Delta", "Charlie", "Bravo", "Alpha"]
+
+
+def test_pagination_estimate_falls_back_to_exact_count(db_session):
+    response = pagination(db_session.query(Project), offset=0, limit=2, total="estimate")
+    assert response["total"] == 5
+    assert response["total_is_estimate"] is False
+
+
+def test_pagination_rejects_bad_cursors(db_session):
+    keyset = keyset_order(Project, "name", ("name",))
+    with pytest.raises(HTTPException):
+        pagination(db_session.query(Project), 0, 2, after="not-a-cursor", keyset=keyset)
+    with pytest.raises(HTTPException):
+        pagination(db_session.query(Project), 0, 2, after="WzFd", keyset=None)
+    assert keyset_order(Project, "description", ("name",)) is None
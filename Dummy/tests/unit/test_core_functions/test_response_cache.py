@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from fastapi import Request
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import fedrisk_api.utils.response_cache as response_cache_module
+from fedrisk_api.db.models import Base, Project, Risk
+from fedrisk_api.utils.response_cache import LRUResponseCache, cached_response
+
+
+@pytest.fixture(autouse=True)
+def lru_cache(monkeypatch):
+    cache = LRUResponseCache(16, 60)
+    monkeypatch.setattr(response_cache_module, "response_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [Project(id=1, name="Apollo", tenant_id=1), Project(id=2, name="Gemini", tenant_id=2)]
+    )
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def get(calls):
+    def get(project_id, query_string=b"", user_id=1, if_none_match=None):
+        headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+        request = Request(
+            {
+                "type": "http",
+                "method": "GET",
+                "path": f"/projects/{project_id}",
+                "query_string": query_string,
+                "headers": headers,
+            }
+        )
+
+        def compute():
+            calls.append(project_id)
+            return {"project_id": project_id}
+
+        user = {"tenant_id": 1, "user_id": user_id}
+        return cached_response(request, user, compute, project_id=project_id, per_user=True)
+
+    return get
+
+
+def test_cached_response_serves_repeat_requests(get, calls):
+    first = get(1, b"sort=name&page=2")
+    assert json.loads(first.body) == {"project_id": 1}
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    second = get(1, b"page=2&sort=name")
+    assert second.body == first.body
+    assert second.headers["etag"] == first.headers["etag"]
+    assert calls == [1]
+
+    get(1, b"page=2&sort=name", user_id=2)
+    assert calls == [1, 1]
+
+
+def test_cached_response_if_none_match(get, calls):
+    etag = get(1).headers["etag"]
+
+    response = get(1, if_none_match=etag)
+    assert response.status_code == 304
+    assert response.body == b""
+    assert calls == [1]
+
+
+def test_commit_bumps_project_versions(get, calls, db_session, lru_cache):
+    names = ["project:1", "tenant:1", "project:2", "tenant:2"]
+    versions = lru_cache.get_versions(names)
+    get(1)
+    get(2)
+
+    db_session.add(Risk(name="r1", project_id=1, tenant_id=1))
+    db_session.flush()
+    get(1)
+    assert calls == [1, 2]
+
+    db_session.commit()
+    assert lru_cache.get_versions(names) == [
+        versions[0] + 1,
+        versions[1] + 1,
+        versions[2],
+        versions[3],
+    ]
+    get(1)
+    get(2)
+    assert calls == [1, 2, 1]
+
+
+def test_rollback_discards_pending_versions(db_session, lru_cache):
+    versions = lru_cache.get_versions(["project:1", "tenant:1"])
+    db_session.add(Risk(name="r1", project_id=1, tenant_id=1))
+    db_session.flush()
+    db_session.rollback()
+
+    assert lru_cache.get_versions(["project:1", "tenant:1"]) == versions
@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import fedrisk_api.db.dashboard_metrics as dashboard_metrics
+from fedrisk_api.db.dashboard_metrics import get_dashboard_metric, get_dashboard_metrics
+from fedrisk_api.db.models import (
+    AuditTest,
+    AuditTestInstance,
+    Base,
+    DashboardMetric,
+    Project,
+    Risk,
+)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            Project(id=1, name="Apollo", tenant_id=1),
+            Project(id=2, name="Gemini", tenant_id=1),
+            AuditTest(id=1, name="a1", project_id=2, tenant_id=1),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def risk_counter(db_session):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"risks": db_session.query(Risk).filter(Risk.project_id == 1).count()}
+
+    compute.calls = calls
+    return compute
+
+
+def test_get_dashboard_metric_is_stored(db_session, risk_counter):
+    payload, computed_date = get_dashboard_metric(db_session, 1, "risk", risk_counter)
+    assert payload == {"risks": 0}
+    assert computed_date is not None
+
+    assert get_dashboard_metric(db_session, 1, "risk", risk_counter) == (payload, computed_date)
+    assert len(risk_counter.calls) == 1
+
+
+def test_writes_mark_metric_stale(db_session, risk_counter, monkeypatch):
+    get_dashboard_metric(db_session, 1, "risk", risk_counter)
+
+    db_session.add(Risk(name="r1", project_id=1, tenant_id=1))
+    db_session.commit()
+
+    row = db_session.query(DashboardMetric).filter_by(project_id=1, metric="risk").one()
+    assert row.stale_date is not None
+
+    # within the refresh window the stale row is still served
+    assert get_dashboard_metric(db_session, 1, "risk", risk_counter)[0] == {"risks": 0}
+
+    monkeypatch.setattr(dashboard_metrics, "DASHBOARD_METRIC_REFRESH_SECONDS", 0)
+    assert get_dashboard_metric(db_session, 1, "risk", risk_counter)[0] == {"risks": 1}
+    assert len(risk_counter.calls) == 2
+
+
+def test_indirect_writes_mark_owning_project_stale(db_session):
+    get_dashboard_metrics(db_session, [1, 2], "pivot", lambda ids: {i: {"id": i} for i in ids})
+
+    db_session.add(AuditTestInstance(audit_test_id=1, status="complete"))
+    db_session.commit()
+
+    stale = {
+        row.project_id: row.stale_date is not None
+        for row in db_session.query(DashboardMetric).filter_by(metric="pivot")
+    }
+    assert stale == {1: False, 2: True}
+
+
+def test_get_dashboard_metric_skips_empty_payload(db_session):
+    assert get_dashboard_metric(db_session, 3, "summary", lambda: None) == (None, None)
+    assert db_session.query(DashboardMetric).count() == 0
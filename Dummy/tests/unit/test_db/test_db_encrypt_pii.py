@@ -0,0 +1,138 @@
+import os
+
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy.orm import Session
+
+import fedrisk_api.db.util.encrypt_pii_utils as encrypt_pii_utils
+from fedrisk_api.db.util.encrypt_pii_utils import (
+    DataKeyCache,
+    decrypt_pii,
+    decrypt_pii_values,
+    decrypt_user_fields,
+    decrypt_users_fields,
+    encrypt_pii,
+    is_encrypted,
+    request_pii_memo,
+)
+
+WRAPPED_KEY = b"wrapped-data-key"
+PLAINTEXT_KEY = os.urandom(32)
+
+
+@pytest.fixture
+def mock_session():
+    session = MagicMock(spec=Session)
+    session.query().filter().first.return_value = None
+    return session
+
+
+@pytest.fixture
+def mock_kms(monkeypatch):
+    kms = MagicMock()
+    kms.generate_data_key.return_value = {
+        "CiphertextBlob": WRAPPED_KEY,
+        "Plaintext": PLAINTEXT_KEY,
+    }
+    kms.decrypt.return_value = {"Plaintext": PLAINTEXT_KEY}
+    kms.exceptions.InvalidCiphertextException = ValueError
+    monkeypatch.setattr(encrypt_pii_utils, "kms_client", kms)
+    monkeypatch.setattr(encrypt_pii_utils, "data_key_cache", DataKeyCache(8, 60))
+    return kms
+
+
+def test_encrypt_pii_round_trip(mock_session, mock_kms):
+    encrypted = encrypt_pii(mock_session, 1, "Jane")
+
+    assert encrypted.startswith("ENC2::")
+    assert is_encrypted(encrypted)
+    assert decrypt_pii(encrypted) == "Jane"
+    mock_kms.generate_data_key.assert_called_once()
+    mock_session.add.assert_called_once()
+
+
+def test_decrypt_pii_uses_cached_data_key(mock_session, mock_kms):
+    encrypted = [encrypt_pii(mock_session, 1, name) for name in ("Jane", "John", "Jim")]
+    encrypt_pii_utils.data_key_cache.clear()
+
+    assert [decrypt_pii(value) for value in encrypted] == ["Jane", "John", "Jim"]
+    assert mock_kms.decrypt.call_count == 1
+
+
+def test_decrypt_pii_reads_legacy_values(mock_kms):
+    mock_kms.decrypt.return_value = {"Plaintext": b"Legacy"}
+
+    assert decrypt_pii("ENC::" + b"blob".hex()) == "Legacy"
+    assert decrypt_pii("plain") == "plain"
+    assert decrypt_pii(None) is None
+
+
+def test_encrypt_pii_skips_encrypted_values(mock_session, mock_kms):
+    assert encrypt_pii(mock_session, 1, "ENC::abcd") == "ENC::abcd"
+    assert encrypt_pii(mock_session, 1, "") == ""
+    mock_kms.generate_data_key.assert_not_called()
+
+
+def test_data_key_cache_is_bounded():
+    cache = DataKeyCache(max_size=2, ttl_seconds=60)
+    cache.set(b"a", b"1")
+    cache.set(b"b", b"2")
+    cache.set(b"c", b"3")
+
+    assert cache.get(b"a") is None
+    assert cache.get(b"c") == b"3"
+
+
+def test_decrypt_user_fields(mock_session, mock_kms):
+    user = MagicMock()
+    user.first_name = encrypt_pii(mock_session, 1, "Jane")
+    user.last_name = "Doe"
+    user.phone_no = None
+
+    result = decrypt_user_fields(user)
+
+    assert result["first_name"] == "Jane"
+    assert result["last_name"] == "Doe"
+    assert result["phone_no"] is None
+
+
+def test_decrypt_pii_values_decrypts_distinct_values_once(mock_kms):
+    mock_kms.decrypt.side_effect = lambda CiphertextBlob: {
+        "Plaintext": CiphertextBlob.decode("utf-8").upper().encode("utf-8")
+    }
+    values = ["ENC::" + b"ann".hex(), "ENC::" + b"bob".hex(), "ENC::" + b"ann".hex(), "plain"]
+
+    result = decrypt_pii_values(values)
+
+    assert result[values[0]] == "ANN"
+    assert result[values[1]] == "BOB"
+    assert result["plain"] == "plain"
+    assert mock_kms.decrypt.call_count == 2
+
+
+def test_decrypt_pii_values_shares_request_memo(mock_kms):
+    mock_kms.decrypt.return_value = {"Plaintext": b"Memo"}
+    value = "ENC::" + b"blob".hex()
+    token = request_pii_memo.set({})
+    try:
+        decrypt_pii_values([value])
+        assert decrypt_pii(value) == "Memo"
+    finally:
+        request_pii_memo.reset(token)
+
+    assert mock_kms.decrypt.call_count == 1
+
+
+def test_decrypt_users_fields(mock_session, mock_kms):
+    users = []
+    for first_name in ("Jane", "John"):
+        user = MagicMock()
+        user.first_name = encrypt_pii(mock_session, 1, first_name)
+        user.last_name = encrypt_pii(mock_session, 1, "Doe")
+        user.phone_no = None
+        users.append(user)
+
+    result = decrypt_users_fields(users + [None])
+
+    assert [user["first_name"] for user in result] == ["Jane", "John"]
+    assert [user["last_name"] for user in result] == ["Doe", "Doe"]
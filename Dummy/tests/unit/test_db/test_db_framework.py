@@ -132,8 +132,9 @@ def test_delete_framework(db_session, mock_framework):
 
 def test_search(db_session, mock_superuser, mock_framework):
     """Test searching for frameworks based on a query."""
-    db_session.query().filter().all.return_value = [mock_framework]
-    db_session.query().filter().count.return_value = 1
+    db_session.query().filter().add_columns().order_by().offset().limit().all.return_value = [
+        (mock_framework, 1)
+    ]
     db_session.query().filter().first.return_value = mock_superuser
 
     new_user = User(id=1, email="test@test.com")
@@ -145,6 +146,6 @@ def test_search(db_session, mock_superuser, mock_framework):
     )
 
     assert count == 1
-    assert results is not None
-    db_session.query().filter().all.assert_called()
-    db_session.query().filter().count.assert_called_once()
+    assert results == [mock_framework]
+    db_session.query().filter().add_columns().order_by().offset().limit().all.assert_called()
+    db_session.query().filter().count.assert_not_called()
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from fedrisk_api.db.governance_dashboard import get_control_breakdown
+from fedrisk_api.db.models import (
+    Base,
+    Control,
+    ControlClass,
+    ControlFrameworkVersion,
+    Framework,
+    FrameworkTenant,
+    FrameworkVersion,
+    ProjectControl,
+)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            ControlClass(id=1, name="Technical", tenant_id=1),
+            ControlClass(id=2, name="Operational", tenant_id=1),
+            ControlClass(id=3, name="Management", tenant_id=2),
+            Framework(id=1, name="NIST 800-53"),
+            Framework(id=2, name="CIS"),
+            FrameworkTenant(tenant_id=1, framework_id=1),
+            FrameworkTenant(tenant_id=1, framework_id=2),
+            FrameworkVersion(id=1, framework_id=1),
+            FrameworkVersion(id=2, framework_id=1),
+            Control(id=1, name="AC-1", tenant_id=1),
+            Control(id=2, name="AC-2", tenant_id=1),
+            # AC-1 is in both versions of the framework but counts once
+            ControlFrameworkVersion(control_id=1, framework_version_id=1),
+            ControlFrameworkVersion(control_id=1, framework_version_id=2),
+            ControlFrameworkVersion(control_id=2, framework_version_id=2),
+            ProjectControl(
+                project_id=1, control_id=1, control_class_id=1, mitigation_percentage=25
+            ),
+            ProjectControl(
+                project_id=1, control_id=2, control_class_id=1, mitigation_percentage=50
+            ),
+            ProjectControl(
+                project_id=2, control_id=1, control_class_id=2, mitigation_percentage=100
+            ),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_get_control_breakdown_by_class(db_session):
+    assert get_control_breakdown(db_session, 1, 1, "class") == [
+        {"x": "Technical", "y": 2, "percent": 37.5},
+        {"x": "Operational", "y": 0, "percent": 0},
+    ]
+
+
+def test_get_control_breakdown_by_framework(db_session):
+    assert get_control_breakdown(db_session, 1, 1, "framework") == [
+        {"x": "NIST 800-53", "y": 2, "percent": 37.5},
+        {"x": "CIS", "y": 0, "percent": 0},
+    ]
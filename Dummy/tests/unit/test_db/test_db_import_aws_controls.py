@@ -0,0 +1,111 @@
+import asyncio
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import fedrisk_api.db.util.import_aws_controls as import_aws_controls
+from fedrisk_api.db.models import (
+    AWSControl,
+    AWSControlProjectControl,
+    Base,
+    Control,
+    ControlFrameworkVersion,
+    ProjectControl,
+)
+from fedrisk_api.db.util.import_aws_controls import (
+    load_aws_control_data_from_dataframe,
+    parse_related_requirements,
+)
+
+
+@pytest.fixture
+def db_session(monkeypatch):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            Control(id=1, name="AC-2: Account Management", tenant_id=1),
+            Control(id=2, name="AC-2(1) Automated Account Management", tenant_id=1),
+            Control(id=3, name="SC-7: Boundary Protection", tenant_id=1),
+            # not in any framework version, so never mapped
+            Control(id=4, name="SC-8 Transmission Confidentiality", tenant_id=1),
+            ControlFrameworkVersion(control_id=1, framework_version_id=1),
+            ControlFrameworkVersion(control_id=2, framework_version_id=1),
+            ControlFrameworkVersion(control_id=2, framework_version_id=2),
+            ControlFrameworkVersion(control_id=3, framework_version_id=1),
+            ProjectControl(id=11, project_id=1, control_id=1),
+            ProjectControl(id=12, project_id=1, control_id=2),
+            ProjectControl(id=13, project_id=1, control_id=3),
+            ProjectControl(id=14, project_id=1, control_id=4),
+            ProjectControl(id=21, project_id=2, control_id=1),
+            AWSControl(id=1, aws_id="IAM.1", aws_related_requirements="NIST.800-53.r5 SC-7"),
+        ]
+    )
+    session.commit()
+
+    def get_db():
+        yield session
+
+    monkeypatch.setattr(import_aws_controls, "get_db", get_db)
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def security_hub_export(rows):
+    return pd.DataFrame(
+        [
+            {
+                "ID": aws_id,
+                "Title": aws_id,
+                "Control Status": None,
+                "Severity": None,
+                "Failed checks": 0,
+                "Unknown checks": 0,
+                "Not available checks": 0,
+                "Passed checks": 1,
+                "Related requirements": requirements,
+                "Custom parameters": None,
+            }
+            for aws_id, requirements in rows
+        ]
+    )
+
+
+def test_parse_related_requirements():
+    assert parse_related_requirements("NIST.800-53.r5 AC-2, NIST.800-53.r5 AC-2(1)") == [
+        "AC-2",
+        "AC-2(1)",
+    ]
+    assert parse_related_requirements(float("nan")) == []
+
+
+def test_load_aws_control_data_maps_every_listed_requirement(db_session):
+    result = asyncio.run(
+        load_aws_control_data_from_dataframe(
+            security_hub_export(
+                [
+                    ("IAM.1", "NIST.800-53.r5 SC-7"),
+                    ("IAM.2", "NIST.800-53.r5 AC-2, NIST.800-53.r5 AC-2(1), NIST.800-53.r5 SC-8"),
+                    ("EC2.1", "NIST.800-53.r5 SC-7"),
+                ]
+            ),
+            project_id=1,
+        )
+    )
+
+    assert result == [2, 3]
+    aws_control_ids = dict(db_session.query(AWSControl.aws_id, AWSControl.id))
+    assert sorted(
+        (mapping.aws_control_id, mapping.project_control_id)
+        for mapping in db_session.query(AWSControlProjectControl)
+    ) == sorted(
+        [
+            (aws_control_ids["IAM.2"], 11),
+            (aws_control_ids["IAM.2"], 12),
+            (aws_control_ids["EC2.1"], 13),
+        ]
+    )
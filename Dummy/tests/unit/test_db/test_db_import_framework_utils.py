@@ -0,0 +1,110 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import fedrisk_api.db.util.import_framework_utils as import_framework_utils
+from fedrisk_api.db.models import (
+    Base,
+    Control,
+    ControlFrameworkVersion,
+    Framework,
+    FrameworkTenant,
+    FrameworkVersion,
+    Keyword,
+    KeywordMapping,
+)
+from fedrisk_api.db.util.import_framework_utils import load_data_from_dataframe
+
+
+@pytest.fixture
+def db_session(monkeypatch):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            Framework(id=1, name="NIST 800-53"),
+            FrameworkVersion(id=1, framework_id=1, version_prefix="Rev", version_suffix="5"),
+            Control(id=1, name="AC-1: Policy", tenant_id=1),
+        ]
+    )
+    session.commit()
+
+    def get_db():
+        yield session
+
+    monkeypatch.setattr(import_framework_utils, "get_db", get_db)
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def sheet(rows):
+    return pd.DataFrame(
+        rows,
+        columns=[
+            "Framework",
+            "Prefix Version",
+            "Suffix Version",
+            "Control Title",
+            "Control Title 2",
+            "Control Description",
+            "Guidance",
+            "Keywords",
+        ],
+    )
+
+
+def test_load_data_from_dataframe_creates_missing_rows_once(db_session):
+    result = load_data_from_dataframe(
+        sheet(
+            [
+                ["NIST 800-53", "Rev", "5", "AC-1", "Policy", "", "", "access"],
+                ["NIST 800-53", "Rev", "5", "AC-2", "Accounts", "Desc", "Guide", "Access, users"],
+                ["CIS", "v", "8", "1.1", None, "", "", "inventory"],
+                ["CIS", "v", "8", "1.1", None, "", "", "inventory"],
+                [None, "v", "8", "1.2", None, "", "", ""],
+                ["CIS", "v", "8", None, None, "", "", ""],
+            ]
+        ),
+        tenant_id=1,
+        is_superuser=False,
+    )
+
+    assert result == [
+        1,
+        2,
+        1,
+        [
+            {"row": 6, "error": "Framework is missing or empty"},
+            {"row": 7, "error": "Control Title is missing or invalid"},
+        ],
+    ]
+    assert {(c.name, c.description) for c in db_session.query(Control)} == {
+        ("AC-1: Policy", None),
+        ("AC-2: Accounts", "Desc"),
+        ("1.1", ""),
+    }
+    assert db_session.query(FrameworkTenant).one().framework_id == 2
+    assert {
+        (link.control_id, link.framework_version_id)
+        for link in db_session.query(ControlFrameworkVersion)
+    } == {(1, 1), (2, 1), (3, 2)}
+    assert sorted(keyword.name for keyword in db_session.query(Keyword)) == [
+        "access",
+        "inventory",
+        "users",
+    ]
+    assert db_session.query(KeywordMapping).count() == 5
+
+
+def test_load_data_from_dataframe_is_idempotent(db_session):
+    rows = sheet([["CIS", "v", "8", "1.1", None, "", "", "inventory"]])
+    assert load_data_from_dataframe(rows, 1, False)[:3] == [1, 1, 1]
+    assert load_data_from_dataframe(rows, 1, False) == [0, 0, 0, []]
+    assert db_session.query(ControlFrameworkVersion).count() == 1
+
+
+def test_load_data_from_dataframe_without_valid_rows(db_session):
+    assert "error" in load_data_from_dataframe(sheet([[None] * 8]), 1, False)
@@ -0,0 +1,102 @@
+from io import BytesIO
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import fedrisk_api.db.import_job as import_job_module
+import fedrisk_api.db.util.import_framework_utils as import_framework_utils
+from fedrisk_api.db.enums import ImportJobStatus, ImportJobType
+from fedrisk_api.db.import_job import create_import_job, queue_pending_imports, run_import_job
+from fedrisk_api.db.models import Base, Control, ImportFramework, ImportJob, Tenant
+
+
+@pytest.fixture
+def db_session(monkeypatch):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            Tenant(id=1, name="Tenant", s3_bucket="tenant-bucket"),
+            ImportFramework(id=1, name="frameworks.xlsx", tenant_id=1),
+            ImportFramework(id=2, name="imported.xlsx", tenant_id=1, imported=True),
+        ]
+    )
+    session.commit()
+
+    def get_db():
+        yield session
+
+    monkeypatch.setattr(import_job_module, "get_db", get_db)
+    monkeypatch.setattr(import_framework_utils, "get_db", get_db)
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def framework_job(db_session):
+    return create_import_job(
+        db_session, ImportJobType.framework, 1, "frameworks/1-frameworks.xlsx", source_id=1
+    )
+
+
+def spreadsheet(rows):
+    data = BytesIO()
+    pd.DataFrame(rows, columns=["Framework", "Control Title"]).to_excel(data, index=False)
+    return data.getvalue()
+
+
+def test_run_import_job_records_progress_and_outcome(db_session, framework_job, monkeypatch):
+    contents = spreadsheet([["CIS", "CIS-1"], ["CIS", "CIS-2"], ["CIS", None]])
+    monkeypatch.setattr(import_job_module, "read_import_file", lambda db, job: contents)
+
+    run_import_job(framework_job.id)
+
+    job = db_session.query(ImportJob).one()
+    assert job.status == ImportJobStatus.succeeded
+    assert job.progress == 100
+    assert (job.total_rows, job.processed_rows, job.error_rows) == (3, 2, 1)
+    assert job.errors == [{"row": 4, "error": "Control Title is missing or invalid"}]
+    assert db_session.query(Control).count() == 2
+    source = db_session.query(ImportFramework).filter(ImportFramework.id == 1).one()
+    assert source.imported is True
+    assert source.import_results == job.result
+    assert job.result.endswith("Skipped rows 4.")
+
+
+def test_run_import_job_fails_infected_uploads(db_session, framework_job, monkeypatch):
+    monkeypatch.setattr(import_job_module, "S3Service", MagicMock())
+    monkeypatch.setattr(import_job_module, "_scan_result", lambda *args: "Infected")
+
+    job_id = framework_job.id
+    run_import_job(job_id)
+    # jobs that already ran are not run again
+    run_import_job(job_id)
+
+    job = db_session.query(ImportJob).one()
+    assert job.status == ImportJobStatus.failed
+    source = db_session.query(ImportFramework).filter(ImportFramework.id == 1).one()
+    assert source.imported is False
+    assert source.import_results.endswith("Could not import framework as file is infected")
+
+
+def test_run_import_job_leaves_unscanned_uploads_pending(db_session, framework_job, monkeypatch):
+    monkeypatch.setattr(import_job_module, "S3Service", MagicMock())
+    monkeypatch.setattr(import_job_module, "_scan_result", lambda *args: None)
+
+    run_import_job(framework_job.id)
+
+    assert db_session.query(ImportJob).one().status == ImportJobStatus.failed
+    source = db_session.query(ImportFramework).filter(ImportFramework.id == 1).one()
+    assert source.imported is None
+    sources = db_session.query(ImportFramework).all()
+    assert [job.source_id for job in queue_pending_imports(db_session, "framework", sources)] == [1]
+
+
+def test_queue_pending_imports_skips_imported_and_active_uploads(db_session, framework_job):
+    sources = db_session.query(ImportFramework).all()
+    assert queue_pending_imports(db_session, ImportJobType.framework, sources) == []
@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from fedrisk_api.db.models import (
+    Base,
+    Project,
+    User,
+    UserNotificationArchive,
+    UserNotifications,
+    UserWatching,
+)
+from fedrisk_api.db.notification_inbox import (
+    INBOX_KEYSET,
+    archive_user_notifications,
+    get_inbox,
+    get_unread_count,
+    mark_notifications_read,
+)
+from fedrisk_api.db.project import delete_project
+from fedrisk_api.db.util.notifications_utils import manage_notifications
+from fedrisk_api.utils.enumsdata import PaginationTotal
+from fedrisk_api.utils.utils import pagination
+
+NOW = datetime.utcnow()
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            User(id=1, email="one@example.com", tenant_id=1),
+            User(id=2, email="two@example.com", tenant_id=1),
+        ]
+    )
+    session.add_all(
+        [
+            UserNotifications(
+                user_id=1,
+                notification_message=f"Message {day}",
+                created=NOW - timedelta(days=day, hours=1),
+            )
+            for day in range(5)
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_unread_counter_follows_inserts_reads_and_deletes(db_session):
+    assert get_unread_count(db_session, 1) == 5
+
+    newest = get_inbox(db_session, 1).order_by(UserNotifications.created.desc()).first()
+    assert mark_notifications_read(db_session, 1, [newest.id]) == 1
+    # already read
+    assert mark_notifications_read(db_session, 1, [newest.id]) == 0
+    assert get_unread_count(db_session, 1) == 4
+
+    oldest = get_inbox(db_session, 1, unread_only=True).order_by(UserNotifications.created).first()
+    db_session.delete(oldest)
+    db_session.commit()
+    assert get_unread_count(db_session, 1) == 3
+
+    newest.read_date = None
+    db_session.commit()
+    assert get_unread_count(db_session, 1) == 4
+    assert mark_notifications_read(db_session, 1) == 4
+    assert (get_unread_count(db_session, 1), get_unread_count(db_session, 2)) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_bulk_watcher_notifications_are_counted(db_session):
+    watchers = [UserWatching(user_id=1), UserWatching(user_id=2)]
+
+    await manage_notifications(db_session, watchers, "tasks", "Updated task", "/tasks/1", 1, 1)
+
+    assert (get_unread_count(db_session, 1), get_unread_count(db_session, 2)) == (6, 1)
+
+
+def test_inbox_pages_newest_first_by_cursor(db_session):
+    query = get_inbox(db_session, 1)
+    first = pagination(query, 0, 2, total=PaginationTotal.none, keyset=INBOX_KEYSET)
+    second = pagination(
+        get_inbox(db_session, 1), 0, 2, after=first["next_cursor"], keyset=INBOX_KEYSET
+    )
+
+    messages = [n.notification_message for n in first["items"] + second["items"]]
+    assert messages == ["Message 0", "Message 1", "Message 2", "Message 3"]
+    assert second["total"] == 5
+
+
+def test_old_notifications_are_archived(db_session):
+    newest = get_inbox(db_session, 1).order_by(UserNotifications.created.desc()).first()
+    mark_notifications_read(db_session, 1, [newest.id])
+
+    assert archive_user_notifications(db_session, retention_days=2, batch_size=1) == 3
+
+    assert [n.notification_message for n in db_session.query(UserNotificationArchive)] == [
+        "Message 2",
+        "Message 3",
+        "Message 4",
+    ]
+    assert db_session.query(UserNotifications).count() == 2
+    assert get_unread_count(db_session, 1) == 1
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_project_uncounts_its_notifications(db_session):
+    db_session.add(Project(id=1, name="Project", tenant_id=1))
+    db_session.add_all(
+        [
+            UserNotifications(user_id=user_id, project_id=1, notification_message="Project")
+            for user_id in (1, 1, 2)
+        ]
+    )
+    db_session.commit()
+    assert (get_unread_count(db_session, 1), get_unread_count(db_session, 2)) == (7, 1)
+
+    assert await delete_project(db_session, 1, tenant_id=1)
+
+    assert (get_unread_count(db_session, 1), get_unread_count(db_session, 2)) == (5, 0)
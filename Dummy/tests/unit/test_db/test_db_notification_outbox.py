@@ -0,0 +1,186 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import fedrisk_api.db.notification_outbox as notification_outbox_module
+import fedrisk_api.db.util.notifications_utils as notifications_utils_module
+from fedrisk_api.db.enums import NotificationChannel, NotificationOutboxStatus
+from fedrisk_api.db.models import (
+    Base,
+    NotificationOutbox,
+    User,
+    UserNotifications,
+    UserNotificationSettings,
+    UserWatching,
+)
+from fedrisk_api.db.notification_outbox import (
+    claim_outbox_batch,
+    dispatch_outbox_batch,
+    drain_notification_outbox,
+    enqueue_email,
+)
+from fedrisk_api.db.util.notifications_utils import (
+    manage_notifications,
+    send_assigned_email,
+    send_sms,
+)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    sent = []
+
+    def sender():
+        def send(message):
+            if message.recipient.startswith("bad"):
+                raise ValueError(f"rejected {message.recipient}")
+            sent.append((message.channel, message.recipient))
+
+        return send
+
+    monkeypatch.setattr(
+        notification_outbox_module,
+        "OUTBOX_SENDERS",
+        {NotificationChannel.email: sender, NotificationChannel.sms: sender},
+    )
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_notifications_are_queued_with_the_transaction(db_session):
+    await send_assigned_email(db_session, "Assigned", "kept@example.com", "Task assigned")
+    await send_sms(db_session, "+15555550100", "Task assigned")
+    db_session.commit()
+    await send_assigned_email(db_session, "Assigned", "dropped@example.com", "Task assigned")
+    db_session.rollback()
+
+    messages = db_session.query(NotificationOutbox).order_by(NotificationOutbox.id).all()
+    assert [(message.channel, message.recipient) for message in messages] == [
+        (NotificationChannel.email, "kept@example.com"),
+        (NotificationChannel.sms, "+15555550100"),
+    ]
+    assert "Task assigned" in messages[0].body
+    assert all(message.status == NotificationOutboxStatus.pending for message in messages)
+
+
+@pytest.mark.asyncio
+async def test_watchers_are_notified_in_bulk_by_preference(db_session):
+    db_session.add_all(
+        [
+            User(id=1, email="default@example.com", phone_no="+15555550101", tenant_id=1),
+            User(id=2, email="sms@example.com", phone_no="+15555550102", tenant_id=1),
+            User(id=3, email="quiet@example.com", tenant_id=1),
+            UserNotificationSettings(user_id=2, assigned_email=False, assigned_sms=True),
+            UserNotificationSettings(user_id=3, assigned_email=False, assigned_sms=True),
+        ]
+    )
+    db_session.commit()
+    watchers = [UserWatching(user_id=user_id, project_id=1) for user_id in (1, 2, 3, 2, 4)]
+
+    await manage_notifications(db_session, watchers, "tasks", "Updated task", "/tasks/7", 1, 7)
+    db_session.rollback()
+
+    notifications = db_session.query(UserNotifications).order_by(UserNotifications.user_id)
+    assert [(n.user_id, n.notification_data_id) for n in notifications] == [
+        (1, 7),
+        (2, 7),
+        (3, 7),
+    ]
+    queued = db_session.query(NotificationOutbox).order_by(NotificationOutbox.id).all()
+    assert [(message.channel, message.recipient) for message in queued] == [
+        (NotificationChannel.email, "default@example.com"),
+        (NotificationChannel.sms, "+15555550102"),
+    ]
+    assert queued[1].body.startswith("Updated task Link: ")
+
+
+@pytest.mark.asyncio
+async def test_failed_notifications_keep_the_callers_changes(db_session, monkeypatch):
+    def fail(db, *args):
+        db.add(UserNotifications(user_id=1, notification_message="Partial"))
+        db.flush()
+        raise ValueError("no connection")
+
+    monkeypatch.setattr(notifications_utils_module, "notify_watchers", fail)
+    db_session.add(User(id=1, email="caller@example.com", tenant_id=1))
+    db_session.flush()
+
+    await manage_notifications(db_session, [UserWatching(user_id=1)], "tasks", "", "", 1, 7)
+    db_session.rollback()
+
+    assert [user.email for user in db_session.query(User)] == ["caller@example.com"]
+    assert db_session.query(UserNotifications).count() == 0
+
+
+def test_dispatch_retries_and_dead_letters_failures(db_session, sent, monkeypatch):
+    enqueue_email(db_session, "good@example.com", "Subject", "Body")
+    enqueue_email(db_session, "bad@example.com", "Subject", "Body")
+    db_session.commit()
+
+    assert dispatch_outbox_batch(db_session) == {"sent": 1, "retried": 1, "dead": 0}
+    assert sent == [(NotificationChannel.email, "good@example.com")]
+    failed = db_session.query(NotificationOutbox).filter_by(recipient="bad@example.com").one()
+    assert (failed.status, failed.attempts) == (NotificationOutboxStatus.pending, 1)
+    assert failed.last_error == "rejected bad@example.com"
+    # the retry isn't due yet
+    assert claim_outbox_batch(db_session) == []
+
+    monkeypatch.setattr(notification_outbox_module, "NOTIFICATION_OUTBOX_MAX_ATTEMPTS", 2)
+    failed.next_attempt_date = failed.created_date
+    db_session.commit()
+    assert dispatch_outbox_batch(db_session) == {"sent": 0, "retried": 0, "dead": 1}
+    db_session.expire_all()
+    messages = db_session.query(NotificationOutbox).all()
+    statuses = {message.recipient: message.status for message in messages}
+    assert statuses == {
+        "good@example.com": NotificationOutboxStatus.sent,
+        "bad@example.com": NotificationOutboxStatus.dead,
+    }
+
+
+def test_drain_limits_concurrent_sends_per_channel(db_session, monkeypatch):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def sender():
+        def send(message):
+            with lock:
+                active.append(message.id)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.remove(message.id)
+
+        return send
+
+    monkeypatch.setattr(
+        notification_outbox_module, "OUTBOX_SENDERS", {NotificationChannel.email: sender}
+    )
+    monkeypatch.setitem(
+        notification_outbox_module.NOTIFICATION_OUTBOX_CONCURRENCY, NotificationChannel.email, 2
+    )
+    for index in range(7):
+        enqueue_email(db_session, f"user{index}@example.com", "Subject", "Body")
+    db_session.commit()
+
+    assert drain_notification_outbox(db_session, batch_size=3) == {
+        "sent": 7,
+        "retried": 0,
+        "dead": 0,
+    }
+    assert max(peak) <= 2
+    assert db_session.query(NotificationOutbox).filter_by(status="sent").count() == 7
@@ -133,26 +133,28 @@ async def test_delete_project_evaluation(
 
 def test_search_superuser(db_session, mock_project_evaluation):
     """Test search function as a superuser with mock data."""
-    db_session.query().filter().all.return_value = [mock_project_evaluation]
-    db_session.query().filter().count.return_value = 1
+    db_session.query().filter().add_columns().order_by().offset().limit().all.return_value = [
+        (mock_project_evaluation, 1)
+    ]
 
     count, results = search("evaluation", db_session, tenant_id=100, user_id=1)
 
     assert count == 1
     assert results == [mock_project_evaluation]
-    db_session.query().filter().count.assert_called()
+    db_session.query().filter().count.assert_not_called()
 
 
 def test_search_non_superuser(db_session, mock_project_evaluation):
     """Test search function as a non-superuser with mock data."""
-    db_session.query().filter().all.return_value = [mock_project_evaluation]
-    db_session.query().filter().count.return_value = 1
+    db_session.query().filter().add_columns().order_by().offset().limit().all.return_value = [
+        (mock_project_evaluation, 1)
+    ]
 
     count, results = search("evaluation", db_session, tenant_id=100, user_id=2)
 
     assert count == 1
     assert results == [mock_project_evaluation]
-    db_session.query().filter().count.assert_called()
+    db_session.query().filter().count.assert_not_called()
 
 
 def test_get_all_project_evaluations(db_session):
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from fedrisk_api.db.project import (
     create_project,
@@ -32,7 +33,7 @@ from fedrisk_api.db.project import (
     add_users_to_multiple_project,
     add_a_user_to_project,
 )
-from fedrisk_api.db.models import Project, User, Role, ProjectControl
+from fedrisk_api.db.models import Base, Project, ProjectControl, ProjectUser, Risk, Role, User
 from fedrisk_api.schema.project import (
     CreateProject,
     UpdateProject,
@@ -184,6 +185,51 @@ def test_get_all_projects(db_session):
     assert result is not None
 
 
+@pytest.fixture
+def sqlite_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_get_all_projects_returns_list_rows(sqlite_session):
+    sqlite_session.add_all(
+        [
+            User(id=1, email="member@example.com", tenant_id=1, system_role=2),
+            Role(id=1, name="Project Manager"),
+            Project(id=1, name="Apollo", tenant_id=1),
+            Project(id=2, name="Gemini", tenant_id=1),
+            Project(id=3, name="Mercury", tenant_id=2),
+            ProjectUser(project_id=1, user_id=1, role_id=1),
+            Risk(name="r1", project_id=1, tenant_id=1),
+            Risk(name="r2", project_id=1, tenant_id=1),
+            ProjectControl(project_id=1),
+        ]
+    )
+    sqlite_session.commit()
+
+    rows = get_all_projects(
+        db=sqlite_session,
+        tenant_id=1,
+        user_id=1,
+        q=None,
+        filter_by=None,
+        filter_value=None,
+        sort_by="name",
+        with_role=True,
+    ).all()
+
+    assert len(rows) == 1
+    assert rows[0].name == "Apollo"
+    assert rows[0].my_role == "Project Manager"
+    assert rows[0].risk_count == 2
+    assert rows[0].project_control_count == 1
+    assert rows[0].audit_test_count == 0
+
+
 def test_get_all_tenant_projects(db_session):
     result = get_all_tenant_projects(db=db_session, tenant_id=1)
     assert result is not None
@@ -1,7 +1,12 @@
 import pytest
 from unittest.mock import MagicMock
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
 from fedrisk_api.db.models import (
+    AuditTestInstance,
+    Base,
+    CapPoam,
+    ProjectGroup,
     Risk,
     RiskCategory,
     Project,
@@ -69,6 +74,57 @@ def test_get_data_for_pivot(db_session):
     # assert result[0]["name"] == "Test Project"
 
 
+@pytest.fixture
+def sqlite_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_get_data_for_pivot_aggregates_per_project(sqlite_session):
+    """Tallies are grouped by project in one pass over all projects."""
+    sqlite_session.add_all(
+        [
+            User(id=1, email="admin@example.com", tenant_id=1, system_role=1),
+            ProjectGroup(id=1, name="Group", tenant_id=1),
+            Project(id=1, name="Apollo", tenant_id=1, project_group_id=1),
+            Project(id=2, name="Gemini", tenant_id=1, project_group_id=1),
+            RiskLikelihood(id=1, name="Very Likely"),
+            RiskImpact(id=1, name="Extreme"),
+            RiskImpact(id=2, name="Insignificant"),
+            Risk(name="r1", project_id=1, tenant_id=1, current_likelihood_id=1, risk_impact_id=1),
+            Risk(name="r2", project_id=1, tenant_id=1, current_likelihood_id=1, risk_impact_id=1),
+            Risk(name="r3", project_id=2, tenant_id=1, current_likelihood_id=1, risk_impact_id=2),
+            AuditTest(id=1, name="a1", project_id=1, tenant_id=1),
+            AuditTestInstance(audit_test_id=1, status="complete"),
+            AuditTestInstance(audit_test_id=1, status="on_hold"),
+            ProjectControl(project_id=1, mitigation_percentage=50),
+            ProjectControl(project_id=1, mitigation_percentage=0),
+            CapPoam(
+                name="c1", project_id=2, owner_id=1, status="completed", criticality_rating="high"
+            ),
+        ]
+    )
+    sqlite_session.commit()
+
+    result = {row["id"]: row for row in get_data_for_pivot(sqlite_session, tenant_id=1, user_id=1)}
+
+    assert result[1]["risk_high_count"] == 2
+    assert result[2]["risk_low_medium_count"] == 1
+    assert result[1]["audit_test_complete"] == 1
+    assert result[1]["audit_test_on_hold"] == 1
+    assert result[1]["project_control_count"] == 2
+    assert result[1]["control_mitigation_percent"] == 25.0
+    assert result[2]["project_control_count"] == 0
+    assert result[2]["cap_poam_completed"] == 1
+    assert result[2]["cap_poam_criticality_high"] == 1
+    assert result[1]["cap_poam_completed"] == 0
+    assert result[1]["metrics_computed_date"] is not None
+
+
 def test_create_reporting_settings_user(db_session):
     """Test creating reporting settings for a user."""
     settings_data = CreateReportingSettings(user_id=1, pivot_state=True)
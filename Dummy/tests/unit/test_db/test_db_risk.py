@@ -98,8 +98,9 @@ async def test_delete_risk(db_session):
 
 def test_search_risks(db_session):
     """Test searching for risks."""
-    db_session.query().filter().all.return_value = [Risk(id=1, name="Risk A")]
-    db_session.query().filter().count.return_value = 1
+    db_session.query().filter().add_columns().order_by().offset().limit().all.return_value = [
+        (Risk(id=1, name="Risk A"), 1)
+    ]
 
     count, result = search(query="Risk", db=db_session, tenant_id=1, user_id=1)
 
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from fedrisk_api.db.models import Base, Risk, RiskImpact, RiskLikelihood
+from fedrisk_api.db.risk_matrix import (
+    clear_risk_level_lookup,
+    count_risk_levels,
+    count_risk_levels_by,
+    get_risk_level,
+    get_risk_level_lookup,
+)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            RiskLikelihood(id=1, name="Unlikely"),
+            RiskLikelihood(id=2, name="Very Likely"),
+            RiskImpact(id=1, name="Extreme"),
+            RiskImpact(id=2, name="Minor"),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+    clear_risk_level_lookup()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_get_risk_level():
+    assert get_risk_level("Very Likely", "Extreme") == "high"
+    assert get_risk_level("Unlikely", "Extreme") == "medium_high"
+    assert get_risk_level("Unlikely", None) is None
+
+
+def test_get_risk_level_lookup(db_session):
+    assert get_risk_level_lookup(db_session) == {
+        (1, 1): "medium_high",
+        (1, 2): "low_medium",
+        (2, 1): "high",
+        (2, 2): "medium",
+    }
+
+
+def test_count_risk_levels(db_session):
+    db_session.add_all(
+        [
+            Risk(name="r1", project_id=1, tenant_id=1, current_likelihood_id=1, risk_impact_id=1),
+            Risk(name="r2", project_id=1, tenant_id=1, current_likelihood_id=1, risk_impact_id=1),
+            Risk(name="r3", project_id=1, tenant_id=1, current_likelihood_id=2, risk_impact_id=1),
+            Risk(name="r4", project_id=2, tenant_id=1, current_likelihood_id=2, risk_impact_id=2),
+            Risk(name="r5", project_id=2, tenant_id=1),
+        ]
+    )
+    db_session.commit()
+
+    assert count_risk_levels(db_session, Risk.project_id == 1) == {
+        "low": 0,
+        "low_medium": 0,
+        "medium": 0,
+        "medium_high": 2,
+        "high": 1,
+    }
+    by_project = count_risk_levels_by(db_session, Risk.project_id)
+    assert by_project[2]["medium"] == 1
+    assert sum(by_project[2].values()) == 1
@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from fedrisk_api.db.models import Base, Control, Project, ProjectUser, Risk, SearchDocument, User
+from fedrisk_api.db.search import reindex_search_documents, search_documents
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    session = TestingSessionLocal()
+    session.add_all(
+        [
+            User(id=1, email="admin@example.com", tenant_id=1, is_tenant_admin=True),
+            User(id=2, email="member@example.com", tenant_id=1),
+            Project(id=1, name="Apollo", description="Moon landing", tenant_id=1),
+            Project(id=2, name="Gemini", description="Orbital docking", tenant_id=1),
+            ProjectUser(project_id=1, user_id=2),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_search_documents_maintained_on_write(db_session):
+    risk = Risk(name="Fuel leak", description="Oxygen tank rupture", project_id=1, tenant_id=1)
+    db_session.add(risk)
+    db_session.commit()
+
+    document = (
+        db_session.query(SearchDocument).filter_by(object_type="risk", object_id=risk.id).one()
+    )
+    assert document.project_id == 1
+    assert document.title == "Fuel leak"
+
+    risk.name = "Hydrogen leak"
+    db_session.commit()
+    total, items = search_documents("hydrogen", db_session, 1, 1)
+    assert total == 1
+    assert items[0].object_id == risk.id
+
+    db_session.delete(risk)
+    db_session.commit()
+    assert db_session.query(SearchDocument).filter_by(object_type="risk").count() == 0
+
+
+def test_search_documents_filters_by_project_membership(db_session):
+    db_session.add_all(
+        [
+            Risk(name="Docking risk one", project_id=1, tenant_id=1),
+            Risk(name="Docking risk two", project_id=2, tenant_id=1),
+            Control(name="Docking control", tenant_id=1),
+            Risk(name="Docking risk three", project_id=2, tenant_id=2),
+        ]
+    )
+    db_session.commit()
+
+    admin_total, _ = search_documents("docking", db_session, 1, 1)
+    member_total, member_items = search_documents("docking", db_session, 1, 2)
+    risk_total, _ = search_documents("docking", db_session, 1, 1, object_types=["risk"])
+
+    # project 2 itself matches "Orbital docking"
+    assert admin_total == 4
+    assert member_total == 2
+    assert {item.project_id for item in member_items} == {1, None}
+    assert risk_total == 2
+
+
+def test_reindex_search_documents(db_session):
+    db_session.query(SearchDocument).delete()
+    db_session.commit()
+
+    written = reindex_search_documents(db_session)
+    assert written["project"] == 2
+    assert reindex_search_documents(db_session)["project"] == 0
+
+    written = reindex_search_documents(db_session, full=True, object_types=["project"])
+    assert written == {"project": 2}
+    assert db_session.query(SearchDocument).count() == 2
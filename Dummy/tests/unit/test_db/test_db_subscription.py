@@ -1,7 +1,15 @@
 import pytest
 from unittest.mock import MagicMock
 from sqlalchemy.orm import Session
-from fedrisk_api.db.subscription import get_tenant_customer_id, get_tenant_subscription_id
+from datetime import datetime, timedelta
+
+from fedrisk_api.db.subscription import (
+    get_tenant_customer_id,
+    get_tenant_subscription_id,
+    is_tenant_trial_expired,
+    reconcile_tenant_subscription_statuses,
+    sync_tenant_subscription_status,
+)
 
 
 @pytest.fixture
@@ -50,3 +58,62 @@ async def test_get_tenant_subscription_id_without_subscription(mock_session):
 
     # Assert the result is None when there is no subscription
     assert result is None
+
+
+def test_is_tenant_trial_expired(mock_session):
+    mock_status = MagicMock()
+    mock_status.status = "trialing"
+    mock_status.current_period_end = datetime.now() - timedelta(days=1)
+    mock_session.query().filter().first.return_value = mock_status
+
+    assert is_tenant_trial_expired(tenant_id=1, db=mock_session) is True
+
+    mock_status.current_period_end = datetime.now() + timedelta(days=1)
+    assert is_tenant_trial_expired(tenant_id=1, db=mock_session) is False
+
+    mock_status.status = "active"
+    mock_status.current_period_end = datetime.now() - timedelta(days=1)
+    assert is_tenant_trial_expired(tenant_id=1, db=mock_session) is False
+
+
+def test_is_tenant_trial_expired_without_local_state(mock_session):
+    mock_session.query().filter().first.return_value = None
+
+    assert is_tenant_trial_expired(tenant_id=1, db=mock_session) is False
+
+
+def test_sync_tenant_subscription_status_creates_row(mock_session):
+    mock_session.query().filter().first.return_value = None
+    period_end = datetime(2030, 1, 1)
+    subscription = {
+        "id": "sub_1",
+        "customer": "cust_1",
+        "status": "trialing",
+        "current_period_end": int(period_end.timestamp()),
+        "cancel_at_period_end": False,
+        "metadata": {"tenant_id": "7"},
+    }
+
+    result = sync_tenant_subscription_status(subscription, mock_session)
+
+    mock_session.add.assert_called_once()
+    mock_session.commit.assert_called_once()
+    assert result.tenant_id == 7
+    assert result.subscription_id == "sub_1"
+    assert result.status == "trialing"
+    assert result.current_period_end == period_end
+
+
+def test_reconcile_tenant_subscription_statuses(mock_session):
+    mock_tenant = MagicMock()
+    mock_tenant.id = 3
+    mock_tenant.customer_id = "cust_3"
+    mock_session.query().filter().all.return_value = [mock_tenant]
+    mock_session.query().filter().first.return_value = None
+    payment_client = MagicMock()
+    payment_client.list_subscriptions.return_value.data = [
+        {"id": "sub_3", "customer": "cust_3", "status": "active", "current_period_end": None}
+    ]
+
+    assert reconcile_tenant_subscription_statuses(payment_client, mock_session) == 1
+    payment_client.list_subscriptions.assert_called_once()
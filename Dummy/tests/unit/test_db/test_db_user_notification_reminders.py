@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from fedrisk_api.db.models import (
+    Approval,
+    ApprovalStakeholder,
+    ApprovalWorkflow,
+    AuditTest,
+    Base,
+    EmailNotifications,
+    ScheduledReminder,
+    Task,
+    User,
+    UserNotificationSettings,
+)
+from fedrisk_api.db.user_notification import get_scheduled_emails, get_scheduled_sms
+
+TODAY = date(2026, 10, 19)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            User(id=1, email="one@example.com", phone_no="+15555550101", tenant_id=1),
+            User(id=2, email="three@example.com", tenant_id=1),
+            UserNotificationSettings(user_id=1, upcoming_event_deadline="one_day_prior"),
+            UserNotificationSettings(user_id=2, upcoming_event_deadline="three_days_prior"),
+            AuditTest(id=1, name="Audit", tester_id=1, end_date=TODAY + timedelta(1), tenant_id=1),
+            AuditTest(id=2, name="Later", tester_id=1, end_date=TODAY + timedelta(3), tenant_id=1),
+            Task(
+                id=1,
+                name="Task",
+                assigned_to=2,
+                due_date=TODAY + timedelta(days=3),
+                user_id=1,
+                tenant_id=1,
+            ),
+            ApprovalWorkflow(
+                id=1, name="Review", owner_id=1, due_date=TODAY + timedelta(days=1), tenant_id=1
+            ),
+            Approval(approval_workflow_id=1, user_id=1),
+            ApprovalStakeholder(approval_workflow_id=1, user_id=2),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_scheduled_emails_join_due_dates_against_user_offsets(db_session):
+    emails = get_scheduled_emails(db_session, on_date=TODAY)
+
+    assert [(email["email"], email["message"]) for email in emails] == [
+        ("one@example.com", "An audit test Audit you are assigned to is due in 1 days"),
+        ("three@example.com", "A task Task you are assigned to is due in 3 days"),
+        ("one@example.com", "An approval workflow Review you own is due in 1 days"),
+    ]
+    assert db_session.query(ScheduledReminder).count() == 3
+    assert db_session.query(EmailNotifications).count() == 3
+    # reminders are only sent once per item and offset
+    assert get_scheduled_emails(db_session, on_date=TODAY) == []
+
+
+def test_scheduled_sms_skip_users_without_phone(db_session):
+    sms = get_scheduled_sms(db_session, on_date=TODAY)
+
+    assert [(message["phone_no"], message["message"]) for message in sms] == [
+        ("+15555550101", "An audit test Audit you are assigned to is due in 1 days"),
+        ("+15555550101", "An approval workflow Review you own is due in 1 days"),
+    ]
+    # the email reminders are tracked separately
+    assert len(get_scheduled_emails(db_session, on_date=TODAY)) == 3
@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from fedrisk_api.db.enums import TaskPriority
+from fedrisk_api.db.models import (
+    Base,
+    NotificationOutbox,
+    Project,
+    Risk,
+    RiskStakeholder,
+    Task,
+    User,
+    WorkflowEvent,
+    WorkflowEventLog,
+    WorkflowEventSweep,
+    WorkflowFlowchart,
+)
+from fedrisk_api.db.workflow_event import (
+    compile_trigger_logic,
+    process_workflow_event_triggers,
+)
+
+HIGH_PRIORITY = [{"field": "Priority", "operator": "Equals", "value": "High", "weight": 0}]
+
+
+def field(name, value):
+    return {"field": name, "value": value}
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            User(id=1, email="owner@example.com", tenant_id=1),
+            User(id=2, email="stakeholder@example.com", tenant_id=1),
+            Project(id=1, name="Project", project_admin_id=1, tenant_id=1),
+            WorkflowFlowchart(id=1, name="Flowchart", project_id=1),
+            Task(id=1, name="High", priority="high", user_id=1, tenant_id=1),
+            Task(id=2, name="Low", priority="low", user_id=1, tenant_id=1),
+            WorkflowEvent(
+                id=1,
+                name="Risk on high priority",
+                workflow_flowchart_node_id=1,
+                workflow_flowchart_id=1,
+                trigger_logic=HIGH_PRIORITY,
+                event_config={
+                    "data_type": "risk",
+                    "fields": [field("name", "New risk"), field("owner_id", "owner@example.com")],
+                    "additional_stakeholder_ids": ["stakeholder@example.com"],
+                },
+                tenant_id=1,
+            ),
+            WorkflowEvent(
+                id=2,
+                name="Email on high priority",
+                workflow_flowchart_node_id=2,
+                workflow_flowchart_id=1,
+                trigger_logic=HIGH_PRIORITY,
+                event_config={
+                    "data_type": "email",
+                    "fields": [
+                        field("email-subject", "Escalated"),
+                        field("email-body", "Task escalated"),
+                        field("recipient_id", "owner@example.com"),
+                        field("internal_cc_recipient_list", ["stakeholder@example.com"]),
+                    ],
+                },
+                tenant_id=1,
+            ),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_compiled_trigger_logic_is_shared_and_combines_in_weight_order():
+    logic = [
+        {
+            "field": "Status",
+            "operator": "Equals",
+            "value": 2,
+            "weight": 1,
+            "comparison": {"value": "OR"},
+        },
+        *HIGH_PRIORITY,
+    ]
+    predicate = compile_trigger_logic(logic)
+
+    assert compile_trigger_logic(list(reversed(logic))) is not predicate
+    assert compile_trigger_logic([dict(condition) for condition in logic]) is predicate
+    assert predicate(Task(priority=TaskPriority.low, task_status_id=2))
+    assert predicate(Task(priority=TaskPriority.high, task_status_id=1))
+    assert not predicate(Task(priority=TaskPriority.low, task_status_id=1))
+
+
+def test_triggered_events_are_processed_once_with_queued_emails(db_session):
+    logs = process_workflow_event_triggers(db_session)
+
+    assert [(log.workflow_event_id, log.event_type) for log in logs] == [(1, "Create Risk")]
+    risk = db_session.query(Risk).one()
+    assert (risk.name, risk.owner_id, risk.project_id) == ("New risk", 1, 1)
+    assert [stakeholder.user_id for stakeholder in db_session.query(RiskStakeholder)] == [2]
+    assert db_session.query(NotificationOutbox).count() == 0
+
+    db_session.query(Task).filter(Task.id == 2).update({"priority": "high"})
+    db_session.commit()
+    logs = process_workflow_event_triggers(db_session)
+
+    assert [(log.workflow_event_id, log.event_type) for log in logs] == [(2, "Send Email")]
+    queued = db_session.query(NotificationOutbox).order_by(NotificationOutbox.id).all()
+    assert [(message.recipient, message.subject) for message in queued] == [
+        ("owner@example.com", "Escalated"),
+        ("stakeholder@example.com", "Escalated"),
+    ]
+    assert process_workflow_event_triggers(db_session) == []
+    assert db_session.query(WorkflowEventLog).count() == 2
+
+
+def test_incremental_sweep_skips_events_unchanged_since_the_watermark(db_session):
+    db_session.add(WorkflowEventSweep(watermark=datetime.utcnow() + timedelta(days=1)))
+    db_session.commit()
+
+    assert process_workflow_event_triggers(db_session, incremental=True) == []
+    sweep = db_session.query(WorkflowEventSweep).one()
+    assert sweep.events_evaluated == 0
+
+    sweep.watermark = datetime.utcnow() - timedelta(days=1)
+    db_session.commit()
+    logs = process_workflow_event_triggers(db_session, incremental=True)
+
+    assert [log.workflow_event_id for log in logs] == [1]
+    sweep = db_session.query(WorkflowEventSweep).one()
+    assert (sweep.events_evaluated, sweep.events_triggered) == (2, 1)
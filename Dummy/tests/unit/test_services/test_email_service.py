@@ -3,7 +3,14 @@ import unittest.mock
 import pytest
 
 from config.config import Settings
-from fedrisk_api.service.email_service import EmailService
+from fedrisk_api.service.debug_smtp import DebuggingSMTPServer
+from fedrisk_api.service.email_service import (
+    SMTP_POOL_SIZE,
+    SMTP_TIMEOUT_SECONDS,
+    EmailService,
+    SMTPConnectionPool,
+    close_smtp_pools,
+)
 
 TEST_SMTP_HOST = "127.0.0.5"
 TEST_SMTP_PORT = "27"
@@ -42,6 +49,33 @@ def mock_send_prod(*args, **kwargs):
     return ""
 
 
+@pytest.fixture(autouse=True)
+def smtp_pools():
+    close_smtp_pools()
+    yield
+    close_smtp_pools()
+
+
+@pytest.fixture
+def debugging_smtp_server():
+    with DebuggingSMTPServer() as server:
+        yield server
+
+
+@pytest.fixture
+def email_service_debugging(debugging_smtp_server):
+    test_settings = Settings()
+    test_settings.ENVIRONMENT = PROD_ENVIRONMENT_NAME
+    test_settings.SMTP_HOST = "127.0.0.1"
+    test_settings.SMTP_PORT = str(debugging_smtp_server.port)
+    test_settings.SMTP_USERNAME = "riskuity"
+    test_settings.SMTP_PASSWORD = "secret"
+    test_settings.SMTP_SENDER_EMAIL = TEST_SENDER
+
+    email_service = EmailService(config=test_settings)
+    yield email_service
+
+
 @pytest.fixture
 def email_service_non_prod():
     test_settings = Settings()
@@ -85,12 +119,46 @@ def email_service_prod():
 @pytest.mark.asyncio
 async def test_send_email_in_prod_environment(mocker, email_service_prod):
     sendmail_mock = mocker.patch("fedrisk_api.service.email_service.SMTP")
-    sendmail_mock.return_value.__enter__.return_value.sendmail = mock_send_prod
+    sendmail_mock.return_value.sendmail = mock_send_prod
+
+    for _ in range(2):
+        await email_service_prod.send_email(
+            to_email_addresses=TEST_INTENDED_TO_ADDRESS,
+            message=TEST_MESSAGE,
+            subject=TEST_SUBJECT,
+            use_ssl=False,
+        )
+    # the second email reuses the pooled session
+    sendmail_mock.assert_called_once_with(
+        TEST_SMTP_HOST, TEST_SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS
+    )
+
+
+@pytest.mark.asyncio
+async def test_send_emails_shares_pooled_sessions(email_service_debugging, debugging_smtp_server):
+    digest = [(f"user{index}@example.com", TEST_MESSAGE, TEST_SUBJECT) for index in range(20)]
 
-    await email_service_prod.send_email(
-        to_email_addresses=TEST_INTENDED_TO_ADDRESS,
-        message=TEST_MESSAGE,
-        subject=TEST_SUBJECT,
-        use_ssl=False,
+    assert await email_service_debugging.send_emails(digest, use_ssl=False) == [None] * 20
+    await email_service_debugging.send_email(
+        TEST_INTENDED_TO_ADDRESS, TEST_MESSAGE, TEST_SUBJECT, use_ssl=False
     )
-    sendmail_mock.assert_called_once_with(TEST_SMTP_HOST, TEST_SMTP_PORT)
+
+    assert debugging_smtp_server.connections <= SMTP_POOL_SIZE
+    assert len(debugging_smtp_server.messages) == 21
+    sender, recipients, message = debugging_smtp_server.messages[-1]
+    assert (sender, recipients) == (TEST_SENDER, [TEST_INTENDED_TO_ADDRESS])
+    assert message["Subject"] == TEST_SUBJECT
+
+
+def test_send_many_reconnects_dropped_sessions():
+    with DebuggingSMTPServer(max_messages_per_session=2) as server:
+        pool = SMTPConnectionPool("127.0.0.1", server.port, use_ssl=False, size=1)
+        messages = [
+            (TEST_SENDER, [f"user{index}@example.com"], "Subject: hi\n\nhi") for index in range(5)
+        ]
+
+        assert pool.send_many(messages) == [None] * 5
+        pool.close()
+
+    assert len(server.messages) == 5
+    assert server.connections == 3